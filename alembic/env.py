@@ -8,14 +8,7 @@ from alembic import context
 
 # Import our database configuration and all models
 from app.database import Base, SQLALCHEMY_DATABASE_URL
-from app.models import (
-    User, Post, Category, Rule, Group, Resource,
-    Member, Interaction,
-    CategoryRule, CategoryPost, CategoryGroup, CategoryCategory,
-    PostResource, PostPost,
-    UserUser,
-    Notification,
-)
+import app.models  # noqa: F401 - register all tables on Base.metadata
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -71,6 +64,12 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    # A connection passed in via Config.attributes (tests, programmatic upgrades) is reused
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _run_with_connection(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -78,14 +77,18 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata,
-            render_as_batch=True,  # SQLite support
-        )
-
-        with context.begin_transaction():
-            context.run_migrations()
+        _run_with_connection(connection)
+
+
+def _run_with_connection(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=True,  # SQLite support
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
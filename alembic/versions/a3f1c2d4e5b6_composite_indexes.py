@@ -0,0 +1,53 @@
+"""composite_indexes
+
+Composite indexes from specs/data-indexing.md. Soft-deletable tables get partial
+``WHERE deleted_at IS NULL`` indexes, since every list query filters on it.
+target_interactions (target_type, target_id) is already served by uq_target_interaction.
+
+Revision ID: a3f1c2d4e5b6
+Revises: 833ddc5dc597
+Create Date: 2026-10-18 09:12:40.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c2d4e5b6'
+down_revision: Union[str, Sequence[str], None] = '833ddc5dc597'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE_ROWS = sa.text("deleted_at IS NULL")
+
+# (index name, table, columns, partial on live rows)
+INDEXES = [
+    ("ix_posts_type_status_created", "posts", ["type", "status", "created_at"], True),
+    ("ix_posts_created_by_created", "posts", ["created_by", "created_at"], True),
+    ("ix_events_type_status_created", "events", ["type", "status", "created_at"], True),
+    ("ix_events_created_by_created", "events", ["created_by", "created_at"], True),
+    ("ix_interactions_parent_created", "interactions", ["parent_id", "created_at"], True),
+    ("ix_interactions_created_by_type", "interactions", ["created_by", "type", "created_at"], False),
+    ("ix_members_group_status", "members", ["group_id", "status"], False),
+    ("ix_members_user_status", "members", ["user_id", "status"], False),
+    ("ix_user_users_source_relation", "user_users", ["source_user_id", "relation_type"], False),
+    ("ix_user_users_target_relation", "user_users", ["target_user_id", "relation_type"], False),
+    ("ix_event_events_source_relation_order", "event_events", ["source_event_id", "relation_type", "stage_order"], False),
+    ("ix_notifications_user_read_created", "notifications", ["user_id", "is_read", "created_at"], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns, partial in INDEXES:
+        where = {"sqlite_where": LIVE_ROWS, "postgresql_where": LIVE_ROWS} if partial else {}
+        op.create_index(name, table, columns, unique=False, if_not_exists=True, **where)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _columns, _partial in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,63 @@
+"""resource extension
+
+Stored, normalized file extension on resources (lowercased, without the dot) so
+the rule engine's format checks filter in SQL. Existing rows are backfilled from
+their filename.
+
+Revision ID: a8d4b2e6c1f9
+Revises: f7c3a9d2b5e8
+Create Date: 2026-10-18 21:06:14.318902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d4b2e6c1f9'
+down_revision: Union[str, Sequence[str], None] = 'f7c3a9d2b5e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+resources = sa.table(
+    'resources',
+    sa.column('id', sa.Integer()),
+    sa.column('filename', sa.String()),
+    sa.column('extension', sa.String()),
+)
+
+
+def file_extension(filename: str) -> str:
+    """Same rule as app.models.resource.file_extension, frozen for this revision."""
+    if "." in filename:
+        return filename.rsplit(".", 1)[-1].lower()
+    return ""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if 'extension' not in {column['name'] for column in sa.inspect(bind).get_columns('resources')}:
+        op.add_column('resources', sa.Column('extension', sa.String(), server_default='', nullable=False))
+    op.create_index('ix_resources_extension', 'resources', ['extension'], unique=False, if_not_exists=True)
+
+    rows = [
+        {'resource_id': resource_id, 'ext': file_extension(filename or '')}
+        for resource_id, filename in bind.execute(sa.select(resources.c.id, resources.c.filename))
+    ]
+    if rows:
+        bind.execute(
+            resources.update().where(resources.c.id == sa.bindparam('resource_id')).values(
+                extension=sa.bindparam('ext'),
+            ),
+            rows,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_resources_extension', table_name='resources', if_exists=True)
+    with op.batch_alter_table('resources') as batch_op:
+        batch_op.drop_column('extension')
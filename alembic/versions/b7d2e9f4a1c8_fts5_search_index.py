@@ -0,0 +1,91 @@
+"""fts5_search_index
+
+FTS5 external-content tables for posts, events and users plus sync triggers
+(SQLite only). Newly created tables are rebuilt from the base tables.
+
+Revision ID: b7d2e9f4a1c8
+Revises: a3f1c2d4e5b6
+Create Date: 2026-10-18 11:40:05.731962
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e9f4a1c8'
+down_revision: Union[str, Sequence[str], None] = 'a3f1c2d4e5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of app.models.search_index at this revision: fts table -> DDL
+FTS_DDL = {
+    'posts_fts': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+        "title, content, tags, content='posts', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+        "INSERT INTO posts_fts(rowid, title, content, tags) VALUES (new.id, new.title, new.content, new.tags); END",
+        "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+        "INSERT INTO posts_fts(posts_fts, rowid, title, content, tags) "
+        "VALUES ('delete', old.id, old.title, old.content, old.tags); END",
+        "CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content, tags ON posts BEGIN "
+        "INSERT INTO posts_fts(posts_fts, rowid, title, content, tags) "
+        "VALUES ('delete', old.id, old.title, old.content, old.tags); "
+        "INSERT INTO posts_fts(rowid, title, content, tags) VALUES (new.id, new.title, new.content, new.tags); END",
+    ],
+    'events_fts': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+        "name, description, content='events', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS events_fts_ai AFTER INSERT ON events BEGIN "
+        "INSERT INTO events_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+        "CREATE TRIGGER IF NOT EXISTS events_fts_ad AFTER DELETE ON events BEGIN "
+        "INSERT INTO events_fts(events_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); END",
+        "CREATE TRIGGER IF NOT EXISTS events_fts_au AFTER UPDATE OF name, description ON events BEGIN "
+        "INSERT INTO events_fts(events_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO events_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    ],
+    'users_fts': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS users_fts USING fts5("
+        "username, display_name, bio, content='users', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS users_fts_ai AFTER INSERT ON users BEGIN "
+        "INSERT INTO users_fts(rowid, username, display_name, bio) "
+        "VALUES (new.id, new.username, new.display_name, new.bio); END",
+        "CREATE TRIGGER IF NOT EXISTS users_fts_ad AFTER DELETE ON users BEGIN "
+        "INSERT INTO users_fts(users_fts, rowid, username, display_name, bio) "
+        "VALUES ('delete', old.id, old.username, old.display_name, old.bio); END",
+        "CREATE TRIGGER IF NOT EXISTS users_fts_au AFTER UPDATE OF username, display_name, bio ON users BEGIN "
+        "INSERT INTO users_fts(users_fts, rowid, username, display_name, bio) "
+        "VALUES ('delete', old.id, old.username, old.display_name, old.bio); "
+        "INSERT INTO users_fts(rowid, username, display_name, bio) "
+        "VALUES (new.id, new.username, new.display_name, new.bio); END",
+    ],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    for fts, statements in FTS_DDL.items():
+        exists = bind.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,),
+        ).first()
+        for ddl in statements:
+            bind.exec_driver_sql(ddl)
+        if not exists:
+            bind.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite':
+        return
+    for fts in FTS_DDL:
+        for suffix in ('ai', 'ad', 'au'):
+            bind.exec_driver_sql(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        bind.exec_driver_sql(f"DROP TABLE IF EXISTS {fts}")
@@ -0,0 +1,142 @@
+"""post_tags
+
+Normalized post:tag table derived from posts.tags, with sync triggers (SQLite, PostgreSQL).
+Existing posts are backfilled when the triggers are installed.
+
+Revision ID: c4e8a1b2d3f5
+Revises: b7d2e9f4a1c8
+Create Date: 2026-10-18 14:02:51.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1b2d3f5'
+down_revision: Union[str, Sequence[str], None] = 'b7d2e9f4a1c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of the app.models.post_tag trigger SQL at this revision
+SQLITE_TRIGGERS = {
+    'post_tags_ai': (
+        "AFTER INSERT ON posts BEGIN "
+        "INSERT OR IGNORE INTO post_tags (post_id, tag_normalized) "
+        "SELECT new.id, lower(trim(j.value)) "
+        "FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags END) AS j "
+        "WHERE j.type = 'text' AND trim(j.value) != ''; END"
+    ),
+    'post_tags_au': (
+        "AFTER UPDATE OF tags ON posts BEGIN "
+        "DELETE FROM post_tags WHERE post_id = old.id; "
+        "INSERT OR IGNORE INTO post_tags (post_id, tag_normalized) "
+        "SELECT new.id, lower(trim(j.value)) "
+        "FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags END) AS j "
+        "WHERE j.type = 'text' AND trim(j.value) != ''; END"
+    ),
+    'post_tags_ad': "AFTER DELETE ON posts BEGIN DELETE FROM post_tags WHERE post_id = old.id; END",
+}
+SQLITE_BACKFILL = (
+    "INSERT OR IGNORE INTO post_tags (post_id, tag_normalized) "
+    "SELECT posts.id, lower(trim(j.value)) "
+    "FROM posts, json_each(CASE WHEN json_valid(posts.tags) THEN posts.tags END) AS j "
+    "WHERE j.type = 'text' AND trim(j.value) != ''"
+)
+
+# PostgreSQL: the same three triggers share one function
+PG_FUNCTION = (
+    "CREATE OR REPLACE FUNCTION post_tags_sync() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "
+    "IF TG_OP <> 'INSERT' THEN DELETE FROM post_tags WHERE post_id = OLD.id; END IF; "
+    "IF TG_OP <> 'DELETE' THEN "
+    "INSERT INTO post_tags (post_id, tag_normalized) "
+    "SELECT NEW.id, lower(trim(j.value #>> '{}')) "
+    "FROM jsonb_array_elements(CASE WHEN jsonb_typeof(NEW.tags::jsonb) = 'array' THEN NEW.tags::jsonb END) AS j "
+    "WHERE jsonb_typeof(j.value) = 'string' AND trim(j.value #>> '{}') != '' ON CONFLICT DO NOTHING; "
+    "END IF; RETURN NULL; END $$"
+)
+PG_TRIGGERS = {
+    'post_tags_ai': "AFTER INSERT ON posts",
+    'post_tags_au': "AFTER UPDATE OF tags ON posts",
+    'post_tags_ad': "AFTER DELETE ON posts",
+}
+PG_BACKFILL = (
+    "INSERT INTO post_tags (post_id, tag_normalized) "
+    "SELECT posts.id, lower(trim(j.value #>> '{}')) "
+    "FROM posts, jsonb_array_elements("
+    "CASE WHEN jsonb_typeof(posts.tags::jsonb) = 'array' THEN posts.tags::jsonb END) AS j "
+    "WHERE jsonb_typeof(j.value) = 'string' AND trim(j.value #>> '{}') != '' ON CONFLICT DO NOTHING"
+)
+
+
+def check_dialect(bind) -> None:
+    if bind.dialect.name not in ('sqlite', 'postgresql'):
+        # Without the triggers post_tags stays empty and every tag filter silently matches nothing
+        raise RuntimeError(f"post_tags sync triggers are not implemented for {bind.dialect.name}")
+
+
+def create_triggers(bind) -> None:
+    """Create missing sync triggers; backfill post_tags when they were not installed yet."""
+    check_dialect(bind)
+    if bind.dialect.name == 'postgresql':
+        installed = {
+            row[0] for row in bind.exec_driver_sql(
+                "SELECT tgname FROM pg_trigger WHERE tgrelid = 'posts'::regclass AND NOT tgisinternal"
+            )
+        }
+        bind.exec_driver_sql(PG_FUNCTION)
+        for name, when in PG_TRIGGERS.items():
+            if name not in installed:
+                bind.exec_driver_sql(f"CREATE TRIGGER {name} {when} FOR EACH ROW EXECUTE FUNCTION post_tags_sync()")
+        backfill = not set(PG_TRIGGERS) <= installed
+    else:
+        installed = {
+            row[0] for row in bind.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'posts'"
+            )
+        }
+        for name, body in SQLITE_TRIGGERS.items():
+            bind.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        backfill = not set(SQLITE_TRIGGERS) <= installed
+    if backfill:
+        bind.exec_driver_sql("DELETE FROM post_tags")
+        bind.exec_driver_sql(PG_BACKFILL if bind.dialect.name == 'postgresql' else SQLITE_BACKFILL)
+
+
+def drop_triggers(bind) -> None:
+    check_dialect(bind)
+    if bind.dialect.name == 'postgresql':
+        for name in PG_TRIGGERS:
+            bind.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name} ON posts")
+        bind.exec_driver_sql("DROP FUNCTION IF EXISTS post_tags_sync()")
+        return
+    for name in SQLITE_TRIGGERS:
+        bind.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'post_tags',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('tag_normalized', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('post_id', 'tag_normalized', name='uq_post_tag'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_post_tags_id', 'post_tags', ['id'], unique=False, if_not_exists=True)
+    op.create_index(
+        'ix_post_tags_tag_post', 'post_tags', ['tag_normalized', 'post_id'], unique=False, if_not_exists=True,
+    )
+    create_triggers(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_triggers(op.get_bind())
+    op.drop_index('ix_post_tags_tag_post', table_name='post_tags', if_exists=True)
+    op.drop_index('ix_post_tags_id', table_name='post_tags', if_exists=True)
+    op.drop_table('post_tags', if_exists=True)
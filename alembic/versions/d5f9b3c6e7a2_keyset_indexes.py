@@ -0,0 +1,44 @@
+"""keyset pagination indexes
+
+Ordering indexes for cursor pagination on the list endpoints: (created_at, id) over
+live posts/events/groups and (user_id, created_at) for notifications.
+
+Revision ID: d5f9b3c6e7a2
+Revises: c4e8a1b2d3f5
+Create Date: 2026-10-18 15:21:07.815243
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f9b3c6e7a2'
+down_revision: Union[str, Sequence[str], None] = 'c4e8a1b2d3f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE = sa.text("deleted_at IS NULL")
+
+# (name, table, columns, partial on live rows)
+INDEXES = [
+    ("ix_posts_live_created", "posts", ["created_at", "id"], True),
+    ("ix_events_live_created", "events", ["created_at", "id"], True),
+    ("ix_groups_live_created", "groups", ["created_at", "id"], True),
+    ("ix_notifications_user_created", "notifications", ["user_id", "created_at"], False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns, live_only in INDEXES:
+        where = {"sqlite_where": LIVE, "postgresql_where": LIVE} if live_only else {}
+        op.create_index(name, table, columns, unique=False, if_not_exists=True, **where)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,38 @@
+"""rule condition indexes
+
+Covering index for the rule engine's per-event relation counts: COUNT(*) over
+category_posts by (event_id, relation_type) and the submission lists joined to
+posts on post_id.
+
+Revision ID: e6a1c4d8b9f3
+Revises: d5f9b3c6e7a2
+Create Date: 2026-10-18 17:40:22.104518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a1c4d8b9f3'
+down_revision: Union[str, Sequence[str], None] = 'd5f9b3c6e7a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns)
+INDEXES = [
+    ("ix_category_posts_event_relation", "category_posts", ["event_id", "relation_type", "post_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,53 @@
+"""rule_jobs
+
+Queue of rule-engine post-hook runs (event closed, submission added) executed by
+the in-process job worker instead of inside the request.
+
+Revision ID: f7c3a9d2b5e8
+Revises: e6a1c4d8b9f3
+Create Date: 2026-10-18 19:12:37.530861
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c3a9d2b5e8'
+down_revision: Union[str, Sequence[str], None] = 'e6a1c4d8b9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rule_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('trigger', sa.String(), nullable=False),
+        sa.Column('context', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('run_after', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('logs', sa.JSON(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        if_not_exists=True,
+    )
+    op.create_index('ix_rule_jobs_id', 'rule_jobs', ['id'], unique=False, if_not_exists=True)
+    op.create_index('ix_rule_jobs_status_run_after', 'rule_jobs', ['status', 'run_after'], unique=False, if_not_exists=True)
+    op.create_index('ix_rule_jobs_event_created', 'rule_jobs', ['event_id', 'created_at'], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rule_jobs_event_created', table_name='rule_jobs', if_exists=True)
+    op.drop_index('ix_rule_jobs_status_run_after', table_name='rule_jobs', if_exists=True)
+    op.drop_index('ix_rule_jobs_id', table_name='rule_jobs', if_exists=True)
+    op.drop_table('rule_jobs', if_exists=True)
@@ -4,10 +4,30 @@ Environment variables:
 - MOCK_AUTH: Enable mock authentication for development (default: true)
 - MOCK_USER_ID: Default user ID in mock mode (default: 1)
 - MOCK_USER_ROLE: Default user role in mock mode (default: participant)
-- DATABASE_URL: Database connection URL (default: sqlite:///./data/synnovator.db)
+- DATABASE_URL: Database connection URL (default: sqlite:///<SYNNOVATOR_DATA_DIR>/synnovator.db)
+- DB_POOL_SIZE / DB_MAX_OVERFLOW: Connection pool sizing (default: 5 / 10)
+- DB_POOL_TIMEOUT: Seconds to wait for a pooled connection (default: 30)
+- DB_POOL_RECYCLE: Recycle connections older than N seconds, -1 disables (default: -1)
+- DB_POOL_PRE_PING: Test connections on checkout (default: false)
+- DB_READ_ONLY: Open the database read-only (default: false)
+- DB_ASYNC_READS: Serve hot GET endpoints with AsyncSession (default: false)
+- DB_INIT_ON_STARTUP: Bring the schema to the Alembic head on startup (default: true)
+- RULE_CACHE_TTL: Seconds an event's compiled rule set is reused, 0 disables (default: 60)
+- RULE_JOBS_SYNC: Run rule post hooks inside the request instead of queueing them (default: false)
+- RULE_JOB_MAX_ATTEMPTS: Attempts before a queued post-hook run is marked failed (default: 3)
+- RULE_JOB_RETRY_DELAY: Seconds before the first retry, doubled per attempt (default: 5)
+- RULE_JOB_POLL_INTERVAL: Seconds the job worker sleeps when the queue is empty (default: 1)
+- RULE_TRACE_HEADER: Add a Server-Timing header with each request's rule checks (default: false)
+- SQLITE_JOURNAL_MODE: SQLite journal mode applied on connect (default: wal)
+- SQLITE_SYNCHRONOUS: SQLite synchronous level (default: normal)
+- SQLITE_MMAP_SIZE: Bytes of the database file to memory-map (default: 268435456)
+- SQLITE_CACHE_SIZE: Page cache size, negative values are KiB (default: -65536)
+- SQLITE_TEMP_STORE: Where SQLite keeps temporary tables (default: memory)
+- SQLITE_BUSY_TIMEOUT: Milliseconds to wait on a locked database (default: 5000)
+- SQLITE_OPTIMIZE_ON_SHUTDOWN: Run PRAGMA optimize on shutdown (default: true)
 """
 import json
-from typing import Literal
+from typing import Literal, Optional
 from pydantic import ConfigDict, field_validator
 from pydantic_settings import BaseSettings
 
@@ -28,7 +48,36 @@ class Settings(BaseSettings):
     mock_user_role: Literal["participant", "organizer", "admin"] = "participant"
 
     # Database
-    database_url: str = "sqlite:///./data/synnovator.db"
+    database_url: Optional[str] = None  # None → sqlite file under SYNNOVATOR_DATA_DIR
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = -1
+    db_pool_pre_ping: bool = False
+    db_read_only: bool = False
+    db_async_reads: bool = False
+    db_init_on_startup: bool = True
+
+    # SQLite connection profile (applied to every new connection)
+    sqlite_journal_mode: Literal["wal", "delete", "truncate", "persist", "memory", "off"] = "wal"
+    sqlite_synchronous: Literal["off", "normal", "full", "extra"] = "normal"
+    sqlite_mmap_size: int = 268_435_456  # 256 MiB
+    sqlite_cache_size: int = -65_536  # 64 MiB
+    sqlite_temp_store: Literal["default", "file", "memory"] = "memory"
+    sqlite_busy_timeout: int = 5000
+    sqlite_optimize_on_shutdown: bool = True
+
+    # Rule engine: per-event rule sets are also invalidated on local writes;
+    # the TTL bounds staleness when several workers share the database
+    rule_cache_ttl: float = 60.0
+    # Post hooks (ranking, certificates, ...) go to the rule_jobs queue and run in the
+    # in-process worker; rule_jobs_sync keeps them inline in the request (tests)
+    rule_jobs_sync: bool = False
+    rule_job_max_attempts: int = 3
+    rule_job_retry_delay: float = 5.0
+    rule_job_poll_interval: float = 1.0
+    # Debug: per-request rule check breakdown in a Server-Timing response header
+    rule_trace_header: bool = False
 
     # API
     api_prefix: str = "/api"
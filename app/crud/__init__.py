@@ -17,3 +17,4 @@ from app.crud.event_groups import event_groups
 from app.crud.target_interactions import target_interactions
 from app.crud.event_events import event_events
 from app.crud.notifications import notifications
+from app.crud.rule_jobs import rule_jobs
@@ -2,14 +2,15 @@
 from typing import Any, Generic, List, Optional, Type, TypeVar
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from app.database import Base
+from app.crud.bulk import BulkMixin
+from app.database import Base, commit_or_flush
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
-class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+class CRUDBase(BulkMixin, Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
@@ -21,28 +22,34 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> List[ModelType]:
         return db.query(self.model).offset(skip).limit(limit).all()
 
-    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
+    def create(
+        self, db: Session, *, obj_in: CreateSchemaType, refresh: bool = False
+    ) -> ModelType:
+        """refresh=True reloads the row (e.g. trigger-maintained columns); expired
+        attributes otherwise load lazily on first access."""
         obj_data = obj_in.model_dump()
         db_obj = self.model(**obj_data)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db)
+        if refresh:
+            db.refresh(db_obj)
         return db_obj
 
     def update(
-        self, db: Session, *, db_obj: ModelType, obj_in: UpdateSchemaType
+        self, db: Session, *, db_obj: ModelType, obj_in: UpdateSchemaType, refresh: bool = False
     ) -> ModelType:
         update_data = obj_in.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db)
+        if refresh:
+            db.refresh(db_obj)
         return db_obj
 
     def remove(self, db: Session, *, id: Any) -> Optional[ModelType]:
         obj = db.query(self.model).filter(self.model.id == id).first()
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
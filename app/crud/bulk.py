@@ -0,0 +1,112 @@
+"""Bulk insert / update / upsert shared by CRUDBase and the relation CRUDs
+
+Rows are plain dicts keyed by column name. Inserts go through one ORM-enabled
+``INSERT ... RETURNING id`` executed with many parameter sets, which SQLAlchemy
+batches into multi-row VALUES statements; updates are a single executemany UPDATE
+keyed on id. On SQLite ``sort_by_parameter_order`` is not used: it has no implicit
+sentinel, so SQLAlchemy would fall back to one INSERT per row, and rowids are
+allocated in VALUES order anyway, so create_many sorts the ids. Other dialects
+(PostgreSQL) request it, since RETURNING order is not guaranteed there. upsert_many
+restores input order from the unique key.
+
+Inserts and upserts bypass the identity map: objects already loaded in the session
+keep their old state until refreshed. update_many expires the updated columns of
+loaded instances so the next access reloads them.
+"""
+from itertools import groupby
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.database import commit_or_flush
+
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+class BulkMixin:
+    """create_many / update_many / upsert_many for a CRUD class with ``model`` set.
+
+    ``unique_fields`` names the unique constraint that upsert_many resolves conflicts on
+    (e.g. ``("event_id", "post_id")`` for uq_category_post).
+    """
+
+    model: Any
+    unique_fields: Sequence[str] = ()
+
+    def _prepare_row(self, row: Any) -> Dict[str, Any]:
+        """Turn an input row (dict or Create schema) into column values; override to fill defaults."""
+        return row.model_dump() if isinstance(row, BaseModel) else dict(row)
+
+    def _default_update_fields(self, rows: Sequence[Any]) -> List[str]:
+        """Non-key columns the caller supplied in the first row (not defaults filled in by _prepare_row())."""
+        first = rows[0].model_dump(exclude_unset=True) if isinstance(rows[0], BaseModel) else rows[0]
+        return [k for k in first if k not in self.unique_fields and k != "id"]
+
+    def create_many(self, db: Session, *, rows: Sequence[Any]) -> List[int]:
+        """Insert rows in multi-row batches; returns the new ids in input order."""
+        if not rows:
+            return []
+        on_sqlite = db.get_bind().dialect.name == "sqlite"
+        stmt = insert(self.model).returning(self.model.id, sort_by_parameter_order=not on_sqlite)
+        ids = list(db.scalars(stmt, [self._prepare_row(row) for row in rows]))
+        commit_or_flush(db)
+        # SQLite allocates rowids in VALUES order and runs the batches in sequence
+        return sorted(ids) if on_sqlite else ids
+
+    def update_many(self, db: Session, *, rows: Sequence[Mapping[str, Any]]) -> int:
+        """UPDATE rows by id; each row is ``{"id": ..., field: value, ...}``. Returns rows matched."""
+        table = self.model.__table__
+        matched = 0
+        params = sorted(
+            ({("_id" if k == "id" else k): v for k, v in row.items()} for row in rows),
+            key=lambda row: sorted(row),
+        )
+        # One executemany per distinct set of columns
+        for _, group in groupby(params, key=lambda row: sorted(row)):
+            stmt = update(table).where(table.c.id == bindparam("_id"))
+            matched += db.execute(stmt, list(group)).rowcount
+        for row in rows:
+            obj = db.identity_map.get(db.identity_key(self.model, row["id"]))
+            if obj is not None:
+                db.expire(obj, [key for key in row if key != "id"])
+        commit_or_flush(db)
+        return matched
+
+    def upsert_many(
+        self,
+        db: Session,
+        *,
+        rows: Sequence[Any],
+        update_fields: Optional[Sequence[str]] = None,
+    ) -> List[int]:
+        """INSERT ... ON CONFLICT (unique_fields) DO UPDATE; returns ids (new or existing) in input order.
+
+        Args:
+            update_fields: Columns to overwrite on conflict; defaults to every
+                non-key column present in the rows. With nothing to update the
+                existing row is kept as is.
+        """
+        if not rows:
+            return []
+        dialect = db.get_bind().dialect.name
+        if dialect not in _UPSERT_INSERTS:
+            raise NotImplementedError(f"upsert_many is not supported on {dialect}")
+        if not self.unique_fields:
+            raise TypeError(f"{type(self).__name__} has no unique_fields to upsert on")
+        if update_fields is None:
+            update_fields = self._default_update_fields(rows)
+        rows = [self._prepare_row(row) for row in rows]
+        stmt = _UPSERT_INSERTS[dialect](self.model)
+        # A no-op SET on a key column keeps RETURNING populated for rows that already exist
+        set_: Dict[str, Any] = {
+            field: stmt.excluded[field] for field in (update_fields or self.unique_fields[:1])
+        }
+        stmt = stmt.on_conflict_do_update(index_elements=list(self.unique_fields), set_=set_)
+        keys = [getattr(self.model, field) for field in self.unique_fields]
+        result = db.execute(stmt.returning(self.model.id, *keys), rows)
+        ids = {tuple(key): row_id for row_id, *key in result}
+        commit_or_flush(db)
+        return [ids[tuple(row[field] for field in self.unique_fields)] for row in rows]
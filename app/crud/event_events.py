@@ -3,6 +3,7 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.database import commit_or_flush
 from app.models.event_event import EventEvent
 
 
@@ -78,15 +79,14 @@ class CRUDEventEvent:
             stage_order=stage_order,
         )
         db.add(obj)
-        db.commit()
-        db.refresh(obj)
+        commit_or_flush(db)
         return obj
 
     def remove(self, db: Session, *, id: int) -> Optional[EventEvent]:
         obj = db.query(EventEvent).filter(EventEvent.id == id).first()
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
 
     def remove_by_source_and_target(
@@ -98,7 +98,7 @@ class CRUDEventEvent:
         )
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
 
 
@@ -108,7 +108,7 @@ class CRUDEventEvent:
             (EventEvent.source_event_id == event_id) |
             (EventEvent.target_event_id == event_id)
         ).delete(synchronize_session="fetch")
-        db.commit()
+        commit_or_flush(db)
         return count
 
 
@@ -3,6 +3,7 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.database import commit_or_flush
 from app.models.event_group import EventGroup
 
 
@@ -46,33 +47,32 @@ class CRUDEventGroup:
     def create(self, db: Session, *, event_id: int, group_id: int) -> EventGroup:
         obj = EventGroup(event_id=event_id, group_id=group_id)
         db.add(obj)
-        db.commit()
-        db.refresh(obj)
+        commit_or_flush(db)
         return obj
 
     def remove(self, db: Session, *, id: int) -> Optional[EventGroup]:
         obj = db.query(EventGroup).filter(EventGroup.id == id).first()
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
 
     def remove_by_category_and_group(self, db: Session, *, event_id: int, group_id: int) -> Optional[EventGroup]:
         obj = self.get_by_category_and_group(db, event_id=event_id, group_id=group_id)
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
 
 
     def remove_all_by_category(self, db: Session, *, event_id: int) -> int:
         count = db.query(EventGroup).filter(EventGroup.event_id == event_id).delete()
-        db.commit()
+        commit_or_flush(db)
         return count
 
     def remove_all_by_group(self, db: Session, *, group_id: int) -> int:
         count = db.query(EventGroup).filter(EventGroup.group_id == group_id).delete()
-        db.commit()
+        commit_or_flush(db)
         return count
 
 
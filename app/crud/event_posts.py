@@ -3,10 +3,15 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.crud.bulk import BulkMixin
+from app.database import commit_or_flush
 from app.models.event_post import EventPost
 
 
-class CRUDEventPost:
+class CRUDEventPost(BulkMixin):
+    model = EventPost
+    unique_fields = ("event_id", "post_id")  # uq_category_post
+
     def get(self, db: Session, *, id: int) -> Optional[EventPost]:
         return db.query(EventPost).filter(EventPost.id == id).first()
 
@@ -50,26 +55,25 @@ class CRUDEventPost:
     ) -> EventPost:
         obj = EventPost(event_id=event_id, post_id=post_id, relation_type=relation_type)
         db.add(obj)
-        db.commit()
-        db.refresh(obj)
+        commit_or_flush(db)
         return obj
 
     def remove(self, db: Session, *, id: int) -> Optional[EventPost]:
         obj = db.query(EventPost).filter(EventPost.id == id).first()
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
 
 
     def remove_all_by_category(self, db: Session, *, event_id: int) -> int:
         count = db.query(EventPost).filter(EventPost.event_id == event_id).delete()
-        db.commit()
+        commit_or_flush(db)
         return count
 
     def remove_all_by_post(self, db: Session, *, post_id: int) -> int:
         count = db.query(EventPost).filter(EventPost.post_id == post_id).delete()
-        db.commit()
+        commit_or_flush(db)
         return count
 
 
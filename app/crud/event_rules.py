@@ -1,9 +1,11 @@
 """EventRule CRUD — event:rule relationship"""
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 
 from sqlalchemy.orm import Session
 
+from app.database import commit_or_flush
 from app.models.event_rule import EventRule
+from app.models.rule import Rule
 
 
 class CRUDEventRule:
@@ -21,42 +23,71 @@ class CRUDEventRule:
             EventRule.event_id == event_id,
         ).order_by(EventRule.priority.asc()).all()
 
+    def get_rules_by_category(self, db: Session, *, event_id: int) -> List[Rule]:
+        """Live rules linked to an event in priority order, in one query."""
+        return db.query(Rule).join(EventRule, EventRule.rule_id == Rule.id).filter(
+            EventRule.event_id == event_id,
+            Rule.deleted_at.is_(None),
+        ).order_by(EventRule.priority.asc(), EventRule.id.asc()).all()
+
+    def get_rules_by_categories(self, db: Session, *, event_ids: Sequence[int]) -> Dict[int, List[Rule]]:
+        """get_rules_by_category for several events in one query; events without rules are left out."""
+        rows = db.query(EventRule.event_id, Rule).join(Rule, Rule.id == EventRule.rule_id).filter(
+            EventRule.event_id.in_(event_ids),
+            Rule.deleted_at.is_(None),
+        ).order_by(EventRule.event_id, EventRule.priority.asc(), EventRule.id.asc()).all()
+        rules: Dict[int, List[Rule]] = {}
+        for event_id, rule in rows:
+            rules.setdefault(event_id, []).append(rule)
+        return rules
+
     def create(self, db: Session, *, event_id: int, rule_id: int, priority: int = 0) -> EventRule:
+        from app.services.rule_engine import invalidate_event_rules
         obj = EventRule(event_id=event_id, rule_id=rule_id, priority=priority)
         db.add(obj)
-        db.commit()
-        db.refresh(obj)
+        commit_or_flush(db)
+        invalidate_event_rules(event_id, db=db)
         return obj
 
     def update_priority(self, db: Session, *, db_obj: EventRule, priority: int) -> EventRule:
+        from app.services.rule_engine import invalidate_event_rules
         db_obj.priority = priority
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db)
+        invalidate_event_rules(db_obj.event_id, db=db)
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> Optional[EventRule]:
+        from app.services.rule_engine import invalidate_event_rules
         obj = db.query(EventRule).filter(EventRule.id == id).first()
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
+            invalidate_event_rules(obj.event_id, db=db)
         return obj
 
     def remove_by_category_and_rule(self, db: Session, *, event_id: int, rule_id: int) -> Optional[EventRule]:
+        from app.services.rule_engine import invalidate_event_rules
         obj = self.get_by_category_and_rule(db, event_id=event_id, rule_id=rule_id)
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
+            invalidate_event_rules(event_id, db=db)
         return obj
 
 
     def remove_all_by_category(self, db: Session, *, event_id: int) -> int:
+        from app.services.rule_engine import invalidate_event_rules
         count = db.query(EventRule).filter(EventRule.event_id == event_id).delete()
-        db.commit()
+        commit_or_flush(db)
+        invalidate_event_rules(event_id, db=db)
         return count
 
     def remove_all_by_rule(self, db: Session, *, rule_id: int) -> int:
+        from app.services.rule_engine import invalidate_rule_plan
         count = db.query(EventRule).filter(EventRule.rule_id == rule_id).delete()
-        db.commit()
+        commit_or_flush(db)
+        # Drops the plan and every cached event rule set that contains it
+        invalidate_rule_plan(rule_id, db=db)
         return count
 
 
@@ -5,6 +5,7 @@ from typing import Any, List, Optional
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
+from app.database import commit_or_flush
 from app.models.event import Event
 from app.schemas.event import EventCreate, EventUpdate
 
@@ -25,8 +26,7 @@ class CRUDEvent(CRUDBase[Event, EventCreate, EventUpdate]):
         obj = db.query(self.model).filter(self.model.id == id).first()
         if obj:
             obj.deleted_at = datetime.now(timezone.utc)
-            db.commit()
-            db.refresh(obj)
+            commit_or_flush(db)
         return obj
 
 
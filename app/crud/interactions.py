@@ -5,6 +5,7 @@ from typing import Any, List, Optional
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
+from app.database import commit_or_flush
 from app.models.interaction import Interaction
 from app.models.comment import Comment
 from app.models.rating import Rating
@@ -29,8 +30,7 @@ class CRUDInteraction(CRUDBase[Interaction, InteractionCreate, InteractionUpdate
         obj = db.query(self.model).filter(self.model.id == id).first()
         if obj:
             obj.deleted_at = datetime.now(timezone.utc)
-            db.commit()
-            db.refresh(obj)
+            commit_or_flush(db)
         return obj
 
 
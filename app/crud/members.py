@@ -1,13 +1,38 @@
 """Member CRUD — group:user relationship with approval flow"""
 from datetime import datetime, timezone
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.crud.bulk import BulkMixin
+from app.crud.pagination import paginate
+from app.database import commit_or_flush
 from app.models.member import Member
 
 
-class CRUDMember:
+class CRUDMember(BulkMixin):
+    model = Member
+    unique_fields = ("group_id", "user_id")  # uq_group_user
+
+    def _prepare_row(self, row: Any) -> dict:
+        """Same defaults as create(): pending member, joined_at once accepted."""
+        row = super()._prepare_row(row)
+        now = datetime.now(timezone.utc)
+        row.setdefault("role", "member")
+        row.setdefault("status", "pending")
+        row.setdefault("status_changed_at", now)
+        if row["status"] == "accepted":
+            row.setdefault("joined_at", now)
+        return row
+
+    def upsert_many(self, db: Session, *, rows, update_fields=None) -> List[int]:
+        """Add or update memberships by (group_id, user_id); a status change also stamps status_changed_at."""
+        if update_fields is None and rows:
+            update_fields = self._default_update_fields(rows)
+        if update_fields and "status" in update_fields:
+            update_fields = [*update_fields, "status_changed_at"]
+        return super().upsert_many(db, rows=rows, update_fields=update_fields)
+
     def get(self, db: Session, *, id: int) -> Optional[Member]:
         return db.query(Member).filter(Member.id == id).first()
 
@@ -26,6 +51,16 @@ class CRUDMember:
             q = q.filter(Member.status == status)
         return q.offset(skip).limit(limit).all()
 
+    def get_page_by_group(
+        self, db: Session, *, group_id: int, status: Optional[str] = None,
+        cursor: Optional[str] = None, skip: int = 0, limit: int = 100,
+    ) -> Tuple[List[Member], Optional[str]]:
+        """Members ordered by (created_at, id), with a cursor for the next page."""
+        q = db.query(Member).filter(Member.group_id == group_id)
+        if status:
+            q = q.filter(Member.status == status)
+        return paginate(q, (Member.created_at, Member.id), cursor=cursor, skip=skip, limit=limit)
+
     def count_by_group(self, db: Session, *, group_id: int, status: Optional[str] = None) -> int:
         q = db.query(Member).filter(Member.group_id == group_id)
         if status:
@@ -41,6 +76,16 @@ class CRUDMember:
             q = q.filter(Member.status == status)
         return q.offset(skip).limit(limit).all()
 
+    def get_page_by_user(
+        self, db: Session, *, user_id: int, status: Optional[str] = None,
+        cursor: Optional[str] = None, skip: int = 0, limit: int = 100,
+    ) -> Tuple[List[Member], Optional[str]]:
+        """Memberships ordered by (created_at, id), with a cursor for the next page."""
+        q = db.query(Member).filter(Member.user_id == user_id)
+        if status:
+            q = q.filter(Member.status == status)
+        return paginate(q, (Member.created_at, Member.id), cursor=cursor, skip=skip, limit=limit)
+
     def count_by_user(self, db: Session, *, user_id: int, status: Optional[str] = None) -> int:
         q = db.query(Member).filter(Member.user_id == user_id)
         if status:
@@ -58,8 +103,7 @@ class CRUDMember:
             status=status, joined_at=joined, status_changed_at=now,
         )
         db.add(obj)
-        db.commit()
-        db.refresh(obj)
+        commit_or_flush(db)
         return obj
 
     def update_status(self, db: Session, *, db_obj: Member, new_status: str) -> Member:
@@ -68,39 +112,37 @@ class CRUDMember:
         db_obj.status_changed_at = now
         if new_status == "accepted" and db_obj.joined_at is None:
             db_obj.joined_at = now
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db)
         return db_obj
 
     def update_role(self, db: Session, *, db_obj: Member, new_role: str) -> Member:
         db_obj.role = new_role
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db)
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> Optional[Member]:
         obj = db.query(Member).filter(Member.id == id).first()
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
 
     def remove_by_group_and_user(self, db: Session, *, group_id: int, user_id: int) -> Optional[Member]:
         obj = self.get_by_group_and_user(db, group_id=group_id, user_id=user_id)
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
 
 
     def remove_all_by_group(self, db: Session, *, group_id: int) -> int:
         count = db.query(Member).filter(Member.group_id == group_id).delete()
-        db.commit()
+        commit_or_flush(db)
         return count
 
     def remove_all_by_user(self, db: Session, *, user_id: int) -> int:
         count = db.query(Member).filter(Member.user_id == user_id).delete()
-        db.commit()
+        commit_or_flush(db)
         return count
 
 
@@ -1,13 +1,18 @@
 """Notification CRUD operations."""
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.crud.bulk import BulkMixin
+from app.crud.pagination import paginate
+from app.database import commit_or_flush
 from app.models.notification import Notification
 from app.schemas.notification import NotificationCreate, NotificationUpdate
 
 
-class CRUDNotification:
+class CRUDNotification(BulkMixin):
+    model = Notification
+
     def get(self, db: Session, *, id: int) -> Optional[Notification]:
         return db.query(Notification).filter(
             Notification.id == id,
@@ -27,6 +32,25 @@ class CRUDNotification:
             query = query.filter(Notification.is_read == is_read)
         return query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
 
+    def get_page_by_user(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        is_read: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> Tuple[List[Notification], Optional[str]]:
+        """Newest first by (created_at, id), with a cursor for the next page."""
+        query = db.query(Notification).filter(Notification.user_id == user_id)
+        if is_read is not None:
+            query = query.filter(Notification.is_read == is_read)
+        return paginate(
+            query, (Notification.created_at, Notification.id),
+            cursor=cursor, skip=skip, limit=limit, descending=True,
+        )
+
     def count_by_user(
         self,
         db: Session,
@@ -63,15 +87,13 @@ class CRUDNotification:
             is_read=False,
         )
         db.add(obj)
-        db.commit()
-        db.refresh(obj)
+        commit_or_flush(db)
         return obj
 
     def mark_as_read(self, db: Session, *, db_obj: Notification) -> Notification:
         db_obj.is_read = True
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db)
         return db_obj
 
     def mark_all_as_read(self, db: Session, *, user_id: int) -> int:
@@ -80,14 +102,14 @@ class CRUDNotification:
             Notification.user_id == user_id,
             Notification.is_read == False,
         ).update({"is_read": True})
-        db.commit()
+        commit_or_flush(db)
         return count
 
     def remove(self, db: Session, *, id: int) -> Optional[Notification]:
         obj = db.query(Notification).filter(Notification.id == id).first()
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
 
 
@@ -0,0 +1,130 @@
+"""Keyset (cursor) pagination
+
+Pages are ordered by a unique key such as ``(created_at, id)``. The cursor is the key of
+the last row on the previous page, so the next page is an index range scan instead of
+an OFFSET that reads and discards every earlier row. Cursors are opaque to clients
+(urlsafe base64 of a JSON list).
+
+Works on both ``Session.query()`` and ``select()`` statements::
+
+    stmt = keyset(db.query(Post).filter(...), (Post.created_at, Post.id), cursor=cursor, limit=20)
+    items, next_cursor = keyset_page(stmt.all(), 20)
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, String, tuple_, type_coerce
+from sqlalchemy.types import TypeDecorator
+
+
+class InvalidCursor(ValueError):
+    """Cursor is malformed or does not belong to this listing."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor(cursor)
+    if any(v is not None and not isinstance(v, (str, int, float)) for v in values):
+        raise InvalidCursor(cursor)
+    return values
+
+
+class _CursorDateTime(TypeDecorator):
+    """DateTime key whose cursor value is ISO text.
+
+    SQLite stores DateTime as text and the key is compared as that text: binding a
+    datetime renders microseconds, which would not compare equal to server_default
+    values like '2026-01-01 10:00:00'. Other backends compare real timestamps, with the
+    cursor text parsed back into a datetime.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(self.impl)
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str) and dialect.name != "sqlite":
+            return datetime.fromisoformat(value)
+        return value
+
+    def process_result_value(self, value, dialect):
+        return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _key_expr(column):
+    if isinstance(column.type, DateTime):
+        return type_coerce(column, _CursorDateTime(timezone=column.type.timezone))
+    return column
+
+
+def _check_key_values(cursor: str, keys: Sequence, values: Sequence) -> None:
+    """DateTime keys must carry ISO text, so a bad cursor fails here rather than in the driver."""
+    for key, value in zip(keys, values):
+        if value is None or not isinstance(key.type, DateTime):
+            continue
+        try:
+            datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise InvalidCursor(cursor)
+
+
+def keyset(
+    query,
+    keys: Sequence,
+    *,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int,
+    descending: bool = False,
+):
+    """Order ``query`` by ``keys`` and resume after ``cursor``.
+
+    Without a cursor, ``skip`` falls back to OFFSET (same ordering). The result yields
+    ``(entity, *key values)`` rows, with one row past ``limit`` to detect a next page;
+    pass them to keyset_page().
+
+    Raises:
+        InvalidCursor: if the cursor cannot be decoded for these keys.
+    """
+    exprs = [_key_expr(k) for k in keys]
+    if cursor is not None:
+        after = tuple_(*exprs)
+        values = tuple(decode_cursor(cursor, len(exprs)))
+        _check_key_values(cursor, keys, values)
+        query = query.where(after < values if descending else after > values)
+    order = [e.desc() if descending else e.asc() for e in exprs]
+    # Labelled so the key columns cannot collide with the entity's own columns in the row
+    labelled = [e.label(f"_keyset_{i}") for i, e in enumerate(exprs)]
+    query = query.add_columns(*labelled).order_by(*order).limit(limit + 1)
+    if cursor is None and skip:
+        query = query.offset(skip)
+    return query
+
+
+def keyset_page(rows: Sequence, limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Split rows from keyset() into (items, next_cursor); next_cursor is None on the last page."""
+    page = rows[:limit]
+    items = [row[0] for row in page]
+    next_cursor = encode_cursor(tuple(page[-1][1:])) if len(rows) > limit and page else None
+    return items, next_cursor
+
+
+def paginate(query, keys: Sequence, **kwargs) -> Tuple[List[Any], Optional[str]]:
+    """keyset() + keyset_page() for a sync ``Session.query()``."""
+    return keyset_page(keyset(query, keys, **kwargs).all(), kwargs["limit"])
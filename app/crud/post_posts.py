@@ -3,10 +3,15 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.crud.bulk import BulkMixin
+from app.database import commit_or_flush
 from app.models.post_post import PostPost
 
 
-class CRUDPostPost:
+class CRUDPostPost(BulkMixin):
+    model = PostPost
+    unique_fields = ("source_post_id", "target_post_id", "relation_type")  # uq_post_post
+
     def get(self, db: Session, *, id: int) -> Optional[PostPost]:
         return db.query(PostPost).filter(PostPost.id == id).first()
 
@@ -36,8 +41,7 @@ class CRUDPostPost:
             relation_type=relation_type, position=position,
         )
         db.add(obj)
-        db.commit()
-        db.refresh(obj)
+        commit_or_flush(db)
         return obj
 
     def update(
@@ -48,15 +52,14 @@ class CRUDPostPost:
             db_obj.relation_type = relation_type
         if position is not None:
             db_obj.position = position
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db)
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> Optional[PostPost]:
         obj = db.query(PostPost).filter(PostPost.id == id).first()
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
 
 
@@ -66,7 +69,7 @@ class CRUDPostPost:
             (PostPost.source_post_id == post_id) |
             (PostPost.target_post_id == post_id)
         ).delete(synchronize_session="fetch")
-        db.commit()
+        commit_or_flush(db)
         return count
 
 
@@ -3,10 +3,14 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.crud.bulk import BulkMixin
+from app.database import commit_or_flush
 from app.models.post_resource import PostResource
 
 
-class CRUDPostResource:
+class CRUDPostResource(BulkMixin):
+    model = PostResource
+
     def get(self, db: Session, *, id: int) -> Optional[PostResource]:
         return db.query(PostResource).filter(PostResource.id == id).first()
 
@@ -30,8 +34,7 @@ class CRUDPostResource:
             display_type=display_type, position=position,
         )
         db.add(obj)
-        db.commit()
-        db.refresh(obj)
+        commit_or_flush(db)
         return obj
 
     def update(self, db: Session, *, db_obj: PostResource, display_type: Optional[str] = None, position: Optional[int] = None) -> PostResource:
@@ -39,21 +42,20 @@ class CRUDPostResource:
             db_obj.display_type = display_type
         if position is not None:
             db_obj.position = position
-        db.commit()
-        db.refresh(db_obj)
+        commit_or_flush(db)
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> Optional[PostResource]:
         obj = db.query(PostResource).filter(PostResource.id == id).first()
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
 
 
     def remove_all_by_post(self, db: Session, *, post_id: int) -> int:
         count = db.query(PostResource).filter(PostResource.post_id == post_id).delete()
-        db.commit()
+        commit_or_flush(db)
         return count
 
 
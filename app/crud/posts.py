@@ -5,6 +5,7 @@ from typing import Any, List, Optional
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
+from app.database import commit_or_flush
 from app.models.post import Post
 from app.schemas.post import PostCreate, PostUpdate
 
@@ -25,8 +26,7 @@ class CRUDPost(CRUDBase[Post, PostCreate, PostUpdate]):
         obj = db.query(self.model).filter(self.model.id == id).first()
         if obj:
             obj.deleted_at = datetime.now(timezone.utc)
-            db.commit()
-            db.refresh(obj)
+            commit_or_flush(db)
         return obj
 
 
@@ -1,11 +1,12 @@
 """Resource CRUD operations"""
 from datetime import datetime, timezone
-from typing import Any, List, Optional
+from typing import Any, List, Mapping, Optional, Sequence
 
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
-from app.models.resource import Resource
+from app.database import commit_or_flush
+from app.models.resource import Resource, file_extension
 from app.schemas.resource import ResourceCreate, ResourceUpdate
 
 
@@ -21,12 +22,25 @@ class CRUDResource(CRUDBase[Resource, ResourceCreate, ResourceUpdate]):
             self.model.deleted_at.is_(None),
         ).offset(skip).limit(limit).all()
 
+    def _prepare_row(self, row: Any) -> dict:
+        """Bulk inserts skip the filename validator: derive extension here."""
+        row = super()._prepare_row(row)
+        row["extension"] = file_extension(row.get("filename") or "")
+        return row
+
+    def update_many(self, db: Session, *, rows: Sequence[Mapping[str, Any]]) -> int:
+        """Like BulkMixin.update_many; a new filename also rewrites extension."""
+        rows = [
+            {**row, "extension": file_extension(row["filename"] or "")} if "filename" in row else row
+            for row in rows
+        ]
+        return super().update_many(db, rows=rows)
+
     def remove(self, db: Session, *, id: Any) -> Optional[Resource]:
         obj = db.query(self.model).filter(self.model.id == id).first()
         if obj:
             obj.deleted_at = datetime.now(timezone.utc)
-            db.commit()
-            db.refresh(obj)
+            commit_or_flush(db)
         return obj
 
 
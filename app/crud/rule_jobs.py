@@ -0,0 +1,79 @@
+"""RuleJob CRUD — queued rule-engine post-hook runs"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.database import commit_or_flush
+from app.models.rule_job import RuleJob
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+
+class CRUDRuleJob:
+    def get(self, db: Session, *, id: int) -> Optional[RuleJob]:
+        return db.query(RuleJob).filter(RuleJob.id == id).first()
+
+    def get_multi_by_event(
+        self, db: Session, *, event_id: int, status: Optional[str] = None,
+        skip: int = 0, limit: int = 100,
+    ) -> List[RuleJob]:
+        """Newest first."""
+        q = db.query(RuleJob).filter(RuleJob.event_id == event_id)
+        if status:
+            q = q.filter(RuleJob.status == status)
+        return q.order_by(RuleJob.id.desc()).offset(skip).limit(limit).all()
+
+    def enqueue(self, db: Session, *, event_id: int, trigger: str, context: dict[str, Any]) -> RuleJob:
+        obj = RuleJob(
+            event_id=event_id, trigger=trigger, context=context,
+            status="queued", run_after=datetime.now(timezone.utc),
+        )
+        db.add(obj)
+        commit_or_flush(db)
+        return obj
+
+    def claim_next(self, db: Session, *, lease: float) -> Optional[RuleJob]:
+        """Claim the oldest due job: queued, or running with an expired lease (its worker died).
+
+        The conditional UPDATE makes the claim safe against other workers on the same
+        database; a lost race just moves on to the next candidate.
+        """
+        while True:
+            now = datetime.now(timezone.utc)
+            due = (RuleJob.status.in_(("queued", "running")), RuleJob.run_after <= now)
+            job_id = db.query(RuleJob.id).filter(*due).order_by(RuleJob.run_after, RuleJob.id).limit(1).scalar()
+            if job_id is None:
+                return None
+            claimed = db.execute(update(RuleJob).where(RuleJob.id == job_id, *due).values(
+                status="running", attempts=RuleJob.attempts + 1,
+                started_at=now, run_after=now + timedelta(seconds=lease),
+            )).rowcount
+            commit_or_flush(db)
+            if claimed:
+                return db.get(RuleJob, job_id, populate_existing=True)
+
+    def complete(self, db: Session, *, job: RuleJob, logs: List[str]) -> RuleJob:
+        job.status = "succeeded"
+        job.logs = logs
+        job.last_error = None
+        job.finished_at = datetime.now(timezone.utc)
+        commit_or_flush(db)
+        return job
+
+    def fail(self, db: Session, *, job: RuleJob, error: str, retry_in: Optional[float]) -> RuleJob:
+        """Record a failed attempt; requeue it ``retry_in`` seconds from now, or give up when None."""
+        now = datetime.now(timezone.utc)
+        job.last_error = error
+        if retry_in is None:
+            job.status = "failed"
+            job.finished_at = now
+        else:
+            job.status = "queued"
+            job.run_after = now + timedelta(seconds=retry_in)
+        commit_or_flush(db)
+        return job
+
+
+rule_jobs = CRUDRuleJob()
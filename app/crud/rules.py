@@ -5,6 +5,7 @@ from typing import Any, List, Optional
 from sqlalchemy.orm import Session
 
 from app.crud.base import CRUDBase
+from app.database import commit_or_flush
 from app.models.rule import Rule
 from app.schemas.rule import RuleCreate, RuleUpdate
 
@@ -21,12 +22,21 @@ class CRUDRule(CRUDBase[Rule, RuleCreate, RuleUpdate]):
             self.model.deleted_at.is_(None),
         ).offset(skip).limit(limit).all()
 
+    def update(
+        self, db: Session, *, db_obj: Rule, obj_in: RuleUpdate, refresh: bool = False
+    ) -> Rule:
+        from app.services.rule_engine import invalidate_rule_plan
+        obj = super().update(db, db_obj=db_obj, obj_in=obj_in, refresh=refresh)
+        invalidate_rule_plan(obj.id, db=db)
+        return obj
+
     def remove(self, db: Session, *, id: Any) -> Optional[Rule]:
+        from app.services.rule_engine import invalidate_rule_plan
         obj = db.query(self.model).filter(self.model.id == id).first()
         if obj:
             obj.deleted_at = datetime.now(timezone.utc)
-            db.commit()
-            db.refresh(obj)
+            commit_or_flush(db)
+            invalidate_rule_plan(obj.id, db=db)
         return obj
 
 
@@ -1,13 +1,18 @@
 """TargetInteraction CRUD — target:interaction polymorphic binding + cache update"""
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
+from app.crud.pagination import paginate
+from app.crud.bulk import BulkMixin
+from app.database import commit_or_flush
 from app.models.target_interaction import TargetInteraction
 from app.models.interaction import Interaction
 
 
-class CRUDTargetInteraction:
+class CRUDTargetInteraction(BulkMixin):
+    model = TargetInteraction
+
     def get(self, db: Session, *, id: int) -> Optional[TargetInteraction]:
         return db.query(TargetInteraction).filter(TargetInteraction.id == id).first()
 
@@ -67,15 +72,14 @@ class CRUDTargetInteraction:
             target_type=target_type, target_id=target_id, interaction_id=interaction_id,
         )
         db.add(obj)
-        db.commit()
-        db.refresh(obj)
+        commit_or_flush(db)
         return obj
 
     def remove(self, db: Session, *, id: int) -> Optional[TargetInteraction]:
         obj = db.query(TargetInteraction).filter(TargetInteraction.id == id).first()
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
 
     def count_by_target_and_type(
@@ -107,6 +111,25 @@ class CRUDTargetInteraction:
             q = q.filter(TargetInteraction.target_type == target_type)
         return q.order_by(Interaction.created_at.desc()).offset(skip).limit(limit).all()
 
+    def get_like_page_by_user(
+        self, db: Session, *, user_id: int, target_type: Optional[str] = None,
+        cursor: Optional[str] = None, skip: int = 0, limit: int = 100,
+    ) -> Tuple[List[TargetInteraction], Optional[str]]:
+        """Likes by a user, newest first by (created_at, id), with a cursor for the next page."""
+        q = db.query(TargetInteraction).join(
+            Interaction, TargetInteraction.interaction_id == Interaction.id,
+        ).filter(
+            Interaction.type == "like",
+            Interaction.created_by == user_id,
+            Interaction.deleted_at.is_(None),
+        )
+        if target_type:
+            q = q.filter(TargetInteraction.target_type == target_type)
+        return paginate(
+            q, (Interaction.created_at, Interaction.id),
+            cursor=cursor, skip=skip, limit=limit, descending=True,
+        )
+
     def count_likes_by_user(
         self, db: Session, *, user_id: int, target_type: Optional[str] = None,
     ) -> int:
@@ -139,7 +162,7 @@ class CRUDTargetInteraction:
         interaction_ids = [ti.interaction_id for ti in tis]
         for ti in tis:
             db.delete(ti)
-        db.commit()
+        commit_or_flush(db)
         return interaction_ids
 
     def get_all_by_interaction(
@@ -155,7 +178,7 @@ class CRUDTargetInteraction:
         count = db.query(TargetInteraction).filter(
             TargetInteraction.interaction_id == interaction_id,
         ).delete()
-        db.commit()
+        commit_or_flush(db)
         return count
 
 
@@ -3,6 +3,7 @@ from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.database import commit_or_flush
 from app.models.user_user import UserUser
 
 
@@ -75,15 +76,14 @@ class CRUDUserUser:
             relation_type=relation_type,
         )
         db.add(obj)
-        db.commit()
-        db.refresh(obj)
+        commit_or_flush(db)
         return obj
 
     def remove(self, db: Session, *, source_user_id: int, target_user_id: int, relation_type: str) -> Optional[UserUser]:
         obj = self.get_relation(db, source_user_id=source_user_id, target_user_id=target_user_id, relation_type=relation_type)
         if obj:
             db.delete(obj)
-            db.commit()
+            commit_or_flush(db)
         return obj
 
     def remove_all_for_user(self, db: Session, *, user_id: int) -> int:
@@ -91,7 +91,7 @@ class CRUDUserUser:
         count = db.query(UserUser).filter(
             (UserUser.source_user_id == user_id) | (UserUser.target_user_id == user_id)
         ).delete(synchronize_session="fetch")
-        db.commit()
+        commit_or_flush(db)
         return count
 
 
@@ -1,30 +1,341 @@
 """数据库配置"""
 import os
-from sqlalchemy import create_engine
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi import Depends
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.pool import QueuePool
 from pathlib import Path
 
+from app.core.config import Settings, settings
+
 # 数据目录: 优先读取环境变量，默认为项目根目录下的 data/
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = Path(os.environ.get("SYNNOVATOR_DATA_DIR", str(BASE_DIR / "data")))
-DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-SQLALCHEMY_DATABASE_URL = f"sqlite:///{DATA_DIR}/synnovator.db"
+SQLALCHEMY_DATABASE_URL = settings.database_url or f"sqlite:///{DATA_DIR}/synnovator.db"
+
+
+def apply_sqlite_pragmas(dbapi_connection, profile=settings) -> None:
+    """Apply the SQLite connection profile from settings to a raw DBAPI connection.
+
+    WAL lets readers proceed while a writer holds the lock, and busy_timeout makes
+    concurrent writers wait instead of failing with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={profile.sqlite_journal_mode.upper()}")
+        cursor.execute(f"PRAGMA synchronous={profile.sqlite_synchronous.upper()}")
+        cursor.execute(f"PRAGMA mmap_size={int(profile.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size={int(profile.sqlite_cache_size)}")
+        cursor.execute(f"PRAGMA temp_store={profile.sqlite_temp_store.upper()}")
+        cursor.execute(f"PRAGMA busy_timeout={int(profile.sqlite_busy_timeout)}")
+    finally:
+        cursor.close()
+
+
+def optimize_database(bind: Engine) -> None:
+    """Run PRAGMA optimize so SQLite refreshes planner statistics (call on shutdown)."""
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.connect() as conn:
+        conn.exec_driver_sql("PRAGMA optimize")
+
+
+def _install_sqlite_profile(bind: Engine, profile: Settings, read_only: bool) -> None:
+    database = bind.url.database
+    if database and database != ":memory:" and not database.startswith("file:"):
+        # Create the data directory when the first connection is opened, not at import
+        @event.listens_for(bind, "do_connect")
+        def _ensure_data_dir(dialect, conn_rec, cargs, cparams):
+            Path(database).parent.mkdir(parents=True, exist_ok=True)
+
+    @event.listens_for(bind, "connect")
+    def _set_sqlite_pragma(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, profile)
+        if read_only:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA query_only=ON")
+            cursor.close()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait, to make pool starvation visible."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.wait_count = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self.wait_count += 1
+                self.wait_time_total += elapsed
+                self.wait_time_max = max(self.wait_time_max, elapsed)
+
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+def create_db_engine(
+    url: Optional[str] = None,
+    *,
+    profile: Settings = settings,
+    read_only: Optional[bool] = None,
+) -> Engine:
+    """Build an engine from settings: URL, pool sizing and the SQLite connection profile.
+
+    Args:
+        url: Database URL; defaults to the configured database.
+        profile: Settings to read pool and SQLite options from.
+        read_only: Override profile.db_read_only.
+    """
+    url = make_url(url or profile.database_url or SQLALCHEMY_DATABASE_URL)
+    read_only = profile.db_read_only if read_only is None else read_only
+    is_sqlite = url.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and url.database in (None, "", ":memory:")
+
+    kwargs: dict = {"pool_pre_ping": profile.db_pool_pre_ping}
+    if is_sqlite:
+        kwargs["connect_args"] = {"check_same_thread": False}
+    if not in_memory:
+        kwargs.update(
+            poolclass=TimedQueuePool,
+            pool_size=profile.db_pool_size,
+            max_overflow=profile.db_max_overflow,
+            pool_timeout=profile.db_pool_timeout,
+            pool_recycle=profile.db_pool_recycle,
+        )
+    if read_only and url.get_backend_name() == "postgresql":
+        kwargs["execution_options"] = {"postgresql_readonly": True}
+
+    new_engine = create_engine(url, **kwargs)
+
+    if is_sqlite:
+        _install_sqlite_profile(new_engine, profile, read_only)
+    return new_engine
+
+
+# Async drivers used when an async engine is derived from a sync database URL
+_ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def create_async_db_engine(
+    url: Optional[str] = None,
+    *,
+    profile: Settings = settings,
+) -> AsyncEngine:
+    """Build an AsyncEngine for the configured database, swapping in an async driver.
+
+    Pool sizing and the SQLite connection profile match create_db_engine().
+    """
+    url = make_url(url or profile.database_url or SQLALCHEMY_DATABASE_URL)
+    backend = url.get_backend_name()
+    if url.get_driver_name() in ("", "pysqlite", "psycopg2") and backend in _ASYNC_DRIVERS:
+        url = url.set(drivername=_ASYNC_DRIVERS[backend])
+    in_memory = backend == "sqlite" and url.database in (None, "", ":memory:")
+
+    kwargs: dict = {"pool_pre_ping": profile.db_pool_pre_ping}
+    if not in_memory:
+        kwargs.update(
+            pool_size=profile.db_pool_size,
+            max_overflow=profile.db_max_overflow,
+            pool_timeout=profile.db_pool_timeout,
+            pool_recycle=profile.db_pool_recycle,
+        )
+    async_engine = create_async_engine(url, **kwargs)
+
+    if backend == "sqlite":
+        _install_sqlite_profile(async_engine.sync_engine, profile, profile.db_read_only)
+    return async_engine
+
+
+def get_pool_stats(bind: Optional[Engine] = None) -> dict:
+    """Snapshot of connection pool usage for sizing the pool against the worker count."""
+    pool = (bind or engine).pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    if isinstance(pool, TimedQueuePool):
+        with pool._stats_lock:
+            stats.update(
+                wait_count=pool.wait_count,
+                wait_time_total_ms=round(pool.wait_time_total * 1000, 3),
+                wait_time_max_ms=round(pool.wait_time_max * 1000, 3),
+                timeouts=pool.timeouts,
+            )
+    return stats
+
+
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+# Session.info key marking a request-scoped unit of work: CRUD helpers only flush and
+# commit_db() commits once when the endpoint has finished
+UNIT_OF_WORK = "unit_of_work"
+
+
 def get_db():
-    """FastAPI 依赖: 获取数据库会话"""
-    db = SessionLocal()
+    """FastAPI 依赖: 获取数据库会话 (请求级 unit of work, 由 commit_db 统一提交)"""
+    db = SessionLocal(info={UNIT_OF_WORK: True})
     try:
         yield db
     finally:
         db.close()
+
+
+def commit_db(db: Session = Depends(get_db)):
+    """FastAPI 依赖 (scope="function"): 接口返回后提交一次, 出错则回滚
+
+    Registered app-wide. Function scope runs the commit after the response has been
+    serialized but before it is sent, so a failed commit still turns into an error
+    response instead of a lost write behind a 2xx.
+    """
+    try:
+        yield
+    except Exception:
+        db.rollback()
+        raise
+    else:
+        db.commit()
+
+
+def commit_or_flush(db: Session) -> None:
+    """Commit, or only flush when ``db`` is a request unit of work (see get_db).
+
+    Flushing still assigns primary keys and surfaces constraint errors at the call site;
+    scripts and services running on their own sessions keep committing per call.
+    """
+    if db.info.get(UNIT_OF_WORK):
+        db.flush()
+    else:
+        db.commit()
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """Run several CRUD calls on a self-committing session as one transaction.
+
+    Inside the block commit_or_flush() only flushes; the block commits once on exit
+    and rolls back on error. On a session that already is a unit of work (a request)
+    it does nothing and the outer owner commits.
+    """
+    if db.info.get(UNIT_OF_WORK):
+        yield db
+        return
+    db.info[UNIT_OF_WORK] = True
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        del db.info[UNIT_OF_WORK]
+
+
+# The async engine is created on first use so sync-only deployments never load aiosqlite
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            create_async_db_engine(), autoflush=False, expire_on_commit=False,
+        )
+    return _async_session_factory
+
+
+async def get_async_db():
+    """FastAPI 依赖: 获取异步数据库会话 (用于只读热点接口)"""
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+# --- Schema management (called from the app lifespan, not at import) ---
+
+ALEMBIC_INI = BASE_DIR / "alembic.ini"
+_REVISION_LINE = re.compile(r"^(revision|down_revision)\b[^=]*=\s*(.+)$", re.M)
+
+
+def _script_heads() -> set[str]:
+    """Head revisions read straight from alembic/versions, without importing Alembic."""
+    revisions, parents = set(), set()
+    for path in (BASE_DIR / "alembic" / "versions").glob("*.py"):
+        for key, value in _REVISION_LINE.findall(path.read_text(encoding="utf-8")):
+            ids = set(re.findall(r"['\"](\w+)['\"]", value))
+            (revisions if key == "revision" else parents).update(ids)
+    return revisions - parents
+
+
+def _db_revisions(conn) -> set[str]:
+    if not inspect(conn).has_table("alembic_version"):
+        return set()
+    return set(conn.exec_driver_sql("SELECT version_num FROM alembic_version").scalars())
+
+
+def init_db(bind: Optional[Engine] = None) -> str:
+    """Bring the schema to the Alembic head.
+
+    Returns what was done:
+    - "current": already at head. This is one query and needs no Alembic import or
+      schema reflection, so it is the path every worker start takes.
+    - "created": an empty database got create_all() and was stamped at head.
+    - "upgraded": the database was behind. Unversioned databases created by earlier
+      releases get create_all() for missing tables, are stamped at the first revision,
+      and are then upgraded (the migrations are idempotent).
+    """
+    bind = bind or engine
+    heads = _script_heads()
+    with bind.connect() as conn:
+        current = _db_revisions(conn)
+    if heads and current == heads:
+        return "current"
+
+    from alembic import command
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    import app.models  # noqa: F401 - register all tables on Base.metadata
+
+    cfg = Config(str(ALEMBIC_INI))
+    with bind.begin() as conn:
+        cfg.attributes["connection"] = conn
+        if current:
+            command.upgrade(cfg, "heads")
+            return "upgraded"
+        empty = not inspect(conn).get_table_names()
+        Base.metadata.create_all(bind=conn)
+        if empty:
+            command.stamp(cfg, "heads")
+            return "created"
+        command.stamp(cfg, ScriptDirectory.from_config(cfg).get_base())
+        command.upgrade(cfg, "heads")
+        return "upgraded"
@@ -5,10 +5,12 @@
 - MOCK_AUTH=false: 生产模式，需要真实的 OAuth/JWT 认证 (未实现)
 """
 from fastapi import Depends, Header, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.core.config import settings
 
 
@@ -89,6 +91,48 @@ def require_current_user_id(
         raise HTTPException(status_code=501, detail="OAuth authentication not implemented")
 
 
+async def _get_active_user_id_async(db: AsyncSession, user_id: int) -> Optional[int]:
+    from app.models.user import User
+    return (await db.execute(
+        select(User.id).where(User.id == user_id, User.deleted_at.is_(None))
+    )).scalar_one_or_none()
+
+
+async def get_current_user_id_async(
+    x_user_id: Optional[int] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> Optional[int]:
+    """get_current_user_id 的异步版本，用于 AsyncSession 接口。"""
+    if settings.mock_auth:
+        if x_user_id is not None:
+            return await _get_active_user_id_async(db, x_user_id)
+        return None
+    else:
+        # TODO: 实现 JWT 解析
+        raise HTTPException(status_code=501, detail="OAuth authentication not implemented")
+
+
+async def require_current_user_id_async(
+    x_user_id: Optional[int] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+) -> int:
+    """require_current_user_id 的异步版本，用于 AsyncSession 接口。"""
+    if settings.mock_auth:
+        if x_user_id is not None:
+            user_id = await _get_active_user_id_async(db, x_user_id)
+            if user_id is not None:
+                return user_id
+            raise HTTPException(status_code=401, detail="User not found")
+
+        # 未提供 header，自动创建 mock 用户 (写操作复用同步实现)
+        return await db.run_sync(_get_or_create_mock_user)
+    else:
+        # TODO: 实现 JWT 解析
+        if x_user_id is None:
+            raise HTTPException(status_code=401, detail="Authentication required")
+        raise HTTPException(status_code=501, detail="OAuth authentication not implemented")
+
+
 def require_role(*allowed_roles: str):
     """Factory: return a dependency that checks the current user has one of the allowed roles."""
     def _check_role(
@@ -1,27 +1,50 @@
 """Synnovator API Server"""
-from fastapi import FastAPI, Depends
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
-from app.database import engine, Base, get_db
+from app.crud.pagination import InvalidCursor
+from app.database import engine, commit_db, get_db, init_db, optimize_database
 from app.core.config import settings
-from app.routers import users, resources, events, posts, rules, groups, interactions, admin, auth, notifications, meta
+from app.routers import users, resources, events, posts, rules, groups, interactions, admin, auth, notifications, meta, search
 from app import models
+from app.services import rule_jobs
+from app.services.rule_metrics import RuleTraceMiddleware
+
 
-# Import all models so Base.metadata knows about them
-import app.models  # noqa: F401
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema is managed here rather than at import: at head this is a single query
+    if settings.db_init_on_startup and not settings.db_read_only:
+        init_db(engine)
+    # Rule-engine post hooks queued by requests run in this background thread
+    run_rule_jobs = not settings.rule_jobs_sync and not settings.db_read_only
+    if run_rule_jobs:
+        rule_jobs.start_worker()
+    yield
+    if run_rule_jobs:
+        rule_jobs.stop_worker()
+    if settings.sqlite_optimize_on_shutdown:
+        optimize_database(engine)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
 
 # App
 app = FastAPI(
     title="Synnovator API",
     description="协创者 - Creative Collaboration Platform API",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# One commit per request: CRUD calls only flush inside the request's unit of work.
+# Attached per sync router rather than app-wide, so the async read routers don't open
+# a sync Session (and take a threadpool hop) they never use.
+commit_per_request = [Depends(commit_db, scope="function")]
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -31,12 +54,21 @@ app.add_middleware(
 )
 
 
+# Server-Timing breakdown of rule checks per request (RULE_TRACE_HEADER); a pass-through otherwise
+app.add_middleware(RuleTraceMiddleware)
+
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=422, content={"detail": "Invalid cursor"})
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
 
 
-@app.get("/api/stats")
+@app.get("/api/stats", dependencies=commit_per_request)
 def get_stats(db: Session = Depends(get_db)):
     """Get platform statistics (counts excluding soft-deleted records)"""
     user_count = db.query(func.count(models.User.id)).filter(
@@ -59,14 +91,20 @@ def get_stats(db: Session = Depends(get_db)):
 
 
 # Include routers
-app.include_router(users.router, prefix="/api", tags=["users"])
-app.include_router(resources.router, prefix="/api", tags=["resources"])
-app.include_router(meta.router, prefix="/api", tags=["meta"])
-app.include_router(events.router, prefix="/api", tags=["events"])
-app.include_router(posts.router, prefix="/api", tags=["posts"])
-app.include_router(rules.router, prefix="/api", tags=["rules"])
-app.include_router(groups.router, prefix="/api", tags=["groups"])
-app.include_router(interactions.router, prefix="/api", tags=["interactions"])
-app.include_router(admin.router, prefix="/api", tags=["admin"])
-app.include_router(auth.router, prefix="/api", tags=["auth"])
-app.include_router(notifications.router, prefix="/api", tags=["notifications"])
+if settings.db_async_reads:
+    # Registered first so they take precedence over the sync routes with the same paths
+    app.include_router(posts.async_router, prefix="/api", tags=["posts"])
+    app.include_router(events.async_router, prefix="/api", tags=["events"])
+    app.include_router(notifications.async_router, prefix="/api", tags=["notifications"])
+app.include_router(users.router, prefix="/api", tags=["users"], dependencies=commit_per_request)
+app.include_router(resources.router, prefix="/api", tags=["resources"], dependencies=commit_per_request)
+app.include_router(meta.router, prefix="/api", tags=["meta"], dependencies=commit_per_request)
+app.include_router(events.router, prefix="/api", tags=["events"], dependencies=commit_per_request)
+app.include_router(posts.router, prefix="/api", tags=["posts"], dependencies=commit_per_request)
+app.include_router(rules.router, prefix="/api", tags=["rules"], dependencies=commit_per_request)
+app.include_router(groups.router, prefix="/api", tags=["groups"], dependencies=commit_per_request)
+app.include_router(interactions.router, prefix="/api", tags=["interactions"], dependencies=commit_per_request)
+app.include_router(admin.router, prefix="/api", tags=["admin"], dependencies=commit_per_request)
+app.include_router(auth.router, prefix="/api", tags=["auth"], dependencies=commit_per_request)
+app.include_router(notifications.router, prefix="/api", tags=["notifications"], dependencies=commit_per_request)
+app.include_router(search.router, prefix="/api", tags=["search"], dependencies=commit_per_request)
@@ -21,3 +21,6 @@ from app.models.event_resource import EventResource
 from app.models.group_post import GroupPost
 from app.models.group_resource import GroupResource
 from app.models.notification import Notification
+from app.models.post_tag import PostTag
+from app.models.rule_job import RuleJob
+from app.models import search_index  # noqa: F401 - FTS5 tables/triggers created with the schema
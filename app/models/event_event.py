@@ -1,5 +1,5 @@
 """EventEvent SQLAlchemy model — event:event relationship (stage/track/prerequisite)"""
-from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint, Index
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -9,6 +9,7 @@ class EventEvent(Base):
     __tablename__ = "event_events"
     __table_args__ = (
         UniqueConstraint("source_event_id", "target_event_id", name="uq_event_event"),
+        Index("ix_event_events_source_relation_order", "source_event_id", "relation_type", "stage_order"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
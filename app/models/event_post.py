@@ -1,5 +1,5 @@
 """EventPost SQLAlchemy model — event:post relationship"""
-from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, Index, UniqueConstraint
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -9,6 +9,7 @@ class EventPost(Base):
     __tablename__ = "category_posts"
     __table_args__ = (
         UniqueConstraint("event_id", "post_id", name="uq_category_post"),
+        Index("ix_category_posts_event_relation", "event_id", "relation_type", "post_id"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -1,5 +1,5 @@
 """Group SQLAlchemy 模型"""
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, text
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -7,6 +7,12 @@ from app.database import Base
 
 class Group(Base):
     __tablename__ = "groups"
+    __table_args__ = (
+        Index(
+            "ix_groups_live_created", "created_at", "id",
+            sqlite_where=text("deleted_at IS NULL"), postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -1,5 +1,5 @@
 """Interaction SQLAlchemy 模型 — unified model for like/comment/rating"""
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index, text
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -7,6 +7,13 @@ from app.database import Base
 
 class Interaction(Base):
     __tablename__ = "interactions"
+    __table_args__ = (
+        Index(
+            "ix_interactions_parent_created", "parent_id", "created_at",
+            sqlite_where=text("deleted_at IS NULL"), postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index("ix_interactions_created_by_type", "created_by", "type", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     type = Column(String, nullable=False)  # like | comment | rating
@@ -1,5 +1,5 @@
 """Member SQLAlchemy model — group:user relationship"""
-from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint, Index
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -9,6 +9,8 @@ class Member(Base):
     __tablename__ = "members"
     __table_args__ = (
         UniqueConstraint("group_id", "user_id", name="uq_group_user"),
+        Index("ix_members_group_status", "group_id", "status"),
+        Index("ix_members_user_status", "user_id", "status"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
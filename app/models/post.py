@@ -1,5 +1,5 @@
 """Post SQLAlchemy 模型"""
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, Index, text
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -7,6 +7,20 @@ from app.database import Base
 
 class Post(Base):
     __tablename__ = "posts"
+    __table_args__ = (
+        Index(
+            "ix_posts_type_status_created", "type", "status", "created_at",
+            sqlite_where=text("deleted_at IS NULL"), postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_posts_created_by_created", "created_by", "created_at",
+            sqlite_where=text("deleted_at IS NULL"), postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "ix_posts_live_created", "created_at", "id",
+            sqlite_where=text("deleted_at IS NULL"), postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
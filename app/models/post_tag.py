@@ -0,0 +1,128 @@
+"""PostTag SQLAlchemy model — normalized post:tag index
+
+Derived from ``Post.tags`` (the JSON list stays the source of truth). The rows are
+maintained by triggers on posts (SQLite and PostgreSQL), so ORM writes, rule-engine
+rewrites and bulk UPDATEs all stay consistent without application code.
+"""
+from sqlalchemy import Column, Integer, String, UniqueConstraint, Index, event
+
+from app.database import Base
+
+
+class PostTag(Base):
+    __tablename__ = "post_tags"
+    __table_args__ = (
+        UniqueConstraint("post_id", "tag_normalized", name="uq_post_tag"),
+        Index("ix_post_tags_tag_post", "tag_normalized", "post_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    post_id = Column(Integer, nullable=False)
+    tag_normalized = Column(String, nullable=False)  # lower(trim(tag))
+
+
+def _select_tags(source: str) -> str:
+    """SELECT (post_id, tag_normalized) rows from the tags JSON of ``source`` (trigger row or posts)."""
+    tables = "posts, " if source == "posts" else ""
+    return (
+        f"SELECT {source}.id, lower(trim(j.value)) "
+        f"FROM {tables}json_each(CASE WHEN json_valid({source}.tags) THEN {source}.tags END) AS j "
+        "WHERE j.type = 'text' AND trim(j.value) != ''"
+    )
+
+
+def _pg_select_tags(source: str) -> str:
+    """PostgreSQL flavour of _select_tags: string elements of the tags array."""
+    tables = "posts, " if source == "posts" else ""
+    tags = f"{source}.tags::jsonb"
+    return (
+        f"SELECT {source}.id, lower(trim(j.value #>> '{{}}')) "
+        f"FROM {tables}jsonb_array_elements(CASE WHEN jsonb_typeof({tags}) = 'array' THEN {tags} END) AS j "
+        "WHERE jsonb_typeof(j.value) = 'string' AND trim(j.value #>> '{}') != ''"
+    )
+
+
+_TRIGGERS = {
+    "post_tags_ai": (
+        "AFTER INSERT ON posts BEGIN "
+        f"INSERT OR IGNORE INTO post_tags (post_id, tag_normalized) {_select_tags('new')}; END"
+    ),
+    "post_tags_au": (
+        "AFTER UPDATE OF tags ON posts BEGIN "
+        "DELETE FROM post_tags WHERE post_id = old.id; "
+        f"INSERT OR IGNORE INTO post_tags (post_id, tag_normalized) {_select_tags('new')}; END"
+    ),
+    "post_tags_ad": "AFTER DELETE ON posts BEGIN DELETE FROM post_tags WHERE post_id = old.id; END",
+}
+
+# PostgreSQL: the same three triggers share one function
+_PG_FUNCTION = (
+    "CREATE OR REPLACE FUNCTION post_tags_sync() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "
+    "IF TG_OP <> 'INSERT' THEN DELETE FROM post_tags WHERE post_id = OLD.id; END IF; "
+    "IF TG_OP <> 'DELETE' THEN "
+    f"INSERT INTO post_tags (post_id, tag_normalized) {_pg_select_tags('NEW')} ON CONFLICT DO NOTHING; "
+    "END IF; RETURN NULL; END $$"
+)
+_PG_TRIGGERS = {
+    "post_tags_ai": "AFTER INSERT ON posts",
+    "post_tags_au": "AFTER UPDATE OF tags ON posts",
+    "post_tags_ad": "AFTER DELETE ON posts",
+}
+
+
+def _check_dialect(connection) -> None:
+    if connection.dialect.name not in ("sqlite", "postgresql"):
+        # Without the triggers post_tags stays empty and every tag filter silently matches nothing
+        raise RuntimeError(f"post_tags sync triggers are not implemented for {connection.dialect.name}")
+
+
+def create_post_tag_triggers(connection) -> None:
+    """Create missing sync triggers; backfill post_tags when they were not installed yet."""
+    _check_dialect(connection)
+    if connection.dialect.name == "postgresql":
+        installed = {
+            row[0] for row in connection.exec_driver_sql(
+                "SELECT tgname FROM pg_trigger WHERE tgrelid = 'posts'::regclass AND NOT tgisinternal"
+            )
+        }
+        connection.exec_driver_sql(_PG_FUNCTION)
+        for name, when in _PG_TRIGGERS.items():
+            if name not in installed:
+                connection.exec_driver_sql(
+                    f"CREATE TRIGGER {name} {when} FOR EACH ROW EXECUTE FUNCTION post_tags_sync()"
+                )
+        if not set(_PG_TRIGGERS) <= installed:
+            connection.exec_driver_sql("DELETE FROM post_tags")
+            connection.exec_driver_sql(
+                f"INSERT INTO post_tags (post_id, tag_normalized) {_pg_select_tags('posts')} "
+                "ON CONFLICT DO NOTHING"
+            )
+        return
+    installed = {
+        row[0] for row in connection.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'posts'"
+        )
+    }
+    for name, body in _TRIGGERS.items():
+        connection.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+    if not set(_TRIGGERS) <= installed:
+        connection.exec_driver_sql("DELETE FROM post_tags")
+        connection.exec_driver_sql(
+            f"INSERT OR IGNORE INTO post_tags (post_id, tag_normalized) {_select_tags('posts')}"
+        )
+
+
+def drop_post_tag_triggers(connection) -> None:
+    _check_dialect(connection)
+    if connection.dialect.name == "postgresql":
+        for name in _PG_TRIGGERS:
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name} ON posts")
+        connection.exec_driver_sql("DROP FUNCTION IF EXISTS post_tags_sync()")
+        return
+    for name in _TRIGGERS:
+        connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _after_create(target, connection, **kw):
+    create_post_tag_triggers(connection)
@@ -1,15 +1,24 @@
 """Resource SQLAlchemy 模型"""
 from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
 
 from app.database import Base
 
 
+def file_extension(filename: str) -> str:
+    """Normalized extension of a filename: lowercased, without the dot ("" if none)."""
+    if "." in filename:
+        return filename.rsplit(".", 1)[-1].lower()
+    return ""
+
+
 class Resource(Base):
     __tablename__ = "resources"
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String, nullable=False)
+    extension = Column(String, nullable=False, server_default="", index=True)  # file_extension(filename)
     display_name = Column(String, nullable=True)
     description = Column(Text, nullable=True)
     mime_type = Column(String, nullable=True)
@@ -18,4 +27,9 @@ class Resource(Base):
     created_by = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=True)
-    deleted_at = Column(DateTime(timezone=True), nullable=True)
\ No newline at end of file
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+
+    @validates("filename")
+    def _set_extension(self, key, filename):
+        self.extension = file_extension(filename or "")
+        return filename
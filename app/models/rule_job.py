@@ -0,0 +1,32 @@
+"""RuleJob SQLAlchemy model — queued run of an event's rule-engine post hooks
+
+One row per post-phase trigger fired for an event (status change, new submission).
+The request commits the row together with its own changes; the in-process worker
+(app.services.rule_jobs) claims it, runs the post hooks and records the outcome.
+"""
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class RuleJob(Base):
+    __tablename__ = "rule_jobs"
+    __table_args__ = (
+        Index("ix_rule_jobs_status_run_after", "status", "run_after"),
+        Index("ix_rule_jobs_event_created", "event_id", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(Integer, nullable=False)
+    trigger = Column(String, nullable=False)
+    context = Column(JSON, nullable=False, default=dict)
+    status = Column(String, nullable=False, default="queued")  # queued | running | succeeded | failed
+    attempts = Column(Integer, nullable=False, default=0)
+    # queued: earliest next attempt; running: lease expiry, after which another worker may reclaim it
+    run_after = Column(DateTime(timezone=True), nullable=False)
+    logs = Column(JSON, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
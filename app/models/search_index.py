@@ -0,0 +1,67 @@
+"""FTS5 全文索引 — posts / events / users
+
+External-content FTS5 tables over the base tables, kept in sync by triggers. The
+trigram tokenizer gives case-insensitive substring matching (the same semantics as
+the old ``LIKE '%q%'`` search) and works for CJK text, which has no word breaks.
+Only created on SQLite; other backends fall back to LIKE in app.services.search.
+"""
+from sqlalchemy import event
+
+from app.database import Base
+
+# fts table -> (content table, indexed columns)
+FTS_TABLES = {
+    "posts_fts": ("posts", ("title", "content", "tags")),
+    "events_fts": ("events", ("name", "description")),
+    "users_fts": ("users", ("username", "display_name", "bio")),
+}
+
+
+def _fts_ddl(fts: str, table: str, columns: tuple) -> list[str]:
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old});"
+    insert_new = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        # UPDATE OF keeps counter updates (like_count etc.) from rewriting the index
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def create_search_index(connection) -> None:
+    """Create missing FTS tables and triggers, backfilling any table created here."""
+    if connection.dialect.name != "sqlite":
+        return
+    for fts, (table, columns) in FTS_TABLES.items():
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,),
+        ).first()
+        for ddl in _fts_ddl(fts, table, columns):
+            connection.exec_driver_sql(ddl)
+        if not exists:
+            connection.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def drop_search_index(connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    for fts in FTS_TABLES:
+        for suffix in ("ai", "ad", "au"):
+            connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {fts}")
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _after_create(target, connection, **kw):
+    create_search_index(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _before_drop(target, connection, **kw):
+    drop_search_index(connection)
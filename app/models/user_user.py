@@ -1,5 +1,5 @@
 """UserUser SQLAlchemy model — user:user relationship (follow/block)"""
-from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint, Index
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -9,6 +9,8 @@ class UserUser(Base):
     __tablename__ = "user_users"
     __table_args__ = (
         UniqueConstraint("source_user_id", "target_user_id", "relation_type", name="uq_user_user"),
+        Index("ix_user_users_source_relation", "source_user_id", "relation_type"),
+        Index("ix_user_users_target_relation", "target_user_id", "relation_type"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
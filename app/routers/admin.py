@@ -3,13 +3,15 @@ from datetime import datetime, timezone
 from typing import Dict, List
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app import crud, schemas
-from app.database import get_db
+from app.database import get_db, get_pool_stats
 from app.deps import require_role
 from app.models.post import Post
 from app.models.user import User
+from app.services import cache_update, rule_metrics
 
 router = APIRouter()
 
@@ -30,25 +32,17 @@ def batch_delete_posts(
     current_user_id: int = Depends(require_admin),
 ):
     """Batch soft-delete posts (admin only)"""
-    success_count = 0
-    failed_ids: List[int] = []
-    errors: Dict[str, str] = {}
-
-    for post_id in body.ids:
-        post = db.query(Post).filter(
-            Post.id == post_id,
-            Post.deleted_at.is_(None)
-        ).first()
-
-        if not post:
-            failed_ids.append(post_id)
-            errors[str(post_id)] = "Post not found or already deleted"
-            continue
-
-        post.deleted_at = datetime.now(timezone.utc)
-        success_count += 1
-
-    db.commit()
+    # One lookup and one executemany UPDATE instead of a query per id
+    found = set(db.scalars(select(Post.id).where(
+        Post.id.in_(body.ids),
+        Post.deleted_at.is_(None),
+    )))
+    failed_ids: List[int] = [post_id for post_id in body.ids if post_id not in found]
+    errors: Dict[str, str] = {str(post_id): "Post not found or already deleted" for post_id in failed_ids}
+    value = datetime.now(timezone.utc)
+    success_count = crud.posts.update_many(db, rows=[
+        {"id": post_id, "deleted_at": value} for post_id in body.ids if post_id in found
+    ])
 
     return {
         "success_count": success_count,
@@ -71,25 +65,17 @@ def batch_update_post_status(
             detail=f"Invalid status. Must be one of: {', '.join(VALID_POST_STATUSES)}"
         )
 
-    success_count = 0
-    failed_ids: List[int] = []
-    errors: Dict[str, str] = {}
-
-    for post_id in body.ids:
-        post = db.query(Post).filter(
-            Post.id == post_id,
-            Post.deleted_at.is_(None)
-        ).first()
-
-        if not post:
-            failed_ids.append(post_id)
-            errors[str(post_id)] = "Post not found or deleted"
-            continue
-
-        post.status = body.status
-        success_count += 1
-
-    db.commit()
+    # One lookup and one executemany UPDATE instead of a query per id
+    found = set(db.scalars(select(Post.id).where(
+        Post.id.in_(body.ids),
+        Post.deleted_at.is_(None),
+    )))
+    failed_ids: List[int] = [post_id for post_id in body.ids if post_id not in found]
+    errors: Dict[str, str] = {str(post_id): "Post not found or deleted" for post_id in failed_ids}
+    value = body.status
+    success_count = crud.posts.update_many(db, rows=[
+        {"id": post_id, "status": value} for post_id in body.ids if post_id in found
+    ])
 
     return {
         "success_count": success_count,
@@ -112,25 +98,43 @@ def batch_update_user_roles(
             detail=f"Invalid role. Must be one of: {', '.join(VALID_USER_ROLES)}"
         )
 
-    success_count = 0
-    failed_ids: List[int] = []
-    errors: Dict[str, str] = {}
+    # One lookup and one executemany UPDATE instead of a query per id
+    found = set(db.scalars(select(User.id).where(
+        User.id.in_(body.ids),
+        User.deleted_at.is_(None),
+    )))
+    failed_ids: List[int] = [user_id for user_id in body.ids if user_id not in found]
+    errors: Dict[str, str] = {str(user_id): "User not found or deleted" for user_id in failed_ids}
+    value = body.role
+    success_count = crud.users.update_many(db, rows=[
+        {"id": user_id, "role": value} for user_id in body.ids if user_id in found
+    ])
 
-    for user_id in body.ids:
-        user = db.query(User).filter(
-            User.id == user_id,
-            User.deleted_at.is_(None)
-        ).first()
-
-        if not user:
-            failed_ids.append(user_id)
-            errors[str(user_id)] = "User not found or deleted"
-            continue
+    return {
+        "success_count": success_count,
+        "failed_count": len(failed_ids),
+        "failed_ids": failed_ids if failed_ids else None,
+        "errors": errors if errors else None,
+    }
 
-        user.role = body.role
-        success_count += 1
 
-    db.commit()
+@router.post("/admin/posts/recount-counters", response_model=schemas.BatchResult, tags=["admin"])
+def recount_post_counters(
+    body: schemas.BatchIds,
+    db: Session = Depends(get_db),
+    current_user_id: int = Depends(require_admin),
+):
+    """Recount like_count / comment_count of posts from their interactions (admin only).
+
+    A repair path: likes and comments keep the counters up to date incrementally.
+    """
+    found = set(db.scalars(select(Post.id).where(
+        Post.id.in_(body.ids),
+        Post.deleted_at.is_(None),
+    )))
+    failed_ids: List[int] = [post_id for post_id in body.ids if post_id not in found]
+    errors: Dict[str, str] = {str(post_id): "Post not found or deleted" for post_id in failed_ids}
+    success_count = cache_update.recount_post_counters(db, sorted(found)) if found else 0
 
     return {
         "success_count": success_count,
@@ -138,3 +142,29 @@ def batch_update_user_roles(
         "failed_ids": failed_ids if failed_ids else None,
         "errors": errors if errors else None,
     }
+
+
+@router.get("/admin/db/pool", tags=["admin"])
+def get_db_pool_stats(
+    current_user_id: int = Depends(require_admin),
+):
+    """Connection pool usage: checked-out, overflow and checkout wait time (admin only)"""
+    return get_pool_stats()
+
+
+@router.get("/admin/rules/metrics", tags=["admin"])
+def get_rule_metrics(
+    current_user_id: int = Depends(require_admin),
+):
+    """Rule-engine checks per rule, trigger, condition/action type and outcome:
+    call count, time and SQL statements, most total time first (admin only)"""
+    return rule_metrics.metrics.snapshot()
+
+
+@router.delete("/admin/rules/metrics", status_code=status.HTTP_204_NO_CONTENT, tags=["admin"])
+def reset_rule_metrics(
+    current_user_id: int = Depends(require_admin),
+):
+    """Start the rule-engine metrics over (admin only)"""
+    rule_metrics.metrics.reset()
+    return None
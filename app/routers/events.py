@@ -1,53 +1,87 @@
 """events API 路由"""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from app import crud, schemas
-from app.database import get_db
-from app.deps import get_current_user_id, require_current_user_id, require_role
+from app.crud.pagination import keyset, keyset_page, paginate
+from app.crud.rule_jobs import JOB_STATUSES
+from app.database import commit_or_flush, get_async_db, get_db
+from app.deps import get_current_user_id, get_current_user_id_async, require_current_user_id, require_role
 from app.schemas.event import CATEGORY_STATUSES, CATEGORY_TYPES, VALID_STATUS_TRANSITIONS
 
 router = APIRouter()
+# AsyncSession versions of the hot read endpoints (mounted when settings.db_async_reads)
+async_router = APIRouter()
 
 
-@router.get("/events", response_model=schemas.PaginatedEventList, tags=["events"])
-def list_categories(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
-    status: Optional[str] = Query(None),
-    type: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-    current_user_id: Optional[int] = Depends(get_current_user_id),
-):
-    query = db.query(crud.events.model).filter(
-        crud.events.model.deleted_at.is_(None),
-    )
+def _event_list_filters(
+    *, status: Optional[str], type: Optional[str], current_user_id: Optional[int],
+) -> list:
+    """Build the WHERE clauses for list_categories (shared by the sync and async endpoints)."""
+    Event = crud.events.model
+    filters = [Event.deleted_at.is_(None)]
     if status is not None:
         if status not in CATEGORY_STATUSES:
             raise HTTPException(status_code=422, detail=f"Invalid status: {status}")
-        query = query.filter(crud.events.model.status == status)
+        filters.append(Event.status == status)
     else:
         # For anonymous users or when no status filter, hide draft events
         # Draft events only visible to their creator
         if current_user_id is None:
-            query = query.filter(crud.events.model.status != "draft")
+            filters.append(Event.status != "draft")
         else:
             # Show non-draft events + draft events created by current user
-            from sqlalchemy import or_
-            query = query.filter(
-                or_(
-                    crud.events.model.status != "draft",
-                    crud.events.model.created_by == current_user_id,
-                )
-            )
+            filters.append(or_(Event.status != "draft", Event.created_by == current_user_id))
     if type is not None:
         if type not in CATEGORY_TYPES:
             raise HTTPException(status_code=422, detail=f"Invalid type: {type}")
-        query = query.filter(crud.events.model.type == type)
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+        filters.append(Event.type == type)
+    return filters
+
+
+@router.get("/events", response_model=schemas.PaginatedEventList, tags=["events"])
+def list_categories(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    status: Optional[str] = Query(None),
+    type: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    with_total: bool = Query(True),
+    db: Session = Depends(get_db),
+    current_user_id: Optional[int] = Depends(get_current_user_id),
+):
+    filters = _event_list_filters(status=status, type=type, current_user_id=current_user_id)
+    Event = crud.events.model
+    query = db.query(Event).filter(*filters)
+    total = query.count() if with_total else None
+    items, next_cursor = paginate(
+        query, (Event.created_at, Event.id), cursor=cursor, skip=skip, limit=limit,
+    )
+    return {"items": items, "total": total, "skip": skip, "limit": limit, "next_cursor": next_cursor}
+
+
+@async_router.get("/events", response_model=schemas.PaginatedEventList, tags=["events"])
+async def list_categories_async(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    status: Optional[str] = Query(None),
+    type: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    with_total: bool = Query(True),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: Optional[int] = Depends(get_current_user_id_async),
+):
+    filters = _event_list_filters(status=status, type=type, current_user_id=current_user_id)
+    Event = crud.events.model
+    total = None
+    if with_total:
+        total = (await db.execute(select(func.count()).select_from(Event).where(*filters))).scalar_one()
+    stmt = keyset(select(Event).where(*filters), (Event.created_at, Event.id), cursor=cursor, skip=skip, limit=limit)
+    items, next_cursor = keyset_page((await db.execute(stmt)).all(), limit)
+    return {"items": items, "total": total, "skip": skip, "limit": limit, "next_cursor": next_cursor}
 
 
 @router.post("/events", response_model=schemas.Event, status_code=status.HTTP_201_CREATED, tags=["events"])
@@ -61,8 +95,7 @@ def create_category(
     from app.models.event import Event as CategoryModel
     db_obj = CategoryModel(**obj_data)
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    commit_or_flush(db)
     return db_obj
 
 
@@ -125,10 +158,10 @@ def update_category(
             raise HTTPException(status_code=422, detail=e.message)
 
     result = crud.events.update(db, db_obj=item, obj_in=event_in)
-    # Rule engine: post-hooks for event status change
+    # Rule engine: post-hooks for event status change (queued, run after the commit)
     if status_changed:
-        from app.services.rule_engine import run_post_hooks
-        run_post_hooks(
+        from app.services.rule_jobs import dispatch_post_hooks
+        dispatch_post_hooks(
             db,
             trigger="update_content(event.status)",
             event_id=event_id,
@@ -157,6 +190,27 @@ def delete_category(
     return None
 
 
+@router.get("/events/{event_id}/jobs", response_model=list[schemas.RuleJobResponse], tags=["events"])
+def list_event_jobs(
+    event_id: int,
+    status: Optional[str] = Query(None, description="queued | running | succeeded | failed"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(require_role("organizer", "admin")),
+):
+    """Queued rule-engine post-hook runs of an event (ranking, certificates, ...), newest first."""
+    item = crud.events.get(db, id=event_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    current_user = crud.users.get(db, id=user_id)
+    if current_user and current_user.role != "admin" and item.created_by != user_id:
+        raise HTTPException(status_code=403, detail="Not the event owner")
+    if status is not None and status not in JOB_STATUSES:
+        raise HTTPException(status_code=422, detail=f"Invalid status: {status}")
+    return crud.rule_jobs.get_multi_by_event(db, event_id=event_id, status=status, skip=skip, limit=limit)
+
+
 # --- event:rule relationship endpoints ---
 
 @router.get("/events/{event_id}/rules", response_model=list[schemas.EventRuleResponse], tags=["events"])
@@ -217,6 +271,50 @@ def remove_category_rule(
     return None
 
 
+@router.post("/events/{event_id}/rules/simulate", response_model=schemas.RuleSimulationResponse, tags=["events"])
+def simulate_category_rules(
+    event_id: int,
+    body: schemas.RuleSimulationRequest,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(require_role("organizer", "admin")),
+):
+    """Dry-run the rule checks of a trigger: outcome, time and queries per check; writes nothing.
+
+    Runs the event's linked rules, or body.rule_ids, plus any unsaved body.checks, for
+    body.context or the body.sample most recent real operations of the trigger.
+    """
+    item = crud.events.get(db, id=event_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    current_user = crud.users.get(db, id=user_id)
+    if current_user and current_user.role != "admin" and item.created_by != user_id:
+        raise HTTPException(status_code=403, detail="Not the event owner")
+
+    from app.services.rule_engine import get_event_rule_plans, get_rule_plan
+    from app.services.rule_simulation import draft_plan, sample_contexts, simulate_rules
+    if body.rule_ids is None:
+        plans = list(get_event_rule_plans(db, event_id))
+    else:
+        plans = []
+        for rule_id in body.rule_ids:
+            rule = crud.rules.get(db, id=rule_id)
+            if rule is None:
+                raise HTTPException(status_code=404, detail=f"Rule {rule_id} not found")
+            plans.append(get_rule_plan(rule))
+    if body.checks:
+        plans.append(draft_plan([check.model_dump(exclude_none=True) for check in body.checks]))
+
+    if body.sample is not None:
+        try:
+            contexts = sample_contexts(db, event_id, body.trigger, limit=body.sample)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    else:
+        contexts = [body.context.model_dump(exclude_none=True)]
+    runs = simulate_rules(db, event_id, body.trigger, contexts, plans)
+    return {"event_id": event_id, "trigger": body.trigger, "runs": runs}
+
+
 # --- event:post relationship endpoints ---
 
 @router.get("/events/{event_id}/posts", response_model=list[schemas.EventPostResponse], tags=["events"])
@@ -278,10 +376,10 @@ def add_category_post(
         except RuleCheckError as e:
             raise HTTPException(status_code=422, detail=e.message)
     result = crud.event_posts.create(db, event_id=event_id, post_id=body.post_id, relation_type=relation_type)
-    # Rule engine: post-hooks
+    # Rule engine: post-hooks (queued, run after the commit)
     if relation_type == "submission":
-        from app.services.rule_engine import run_post_hooks
-        run_post_hooks(
+        from app.services.rule_jobs import dispatch_post_hooks
+        dispatch_post_hooks(
             db,
             trigger="create_relation(event_post)",
             event_id=event_id,
@@ -4,7 +4,8 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app import crud, schemas
-from app.database import get_db
+from app.crud.pagination import paginate
+from app.database import commit_or_flush, get_db
 from app.deps import get_current_user_id, require_current_user_id
 from app.schemas.group import VISIBILITY_VALUES
 
@@ -16,18 +17,23 @@ def list_groups(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     visibility: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db),
 ):
-    query = db.query(crud.groups.model).filter(
-        crud.groups.model.deleted_at.is_(None),
+    Group = crud.groups.model
+    query = db.query(Group).filter(
+        Group.deleted_at.is_(None),
     )
     if visibility is not None:
         if visibility not in VISIBILITY_VALUES:
             raise HTTPException(status_code=422, detail=f"Invalid visibility: {visibility}")
-        query = query.filter(crud.groups.model.visibility == visibility)
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+        query = query.filter(Group.visibility == visibility)
+    total = query.count() if with_total else None
+    items, next_cursor = paginate(
+        query, (Group.created_at, Group.id), cursor=cursor, skip=skip, limit=limit,
+    )
+    return {"items": items, "total": total, "skip": skip, "limit": limit, "next_cursor": next_cursor}
 
 
 @router.post("/groups", response_model=schemas.Group, status_code=status.HTTP_201_CREATED, tags=["groups"])
@@ -41,8 +47,7 @@ def create_group(
     from app.models.group import Group as GroupModel
     db_obj = GroupModel(**obj_data)
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    commit_or_flush(db)
 
     # Auto-add creator as owner member
     crud.members.create(
@@ -123,14 +128,18 @@ def list_group_members(
     member_status: Optional[str] = Query(None, alias="status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db),
 ):
     item = crud.groups.get(db, id=group_id)
     if item is None:
         raise HTTPException(status_code=404, detail="Group not found")
-    items = crud.members.get_multi_by_group(db, group_id=group_id, status=member_status, skip=skip, limit=limit)
-    total = crud.members.count_by_group(db, group_id=group_id, status=member_status)
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+    items, next_cursor = crud.members.get_page_by_group(
+        db, group_id=group_id, status=member_status, cursor=cursor, skip=skip, limit=limit,
+    )
+    total = crud.members.count_by_group(db, group_id=group_id, status=member_status) if with_total else None
+    return {"items": items, "total": total, "skip": skip, "limit": limit, "next_cursor": next_cursor}
 
 
 @router.post("/groups/{group_id}/members", response_model=schemas.Member, status_code=status.HTTP_201_CREATED, tags=["groups"])
@@ -147,15 +156,15 @@ def add_group_member(
     if existing:
         raise HTTPException(status_code=409, detail="User is already a member of this group")
     # Rule engine: pre-checks for create_relation(group_user)
-    # Find events this group is registered to and run checks
+    # Checked against every event this group is registered to at once; all failing events are reported
     cat_groups = crud.event_groups.get_multi_by_group(db, group_id=group_id)
-    for cg in cat_groups:
-        from app.services.rule_engine import run_pre_checks, RuleCheckError
+    if cat_groups:
+        from app.services.rule_engine import run_pre_checks_batch, RuleCheckError
         try:
-            run_pre_checks(
+            run_pre_checks_batch(
                 db,
                 trigger="create_relation(group_user)",
-                event_id=cg.event_id,
+                event_ids=[cg.event_id for cg in cat_groups],
                 context={"user_id": body.user_id, "group_id": group_id},
             )
         except RuleCheckError as e:
@@ -210,12 +219,16 @@ def list_my_groups(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = Query(None, description="Filter by membership status"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db),
     user_id: int = Depends(require_current_user_id),
 ):
     """List groups the current user is a member of."""
-    memberships = crud.members.get_multi_by_user(db, user_id=user_id, status=status, skip=skip, limit=limit)
-    total = crud.members.count_by_user(db, user_id=user_id, status=status)
+    memberships, next_cursor = crud.members.get_page_by_user(
+        db, user_id=user_id, status=status, cursor=cursor, skip=skip, limit=limit,
+    )
+    total = crud.members.count_by_user(db, user_id=user_id, status=status) if with_total else None
 
     # Fetch the actual group objects
     groups = []
@@ -224,4 +237,4 @@ def list_my_groups(
         if group:
             groups.append(group)
 
-    return {"items": groups, "total": total, "skip": skip, "limit": limit}
+    return {"items": groups, "total": total, "skip": skip, "limit": limit, "next_cursor": next_cursor}
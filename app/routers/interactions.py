@@ -4,10 +4,10 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app import crud, schemas
-from app.database import get_db
+from app.database import commit_or_flush, get_db
 from app.deps import require_current_user_id
 from app.models.interaction import Interaction
-from app.models.post import Post
+from app.services.cache_update import adjust_post_counters, update_post_rating_cache
 
 router = APIRouter()
 
@@ -23,38 +23,6 @@ def _get_target(db: Session, target_type: str, target_id: int):
     return None
 
 
-def _update_post_cache(db: Session, post_id: int):
-    """Recalculate and update post cache fields (like_count, comment_count, average_rating)."""
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        return
-    post.like_count = crud.target_interactions.count_by_target_and_type(
-        db, target_type="post", target_id=post_id, interaction_type="like",
-    )
-    post.comment_count = crud.target_interactions.count_by_target_and_type(
-        db, target_type="post", target_id=post_id, interaction_type="comment",
-    )
-    # Calculate average_rating from all rating interactions bound to this post
-    rating_tis = crud.target_interactions.get_multi_by_target(
-        db, target_type="post", target_id=post_id, interaction_type="rating",
-    )
-    if rating_tis:
-        total = 0.0
-        count = 0
-        for ti in rating_tis:
-            interaction = crud.interactions.get(db, id=ti.interaction_id)
-            if interaction and interaction.value and isinstance(interaction.value, dict):
-                scores = list(interaction.value.values())
-                if scores:
-                    total += sum(scores) / len(scores)
-                    count += 1
-        post.average_rating = round(total / count, 2) if count > 0 else None
-    else:
-        post.average_rating = None
-    db.commit()
-    db.refresh(post)
-
-
 # --- Like endpoints ---
 
 @router.get("/posts/{post_id}/like", tags=["interactions"])
@@ -86,10 +54,9 @@ def like_post(
     # Create interaction + binding
     interaction = Interaction(type="like", created_by=user_id)
     db.add(interaction)
-    db.commit()
-    db.refresh(interaction)
+    commit_or_flush(db)
     crud.target_interactions.create(db, target_type="post", target_id=post_id, interaction_id=interaction.id)
-    _update_post_cache(db, post_id)
+    adjust_post_counters(db, post_id, likes=1)
     return {"post_id": post_id, "liked": True}
 
 
@@ -111,8 +78,8 @@ def unlike_post(
     interaction = crud.interactions.get(db, id=interaction_id)
     if interaction:
         db.delete(interaction)
-        db.commit()
-    _update_post_cache(db, post_id)
+        commit_or_flush(db)
+        adjust_post_counters(db, post_id, likes=-1)
     return None
 
 
@@ -155,10 +122,9 @@ def add_post_comment(
     # Create comment interaction
     interaction = Interaction(type="comment", value=body.value, parent_id=body.parent_id, created_by=user_id)
     db.add(interaction)
-    db.commit()
-    db.refresh(interaction)
+    commit_or_flush(db)
     crud.target_interactions.create(db, target_type="post", target_id=post_id, interaction_id=interaction.id)
-    _update_post_cache(db, post_id)
+    adjust_post_counters(db, post_id, comments=1)
     # Create notification for post author (and @mentions)
     from app.services.notification_events import notify_comment
     comment_text = body.value if isinstance(body.value, str) else None
@@ -203,8 +169,7 @@ def submit_post_rating(
     # Create rating interaction
     interaction = Interaction(type="rating", value=body.value, created_by=user_id)
     db.add(interaction)
-    db.commit()
-    db.refresh(interaction)
+    commit_or_flush(db)
     crud.target_interactions.create(db, target_type="post", target_id=post_id, interaction_id=interaction.id)
-    _update_post_cache(db, post_id)
+    update_post_rating_cache(db, post_id)
     return interaction
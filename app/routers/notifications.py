@@ -1,13 +1,19 @@
 """notifications API 路由"""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from app import crud, schemas
-from app.database import get_db
-from app.deps import require_current_user_id
+from app.crud.pagination import keyset, keyset_page
+from app.database import get_async_db, get_db
+from app.deps import require_current_user_id, require_current_user_id_async
+from app.models.notification import Notification
 
 router = APIRouter()
+# AsyncSession versions of the hot read endpoints (mounted when settings.db_async_reads)
+async_router = APIRouter()
 
 
 @router.get("/notifications", response_model=schemas.PaginatedNotificationList, tags=["notifications"])
@@ -15,15 +21,19 @@ def list_notifications(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     is_read: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db),
     current_user_id: int = Depends(require_current_user_id),
 ):
     """List current user's notifications."""
-    items = crud.notifications.get_multi_by_user(
-        db, user_id=current_user_id, is_read=is_read, skip=skip, limit=limit
+    items, next_cursor = crud.notifications.get_page_by_user(
+        db, user_id=current_user_id, is_read=is_read, cursor=cursor, skip=skip, limit=limit,
     )
-    total = crud.notifications.count_by_user(db, user_id=current_user_id, is_read=is_read)
-    return {"items": items, "total": total, "skip": skip, "limit": limit}
+    total = None
+    if with_total:
+        total = crud.notifications.count_by_user(db, user_id=current_user_id, is_read=is_read)
+    return {"items": items, "total": total, "skip": skip, "limit": limit, "next_cursor": next_cursor}
 
 
 @router.get("/notifications/unread-count", tags=["notifications"])
@@ -81,3 +91,51 @@ def mark_all_as_read(
     """Mark all notifications as read."""
     count = crud.notifications.mark_all_as_read(db, user_id=current_user_id)
     return {"marked_count": count}
+
+
+# --- async read endpoints ---
+
+def _notification_filters(user_id: int, is_read: Optional[bool]) -> list:
+    filters = [Notification.user_id == user_id]
+    if is_read is not None:
+        filters.append(Notification.is_read == is_read)
+    return filters
+
+
+@async_router.get("/notifications", response_model=schemas.PaginatedNotificationList, tags=["notifications"])
+async def list_notifications_async(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    is_read: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    with_total: bool = Query(True),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(require_current_user_id_async),
+):
+    """List current user's notifications."""
+    filters = _notification_filters(current_user_id, is_read)
+    stmt = keyset(
+        select(Notification).where(*filters), (Notification.created_at, Notification.id),
+        cursor=cursor, skip=skip, limit=limit, descending=True,
+    )
+    items, next_cursor = keyset_page((await db.execute(stmt)).all(), limit)
+    total = None
+    if with_total:
+        total = (await db.execute(
+            select(func.count()).select_from(Notification).where(*filters)
+        )).scalar_one()
+    return {"items": items, "total": total, "skip": skip, "limit": limit, "next_cursor": next_cursor}
+
+
+@async_router.get("/notifications/unread-count", tags=["notifications"])
+async def get_unread_count_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: int = Depends(require_current_user_id_async),
+):
+    """Get count of unread notifications."""
+    count = (await db.execute(
+        select(func.count()).select_from(Notification).where(
+            *_notification_filters(current_user_id, False)
+        )
+    )).scalar_one()
+    return {"unread_count": count}
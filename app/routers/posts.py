@@ -1,15 +1,21 @@
 """posts API 路由"""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import inspect as sa_inspect
+from sqlalchemy import func, inspect as sa_inspect, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from app import crud, schemas
-from app.database import get_db
-from app.deps import get_current_user_id, require_current_user_id, require_role
-from app.schemas.post import POST_STATUSES, POST_TYPES, VALID_POST_STATUS_TRANSITIONS
+from app.crud.pagination import keyset, keyset_page, paginate
+from app.database import commit_or_flush, get_async_db, get_db
+from app.deps import get_current_user_id, get_current_user_id_async, require_current_user_id, require_role
+from app.schemas.post import POST_STATUSES, POST_TYPES, TAG_MODES, VALID_POST_STATUS_TRANSITIONS
+from app.models.post_tag import PostTag
+from app.services.search import fts_phrase_query
 
 router = APIRouter()
+# AsyncSession versions of the hot read endpoints (mounted when settings.db_async_reads)
+async_router = APIRouter()
 
 def _normalize_post_type(value: Optional[str]) -> str:
     if value in POST_TYPES:
@@ -23,91 +29,119 @@ def _post_to_dict(post) -> dict:
     return data
 
 
-@router.get("/posts", response_model=schemas.PaginatedPostList, tags=["posts"])
-def list_posts(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
-    type: Optional[str] = Query(None),
-    post_status: Optional[str] = Query(None, alias="status"),
-    q: Optional[str] = Query(None),
-    tags: Optional[str] = Query(None),
-    created_by: Optional[int] = Query(None, description="Filter by author ID"),
-    db: Session = Depends(get_db),
-    current_user_id: Optional[int] = Depends(get_current_user_id),
-):
-    from sqlalchemy import or_, func, text
-    query = db.query(crud.posts.model).filter(
-        crud.posts.model.deleted_at.is_(None),
-    )
+def _post_list_filters(
+    *,
+    type: Optional[str],
+    post_status: Optional[str],
+    q: Optional[str],
+    tags: Optional[str],
+    created_by: Optional[int],
+    current_user_id: Optional[int],
+    dialect_name: str,
+    tags_mode: str = "any",
+) -> list:
+    """Build the WHERE clauses for list_posts (shared by the sync and async endpoints)."""
+    Post = crud.posts.model
+    filters = [Post.deleted_at.is_(None)]
     if created_by is not None:
-        query = query.filter(crud.posts.model.created_by == created_by)
+        filters.append(Post.created_by == created_by)
     if type is not None:
         if type not in POST_TYPES:
             raise HTTPException(status_code=422, detail=f"Invalid type: {type}")
-        query = query.filter(crud.posts.model.type == type)
+        filters.append(Post.type == type)
     if post_status is not None:
         if post_status not in POST_STATUSES:
             raise HTTPException(status_code=422, detail=f"Invalid status: {post_status}")
-        query = query.filter(crud.posts.model.status == post_status)
+        filters.append(Post.status == post_status)
     else:
         # For anonymous users or when no status filter, hide draft posts
         # Draft posts only visible to their creator
         if current_user_id is None:
-            query = query.filter(crud.posts.model.status != "draft")
+            filters.append(Post.status != "draft")
         else:
             # Show non-draft posts + draft posts created by current user
-            query = query.filter(
-                or_(
-                    crud.posts.model.status != "draft",
-                    crud.posts.model.created_by == current_user_id,
-                )
-            )
+            filters.append(or_(Post.status != "draft", Post.created_by == current_user_id))
     # Also filter private posts (visibility)
     if current_user_id is None:
-        query = query.filter(
-            or_(
-                crud.posts.model.visibility.is_(None),
-                crud.posts.model.visibility == "public",
-            )
-        )
+        filters.append(or_(Post.visibility.is_(None), Post.visibility == "public"))
     else:
         # Show public posts + private posts created by current user
-        query = query.filter(
-            or_(
-                crud.posts.model.visibility.is_(None),
-                crud.posts.model.visibility == "public",
-                crud.posts.model.created_by == current_user_id,
-            )
-        )
+        filters.append(or_(
+            Post.visibility.is_(None),
+            Post.visibility == "public",
+            Post.created_by == current_user_id,
+        ))
 
     if q is not None and q.strip():
-        q_norm = q.strip().lower()
-        like = f"%{q_norm}%"
-        query = query.filter(
-            or_(
-                func.lower(crud.posts.model.title).like(like),
-                func.lower(func.coalesce(crud.posts.model.content, "")).like(like),
-            )
-        )
+        # FTS5 trigram index (substring match on title/content) when available
+        match = fts_phrase_query(q, ("title", "content")) if dialect_name == "sqlite" else None
+        if match is not None:
+            filters.append(text(
+                "posts.id IN (SELECT rowid FROM posts_fts WHERE posts_fts MATCH :fts_q)"
+            ).bindparams(fts_q=match))
+        else:
+            q_norm = q.strip().lower()
+            like = f"%{q_norm}%"
+            filters.append(or_(
+                func.lower(Post.title).like(like),
+                func.lower(func.coalesce(Post.content, "")).like(like),
+            ))
 
     if tags is not None and tags.strip():
-        tag_list = [t.strip() for t in tags.split(",") if t.strip()]
+        if tags_mode not in TAG_MODES:
+            raise HTTPException(status_code=422, detail=f"Invalid tags_mode: {tags_mode}")
+        tag_list = list(dict.fromkeys(t.strip().lower() for t in tags.split(",") if t.strip()))
         if tag_list:
-            placeholders = []
-            bind = {}
-            for i, t in enumerate(tag_list):
-                key = f"tag_{i}"
-                placeholders.append(f":{key}")
-                bind[key] = t.lower()
-            exists_sql = (
-                "EXISTS (SELECT 1 FROM json_each(posts.tags) "
-                f"WHERE lower(json_each.value) IN ({', '.join(placeholders)}))"
-            )
-            query = query.filter(text(exists_sql).bindparams(**bind))
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
+            tagged = select(PostTag.post_id).where(PostTag.tag_normalized.in_(tag_list))
+            if tags_mode == "all":
+                tagged = tagged.group_by(PostTag.post_id).having(
+                    func.count(PostTag.tag_normalized) == len(tag_list),
+                )
+            filters.append(Post.id.in_(tagged))
+    return filters
+
+
+def _tag_facets_query(filters: list, limit: int):
+    """Tag counts over the posts matching ``filters`` (shared by the sync and async endpoints)."""
+    count = func.count(PostTag.post_id)
+    return (
+        select(PostTag.tag_normalized.label("tag"), count.label("count"))
+        .join(crud.posts.model, crud.posts.model.id == PostTag.post_id)
+        .where(*filters)
+        .group_by(PostTag.tag_normalized)
+        .order_by(count.desc(), PostTag.tag_normalized)
+        .limit(limit)
+    )
+
+
+@router.get("/posts", response_model=schemas.PaginatedPostList, tags=["posts"])
+def list_posts(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    type: Optional[str] = Query(None),
+    post_status: Optional[str] = Query(None, alias="status"),
+    q: Optional[str] = Query(None),
+    tags: Optional[str] = Query(None),
+    tags_mode: str = Query("any", description="any: match one of the tags, all: match every tag"),
+    created_by: Optional[int] = Query(None, description="Filter by author ID"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    with_total: bool = Query(True),
+    db: Session = Depends(get_db),
+    current_user_id: Optional[int] = Depends(get_current_user_id),
+):
+    filters = _post_list_filters(
+        type=type, post_status=post_status, q=q, tags=tags, tags_mode=tags_mode,
+        created_by=created_by, current_user_id=current_user_id,
+        dialect_name=db.get_bind().dialect.name,
+    )
+    Post = crud.posts.model
+    query = db.query(Post).filter(*filters)
+    total = query.count() if with_total else None
+    items, next_cursor = paginate(
+        query, (Post.created_at, Post.id), cursor=cursor, skip=skip, limit=limit,
+    )
     items_out = [_post_to_dict(p) for p in items]
-    return {"items": items_out, "total": total, "skip": skip, "limit": limit}
+    return {"items": items_out, "total": total, "skip": skip, "limit": limit, "next_cursor": next_cursor}
 
 
 @router.post("/posts", response_model=schemas.Post, status_code=status.HTTP_201_CREATED, tags=["posts"])
@@ -121,11 +155,32 @@ def create_post(
     from app.models.post import Post as PostModel
     db_obj = PostModel(**obj_data)
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    commit_or_flush(db)
     return _post_to_dict(db_obj)
 
 
+# Registered before /posts/{post_id} so "tag-facets" is not parsed as an id
+@router.get("/posts/tag-facets", response_model=schemas.TagFacetList, tags=["posts"])
+def get_tag_facets(
+    limit: int = Query(50, ge=1, le=500),
+    type: Optional[str] = Query(None),
+    post_status: Optional[str] = Query(None, alias="status"),
+    q: Optional[str] = Query(None),
+    tags: Optional[str] = Query(None),
+    tags_mode: str = Query("any"),
+    created_by: Optional[int] = Query(None, description="Filter by author ID"),
+    db: Session = Depends(get_db),
+    current_user_id: Optional[int] = Depends(get_current_user_id),
+):
+    filters = _post_list_filters(
+        type=type, post_status=post_status, q=q, tags=tags, tags_mode=tags_mode,
+        created_by=created_by, current_user_id=current_user_id,
+        dialect_name=db.get_bind().dialect.name,
+    )
+    rows = db.execute(_tag_facets_query(filters, limit)).mappings().all()
+    return {"items": rows}
+
+
 @router.get("/posts/{post_id}", response_model=schemas.Post, tags=["posts"])
 def get_post(
     post_id: int,
@@ -133,6 +188,11 @@ def get_post(
     current_user_id: Optional[int] = Depends(get_current_user_id),
 ):
     item = crud.posts.get(db, id=post_id)
+    _check_post_visible(item, current_user_id)
+    return _post_to_dict(item)
+
+
+def _check_post_visible(item, current_user_id: Optional[int]) -> None:
     if item is None:
         raise HTTPException(status_code=404, detail="Post not found")
     # Visibility: draft posts only visible to author
@@ -141,7 +201,6 @@ def get_post(
     # Visibility: private posts only visible to author
     if item.visibility == "private" and item.created_by != current_user_id:
         raise HTTPException(status_code=404, detail="Post not found")
-    return _post_to_dict(item)
 
 
 @router.patch("/posts/{post_id}", response_model=schemas.Post, tags=["posts"])
@@ -325,3 +384,70 @@ def remove_post_related(
         raise HTTPException(status_code=404, detail="Post relation not found")
     crud.post_posts.remove(db, id=relation_id)
     return None
+
+
+# --- async read endpoints ---
+
+@async_router.get("/posts", response_model=schemas.PaginatedPostList, tags=["posts"])
+async def list_posts_async(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    type: Optional[str] = Query(None),
+    post_status: Optional[str] = Query(None, alias="status"),
+    q: Optional[str] = Query(None),
+    tags: Optional[str] = Query(None),
+    tags_mode: str = Query("any", description="any: match one of the tags, all: match every tag"),
+    created_by: Optional[int] = Query(None, description="Filter by author ID"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    with_total: bool = Query(True),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: Optional[int] = Depends(get_current_user_id_async),
+):
+    filters = _post_list_filters(
+        type=type, post_status=post_status, q=q, tags=tags, tags_mode=tags_mode,
+        created_by=created_by, current_user_id=current_user_id,
+        dialect_name=db.bind.dialect.name,
+    )
+    Post = crud.posts.model
+    total = None
+    if with_total:
+        total = (await db.execute(select(func.count()).select_from(Post).where(*filters))).scalar_one()
+    stmt = keyset(select(Post).where(*filters), (Post.created_at, Post.id), cursor=cursor, skip=skip, limit=limit)
+    items, next_cursor = keyset_page((await db.execute(stmt)).all(), limit)
+    items_out = [_post_to_dict(p) for p in items]
+    return {"items": items_out, "total": total, "skip": skip, "limit": limit, "next_cursor": next_cursor}
+
+
+@async_router.get("/posts/tag-facets", response_model=schemas.TagFacetList, tags=["posts"])
+async def get_tag_facets_async(
+    limit: int = Query(50, ge=1, le=500),
+    type: Optional[str] = Query(None),
+    post_status: Optional[str] = Query(None, alias="status"),
+    q: Optional[str] = Query(None),
+    tags: Optional[str] = Query(None),
+    tags_mode: str = Query("any"),
+    created_by: Optional[int] = Query(None, description="Filter by author ID"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: Optional[int] = Depends(get_current_user_id_async),
+):
+    filters = _post_list_filters(
+        type=type, post_status=post_status, q=q, tags=tags, tags_mode=tags_mode,
+        created_by=created_by, current_user_id=current_user_id,
+        dialect_name=db.bind.dialect.name,
+    )
+    rows = (await db.execute(_tag_facets_query(filters, limit))).mappings().all()
+    return {"items": rows}
+
+
+@async_router.get("/posts/{post_id}", response_model=schemas.Post, tags=["posts"])
+async def get_post_async(
+    post_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user_id: Optional[int] = Depends(get_current_user_id_async),
+):
+    Post = crud.posts.model
+    item = (await db.execute(
+        select(Post).where(Post.id == post_id, Post.deleted_at.is_(None))
+    )).scalar_one_or_none()
+    _check_post_visible(item, current_user_id)
+    return _post_to_dict(item)
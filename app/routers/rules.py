@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from app import crud, schemas
-from app.database import get_db
+from app.database import commit_or_flush, get_db
 from app.deps import get_current_user_id, require_current_user_id, require_role
 
 router = APIRouter()
@@ -32,8 +32,7 @@ def create_rule(
     from app.models.rule import Rule as RuleModel
     db_obj = RuleModel(**obj_data)
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
+    commit_or_flush(db)
     return db_obj
 
 
@@ -0,0 +1,34 @@
+"""search API 路由"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app import schemas
+from app.database import get_db
+from app.deps import get_current_user_id
+from app.services.search import SEARCH_TYPES, search as run_search
+
+router = APIRouter()
+
+
+@router.get("/search", response_model=schemas.PaginatedSearchResults, tags=["search"])
+def search(
+    q: str = Query(..., min_length=1, description="Search text"),
+    type: Optional[str] = Query(None, description="Comma-separated result types: post,event,user"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user_id: Optional[int] = Depends(get_current_user_id),
+):
+    types = SEARCH_TYPES
+    if type is not None:
+        types = tuple(dict.fromkeys(t.strip() for t in type.split(",") if t.strip()))
+        invalid = [t for t in types if t not in SEARCH_TYPES]
+        if invalid or not types:
+            raise HTTPException(status_code=422, detail=f"Invalid type: {type}")
+    if not q.strip():
+        return {"items": [], "total": 0, "skip": skip, "limit": limit}
+    items, total = run_search(
+        db, q, types=types, current_user_id=current_user_id, skip=skip, limit=limit,
+    )
+    return {"items": items, "total": total, "skip": skip, "limit": limit}
@@ -227,6 +227,8 @@ def list_user_likes(
     user_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    with_total: bool = Query(True),
     db: Session = Depends(get_db),
     current_user_id: int = Depends(require_current_user_id),
 ):
@@ -242,12 +244,14 @@ def list_user_likes(
         raise HTTPException(status_code=404, detail="User not found")
 
     # Get all likes by user for posts
-    likes = crud.target_interactions.get_likes_by_user(
-        db, user_id=user_id, target_type="post", skip=skip, limit=limit
-    )
-    total = crud.target_interactions.count_likes_by_user(
-        db, user_id=user_id, target_type="post"
+    likes, next_cursor = crud.target_interactions.get_like_page_by_user(
+        db, user_id=user_id, target_type="post", cursor=cursor, skip=skip, limit=limit,
     )
+    total = None
+    if with_total:
+        total = crud.target_interactions.count_likes_by_user(
+            db, user_id=user_id, target_type="post"
+        )
 
     # Fetch post details for each liked post
     posts = []
@@ -256,4 +260,4 @@ def list_user_likes(
         if post:
             posts.append(post)
 
-    return {"items": posts, "total": total, "skip": skip, "limit": limit}
+    return {"items": posts, "total": total, "skip": skip, "limit": limit, "next_cursor": next_cursor}
@@ -2,7 +2,7 @@
 from app.schemas.user import User, UserCreate, UserUpdate
 from app.schemas.resource import Resource, ResourceCreate, ResourceUpdate
 from app.schemas.event import Event, EventCreate, EventUpdate
-from app.schemas.post import Post, PostCreate, PostUpdate
+from app.schemas.post import Post, PostCreate, PostUpdate, TagFacet, TagFacetList
 from app.schemas.rule import Rule, RuleCreate, RuleUpdate
 from app.schemas.group import Group, GroupCreate, GroupUpdate
 from app.schemas.interaction import Interaction, InteractionCreate, InteractionUpdate
@@ -41,3 +41,6 @@ from app.schemas.notification import (
     Notification, NotificationCreate, NotificationUpdate,
     NotificationType, PaginatedNotificationList
 )
+from app.schemas.search import SearchResult, PaginatedSearchResults
+from app.schemas.rule_job import RuleJobResponse
+from app.schemas.rule_simulation import RuleSimulationRequest, RuleSimulationResponse
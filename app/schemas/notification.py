@@ -47,7 +47,8 @@ class Notification(NotificationInDBBase):
 
 class PaginatedNotificationList(BaseModel):
     items: List[Notification]
-    total: int
+    total: Optional[int] = None  # omitted with ?with_total=false
+    next_cursor: Optional[str] = None
     skip: int
     limit: int
     unread_count: Optional[int] = None
@@ -1,11 +1,12 @@
 """Paginated event list schema"""
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from app.schemas.event import Event
 
 
 class PaginatedEventList(BaseModel):
     items: List[Event]
-    total: int
+    total: Optional[int] = None  # omitted with ?with_total=false
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
@@ -1,11 +1,12 @@
 """Paginated post list schema"""
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from app.schemas.post import Post
 
 
 class PaginatedPostList(BaseModel):
     items: List[Post]
-    total: int
+    total: Optional[int] = None  # omitted with ?with_total=false
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
@@ -9,6 +9,7 @@ from app.schemas.enums import PostType
 POST_TYPES = tuple(t.value for t in PostType)
 POST_STATUSES = ("draft", "pending_review", "published", "rejected")
 POST_VISIBILITIES = ("public", "private")
+TAG_MODES = ("any", "all")
 
 # Valid status transitions:
 #   draft → pending_review → published | rejected
@@ -59,3 +60,12 @@ class PostInDBBase(PostBase):
 
 class Post(PostInDBBase):
     pass
+
+
+class TagFacet(BaseModel):
+    tag: str
+    count: int
+
+
+class TagFacetList(BaseModel):
+    items: List[TagFacet]
@@ -26,6 +26,7 @@ class ResourceInDBBase(ResourceBase):
     model_config = {"from_attributes": True}
 
     id: int
+    extension: str = ""  # normalized from filename
     created_by: Optional[int] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -0,0 +1,22 @@
+"""RuleJob Pydantic schemas — queued rule-engine post-hook runs"""
+from datetime import datetime
+from typing import Any, List, Optional
+
+from pydantic import BaseModel
+
+
+class RuleJobResponse(BaseModel):
+    id: int
+    event_id: int
+    trigger: str
+    context: dict[str, Any]
+    status: str
+    attempts: int
+    run_after: datetime
+    logs: Optional[List[str]] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
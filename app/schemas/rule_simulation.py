@@ -0,0 +1,62 @@
+"""Rule simulation Pydantic schemas — dry runs of an event's rule checks"""
+from typing import Any, List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from app.schemas.rule import CheckDefinition
+
+
+class RuleSimulationContext(BaseModel):
+    user_id: Optional[int] = None
+    post_id: Optional[int] = None
+    group_id: Optional[int] = None
+    new_status: Optional[str] = None
+
+
+class RuleSimulationRequest(BaseModel):
+    trigger: str
+    context: Optional[RuleSimulationContext] = None
+    sample: Optional[int] = Field(None, ge=1, le=100)  # replay the N most recent real operations
+    rule_ids: Optional[List[int]] = None  # simulate these rules instead of the event's linked ones
+    checks: Optional[List[CheckDefinition]] = None  # unsaved checks, simulated as an extra "draft" rule
+
+    @model_validator(mode="after")
+    def validate_context_source(self) -> "RuleSimulationRequest":
+        if (self.context is None) == (self.sample is None):
+            raise ValueError("Provide exactly one of context or sample")
+        return self
+
+
+class RuleSimulationWrite(BaseModel):
+    statement: str  # INSERT | UPDATE | DELETE
+    table: str
+    rows: int
+
+
+class RuleSimulationCheck(BaseModel):
+    rule_id: Optional[int] = None  # None for draft checks
+    rule_name: str
+    phase: str
+    condition: Optional[str] = None
+    action: Optional[str] = None
+    message: Optional[str] = None
+    outcome: str  # pre: pass | deny | warn | flag | error; post: ok | skip | pass | error
+    elapsed_ms: float
+    statements: int
+    writes: List[RuleSimulationWrite] = []
+    error: Optional[str] = None
+
+
+class RuleSimulationRun(BaseModel):
+    context: dict[str, Any]
+    outcome: str  # allow | deny
+    message: Optional[str] = None
+    elapsed_ms: float
+    statements: int
+    checks: List[RuleSimulationCheck]
+
+
+class RuleSimulationResponse(BaseModel):
+    event_id: int
+    trigger: str
+    runs: List[RuleSimulationRun]
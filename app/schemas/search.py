@@ -0,0 +1,19 @@
+"""Search result schemas"""
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    type: Literal["post", "event", "user"]
+    id: int
+    title: str
+    subtitle: Optional[str] = None
+    score: float  # bm25 rank, lower is better
+
+
+class PaginatedSearchResults(BaseModel):
+    items: List[SearchResult]
+    total: int
+    skip: int
+    limit: int
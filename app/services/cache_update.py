@@ -1,7 +1,14 @@
 """Cache update functions for denormalized counts"""
+from typing import Optional, Sequence
+
+from sqlalchemy import and_, func, select, update
 from sqlalchemy.orm import Session
 
 from app import crud
+from app.database import commit_or_flush
+from app.models.interaction import Interaction
+from app.models.post import Post
+from app.models.target_interaction import TargetInteraction
 from app.models.user import User
 from app.models.event import Event
 
@@ -22,7 +29,7 @@ def update_user_follow_cache(db: Session, user_id: int) -> None:
     user.following_count = crud.user_users.count_following(db, user_id=user_id)
 
     db.add(user)
-    db.commit()
+    commit_or_flush(db)
 
 
 def update_event_participant_cache(db: Session, event_id: int) -> None:
@@ -38,4 +45,73 @@ def update_event_participant_cache(db: Session, event_id: int) -> None:
     event.participant_count = crud.event_groups.count_by_category(db, event_id=event_id)
 
     db.add(event)
-    db.commit()
+    commit_or_flush(db)
+
+
+def adjust_post_counters(db: Session, post_id: int, *, likes: int = 0, comments: int = 0) -> None:
+    """Add ``likes`` / ``comments`` (negative to subtract) to a post's like_count / comment_count.
+
+    Called in the same transaction as the interaction write. The counters change in one
+    UPDATE posts SET like_count = like_count + :n, so parallel likes can't overwrite each
+    other's increment the way a recount-and-assign can; recount_post_counters repairs drift.
+    """
+    values = {}
+    if likes:
+        values["like_count"] = Post.like_count + likes
+    if comments:
+        values["comment_count"] = Post.comment_count + comments
+    if not values:
+        return
+    db.execute(
+        update(Post).where(Post.id == post_id).values(**values).execution_options(synchronize_session="fetch")
+    )
+    commit_or_flush(db)
+
+
+def update_post_rating_cache(db: Session, post_id: int) -> None:
+    """Recalculate a post's average_rating from its rating interactions.
+
+    Each rating's score is the mean of its dimensions; ratings without a dict value are skipped.
+    """
+    post = db.query(Post).filter(Post.id == post_id).first()
+    if not post:
+        return
+    ratings = db.scalars(select(Interaction.value).join(
+        TargetInteraction, TargetInteraction.interaction_id == Interaction.id,
+    ).where(
+        TargetInteraction.target_type == "post",
+        TargetInteraction.target_id == post_id,
+        Interaction.type == "rating",
+        Interaction.deleted_at.is_(None),
+    ))
+    scores = [sum(value.values()) / len(value) for value in ratings if value and isinstance(value, dict)]
+    post.average_rating = round(sum(scores) / len(scores), 2) if scores else None
+    commit_or_flush(db)
+
+
+def _interaction_count(interaction_type: str):
+    """Correlated COUNT of a post's live interactions of one type."""
+    return select(func.count(TargetInteraction.id)).join(
+        Interaction, and_(Interaction.id == TargetInteraction.interaction_id, Interaction.deleted_at.is_(None)),
+    ).where(
+        TargetInteraction.target_type == "post",
+        TargetInteraction.target_id == Post.id,
+        Interaction.type == interaction_type,
+    ).scalar_subquery()
+
+
+def recount_post_counters(db: Session, post_ids: Optional[Sequence[int]] = None) -> int:
+    """Repair like_count / comment_count by recounting the bindings (all posts by default).
+
+    Not part of the like/comment flows, which use adjust_post_counters; one UPDATE with
+    correlated COUNTs fixes counters that drifted (e.g. after manual edits). Returns the
+    number of posts recounted.
+    """
+    statement = update(Post).values(
+        like_count=_interaction_count("like"), comment_count=_interaction_count("comment"),
+    )
+    if post_ids is not None:
+        statement = statement.where(Post.id.in_(post_ids))
+    count = db.execute(statement.execution_options(synchronize_session="fetch")).rowcount
+    commit_or_flush(db)
+    return count
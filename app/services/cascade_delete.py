@@ -3,11 +3,14 @@
 Each function handles the cascade chain for a specific content type.
 Relationship records are hard-deleted; content types are soft-deleted.
 """
+from collections import Counter
+
 from sqlalchemy.orm import Session
 
 from app import crud
+from app.database import commit_or_flush
 from app.models.interaction import Interaction
-from app.models.post import Post
+from app.services.cache_update import adjust_post_counters, update_post_rating_cache
 
 
 def _hard_delete_interactions(db: Session, interaction_ids: list[int]):
@@ -16,7 +19,7 @@ def _hard_delete_interactions(db: Session, interaction_ids: list[int]):
         obj = db.query(Interaction).filter(Interaction.id == iid).first()
         if obj:
             db.delete(obj)
-    db.commit()
+    commit_or_flush(db)
 
 
 def _cascade_delete_interactions_for_target(db: Session, target_type: str, target_id: int):
@@ -27,34 +30,20 @@ def _cascade_delete_interactions_for_target(db: Session, target_type: str, targe
     _hard_delete_interactions(db, interaction_ids)
 
 
-def _update_post_cache(db: Session, post_id: int):
-    """Recalculate post cache counters."""
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        return
-    post.like_count = crud.target_interactions.count_by_target_and_type(
-        db, target_type="post", target_id=post_id, interaction_type="like",
-    )
-    post.comment_count = crud.target_interactions.count_by_target_and_type(
-        db, target_type="post", target_id=post_id, interaction_type="comment",
-    )
-    rating_tis = crud.target_interactions.get_multi_by_target(
-        db, target_type="post", target_id=post_id, interaction_type="rating",
-    )
-    if rating_tis:
-        total = 0.0
-        count = 0
-        for ti in rating_tis:
-            interaction = crud.interactions.get(db, id=ti.interaction_id)
-            if interaction and interaction.value and isinstance(interaction.value, dict):
-                scores = list(interaction.value.values())
-                if scores:
-                    total += sum(scores) / len(scores)
-                    count += 1
-        post.average_rating = round(total / count, 2) if count > 0 else None
-    else:
-        post.average_rating = None
-    db.commit()
+def _update_post_caches(db: Session, removed: list[tuple[int, str]]):
+    """Subtract removed (post_id, interaction type) likes/comments from the post counters.
+
+    Posts that lost a rating get their average_rating recalculated.
+    """
+    removed_counts = Counter(removed)
+    for post_id in sorted({post_id for post_id, _ in removed}):
+        adjust_post_counters(
+            db, post_id,
+            likes=-removed_counts[(post_id, "like")],
+            comments=-removed_counts[(post_id, "comment")],
+        )
+        if removed_counts[(post_id, "rating")]:
+            update_post_rating_cache(db, post_id)
 
 
 def cascade_delete_event(db: Session, event_id: int):
@@ -91,20 +80,19 @@ def cascade_delete_user(db: Session, user_id: int):
         Interaction.deleted_at.is_(None),
     ).all()
 
-    affected_post_ids = set()
+    removed = []
     for interaction in interactions:
         # Find target_interaction bindings for this interaction
         tis = crud.target_interactions.get_all_by_interaction(db, interaction_id=interaction.id)
         for ti in tis:
             if ti.target_type == "post":
-                affected_post_ids.add(ti.target_id)
+                removed.append((ti.target_id, interaction.type))
         crud.target_interactions.remove_all_by_interaction(db, interaction_id=interaction.id)
         db.delete(interaction)
-    db.commit()
+    commit_or_flush(db)
 
     # Update caches on affected posts
-    for post_id in affected_post_ids:
-        _update_post_cache(db, post_id)
+    _update_post_caches(db, removed)
 
     crud.members.remove_all_by_user(db, user_id=user_id)
     crud.user_users.remove_all_for_user(db, user_id=user_id)
@@ -166,25 +154,26 @@ def cascade_delete_interaction(db: Session, interaction_id: int):
     # Collect all interaction IDs to delete (recursive for comments)
     ids_to_delete = _collect_interaction_tree(db, interaction_id)
 
+    objs = db.query(Interaction).filter(Interaction.id.in_(ids_to_delete)).all()
+    # Only live interactions are counted in the post caches
+    types = {obj.id: obj.type for obj in objs if obj.deleted_at is None}
+
     # Find affected posts for cache update
-    affected_post_ids = set()
+    removed = []
     for iid in ids_to_delete:
         tis = crud.target_interactions.get_all_by_interaction(db, interaction_id=iid)
         for ti in tis:
-            if ti.target_type == "post":
-                affected_post_ids.add(ti.target_id)
+            if ti.target_type == "post" and iid in types:
+                removed.append((ti.target_id, types[iid]))
         crud.target_interactions.remove_all_by_interaction(db, interaction_id=iid)
 
     # Hard-delete all interactions in the tree
-    for iid in ids_to_delete:
-        obj = db.query(Interaction).filter(Interaction.id == iid).first()
-        if obj:
-            db.delete(obj)
-    db.commit()
+    for obj in objs:
+        db.delete(obj)
+    commit_or_flush(db)
 
     # Update caches
-    for post_id in affected_post_ids:
-        _update_post_cache(db, post_id)
+    _update_post_caches(db, removed)
 
 
 def _collect_interaction_tree(db: Session, interaction_id: int) -> list[int]:
@@ -23,6 +23,7 @@ from sqlalchemy.orm import Session
 
 from app import crud
 from app.crud.notifications import notifications as notification_crud
+from app.models.user import User
 
 
 def notify_follow(db: Session, *, follower_id: int, followed_id: int) -> None:
@@ -133,27 +134,26 @@ def notify_mentions(
     if not mentioner:
         return []
 
-    notified_ids = []
-    for username in usernames:
-        mentioned_user = crud.users.get_by_username(db, username=username)
-        if not mentioned_user:
-            continue
-
-        # Don't notify if user mentions themselves
-        if mentioned_user.id == mentioner_id:
-            continue
-
-        notification_crud.create(
-            db,
-            user_id=mentioned_user.id,
-            type="mention",
-            title="有人提到了你",
-            content=f"{mentioner.username} 在评论中提到了你",
-            related_url=related_url,
-            actor_id=mentioner_id,
-        )
-        notified_ids.append(mentioned_user.id)
-
+    # One lookup and one multi-row insert for the whole fan-out
+    found = dict(db.query(User.username, User.id).filter(
+        User.username.in_(usernames),
+        User.deleted_at.is_(None),
+    ).all())
+    # Don't notify if user mentions themselves
+    notified_ids = [found[name] for name in usernames if name in found and found[name] != mentioner_id]
+
+    notification_crud.create_many(db, rows=[
+        {
+            "user_id": user_id,
+            "type": "mention",
+            "title": "有人提到了你",
+            "content": f"{mentioner.username} 在评论中提到了你",
+            "related_url": related_url,
+            "actor_id": mentioner_id,
+            "is_read": False,
+        }
+        for user_id in notified_ids
+    ])
     return notified_ids
 
 
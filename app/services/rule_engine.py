@@ -8,12 +8,31 @@ The engine supports:
 - on_fail behavior: deny (raise), warn (return warning), flag (tag target).
 - post-phase actions: compute_ranking, flag_disqualified, award_certificate.
 """
+import operator
+import time
+from collections import namedtuple
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Sequence
 
+from sqlalchemy import and_, case, exists, func, not_
+from sqlalchemy import event as sa_event
 from sqlalchemy.orm import Session
 
 from app import crud
+from app.core.config import settings
+from app.database import UNIT_OF_WORK, unit_of_work
+from app.models.event_group import EventGroup
+from app.models.event_post import EventPost
+from app.models.member import Member
+from app.models.post import Post
+from app.models.post_post import PostPost
+from app.models.post_resource import PostResource
+from app.models.post_tag import PostTag
+from app.models.resource import Resource
+from app.models.rule import Rule
+from app.services.rule_metrics import measure
 
 
 class RuleCheckError(Exception):
@@ -24,6 +43,21 @@ class RuleCheckError(Exception):
         super().__init__(message)
 
 
+class RuleBatchCheckError(RuleCheckError):
+    """Raised by run_pre_checks_batch when deny checks fail on one or more events.
+
+    ``failures`` maps each failing event to its RuleCheckError; the message is that
+    error's message for a single event, otherwise one "Event <id>: ..." part per event.
+    """
+    def __init__(self, failures: dict[int, RuleCheckError]):
+        self.failures = failures
+        first = next(iter(failures.values()))
+        message = first.message if len(failures) == 1 else "; ".join(
+            f"Event {event_id}: {error.message}" for event_id, error in failures.items()
+        )
+        super().__init__(message=message, rule_name=first.rule_name)
+
+
 class RuleCheckWarning:
     """Returned when a check with on_fail=warn fails."""
     def __init__(self, message: str, rule_name: str = ""):
@@ -123,36 +157,254 @@ def _expand_fixed_fields(rule) -> list[dict]:
     return expanded
 
 
-def _get_checks_for_trigger(rule, trigger: str, phase: str) -> list[dict]:
-    """Get all checks (expanded + custom) for a given trigger and phase."""
-    expanded = _expand_fixed_fields(rule)
+@dataclass(frozen=True)
+class CompiledCheck:
+    """One check of a compiled rule plan; condition params are read-only."""
+    condition: Optional[Mapping[str, Any]]
+    on_fail: str
+    message: Optional[str]
+    action: Optional[str] = None
+    action_params: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    cost: int = 0
+    memo_key: Optional[tuple] = None
+
+
+# Detached, read-only copy of a Rule row; evaluators and actions read it as context["rule"]
+RuleSnapshot = namedtuple("RuleSnapshot", [column.key for column in Rule.__table__.columns])
+
+
+@dataclass(frozen=True)
+class RulePlan:
+    """A rule's checks (expanded + custom) indexed by (trigger, phase)."""
+    rule_id: int
+    version: Optional[datetime]
+    rule: RuleSnapshot
+    checks: Mapping[tuple[str, str], tuple[CompiledCheck, ...]]
+
+    def for_trigger(self, trigger: str, phase: str) -> tuple[CompiledCheck, ...]:
+        return self.checks.get((trigger, phase), ())
+
+
+# rule_id -> plan; a plan is reused while rule.updated_at matches its version.
+# CRUDRule.update/remove also drop entries, since SQLite timestamps are only
+# second-resolution.
+_plan_cache: dict[int, RulePlan] = {}
+
+# event_id -> (loaded_at, plans in priority order). Dropped by the event_rules
+# and rules CRUD writes; settings.rule_cache_ttl bounds staleness across workers.
+_event_cache: dict[int, tuple[float, tuple[RulePlan, ...]]] = {}
+
+
+def _parse_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _compile_condition(rule, condition: Optional[dict]) -> Optional[Mapping[str, Any]]:
+    """Freeze a condition, pre-parsing time_window bounds and $rule.<field> values."""
+    if not condition:
+        return None
+    params = dict(condition.get("params") or {})
+    if condition.get("type") == "time_window":
+        for key in ("start", "end"):
+            if params.get(key) is not None:
+                params[key] = _parse_datetime(params[key])
+    value = params.get("value")
+    if isinstance(value, str) and value.startswith("$rule."):
+        params["value"] = getattr(rule, value[len("$rule."):], 0) or 0
+    return MappingProxyType({**condition, "params": MappingProxyType(params)})
+
+
+# Estimated evaluation cost by condition type; run_pre_checks evaluates cheap checks first.
+# 0: in memory, 1: primary-key lookup, 2: indexed COUNT/EXISTS scoped to a user, group
+# or post, 4: aggregate over an event's groups. Unknown types pass without evaluation.
+_CONDITION_COSTS = {
+    "time_window": 0,
+    "field_match": 1,
+    "count": 2,
+    "exists": 2,
+    "resource_format": 2,
+    "resource_required": 2,
+    "aggregate": 4,
+}
+
+
+def _condition_cost(condition: Optional[Mapping[str, Any]]) -> int:
+    """Estimated cost of evaluating a condition (see _CONDITION_COSTS)."""
+    if condition is None:
+        return 0
+    ctype = condition.get("type")
+    cost = _CONDITION_COSTS.get(ctype, 0)
+    if ctype == "count" and not (condition.get("params") or {}).get("scope"):
+        cost += 1  # counts all of an event's relations
+    return cost
+
+
+# Context keys read by each condition type, beyond those of its count/exists lookup
+# (_LOOKUP_CONTEXT_KEYS). Conditions of other types aren't memoized: time_window
+# depends on the clock and evaluates in memory anyway.
+_CONDITION_CONTEXT_KEYS = {
+    "field_match": {"event": ("event_id",), "post": ("post_id",), "group": ("group_id",)},
+    "resource_format": ("post_id",),
+    "resource_required": ("post_id",),
+    "aggregate": ("event_id",),
+}
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _condition_memo_key(condition: Optional[Mapping[str, Any]]) -> Optional[tuple]:
+    """(normalized condition, context keys it reads), or None if it isn't memoized."""
+    if condition is None:
+        return None
+    ctype = condition.get("type")
+    entity = (condition.get("params") or {}).get("entity", "")
+    if ctype in ("count", "exists"):
+        context_keys = _LOOKUP_CONTEXT_KEYS.get((ctype, entity))
+    elif ctype == "field_match":
+        context_keys = _CONDITION_CONTEXT_KEYS[ctype].get(entity)
+    else:
+        context_keys = _CONDITION_CONTEXT_KEYS.get(ctype)
+    if context_keys is None:
+        return None
+    return _freeze(condition), context_keys
+
+
+def compile_rule(rule) -> RulePlan:
+    """Compile a rule's fixed fields and custom checks into an immutable plan."""
+    custom_checks = rule.checks if isinstance(rule.checks, list) else []  # ignore invalid format
+    indexed: dict[tuple[str, str], list[CompiledCheck]] = {}
+    for check in _expand_fixed_fields(rule) + custom_checks:
+        if not isinstance(check, dict):
+            continue
+        condition = _compile_condition(rule, check.get("condition"))
+        compiled = CompiledCheck(
+            condition=condition,
+            on_fail=check.get("on_fail", "deny"),
+            message=check.get("message"),
+            action=check.get("action"),
+            action_params=MappingProxyType(dict(check.get("action_params") or {})),
+            cost=_condition_cost(condition),
+            memo_key=_condition_memo_key(condition),
+        )
+        indexed.setdefault((check.get("trigger"), check.get("phase")), []).append(compiled)
+    return RulePlan(
+        rule_id=rule.id,
+        version=rule.updated_at,
+        rule=RuleSnapshot(*(getattr(rule, key) for key in RuleSnapshot._fields)),
+        checks=MappingProxyType({key: tuple(checks) for key, checks in indexed.items()}),
+    )
+
+
+def get_rule_plan(rule) -> RulePlan:
+    """Return the cached plan for rule, compiling it if missing or stale."""
+    plan = _plan_cache.get(rule.id)
+    if plan is None or plan.version != rule.updated_at:
+        plan = _plan_cache[rule.id] = compile_rule(rule)
+    return plan
+
 
-    custom_checks = []
-    if rule.checks:
-        raw = rule.checks
-        if isinstance(raw, list):
-            custom_checks = raw
-        # Otherwise ignore (invalid format)
+def get_event_rule_plans(db: Session, event_id: int) -> tuple[RulePlan, ...]:
+    """Plans for an event's live rules in priority order, loaded with one query."""
+    cached = _event_cache.get(event_id)
+    if cached is not None and time.monotonic() - cached[0] < settings.rule_cache_ttl:
+        return cached[1]
+    plans = tuple(
+        get_rule_plan(rule)
+        for rule in crud.event_rules.get_rules_by_category(db, event_id=event_id)
+    )
+    if settings.rule_cache_ttl > 0:
+        _event_cache[event_id] = (time.monotonic(), plans)
+    return plans
+
+
+def get_events_rule_plans(db: Session, event_ids: Sequence[int]) -> dict[int, tuple[RulePlan, ...]]:
+    """get_event_rule_plans() for several events; the rule sets not cached are loaded in one query."""
+    now = time.monotonic()
+    result, missing = {}, []
+    for event_id in event_ids:
+        cached = _event_cache.get(event_id)
+        if cached is not None and now - cached[0] < settings.rule_cache_ttl:
+            result[event_id] = cached[1]
+        else:
+            missing.append(event_id)
+    if missing:
+        rules = crud.event_rules.get_rules_by_categories(db, event_ids=missing)
+        for event_id in missing:
+            plans = result[event_id] = tuple(get_rule_plan(rule) for rule in rules.get(event_id, ()))
+            if settings.rule_cache_ttl > 0:
+                _event_cache[event_id] = (now, plans)
+    return result
+
+
+def _invalidate_again_at_end(db: Optional[Session], invalidate, key: Optional[int]) -> None:
+    """Repeat ``invalidate(key)`` when db's open transaction commits or rolls back.
+
+    Inside a request unit of work the change is only flushed: until the commit, another
+    request can still load (and cache) the old rule set, and this one may cache its own
+    uncommitted state.
+    """
+    if db is None or not db.in_transaction():
+        return
+    for name in ("after_commit", "after_rollback"):
+        sa_event.listen(db, name, lambda session: invalidate(key), once=True)
 
-    all_checks = expanded + custom_checks
 
-    return [
-        c for c in all_checks
-        if c.get("trigger") == trigger and c.get("phase") == phase
-    ]
+def invalidate_event_rules(event_id: Optional[int] = None, *, db: Optional[Session] = None) -> None:
+    """Drop the cached rule set of event_id, or of every event when event_id is None.
 
+    Pass the writing session as ``db`` to drop it again once its transaction ends.
+    """
+    if event_id is None:
+        _event_cache.clear()
+    else:
+        _event_cache.pop(event_id, None)
+    _invalidate_again_at_end(db, invalidate_event_rules, event_id)
 
-def _evaluate_condition(db: Session, condition: dict, context: dict) -> bool:
-    """Evaluate a single condition. Returns True if condition passes."""
+
+def invalidate_rule_plan(rule_id: Optional[int] = None, *, db: Optional[Session] = None) -> None:
+    """Drop the cached plan for rule_id and every event rule set containing it.
+
+    With rule_id None, all plans and event rule sets are dropped. Pass the writing
+    session as ``db`` to drop them again once its transaction ends.
+    """
+    _invalidate_again_at_end(db, invalidate_rule_plan, rule_id)
+    if rule_id is None:
+        _plan_cache.clear()
+        _event_cache.clear()
+        return
+    _plan_cache.pop(rule_id, None)
+    for event_id, (_, plans) in list(_event_cache.items()):
+        if any(plan.rule_id == rule_id for plan in plans):
+            _event_cache.pop(event_id, None)
+
+
+def _evaluate_condition(
+    db: Session, condition: Mapping[str, Any], context: dict, lookups: Optional[dict] = None,
+) -> bool:
+    """Evaluate a single condition. Returns True if condition passes.
+
+    With ``lookups``, count/exists queries are shared with other evaluations using the
+    same dict (see _shared_lookup).
+    """
     ctype = condition.get("type")
     params = condition.get("params", {})
 
     if ctype == "time_window":
         return _eval_time_window(params)
     elif ctype == "count":
-        return _eval_count(db, params, context)
+        return _eval_count(db, params, context, lookups)
     elif ctype == "exists":
-        return _eval_exists(db, params, context)
+        return _eval_exists(db, params, context, lookups)
     elif ctype == "field_match":
         return _eval_field_match(db, params, context)
     elif ctype == "resource_format":
@@ -166,52 +418,34 @@ def _evaluate_condition(db: Session, condition: dict, context: dict) -> bool:
         return True
 
 
-def _eval_time_window(params: dict) -> bool:
-    """Check if current time is within [start, end]."""
+def _eval_time_window(params: Mapping[str, Any]) -> bool:
+    """Check if current time is within [start, end] (bounds pre-parsed by compile_rule)."""
     now = datetime.now(timezone.utc)
-    start = params.get("start")
-    end = params.get("end")
+    start = _parse_datetime(params.get("start"))
+    end = _parse_datetime(params.get("end"))
 
-    if start is not None:
-        if isinstance(start, str):
-            start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
-        else:
-            start_dt = start
-        if start_dt.tzinfo is None:
-            start_dt = start_dt.replace(tzinfo=timezone.utc)
-        if now < start_dt:
-            return False
+    if start is not None and now < start:
+        return False
+    if end is not None and now > end:
+        return False
+    return True
 
-    if end is not None:
-        if isinstance(end, str):
-            end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
-        else:
-            end_dt = end
-        if end_dt.tzinfo is None:
-            end_dt = end_dt.replace(tzinfo=timezone.utc)
-        if now > end_dt:
-            return False
 
-    return True
+def _eval_count(
+    db: Session, params: Mapping[str, Any], context: dict, lookups: Optional[dict] = None,
+) -> bool:
+    """Evaluate count condition on a relationship entity (one COUNT query)."""
+    op = params.get("op", ">=")
+    value = _resolve_rule_ref(params.get("value", 0), context, default=0)
+    actual = _shared_lookup(lookups, "count", params, context, lambda: _count_actual(db, params, context))
+    return _compare(actual, op, value)
 
 
-def _eval_count(db: Session, params: dict, context: dict) -> bool:
-    """Evaluate count condition on a relationship entity."""
+def _count_actual(db: Session, params: Mapping[str, Any], context: dict) -> int:
     entity = params.get("entity", "")
     scope = params.get("scope", "")
-    op = params.get("op", ">=")
-    value = params.get("value", 0)
     filt = params.get("filter", {})
 
-    # Resolve $rule.<field> references in value
-    if isinstance(value, str) and value.startswith("$rule."):
-        field_name = value[len("$rule."):]
-        rule_obj = context.get("rule")
-        if rule_obj:
-            value = getattr(rule_obj, field_name, 0) or 0
-        else:
-            value = 0
-
     actual = 0
 
     if entity == "event_post":
@@ -222,11 +456,9 @@ def _eval_count(db: Session, params: dict, context: dict) -> bool:
                 db, event_id=event_id, user_id=user_id,
             )
         elif event_id:
-            rels = crud.event_posts.get_multi_by_category(
-                db, event_id=event_id,
-                relation_type=filt.get("relation_type"),
+            actual = crud.event_posts.count_by_category(
+                db, event_id=event_id, relation_type=filt.get("relation_type"),
             )
-            actual = len(rels)
 
     elif entity == "group_user":
         group_id = context.get("group_id")
@@ -234,84 +466,144 @@ def _eval_count(db: Session, params: dict, context: dict) -> bool:
             status_filter = filt.get("status")
             actual = crud.members.count_by_group(db, group_id=group_id, status=status_filter)
 
-    return _compare(actual, op, value)
+    return actual
+
+
+def _eval_exists(
+    db: Session, params: Mapping[str, Any], context: dict, lookups: Optional[dict] = None,
+) -> bool:
+    """Check if an entity exists (or doesn't exist if require=false) with one EXISTS query."""
+    require = params.get("require", True)
+    found = _shared_lookup(lookups, "exists", params, context, lambda: _exists_found(db, params, context))
+    return found if require else not found
 
 
-def _eval_exists(db: Session, params: dict, context: dict) -> bool:
-    """Check if an entity exists (or doesn't exist if require=false)."""
+def _exists_found(db: Session, params: Mapping[str, Any], context: dict) -> bool:
     entity = params.get("entity", "")
     scope = params.get("scope", "")
-    require = params.get("require", True)
     filt = params.get("filter", {})
 
-    found = False
+    query = None
+    user_id = context.get("user_id")
+    event_id = context.get("event_id")
 
     if entity == "post_resource":
         post_id = context.get("post_id")
         if post_id and scope == "post":
-            rels = crud.post_resources.get_multi_by_post(db, post_id=post_id)
-            found = len(rels) > 0
+            query = db.query(PostResource.id).filter(PostResource.post_id == post_id)
 
     elif entity == "event_post":
-        user_id = context.get("user_id")
-        event_id = context.get("event_id")
         if user_id and event_id:
-            relation_type = filt.get("relation_type")
-            rels = crud.event_posts.get_multi_by_category(
-                db, event_id=event_id, relation_type=relation_type,
+            # Driven from the user's posts, probing uq_category_post per post, rather than
+            # walking every relation of a large event
+            linked = exists().where(EventPost.post_id == Post.id, EventPost.event_id == event_id)
+            if filt.get("relation_type"):
+                linked = linked.where(EventPost.relation_type == filt["relation_type"])
+            query = db.query(Post.id).filter(
+                Post.created_by == user_id,
+                Post.deleted_at.is_(None),
+                linked,
             )
-            # Filter by user
-            for rel in rels:
-                post = crud.posts.get(db, id=rel.post_id)
-                if post and post.created_by == user_id:
-                    found = True
-                    break
 
     elif entity == "event_group":
-        event_id = context.get("event_id")
         if event_id:
-            rels = crud.event_groups.get_multi_by_category(db, event_id=event_id)
+            query = db.query(EventGroup.id).filter(EventGroup.event_id == event_id)
             if scope == "user_group":
-                user_id = context.get("user_id")
-                if user_id:
-                    for rel in rels:
-                        member = crud.members.get_by_group_and_user(db, group_id=rel.group_id, user_id=user_id)
-                        if member:
-                            found = True
-                            break
-            else:
-                found = len(rels) > 0
+                query = query.join(Member, Member.group_id == EventGroup.group_id).filter(
+                    Member.user_id == user_id,
+                ) if user_id else None
 
     elif entity == "group_user":
-        user_id = context.get("user_id")
         if user_id:
-            # Check if user is in any accepted group
-            from app.models.member import Member
-            status_filter = filt.get("status", "accepted")
-            members = db.query(Member).filter(
+            query = db.query(Member.id).filter(
                 Member.user_id == user_id,
-                Member.status == status_filter,
-            ).all()
-            found = len(members) > 0
+                Member.status == filt.get("status", "accepted"),
+            )
 
     elif entity == "post":
-        user_id = context.get("user_id")
         if user_id and scope == "user":
-            from app.models.post import Post
-            q = db.query(Post).filter(
+            query = db.query(Post.id).filter(
                 Post.created_by == user_id,
                 Post.deleted_at.is_(None),
             )
             if "type" in filt:
-                q = q.filter(Post.type == filt["type"])
+                query = query.filter(Post.type == filt["type"])
             if "status" in filt:
-                q = q.filter(Post.status == filt["status"])
-            found = q.first() is not None
+                query = query.filter(Post.status == filt["status"])
+
+    return query is not None and db.query(query.exists()).scalar()
+
+
+# Context keys read by each count/exists lookup; lookups of other entities aren't shared
+_LOOKUP_CONTEXT_KEYS = {
+    ("count", "event_post"): ("event_id", "user_id"),
+    ("count", "group_user"): ("group_id",),
+    ("exists", "post_resource"): ("post_id",),
+    ("exists", "event_post"): ("event_id", "user_id"),
+    ("exists", "event_group"): ("event_id", "user_id"),
+    ("exists", "group_user"): ("user_id",),
+    ("exists", "post"): ("user_id",),
+}
+
+
+def _shared_lookup(lookups: Optional[dict], ctype: str, params: Mapping[str, Any], context: dict, load):
+    """Return load(), running it once per ``lookups`` dict for the same query.
+
+    The key is the query's entity, scope and filter plus only the context values it
+    reads, so a group's member count is shared by checks of different events and
+    different thresholds.
+    """
+    context_keys = _LOOKUP_CONTEXT_KEYS.get((ctype, params.get("entity", "")))
+    if lookups is None or context_keys is None:
+        return load()
+    key = (
+        ctype, params.get("entity"), params.get("scope", ""),
+        repr(sorted((params.get("filter") or {}).items())),
+        tuple(context.get(name) for name in context_keys),
+    )
+    if key not in lookups:
+        lookups[key] = load()
+    return lookups[key]
+
+
+# Session.info key of the request's memo: condition results (by CompiledCheck.memo_key)
+# and count/exists lookups, shared by run_pre_checks and run_post_hooks
+RULE_MEMO = "rule_memo"
+
+
+def _request_memo(db: Session) -> Optional[dict]:
+    """The session's memo, or None outside a request unit of work (see get_db)."""
+    if not db.info.get(UNIT_OF_WORK):
+        return None
+    return db.info.setdefault(RULE_MEMO, {})
+
+
+def _forget(session: Session, *args) -> None:
+    session.info.pop(RULE_MEMO, None)
+
+
+# Any write on the session drops the memo: flushes, INSERT/UPDATE/DELETE statements
+# run through it (bulk crud helpers) and the end of its transaction
+sa_event.listen(Session, "after_flush", _forget)
+sa_event.listen(Session, "after_commit", _forget)
+sa_event.listen(Session, "after_rollback", _forget)
+
+
+@sa_event.listens_for(Session, "do_orm_execute")
+def _forget_on_write(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _forget(orm_execute_state.session)
 
-    if require:
-        return found
-    else:
-        return not found
+
+def _evaluate_check(db: Session, check: CompiledCheck, context: dict, memo: Optional[dict]) -> bool:
+    """Evaluate a check's condition, reusing its result from ``memo`` for the same context."""
+    if memo is None or check.memo_key is None:
+        return _evaluate_condition(db, check.condition, context, memo)
+    condition_key, context_keys = check.memo_key
+    key = ("condition", condition_key, tuple(context.get(name) for name in context_keys))
+    if key not in memo:
+        memo[key] = _evaluate_condition(db, check.condition, context, memo)
+    return memo[key]
 
 
 def _eval_field_match(db: Session, params: dict, context: dict) -> bool:
@@ -343,7 +635,20 @@ def _eval_field_match(db: Session, params: dict, context: dict) -> bool:
     return _compare_field(actual, op, value)
 
 
-def _eval_resource_format(db: Session, params: dict, context: dict) -> bool:
+def _resource_counts(db: Session, post_id: int, formats: Sequence[str]) -> tuple[int, int, int]:
+    """(links, live resources, live resources in formats) of a post, in one COUNT query."""
+    allowed = [str(f).lower() for f in formats]  # as stored in Resource.extension
+    links, live, matching = db.query(
+        func.count(PostResource.id),
+        func.count(Resource.id),
+        func.count(case((Resource.extension.in_(allowed), Resource.id))),
+    ).select_from(PostResource).outerjoin(
+        Resource, and_(Resource.id == PostResource.resource_id, Resource.deleted_at.is_(None)),
+    ).filter(PostResource.post_id == post_id).one()
+    return links, live, matching
+
+
+def _eval_resource_format(db: Session, params: Mapping[str, Any], context: dict) -> bool:
     """Check that post resources match allowed formats."""
     formats = params.get("formats", [])
     require_any = params.get("require_any", False)
@@ -351,27 +656,15 @@ def _eval_resource_format(db: Session, params: dict, context: dict) -> bool:
     if not post_id or not formats:
         return True
 
-    rels = crud.post_resources.get_multi_by_post(db, post_id=post_id)
-    if not rels:
+    links, live, matching = _resource_counts(db, post_id, formats)
+    if not links:
         return True  # No resources to check
-
-    for rel in rels:
-        resource = crud.resources.get(db, id=rel.resource_id)
-        if resource:
-            ext = _get_extension(resource.filename) if resource.filename else ""
-            if require_any:
-                if ext.lower() in [f.lower() for f in formats]:
-                    return True
-            else:
-                if ext.lower() not in [f.lower() for f in formats]:
-                    return False
-
     if require_any:
-        return False  # None matched
-    return True  # All matched
+        return matching > 0
+    return matching == live
 
 
-def _eval_resource_required(db: Session, params: dict, context: dict) -> bool:
+def _eval_resource_required(db: Session, params: Mapping[str, Any], context: dict) -> bool:
     """Check that post has required number of resources (optionally with format)."""
     min_count = params.get("min_count", 1)
     formats = params.get("formats")
@@ -379,52 +672,57 @@ def _eval_resource_required(db: Session, params: dict, context: dict) -> bool:
     if not post_id:
         return True
 
-    rels = crud.post_resources.get_multi_by_post(db, post_id=post_id)
     if formats:
-        count = 0
-        for rel in rels:
-            resource = crud.resources.get(db, id=rel.resource_id)
-            if resource:
-                ext = _get_extension(resource.filename) if resource.filename else ""
-                if ext.lower() in [f.lower() for f in formats]:
-                    count += 1
+        _, _, count = _resource_counts(db, post_id, formats)
         return count >= min_count
-    else:
-        return len(rels) >= min_count
+    count = db.query(func.count(PostResource.id)).filter(PostResource.post_id == post_id).scalar()
+    return count >= min_count
 
 
-def _eval_aggregate(db: Session, params: dict, context: dict) -> bool:
-    """Aggregate check across entities in a scope."""
-    entity = params.get("entity", "")
+def _eval_aggregate(db: Session, params: Mapping[str, Any], context: dict) -> bool:
+    """Aggregate check across entities in a scope (one GROUP BY ... HAVING query)."""
     scope = params.get("scope", "")
     filt = params.get("filter", {})
-    agg_func = params.get("agg_func", "count")
     op = params.get("op", ">=")
-    value = params.get("value", 0)
-
-    # Resolve $rule references
-    if isinstance(value, str) and value.startswith("$rule."):
-        field_name = value[len("$rule."):]
-        rule_obj = context.get("rule")
-        if rule_obj:
-            value = getattr(rule_obj, field_name, 0) or 0
+    value = _resolve_rule_ref(params.get("value", 0), context)
 
     if scope == "each_group_in_category":
         event_id = context.get("event_id")
-        if not event_id:
+        if not event_id or op not in _SQL_OPS:
             return True
-        # Get all groups registered to this event
-        cat_groups = crud.event_groups.get_multi_by_category(db, event_id=event_id)
-        for cg in cat_groups:
-            status_filter = filt.get("status")
-            count = crud.members.count_by_group(db, group_id=cg.group_id, status=status_filter)
-            if not _compare(count, op, value):
-                return False
-        return True
+        # Every registered group must satisfy COUNT(members) <op> value; look for one that doesn't
+        join_on = [Member.group_id == EventGroup.group_id]
+        if filt.get("status"):
+            join_on.append(Member.status == filt["status"])
+        member_count = func.count(Member.id)
+        failing = db.query(EventGroup.id).outerjoin(Member, and_(*join_on)).filter(
+            EventGroup.event_id == event_id,
+        ).group_by(EventGroup.id).having(not_(_SQL_OPS[op](member_count, value)))
+        return not db.query(failing.exists()).scalar()
 
     return True  # Unknown scope
 
 
+def _resolve_rule_ref(value: Any, context: dict, default: Any = None) -> Any:
+    """Resolve a "$rule.<field>" value left unresolved by compile_rule (no rule in context)."""
+    if isinstance(value, str) and value.startswith("$rule."):
+        rule_obj = context.get("rule")
+        if rule_obj:
+            return getattr(rule_obj, value[len("$rule."):], 0) or 0
+        return value if default is None else default
+    return value
+
+
+_SQL_OPS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    ">=": operator.ge,
+    ">": operator.gt,
+    "!=": operator.ne,
+}
+
+
 def _compare(actual: int, op: str, value: int) -> bool:
     """Compare actual vs value using operator string."""
     if op == "<":
@@ -460,14 +758,31 @@ def _compare_field(actual: Any, op: str, value: Any) -> bool:
     return True
 
 
-def _get_extension(filename: str) -> str:
-    """Extract file extension without dot."""
-    if "." in filename:
-        return filename.rsplit(".", 1)[-1]
-    return ""
+# --- Public API ---
+
+def order_pre_checks(
+    plans: tuple[RulePlan, ...],
+    trigger: str,
+    event_id: int,
+    context: dict,
+) -> list[tuple[int, CompiledCheck, RuleSnapshot, dict]]:
+    """The trigger's pre checks with a condition, in evaluation order.
 
+    Returns (declaration position, check, rule, evaluation context) tuples sorted by
+    check cost, then position.
+    """
+    pending = []
+    for plan in plans:
+        checks = plan.for_trigger(trigger, "pre")
+        if not checks:
+            continue
+        ctx = {**context, "rule": plan.rule, "event_id": event_id}
+        for check in checks:
+            if check.condition is not None:
+                pending.append((check.cost, len(pending), check, plan.rule, ctx))
+    pending.sort(key=lambda item: item[:2])
+    return [item[1:] for item in pending]
 
-# --- Public API ---
 
 def run_pre_checks(
     db: Session,
@@ -483,38 +798,82 @@ def run_pre_checks(
         event_id: The event to get rules from
         context: Dict with keys like user_id, post_id, group_id, etc.
 
+    Checks from all of the event's rules are evaluated cheapest first (CompiledCheck.cost),
+    so an in-memory time_window deny stops the run before any COUNT/EXISTS query. Checks
+    of equal cost keep declaration order (rule priority, then expanded before custom).
+    In a request, condition results are memoized on the session until its next write
+    (RULE_MEMO), so a condition several rules expand to runs its query once.
+
     Returns:
-        List of warnings (on_fail=warn). Raises RuleCheckError for on_fail=deny.
+        List of warnings (on_fail=warn/flag) in declaration order. Raises RuleCheckError
+        for the first failing on_fail=deny check.
     """
-    warnings = []
-    cat_rules = crud.event_rules.get_multi_by_category(db, event_id=event_id)
+    plans = get_event_rule_plans(db, event_id)
+    return _run_pre_checks(db, trigger, event_id, context, plans, _request_memo(db))
 
-    for cr in cat_rules:
-        rule = crud.rules.get(db, id=cr.rule_id)
-        if rule is None:
-            continue
 
-        ctx = {**context, "rule": rule, "event_id": event_id}
-        checks = _get_checks_for_trigger(rule, trigger, "pre")
+def run_pre_checks_batch(
+    db: Session,
+    trigger: str,
+    event_ids: Sequence[int],
+    context: dict,
+) -> dict[int, list[RuleCheckWarning]]:
+    """Run the pre-phase checks of one trigger on several events' rules.
 
-        for check in checks:
-            condition = check.get("condition")
-            if condition is None:
-                continue
+    For operations that concern every event a group is registered in (a member
+    joining the team). The rule sets are loaded together and the count/exists
+    lookups that depend only on the context, such as the group's member count, run
+    once for all events. Unlike calling run_pre_checks per event, every event is
+    checked before failing.
 
-            passed = _evaluate_condition(db, condition, ctx)
+    Returns:
+        Warnings per event. Raises RuleBatchCheckError listing every event with a
+        failing on_fail=deny check.
+    """
+    event_ids = list(dict.fromkeys(event_ids))
+    plans = get_events_rule_plans(db, event_ids)
+    lookups = _request_memo(db)
+    if lookups is None:
+        lookups = {}
+    warnings, failures = {}, {}
+    for event_id in event_ids:
+        try:
+            warnings[event_id] = _run_pre_checks(db, trigger, event_id, context, plans[event_id], lookups)
+        except RuleCheckError as e:
+            failures[event_id] = e
+    if failures:
+        raise RuleBatchCheckError(failures)
+    return warnings
+
+
+def _run_pre_checks(
+    db: Session,
+    trigger: str,
+    event_id: int,
+    context: dict,
+    plans: tuple[RulePlan, ...],
+    lookups: Optional[dict] = None,
+) -> list[RuleCheckWarning]:
+    warnings = []
+    for position, check, rule, ctx in order_pre_checks(plans, trigger, event_id, context):
+        condition = check.condition
+        with measure(rule, trigger, "condition", condition.get("type")) as measurement:
+            passed = _evaluate_check(db, check, ctx, lookups)
+            measurement.outcome = "pass" if passed else check.on_fail
             if not passed:
-                on_fail = check.get("on_fail", "deny")
-                message = check.get("message", "Rule check failed")
+                on_fail = check.on_fail
+                message = "Rule check failed" if check.message is None else check.message
                 if on_fail == "deny":
                     raise RuleCheckError(message=message, rule_name=rule.name)
                 elif on_fail == "warn":
-                    warnings.append(RuleCheckWarning(message=message, rule_name=rule.name))
+                    warnings.append((position, RuleCheckWarning(message=message, rule_name=rule.name)))
                 elif on_fail == "flag":
                     # Flag target (add tag to post/group) — simplified implementation
-                    warnings.append(RuleCheckWarning(message=f"[flagged] {message}", rule_name=rule.name))
+                    warning = RuleCheckWarning(message=f"[flagged] {message}", rule_name=rule.name)
+                    warnings.append((position, warning))
 
-    return warnings
+    warnings.sort(key=lambda item: item[0])
+    return [warning for _, warning in warnings]
 
 
 def run_post_hooks(
@@ -522,43 +881,54 @@ def run_post_hooks(
     trigger: str,
     event_id: int,
     context: dict,
+    *,
+    raise_errors: bool = False,
 ) -> list[str]:
     """Run all post-phase checks/actions for a trigger on a event's rules.
 
     Post hooks never block the operation. They execute actions when conditions are met.
+    Requests reach them through app.services.rule_jobs, normally as a queued job.
+    Conditions share the request memo of run_pre_checks; each action's writes drop it.
+
+    Args:
+        raise_errors: Propagate a failing action instead of logging it, so the job
+            worker can roll the run back and retry it.
 
     Returns:
         List of action log messages.
     """
     logs = []
-    cat_rules = crud.event_rules.get_multi_by_category(db, event_id=event_id)
-
-    for cr in cat_rules:
-        rule = crud.rules.get(db, id=cr.rule_id)
-        if rule is None:
+    memo = _request_memo(db)
+    for plan in get_event_rule_plans(db, event_id):
+        checks = plan.for_trigger(trigger, "post")
+        if not checks:
             continue
-
+        rule = plan.rule
         ctx = {**context, "rule": rule, "event_id": event_id}
-        checks = _get_checks_for_trigger(rule, trigger, "post")
 
         for check in checks:
-            condition = check.get("condition")
-            action = check.get("action")
-            action_params = check.get("action_params", {})
-            message = check.get("message", "")
+            condition = check.condition
+            action = check.action
+            action_params = check.action_params
+            message = check.message or ""
 
             # If condition exists, evaluate it; if not, action always runs
             if condition:
-                passed = _evaluate_condition(db, condition, ctx)
+                with measure(rule, trigger, "condition", condition.get("type")) as measurement:
+                    passed = _evaluate_check(db, check, ctx, memo)
+                    measurement.outcome = "pass" if passed else "skip"
                 if not passed:
                     logs.append(f"Post-hook skipped (condition not met): {message}")
                     continue
 
             if action:
                 try:
-                    _execute_action(db, action, action_params, ctx)
+                    with measure(rule, trigger, "action", action):
+                        _execute_action(db, action, action_params, ctx)
                     logs.append(f"Post-hook executed: {action} — {message}")
                 except Exception as e:
+                    if raise_errors:
+                        raise
                     logs.append(f"Post-hook failed: {action} — {e}")
 
     return logs
@@ -578,72 +948,64 @@ def _execute_action(db: Session, action: str, params: dict, context: dict):
         pass  # Unknown action, skip
 
 
-def _action_compute_ranking(db: Session, params: dict, context: dict):
-    """Compute ranking for posts in a event based on average_rating."""
+# Posts carrying any of these tags are left out of rankings
+DISQUALIFICATION_TAGS = ("team_too_small", "missing_attachment", "disqualified")
+
+_RANK_FUNCTIONS = {"competition": func.rank, "dense": func.dense_rank}
+
+
+def _action_compute_ranking(db: Session, params: Mapping[str, Any], context: dict):
+    """Rank an event's eligible submissions by a Post column and tag them ``<prefix><rank>``.
+
+    Ranks come from one RANK()/DENSE_RANK() window query (tie_mode "competition",
+    the default: 1, 1, 3; or "dense": 1, 1, 2) and are written back with a single
+    executemany UPDATE of the posts whose tags actually change.
+    """
     event_id = context.get("event_id")
     if not event_id:
         return
 
-    source_field = params.get("source_field", "average_rating")
-    order = params.get("order", "desc")
+    score = Post.__table__.c.get(params.get("source_field", "average_rating"))
+    tie_mode = params.get("tie_mode", "competition")
     output_tag_prefix = params.get("output_tag_prefix", "rank_")
+    if score is None or tie_mode not in _RANK_FUNCTIONS:
+        return
 
-    # Get all submissions
-    rels = crud.event_posts.get_multi_by_category(
-        db, event_id=event_id, relation_type="submission",
+    ordering = score.desc() if params.get("order", "desc") == "desc" else score.asc()
+    disqualified = exists().where(
+        PostTag.post_id == Post.id,
+        PostTag.tag_normalized.in_(DISQUALIFICATION_TAGS),
     )
-
-    scored_posts = []
-    for rel in rels:
-        post = crud.posts.get(db, id=rel.post_id)
-        if post:
-            score = getattr(post, source_field, None)
-            if score is not None:
-                scored_posts.append((post, score))
-
-    # Filter out disqualified posts (posts with any disqualification tag)
-    disqualification_tags = {"team_too_small", "missing_attachment", "disqualified"}
-    eligible_posts = []
-    for post, score in scored_posts:
-        tags = post.tags or []
+    ranked = db.query(
+        Post.id, Post.tags, _RANK_FUNCTIONS[tie_mode]().over(order_by=ordering),
+    ).join(EventPost, EventPost.post_id == Post.id).filter(
+        EventPost.event_id == event_id,
+        EventPost.relation_type == "submission",
+        Post.deleted_at.is_(None),
+        score.isnot(None),
+        ~disqualified,
+    ).all()
+
+    updates = []
+    for post_id, tags, rank in ranked:
+        tags = tags or []
         if isinstance(tags, str):
             tags = [tags]
-        if not any(t in disqualification_tags for t in tags):
-            eligible_posts.append((post, score))
-
-    # Sort
-    reverse = (order == "desc")
-    eligible_posts.sort(key=lambda x: x[1], reverse=reverse)
-
-    # Assign ranking tags with tie handling
-    rank = 1
-    i = 0
-    while i < len(eligible_posts):
-        # Find all posts with same score (tie group)
-        current_score = eligible_posts[i][1]
-        tie_group = []
-        while i < len(eligible_posts) and eligible_posts[i][1] == current_score:
-            tie_group.append(eligible_posts[i][0])
-            i += 1
-
-        # All tied posts get the same rank
-        tag = f"{output_tag_prefix}{rank}"
-        for post in tie_group:
-            current_tags = post.tags or []
-            if isinstance(current_tags, str):
-                current_tags = [current_tags]
-            current_tags = [t for t in current_tags if not t.startswith(output_tag_prefix)]
-            current_tags.append(tag)
-            post.tags = current_tags
-
-        # Next rank skips by tie count (e.g., 2 tied at rank 1 → next is rank 3)
-        rank += len(tie_group)
-
-    db.commit()
-
-
-def _action_flag_disqualified(db: Session, params: dict, context: dict):
-    """Flag disqualified groups/posts in a event."""
+        new_tags = [t for t in tags if not (isinstance(t, str) and t.startswith(output_tag_prefix))]
+        new_tags.append(f"{output_tag_prefix}{rank}")
+        if new_tags != tags:
+            updates.append({"id": post_id, "tags": new_tags})
+
+    crud.posts.update_many(db, rows=updates)
+
+
+def _action_flag_disqualified(db: Session, params: Mapping[str, Any], context: dict):
+    """Tag an event's disqualified submissions (one SELECT, one executemany UPDATE).
+
+    target "group": submissions by members of registered groups with fewer than
+    the rule's min_team_size accepted members. target "post" with tag
+    "missing_attachment": submissions without any post_resources row.
+    """
     event_id = context.get("event_id")
     if not event_id:
         return
@@ -651,60 +1013,49 @@ def _action_flag_disqualified(db: Session, params: dict, context: dict):
     target = params.get("target", "group")
     tag = params.get("tag", "disqualified")
 
-    # For groups: check each group's team size against rule's min_team_size
+    submissions = db.query(Post.id, Post.tags).join(EventPost, EventPost.post_id == Post.id).filter(
+        EventPost.event_id == event_id,
+        EventPost.relation_type == "submission",
+        Post.deleted_at.is_(None),
+    )
+
     if target == "group":
         rule = context.get("rule")
         min_size = rule.min_team_size if rule else None
         if min_size is None:
             return
+        undersized = db.query(EventGroup.group_id).outerjoin(Member, and_(
+            Member.group_id == EventGroup.group_id, Member.status == "accepted",
+        )).filter(
+            EventGroup.event_id == event_id,
+        ).group_by(EventGroup.group_id).having(func.count(Member.id) < min_size)
+        # Any member of an undersized group, whatever their own status
+        members = db.query(Member.user_id).filter(Member.group_id.in_(undersized))
+        flagged = submissions.filter(Post.created_by.in_(members))
+    elif target == "post" and tag == "missing_attachment":
+        flagged = submissions.filter(~exists().where(PostResource.post_id == Post.id))
+    else:
+        return
 
-        cat_groups = crud.event_groups.get_multi_by_category(db, event_id=event_id)
-        for cg in cat_groups:
-            count = crud.members.count_by_group(db, group_id=cg.group_id, status="accepted")
-            if count < min_size:
-                # Find submissions by group members and tag them
-                group_members = crud.members.get_multi_by_group(db, group_id=cg.group_id)
-                for member in group_members:
-                    rels = crud.event_posts.get_multi_by_category(
-                        db, event_id=event_id, relation_type="submission",
-                    )
-                    for rel in rels:
-                        post = crud.posts.get(db, id=rel.post_id)
-                        if post and post.created_by == member.user_id:
-                            current_tags = post.tags or []
-                            if isinstance(current_tags, str):
-                                current_tags = [current_tags]
-                            if tag not in current_tags:
-                                current_tags.append(tag)
-                                post.tags = current_tags
-        db.commit()
-
-    # For posts: check each submission post directly (e.g., missing resource)
-    elif target == "post":
-        rels = crud.event_posts.get_multi_by_category(
-            db, event_id=event_id, relation_type="submission",
-        )
-        for rel in rels:
-            post = crud.posts.get(db, id=rel.post_id)
-            if not post:
-                continue
-            # Check condition based on tag type
-            should_flag = False
-            if tag == "missing_attachment":
-                post_rels = crud.post_resources.get_multi_by_post(db, post_id=post.id)
-                should_flag = len(post_rels) == 0
-            if should_flag:
-                current_tags = post.tags or []
-                if isinstance(current_tags, str):
-                    current_tags = [current_tags]
-                if tag not in current_tags:
-                    current_tags.append(tag)
-                    post.tags = current_tags
-        db.commit()
-
-
-def _action_award_certificate(db: Session, params: dict, context: dict):
-    """Award certificates based on ranking. Depends on compute_ranking having run first."""
+    updates = []
+    for post_id, tags in flagged.all():
+        tags = tags or []
+        if isinstance(tags, str):
+            tags = [tags]
+        if tag not in tags:
+            updates.append({"id": post_id, "tags": [*tags, tag]})
+    crud.posts.update_many(db, rows=updates)
+
+
+def _action_award_certificate(db: Session, params: Mapping[str, Any], context: dict):
+    """Award certificates based on ranking. Depends on compute_ranking having run first.
+
+    Rank tags are read from post_tags in one query; every certificate post, its event
+    "reference" link and its post_posts "reference" to the ranked submission are
+    bulk-inserted in one transaction. Submissions already referenced by a live
+    certificate of the event are skipped, so re-running the action never issues
+    duplicates, whatever the award titles.
+    """
     event_id = context.get("event_id")
     if not event_id:
         return
@@ -712,50 +1063,60 @@ def _action_award_certificate(db: Session, params: dict, context: dict):
     rules_list = params.get("rules", [])
     output_tag_prefix = "rank_"  # Must match compute_ranking output
 
-    rels = crud.event_posts.get_multi_by_category(
-        db, event_id=event_id, relation_type="submission",
-    )
-
-    for rel in rels:
-        post = crud.posts.get(db, id=rel.post_id)
-        if not post:
-            continue
-        tags = post.tags or []
-        if isinstance(tags, str):
-            tags = [tags]
-
-        # Find rank tag
-        rank = None
-        for t in tags:
-            if t.startswith(output_tag_prefix):
-                try:
-                    rank = int(t[len(output_tag_prefix):])
-                except ValueError:
-                    pass
+    rank_tags = db.query(Post.id, Post.title, Post.created_by, PostTag.tag_normalized).join(
+        EventPost, EventPost.post_id == Post.id,
+    ).join(PostTag, PostTag.post_id == Post.id).filter(
+        EventPost.event_id == event_id,
+        EventPost.relation_type == "submission",
+        Post.deleted_at.is_(None),
+        PostTag.tag_normalized.startswith(output_tag_prefix, autoescape=True),
+    ).order_by(PostTag.id)  # tags are indexed in list order: the last valid one wins
+    ranked = {}
+    for post_id, title, created_by, tag in rank_tags:
+        try:
+            ranked[post_id] = (title, created_by, int(tag[len(output_tag_prefix):]))
+        except ValueError:
+            pass
+    if not ranked:
+        return
 
-        if rank is None:
+    issued = {post_id for post_id, in db.query(PostPost.target_post_id).join(
+        Post, Post.id == PostPost.source_post_id,
+    ).join(EventPost, EventPost.post_id == Post.id).filter(
+        PostPost.relation_type == "reference",
+        EventPost.event_id == event_id,
+        EventPost.relation_type == "reference",
+        Post.type == "certificate",
+        Post.deleted_at.is_(None),
+    )}
+    certificates, sources = [], []
+    for post_id, (title, created_by, rank) in ranked.items():
+        if post_id in issued:
             continue
-
-        # Check award rules
         for award_rule in rules_list:
-            rank_range = award_rule.get("rank_range", [0, 0])
-            if rank_range[0] <= rank <= rank_range[1]:
-                title = award_rule.get("title", "Certificate")
-                # Create certificate post
-                from app.models.post import Post as PostModel
-                cert_post = PostModel(
-                    title=f"{title} — {post.title}",
-                    content=f"Certificate awarded for rank {rank}",
-                    type="certificate",
-                    status="published",
-                    visibility="public",
-                    created_by=post.created_by,
-                )
-                db.add(cert_post)
-                db.commit()
-                db.refresh(cert_post)
-                # Link to event
-                crud.event_posts.create(
-                    db, event_id=event_id, post_id=cert_post.id, relation_type="reference",
-                )
+            low, high = award_rule.get("rank_range", [0, 0])
+            if low <= rank <= high:
                 break  # Only first matching rule
+        else:
+            continue
+        sources.append(post_id)
+        certificates.append({
+            "title": f"{award_rule.get('title', 'Certificate')} — {title}",
+            "content": f"Certificate awarded for rank {rank}",
+            "type": "certificate",
+            "status": "published",
+            "visibility": "public",
+            "created_by": created_by,
+        })
+    if not certificates:
+        return
+
+    with unit_of_work(db):
+        cert_ids = crud.posts.create_many(db, rows=certificates)
+        crud.event_posts.create_many(db, rows=[
+            {"event_id": event_id, "post_id": cert_id, "relation_type": "reference"} for cert_id in cert_ids
+        ])
+        crud.post_posts.create_many(db, rows=[
+            {"source_post_id": cert_id, "target_post_id": post_id, "relation_type": "reference"}
+            for cert_id, post_id in zip(cert_ids, sources)
+        ])
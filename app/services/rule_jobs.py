@@ -0,0 +1,147 @@
+"""Rule job queue — runs rule-engine post hooks outside the request.
+
+dispatch_post_hooks() is what routers call after a write that fires a post-phase
+trigger. It adds a rule_jobs row on the request's session, so the job is committed
+(and becomes visible to workers) together with the change that fired it. The
+RuleJobWorker thread started in the app lifespan claims due jobs, runs each one in a
+single transaction and retries failures with a doubling delay. With
+settings.rule_jobs_sync the hooks run inline in the request instead.
+
+Usage:
+    from app.services.rule_jobs import dispatch_post_hooks
+
+    # In the event update endpoint, after the status change:
+    dispatch_post_hooks(db, trigger="update_content(event.status)", event_id=event_id,
+                        context={"user_id": user_id})
+"""
+import logging
+import threading
+from typing import Callable, Optional
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.core.config import settings
+from app.database import SessionLocal, unit_of_work
+from app.models.rule_job import RuleJob
+from app.services.rule_engine import run_post_hooks
+
+logger = logging.getLogger(__name__)
+
+# Seconds a claimed job stays reserved; if its worker dies, another one reclaims it after this
+JOB_LEASE_SECONDS = 600.0
+
+
+def dispatch_post_hooks(db: Session, *, trigger: str, event_id: int, context: dict) -> Optional[RuleJob]:
+    """Queue the post hooks for ``trigger`` on an event, or run them now with rule_jobs_sync.
+
+    Returns the queued job (None in synchronous mode).
+    """
+    if settings.rule_jobs_sync:
+        run_post_hooks(db, trigger=trigger, event_id=event_id, context=context)
+        return None
+    job = crud.rule_jobs.enqueue(db, event_id=event_id, trigger=trigger, context=context)
+    worker = _worker
+    if worker is not None:
+        if db.in_transaction():
+            # Request unit of work: the job becomes visible when the request commits
+            sa_event.listen(db, "after_commit", lambda session: worker.wake(), once=True)
+        else:
+            worker.wake()
+    return job
+
+
+def run_job(db: Session, job: RuleJob) -> RuleJob:
+    """Run a claimed job's post hooks in one transaction and record the outcome.
+
+    A failing action rolls the whole run back; the job is requeued until it has used
+    settings.rule_job_max_attempts attempts, then marked failed. The actions are
+    idempotent, so a retry re-runs every hook of the trigger.
+    """
+    if job.attempts > settings.rule_job_max_attempts:
+        # The lease of its last attempt ran out: the worker running it went away
+        return crud.rule_jobs.fail(db, job=job, error=job.last_error or "Job worker lost", retry_in=None)
+    try:
+        with unit_of_work(db):
+            logs = run_post_hooks(db, job.trigger, job.event_id, dict(job.context), raise_errors=True)
+    except Exception as e:
+        retry_in = None
+        if job.attempts < settings.rule_job_max_attempts:
+            retry_in = settings.rule_job_retry_delay * 2 ** (job.attempts - 1)
+        return crud.rule_jobs.fail(db, job=job, error=f"{type(e).__name__}: {e}", retry_in=retry_in)
+    return crud.rule_jobs.complete(db, job=job, logs=logs)
+
+
+def run_pending(session_factory: Callable[[], Session] = SessionLocal, *, max_jobs: Optional[int] = None) -> int:
+    """Claim and run due jobs until none is left (or ``max_jobs`` ran); returns how many ran."""
+    ran = 0
+    while max_jobs is None or ran < max_jobs:
+        with session_factory() as db:
+            job = crud.rule_jobs.claim_next(db, lease=JOB_LEASE_SECONDS)
+            if job is None:
+                break
+            run_job(db, job)
+        ran += 1
+    return ran
+
+
+class RuleJobWorker:
+    """Daemon thread draining the rule_jobs queue.
+
+    Sleeps settings.rule_job_poll_interval between empty polls; wake() (called when a
+    request commits a new job) cuts the wait short. Several processes may each run
+    one against the same database: claims are exclusive.
+    """
+
+    def __init__(
+        self, session_factory: Callable[[], Session] = SessionLocal, *, poll_interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.poll_interval = settings.rule_job_poll_interval if poll_interval is None else poll_interval
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="rule-jobs", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Stop after the job in progress, waiting up to ``timeout`` seconds for it."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            try:
+                while not self._stopping.is_set() and run_pending(self.session_factory, max_jobs=1):
+                    pass
+            except Exception:
+                logger.exception("Rule job worker: polling the queue failed")
+            self._wakeup.wait(self.poll_interval)
+
+
+_worker: Optional[RuleJobWorker] = None
+
+
+def start_worker(session_factory: Callable[[], Session] = SessionLocal) -> RuleJobWorker:
+    """Start this process's worker (called from the app lifespan)."""
+    global _worker
+    if _worker is None:
+        _worker = RuleJobWorker(session_factory)
+        _worker.start()
+    return _worker
+
+
+def stop_worker() -> None:
+    global _worker
+    if _worker is not None:
+        _worker.stop()
+        _worker = None
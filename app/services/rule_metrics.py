@@ -0,0 +1,173 @@
+"""Rule-engine instrumentation — per-check latency, SQL statement counts and outcomes.
+
+run_pre_checks / run_post_hooks wrap every condition evaluation and action in
+measure(). A measurement is labelled with the rule (id, name), trigger, kind
+("condition" or "action") and condition type / action name, and ends with an
+outcome:
+
+- condition: pass, or deny / warn / flag by the check's on_fail (pre phase);
+  skip when a post-phase condition is not met
+- action: ok | error
+
+Totals per label set accumulate process-wide (GET /api/admin/rules/metrics). With
+RULE_TRACE_HEADER enabled, RuleTraceMiddleware also collects each request's own
+measurements and returns them in a Server-Timing response header.
+"""
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+MetricKey = namedtuple("MetricKey", "rule_id rule_name trigger kind type outcome")
+
+
+class Measurement:
+    """One condition evaluation or action run; the caller sets ``outcome``."""
+
+    __slots__ = ("statements", "outcome")
+
+    def __init__(self):
+        self.statements = 0
+        self.outcome: Optional[str] = None
+
+
+class RuleMetrics:
+    """Call count, time and SQL statements per MetricKey, for the whole process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[MetricKey, list] = {}  # key → [count, time_total, time_max, statements]
+
+    def record(self, key: MetricKey, elapsed: float, statements: int) -> None:
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                self._stats[key] = [1, elapsed, elapsed, statements]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+                stats[2] = max(stats[2], elapsed)
+                stats[3] += statements
+
+    def snapshot(self) -> list[dict]:
+        """Label sets with their totals, most total time first."""
+        with self._lock:
+            items = [(key, list(stats)) for key, stats in self._stats.items()]
+        items.sort(key=lambda item: item[1][1], reverse=True)
+        return [
+            {
+                **key._asdict(),
+                "count": count,
+                "time_total_ms": round(total * 1000, 3),
+                "time_avg_ms": round(total * 1000 / count, 3),
+                "time_max_ms": round(longest * 1000, 3),
+                "statements_total": statements,
+                "statements_avg": round(statements / count, 2),
+            }
+            for key, (count, total, longest, statements) in items
+        ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+metrics = RuleMetrics()
+
+# The measurement in progress in this context, and the request trace (if tracing)
+_current: ContextVar[Optional[Measurement]] = ContextVar("rule_measurement", default=None)
+_trace: ContextVar[Optional[list]] = ContextVar("rule_trace", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    measurement = _current.get()
+    if measurement is not None:
+        measurement.statements += 1
+
+
+@contextmanager
+def measure(rule, trigger: str, kind: str, type_: Optional[str]) -> Iterator[Measurement]:
+    """Time the block and count its SQL statements under the rule's labels.
+
+    An exception leaving the block is recorded as outcome "error" unless the caller
+    already set one (a deny check raises RuleCheckError after setting "deny").
+    """
+    measurement = Measurement()
+    token = _current.set(measurement)
+    start = time.perf_counter()
+    try:
+        yield measurement
+    except BaseException:
+        measurement.outcome = measurement.outcome or "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        _current.reset(token)
+        key = MetricKey(rule.id, rule.name, trigger, kind, type_ or "", measurement.outcome or "ok")
+        metrics.record(key, elapsed, measurement.statements)
+        records = _trace.get()
+        if records is not None:
+            records.append((key, elapsed, measurement.statements))
+
+
+@contextmanager
+def count_statements() -> Iterator[Measurement]:
+    """Count the block's SQL statements without recording a metric (rule simulation)."""
+    measurement = Measurement()
+    token = _current.set(measurement)
+    try:
+        yield measurement
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def trace() -> Iterator[list]:
+    """Collect the measurements made in this context (a request) into the yielded list."""
+    records: list = []
+    token = _trace.set(records)
+    try:
+        yield records
+    finally:
+        _trace.reset(token)
+
+
+def server_timing(records: list) -> str:
+    """Render trace records as a Server-Timing header value, one entry per measurement."""
+    entries = []
+    for i, (key, elapsed, statements) in enumerate(records):
+        desc = f"r{key.rule_id} {key.trigger} {key.kind}:{key.type} {key.outcome} sql={statements}"
+        desc = desc.replace("\\", "/").replace('"', "'")  # user-defined types end up in a quoted-string
+        entries.append(f'rule{i};desc="{desc}";dur={elapsed * 1000:.2f}')
+    return ", ".join(entries)
+
+
+class RuleTraceMiddleware:
+    """ASGI middleware: Server-Timing header with the request's rule checks (RULE_TRACE_HEADER).
+
+    Passes requests straight through while the setting is off.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.rule_trace_header:
+            await self.app(scope, receive, send)
+            return
+        with trace() as records:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start" and records:
+                    header = server_timing(records).encode("latin-1", "replace")
+                    message = {**message, "headers": [*message.get("headers", []), (b"server-timing", header)]}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
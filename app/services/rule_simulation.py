@@ -0,0 +1,242 @@
+"""Rule simulation — dry-runs an event's rules for a trigger without writing anything.
+
+simulate_rules() evaluates every check of a trigger for each given context (see
+sample_contexts() for replaying recent real ones) on the caller's session:
+
+- pre checks run in the engine's order (cheapest first), but a deny doesn't stop
+  the run: each check reports "pass" or its on_fail
+- post checks evaluate their condition ("skip" when it doesn't hold) and run the
+  action; the INSERT/UPDATE/DELETE statements it issued are reported per table
+
+Each context runs inside a SAVEPOINT that is rolled back, and the session's
+transaction is rolled back at the end, so a simulation never commits. Every entry
+carries its elapsed time and SQL statement count; simulations are not recorded in
+the rule metrics.
+
+Usage:
+    from app.services.rule_simulation import sample_contexts, simulate_rules
+
+    contexts = sample_contexts(db, event_id, "create_relation(event_post)", limit=20)
+    runs = simulate_rules(db, event_id, "create_relation(event_post)", contexts)
+"""
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Sequence
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+from app.database import UNIT_OF_WORK
+from app.models.event_group import EventGroup
+from app.models.event_post import EventPost
+from app.models.group import Group
+from app.models.member import Member
+from app.models.post import Post
+from app.models.rule import Rule
+from app.services.rule_engine import (
+    RulePlan,
+    _evaluate_condition,
+    _execute_action,
+    compile_rule,
+    get_event_rule_plans,
+    order_pre_checks,
+)
+from app.services.rule_metrics import count_statements
+
+# Triggers with recorded operations that sample_contexts() can replay
+SAMPLED_TRIGGERS = (
+    "create_relation(event_post)",
+    "create_relation(event_group)",
+    "create_relation(group_user)",
+)
+
+
+def sample_contexts(db: Session, event_id: int, trigger: str, limit: int) -> list[dict]:
+    """Contexts of the event's ``limit`` most recent operations that fired ``trigger``.
+
+    Raises ValueError for triggers not in SAMPLED_TRIGGERS.
+    """
+    if trigger == "create_relation(event_post)":
+        rows = db.query(Post.created_by, Post.id).join(EventPost, EventPost.post_id == Post.id).filter(
+            EventPost.event_id == event_id, EventPost.relation_type == "submission",
+        ).order_by(EventPost.id.desc()).limit(limit).all()
+        return [{"user_id": user_id, "post_id": post_id} for user_id, post_id in rows]
+    if trigger == "create_relation(event_group)":
+        rows = db.query(Group.created_by, Group.id).join(EventGroup, EventGroup.group_id == Group.id).filter(
+            EventGroup.event_id == event_id,
+        ).order_by(EventGroup.id.desc()).limit(limit).all()
+        return [{"user_id": user_id, "group_id": group_id} for user_id, group_id in rows]
+    if trigger == "create_relation(group_user)":
+        rows = db.query(Member.user_id, Member.group_id).join(
+            EventGroup, EventGroup.group_id == Member.group_id,
+        ).filter(EventGroup.event_id == event_id).order_by(Member.id.desc()).limit(limit).all()
+        return [{"user_id": user_id, "group_id": group_id} for user_id, group_id in rows]
+    raise ValueError(f"Cannot sample contexts for trigger: {trigger}")
+
+
+def draft_plan(checks: list[dict]) -> RulePlan:
+    """Compile checks not saved on any rule yet, as a rule named "draft"."""
+    return compile_rule(Rule(name="draft", description="", checks=checks))
+
+
+def simulate_rules(
+    db: Session,
+    event_id: int,
+    trigger: str,
+    contexts: Sequence[dict],
+    plans: Optional[Sequence[RulePlan]] = None,
+) -> list[dict]:
+    """Evaluate the trigger's checks for each context and roll everything back.
+
+    Args:
+        plans: Rules to simulate; defaults to the event's linked rules.
+
+    Returns:
+        One run per context: whether the operation would be denied (and by which
+        message, as run_pre_checks would raise it), its totals and the checks.
+    """
+    if plans is None:
+        plans = get_event_rule_plans(db, event_id)
+    unit_of_work = db.info.get(UNIT_OF_WORK)
+    # Actions only flush, so their writes stay inside the savepoints
+    db.info[UNIT_OF_WORK] = True
+    try:
+        runs = []
+        for context in contexts:
+            savepoint = _begin_savepoint(db)
+            try:
+                runs.append(_simulate_context(db, event_id, trigger, dict(context), plans))
+            finally:
+                savepoint.rollback()
+        return runs
+    finally:
+        db.rollback()
+        if unit_of_work is None:
+            db.info.pop(UNIT_OF_WORK, None)
+        else:
+            db.info[UNIT_OF_WORK] = unit_of_work
+
+
+def _simulate_context(
+    db: Session, event_id: int, trigger: str, context: dict, plans: Sequence[RulePlan],
+) -> dict:
+    checks = []
+    denied_by = None
+    for _, check, rule, ctx in order_pre_checks(plans, trigger, event_id, context):
+        entry = _entry(rule, "pre", check)
+        with _timed(entry):
+            try:
+                passed = _evaluate_condition(db, check.condition, ctx)
+                entry["outcome"] = "pass" if passed else check.on_fail
+            except Exception as e:
+                entry["outcome"], entry["error"] = "error", f"{type(e).__name__}: {e}"
+        if entry["outcome"] == "deny" and denied_by is None:
+            denied_by = entry
+        checks.append(entry)
+
+    for plan in plans:
+        ctx = {**context, "rule": plan.rule, "event_id": event_id}
+        for check in plan.for_trigger(trigger, "post"):
+            entry = _entry(plan.rule, "post", check)
+            # A failing action's writes are dropped; later actions see those of the others
+            savepoint = _begin_savepoint(db)
+            with _timed(entry):
+                try:
+                    passed = check.condition is None or _evaluate_condition(db, check.condition, ctx)
+                    if not passed:
+                        entry["outcome"] = "skip"
+                    elif check.action:
+                        with _capture_writes(db) as writes:
+                            _execute_action(db, check.action, dict(check.action_params), ctx)
+                            db.flush()
+                        entry["outcome"], entry["writes"] = "ok", writes
+                    else:
+                        entry["outcome"] = "pass"
+                except Exception as e:
+                    entry["outcome"], entry["error"] = "error", f"{type(e).__name__}: {e}"
+            if entry["outcome"] == "error":
+                savepoint.rollback()
+            else:
+                savepoint.commit()
+            checks.append(entry)
+
+    message = None
+    if denied_by is not None:
+        message = "Rule check failed" if denied_by["message"] is None else denied_by["message"]
+    return {
+        "context": context,
+        "outcome": "allow" if denied_by is None else "deny",
+        "message": message,
+        "elapsed_ms": round(sum(entry["elapsed_ms"] for entry in checks), 3),
+        "statements": sum(entry["statements"] for entry in checks),
+        "checks": checks,
+    }
+
+
+def _begin_savepoint(db: Session):
+    """Begin a SAVEPOINT now rather than on first use, so no check is timed with it."""
+    savepoint = db.begin_nested()
+    db.connection()
+    return savepoint
+
+
+def _entry(rule, phase: str, check) -> dict[str, Any]:
+    return {
+        "rule_id": rule.id,
+        "rule_name": rule.name,
+        "phase": phase,
+        "condition": check.condition.get("type") if check.condition else None,
+        "action": check.action if phase == "post" else None,
+        "message": check.message,
+        "outcome": None,
+        "elapsed_ms": 0.0,
+        "statements": 0,
+        "writes": [],
+        "error": None,
+    }
+
+
+@contextmanager
+def _timed(entry: dict) -> Iterator[None]:
+    """Store the block's elapsed time and SQL statement count on a check entry."""
+    with count_statements() as measurement:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            entry["statements"] = measurement.statements
+
+
+@contextmanager
+def _capture_writes(db: Session) -> Iterator[list[dict]]:
+    """Collect the INSERT/UPDATE/DELETE row counts per table issued on the session's connection."""
+    writes: list[dict] = []
+
+    def record(conn, clauseelement, multiparams, params, execution_options, result):
+        if clauseelement.is_insert:
+            statement = "INSERT"
+        elif clauseelement.is_update:
+            statement = "UPDATE"
+        elif clauseelement.is_delete:
+            statement = "DELETE"
+        else:
+            return
+        if result.returns_rows or result.rowcount < 0:
+            rows = len(multiparams) or 1  # INSERT ... RETURNING: one row per parameter set
+        else:
+            rows = result.rowcount
+        table = clauseelement.table.name
+        for write in writes:
+            if (write["statement"], write["table"]) == (statement, table):
+                write["rows"] += rows
+                break
+        else:
+            writes.append({"statement": statement, "table": table, "rows": rows})
+
+    connection = db.connection()
+    sa_event.listen(connection, "after_execute", record)
+    try:
+        yield writes
+    finally:
+        sa_event.remove(connection, "after_execute", record)
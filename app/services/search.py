@@ -0,0 +1,129 @@
+"""Full-text search over posts, events and users
+
+Uses the FTS5 tables from app.models.search_index, ranked with bm25. Terms shorter
+than three characters (below the trigram size) can't use the index: they are matched
+with LIKE next to the MATCH of the other terms, and queries made only of short terms,
+like those on non-SQLite backends, fall back to a LIKE scan with the same visibility
+rules.
+"""
+from typing import Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+SEARCH_TYPES = ("post", "event", "user")
+
+# Trigram tokenizer: shorter terms cannot match anything in the index
+MIN_TERM_LENGTH = 3
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def fts_match_query(q: str) -> Optional[str]:
+    """Turn user input into an FTS5 MATCH expression (all terms, each as a quoted phrase).
+
+    Terms too short for the trigram index are left out (see short_terms). Returns None
+    when no term is long enough.
+    """
+    terms = [t for t in q.split() if len(t) >= MIN_TERM_LENGTH]
+    if not terms:
+        return None
+    return " ".join(_quote(t) for t in terms)
+
+
+def short_terms(q: str) -> list[str]:
+    """Lowercased terms of ``q`` shorter than MIN_TERM_LENGTH, which MATCH can't find."""
+    return [t.lower() for t in q.split() if len(t) < MIN_TERM_LENGTH]
+
+
+def fts_phrase_query(q: str, columns: Sequence[str]) -> Optional[str]:
+    """MATCH expression for ``q`` as one substring across ``columns`` (LIKE '%q%' semantics)."""
+    q = q.strip()
+    if len(q) < MIN_TERM_LENGTH:
+        return None
+    return "{" + " ".join(columns) + "} : " + _quote(q)
+
+
+# Per type: FTS source, bm25 column weights, SELECT list and visibility filter
+_SOURCES = {
+    "post": {
+        "fts": "posts_fts", "table": "posts",
+        "weights": "10.0, 1.0, 5.0",
+        "columns": "b.title AS title, b.type AS subtitle",
+        "like": ("b.title", "b.content", "CAST(b.tags AS TEXT)"),
+        "where": (
+            "b.deleted_at IS NULL"
+            " AND (b.status = 'published' OR b.created_by = :uid)"
+            " AND (b.visibility IS NULL OR b.visibility = 'public' OR b.created_by = :uid)"
+        ),
+    },
+    "event": {
+        "fts": "events_fts", "table": "events",
+        "weights": "10.0, 1.0",
+        "columns": "b.name AS title, b.type AS subtitle",
+        "like": ("b.name", "b.description"),
+        "where": "b.deleted_at IS NULL AND (b.status != 'draft' OR b.created_by = :uid)",
+    },
+    "user": {
+        "fts": "users_fts", "table": "users",
+        "weights": "10.0, 8.0, 1.0",
+        "columns": "coalesce(b.display_name, b.username) AS title, b.username AS subtitle",
+        "like": ("b.username", "b.display_name", "b.bio"),
+        "where": "b.deleted_at IS NULL",
+    },
+}
+
+
+def _like_any(kind: str, param: str) -> str:
+    """``:param`` LIKE-matches any of the type's searchable columns."""
+    return " OR ".join(f"lower(coalesce({col}, '')) LIKE :{param}" for col in _SOURCES[kind]["like"])
+
+
+def _fts_select(kind: str, short_params: Sequence[str] = ()) -> str:
+    src = _SOURCES[kind]
+    short = "".join(f" AND ({_like_any(kind, param)})" for param in short_params)
+    return (
+        f"SELECT '{kind}' AS type, b.id AS id, {src['columns']}, "
+        f"bm25({src['fts']}, {src['weights']}) AS score "
+        f"FROM {src['fts']} JOIN {src['table']} b ON b.id = {src['fts']}.rowid "
+        f"WHERE {src['fts']} MATCH :match{short} AND {src['where']}"
+    )
+
+
+def _like_select(kind: str) -> str:
+    src = _SOURCES[kind]
+    like = _like_any(kind, "like")
+    return (
+        f"SELECT '{kind}' AS type, b.id AS id, {src['columns']}, 0.0 AS score "
+        f"FROM {src['table']} b WHERE ({like}) AND {src['where']}"
+    )
+
+
+def search(
+    db: Session,
+    q: str,
+    *,
+    types: Sequence[str] = SEARCH_TYPES,
+    current_user_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 20,
+) -> tuple[list[dict], int]:
+    """Ranked mixed search results and the total match count."""
+    match = fts_match_query(q) if db.get_bind().dialect.name == "sqlite" else None
+    if match is not None:
+        # Every term must match: the short ones as substrings of a searchable column
+        shorts = {f"short{i}": f"%{term}%" for i, term in enumerate(short_terms(q))}
+        union = " UNION ALL ".join(_fts_select(kind, list(shorts)) for kind in types)
+        params = {"match": match, "uid": current_user_id, **shorts}
+    else:
+        union = " UNION ALL ".join(_like_select(kind) for kind in types)
+        params = {"like": f"%{q.strip().lower()}%", "uid": current_user_id}
+
+    total = db.execute(text(f"SELECT count(*) FROM ({union}) AS results"), params).scalar_one()
+    rows = db.execute(
+        text(f"SELECT * FROM ({union}) AS results ORDER BY score, type, id LIMIT :limit OFFSET :skip"),
+        {**params, "limit": limit, "skip": skip},
+    ).mappings().all()
+    return [dict(row) for row in rows], total
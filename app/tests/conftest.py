@@ -1,12 +1,20 @@
 """Test configuration — in-memory SQLite for isolation"""
-import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, event
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+import os
 
-from app.database import Base, get_db
-from app.main import app
+# Tests bring their own databases; skip migrating the default one in the app lifespan
+os.environ.setdefault("DB_INIT_ON_STARTUP", "false")
+# Run rule post hooks inline so tests see their effects when the request returns
+os.environ.setdefault("RULE_JOBS_SYNC", "true")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.database import UNIT_OF_WORK, Base, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.rule_engine import invalidate_rule_plan  # noqa: E402
 
 
 @pytest.fixture()
@@ -31,15 +39,19 @@ def db_session():
     finally:
         session.close()
         Base.metadata.drop_all(bind=engine)
+        # Rule ids restart with every database; don't let plans leak between tests
+        invalidate_rule_plan()
 
 
 @pytest.fixture()
 def client(db_session):
     def _override_get_db():
+        # Same unit-of-work mode as get_db; commit_db commits at the end of the request
+        db_session.info[UNIT_OF_WORK] = True
         try:
             yield db_session
         finally:
-            pass
+            db_session.info.pop(UNIT_OF_WORK, None)
 
     app.dependency_overrides[get_db] = _override_get_db
     with TestClient(app) as c:
@@ -0,0 +1,141 @@
+"""Async read endpoints (settings.db_async_reads) — parity with the sync endpoints"""
+import importlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+import app.main
+from app.core.config import Settings, settings
+from app.database import Base, create_async_db_engine, create_db_engine, get_async_db, get_db
+from app.routers import events, notifications, posts, users
+from app.services.notification_events import notify_follow
+
+
+def _build_app(async_reads: bool) -> FastAPI:
+    test_app = FastAPI()
+    if async_reads:
+        test_app.include_router(posts.async_router, prefix="/api")
+        test_app.include_router(events.async_router, prefix="/api")
+        test_app.include_router(notifications.async_router, prefix="/api")
+    for module in (users, posts, events, notifications):
+        test_app.include_router(module.router, prefix="/api")
+    return test_app
+
+
+@pytest.fixture()
+def apps(tmp_path):
+    url = f"sqlite:///{tmp_path}/async.db"
+    profile = Settings(database_url=url)
+    sync_engine = create_db_engine(url, profile=profile)
+    Base.metadata.create_all(bind=sync_engine)
+    SyncSession = sessionmaker(bind=sync_engine, autoflush=False)
+    async_engine = create_async_db_engine(url, profile=profile)
+    AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    def _get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def _get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    built = {}
+    for mode in (False, True):
+        a = _build_app(mode)
+        a.dependency_overrides[get_db] = _get_db
+        a.dependency_overrides[get_async_db] = _get_async_db
+        built[mode] = a
+    with TestClient(built[False]) as sync_client, TestClient(built[True]) as async_client:
+        yield sync_client, async_client, SyncSession
+    sync_engine.dispose()
+
+
+def _seed(client, SyncSession):
+    alice = client.post("/api/users", json={
+        "username": "alice", "email": "alice@example.com", "role": "organizer",
+    }).json()["id"]
+    bob = client.post("/api/users", json={"username": "bob", "email": "bob@example.com"}).json()["id"]
+    h = {"X-User-Id": str(alice)}
+    for i in range(5):
+        client.post("/api/posts", json={
+            "title": f"Post {i}", "content": f"body {i}", "status": "published", "tags": ["ai"] if i % 2 else [],
+        }, headers=h)
+    client.post("/api/posts", json={"title": "Draft", "status": "draft"}, headers=h)
+    client.post("/api/events", json={
+        "name": "Hack", "description": "d", "type": "competition", "status": "published",
+    }, headers=h)
+    with SyncSession() as db:
+        notify_follow(db, follower_id=bob, followed_id=alice)
+    return alice, bob
+
+
+@pytest.mark.parametrize("path", [
+    "/api/posts",
+    "/api/posts?tags=ai",
+    "/api/posts?tags=ai,x&tags_mode=all",
+    "/api/posts/tag-facets",
+    "/api/posts?q=body&skip=1&limit=2",
+    "/api/posts/1",
+    "/api/posts/6",
+    "/api/events",
+    "/api/notifications",
+    "/api/notifications?is_read=false",
+    "/api/notifications/unread-count",
+])
+def test_async_reads_match_sync(apps, path):
+    sync_client, async_client, SyncSession = apps
+    alice, _ = _seed(sync_client, SyncSession)
+    for headers in ({}, {"X-User-Id": str(alice)}):
+        if path.startswith("/api/notifications") and not headers:
+            continue
+        expected = sync_client.get(path, headers=headers)
+        actual = async_client.get(path, headers=headers)
+        assert actual.status_code == expected.status_code
+        assert actual.json() == expected.json()
+
+
+def test_async_reads_unknown_user_rejected(apps):
+    _, async_client, _ = apps
+    resp = async_client.get("/api/notifications", headers={"X-User-Id": "999"})
+    assert resp.status_code == 401
+
+
+def test_async_reads_mock_user_created_without_header(apps):
+    _, async_client, _ = apps
+    resp = async_client.get("/api/notifications/unread-count")
+    assert resp.status_code == 200
+    assert resp.json() == {"unread_count": 0}
+
+
+def test_async_reads_skip_the_sync_unit_of_work(apps, monkeypatch):
+    """app.main attaches commit_db per sync router, so async reads never open a sync Session."""
+    sync_client, _, SyncSession = apps
+    _seed(sync_client, SyncSession)
+    monkeypatch.setattr(settings, "db_async_reads", True)
+    main = importlib.reload(app.main)
+    try:
+        sync_sessions = []
+
+        def _get_db():
+            sync_sessions.append(1)
+            with SyncSession() as db:
+                yield db
+
+        main.app.dependency_overrides[get_db] = _get_db
+        main.app.dependency_overrides[get_async_db] = sync_client.app.dependency_overrides[get_async_db]
+        client = TestClient(main.app)
+        assert client.get("/api/posts").status_code == 200
+        assert client.get("/api/events").status_code == 200
+        assert sync_sessions == []
+        assert client.get("/api/users").status_code == 200
+        assert sync_sessions
+    finally:
+        monkeypatch.undo()
+        importlib.reload(app.main)
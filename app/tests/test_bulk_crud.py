@@ -0,0 +1,148 @@
+"""Bulk CRUD — create_many / update_many / upsert_many"""
+import pytest
+from sqlalchemy import event
+
+from app import crud
+from app.models.event_post import EventPost
+from app.models.member import Member
+from app.models.notification import Notification
+from app.models.resource import Resource
+from app.models.user import User
+from app.schemas.member import MemberCreate
+from app.schemas.user import UserCreate
+
+
+def _count_statements(db):
+    statements = []
+    event.listen(db.get_bind(), "before_cursor_execute",
+                 lambda conn, cursor, sql, params, context, executemany: statements.append(sql))
+    return statements
+
+
+def test_create_many_returns_ids_in_order(db_session):
+    ids = crud.users.create_many(db_session, rows=[
+        UserCreate(username=f"bulk{i}", email=f"bulk{i}@example.com") for i in range(5)
+    ])
+    assert len(ids) == 5
+    users = {u.id: u for u in db_session.query(User).all()}
+    assert [users[i].username for i in ids] == [f"bulk{i}" for i in range(5)]
+    assert all(users[i].created_at is not None for i in ids)
+    assert crud.users.create_many(db_session, rows=[]) == []
+
+
+def test_create_many_mixed_keys_and_defaults(db_session):
+    a, b = crud.users.create_many(db_session, rows=[
+        {"username": "a", "email": "a@example.com"},
+        {"username": "b", "email": "b@example.com"},
+    ])
+    ids = crud.notifications.create_many(db_session, rows=[
+        {"user_id": a, "type": "system", "content": "a"},
+        {"user_id": b, "type": "system", "content": "b", "title": "t"},
+    ])
+    rows = db_session.query(Notification).order_by(Notification.id).all()
+    assert [r.id for r in rows] == ids
+    assert [r.title for r in rows] == [None, "t"]
+    assert [r.is_read for r in rows] == [False, False]
+
+
+def test_create_many_batches_statements(db_session):
+    statements = _count_statements(db_session)
+    crud.target_interactions.create_many(db_session, rows=[
+        {"target_type": "post", "target_id": i, "interaction_id": i} for i in range(1, 2001)
+    ])
+    inserts = [s for s in statements if s.startswith("INSERT")]
+    # Multi-row VALUES batches, not one statement per row
+    assert 1 <= len(inserts) <= 4
+
+
+def test_update_many(db_session):
+    ids = crud.users.create_many(db_session, rows=[
+        {"username": f"u{i}", "email": f"u{i}@example.com"} for i in range(3)
+    ])
+    matched = crud.users.update_many(db_session, rows=[
+        {"id": ids[0], "role": "organizer"},
+        {"id": ids[1], "role": "admin", "display_name": "Boss"},
+        {"id": 9999, "role": "admin"},
+    ])
+    assert matched == 2
+    db_session.expire_all()
+    roles = {u.id: (u.role, u.display_name) for u in db_session.query(User).all()}
+    assert roles[ids[0]] == ("organizer", None)
+    assert roles[ids[1]] == ("admin", "Boss")
+    assert roles[ids[2]][0] == "participant"
+
+
+def test_event_posts_upsert_on_uq_category_post(db_session):
+    first = crud.event_posts.upsert_many(db_session, rows=[
+        {"event_id": 1, "post_id": 1, "relation_type": "submission"},
+        {"event_id": 1, "post_id": 2, "relation_type": "submission"},
+    ])
+    second = crud.event_posts.upsert_many(db_session, rows=[
+        {"event_id": 1, "post_id": 3, "relation_type": "reference"},
+        {"event_id": 1, "post_id": 1, "relation_type": "reference"},
+    ])
+    assert second[1] == first[0]
+    assert db_session.query(EventPost).count() == 3
+    db_session.expire_all()
+    assert crud.event_posts.get(db_session, id=first[0]).relation_type == "reference"
+    # Keys only: existing rows are kept and still return their ids
+    assert crud.event_posts.upsert_many(db_session, rows=[{"event_id": 1, "post_id": 2}]) == [first[1]]
+    assert crud.event_posts.get(db_session, id=first[1]).relation_type == "submission"
+
+
+def test_members_bulk_defaults_and_upsert(db_session):
+    ids = crud.members.create_many(db_session, rows=[
+        {"group_id": 1, "user_id": 1, "role": "owner", "status": "accepted"},
+        {"group_id": 1, "user_id": 2},
+    ])
+    owner, pending = (db_session.get(Member, i) for i in ids)
+    assert owner.joined_at is not None and owner.role == "owner"
+    assert pending.status == "pending" and pending.joined_at is None and pending.status_changed_at is not None
+
+    assert crud.members.upsert_many(db_session, rows=[
+        {"group_id": 1, "user_id": 2, "status": "rejected"},
+    ]) == [ids[1]]
+    db_session.expire_all()
+    assert db_session.get(Member, ids[1]).status == "rejected"
+    assert db_session.get(Member, ids[1]).role == "member"
+
+
+def test_members_upsert_schema_rows_stamp_status_change(db_session):
+    [member_id] = crud.members.create_many(db_session, rows=[MemberCreate(group_id=1, user_id=1)])
+    before = db_session.get(Member, member_id).status_changed_at
+
+    assert crud.members.upsert_many(db_session, rows=[
+        MemberCreate(group_id=1, user_id=1, status="accepted"),
+    ]) == [member_id]
+    db_session.expire_all()
+    member = db_session.get(Member, member_id)
+    assert member.status == "accepted"
+    assert member.status_changed_at > before
+
+
+def test_upsert_needs_a_unique_constraint(db_session):
+    with pytest.raises(TypeError):
+        crud.post_resources.upsert_many(db_session, rows=[{"post_id": 1, "resource_id": 1}])
+
+
+def test_admin_batch_uses_bulk_update(client, db_session, admin_user, participant_user):
+    headers = {"X-User-Id": str(participant_user["id"])}
+    ids = [client.post("/api/posts", json={"title": f"p{i}"}, headers=headers).json()["id"] for i in range(3)]
+    resp = client.post("/api/admin/posts/batch-update-status", json={
+        "ids": [*ids, 999], "status": "published",
+    }, headers={"X-User-Id": str(admin_user["id"])})
+    data = resp.json()
+    assert data["success_count"] == 3
+    assert data["failed_ids"] == [999]
+    assert all(client.get(f"/api/posts/{i}").json()["status"] == "published" for i in ids)
+
+
+def test_resources_bulk_paths_set_extension(db_session):
+    ids = crud.resources.create_many(db_session, rows=[
+        {"filename": "Deck.PDF"}, {"filename": "README"},
+    ])
+    crud.resources.update_many(db_session, rows=[
+        {"id": ids[1], "filename": "notes.md"}, {"id": ids[0], "display_name": "Deck"},
+    ])
+    rows = db_session.query(Resource).order_by(Resource.id).all()
+    assert [(r.filename, r.extension) for r in rows] == [("Deck.PDF", "pdf"), ("notes.md", "md")]
@@ -8,14 +8,18 @@ Covers:
 - TC-CLOSE-001: Pre-phase warn on close — warn condition allows close
 - TC-CLOSE-002: Pre-phase deny on close — deny condition blocks close
 - TC-CLOSE-010: flag_disqualified — teams below min_team_size are flagged
+- TC-CLOSE-011: flag_disqualified — matches the per-row implementation, set-based
 - TC-CLOSE-020: compute_ranking — posts ranked by average_rating
+- TC-CLOSE-021: compute_ranking — tie modes, eligibility, re-ranking, large events
 - TC-CLOSE-022: Null rating excluded from ranking
 - TC-CLOSE-030: award_certificate — certificate posts created for ranked submissions
+- TC-CLOSE-031: award_certificate — bulk issuance in one transaction, idempotent reruns
 - TC-CLOSE-040: Full closure flow (flag + rank + award in sequence)
 - TC-CLOSE-900: Non-closed status transition does not trigger post hooks
 - TC-CLOSE-901: No rules attached — close succeeds with no side effects
 - TC-CLOSE-902: Post-hook failure does not rollback main operation
 """
+import pytest
 
 
 # ---------------------------------------------------------------------------
@@ -319,6 +323,152 @@ def test_close_010_flag_disqualified_team_too_small(client):
     assert "team_too_small" not in tags_b, f"Team B should not be flagged: {tags_b}"
 
 
+# ---------------------------------------------------------------------------
+# TC-CLOSE-011: flag_disqualified equivalence and scale
+# ---------------------------------------------------------------------------
+
+def _legacy_flag_disqualified(db, params, context):
+    """flag_disqualified as it was before it became set-based (reference only)."""
+    from app import crud
+    event_id = context.get("event_id")
+    if not event_id:
+        return
+    target = params.get("target", "group")
+    tag = params.get("tag", "disqualified")
+
+    def flag(post):
+        current_tags = post.tags or []
+        if isinstance(current_tags, str):
+            current_tags = [current_tags]
+        if tag not in current_tags:
+            post.tags = [*current_tags, tag]
+
+    rels = crud.event_posts.get_multi_by_category(db, event_id=event_id, relation_type="submission")
+    if target == "group":
+        rule = context.get("rule")
+        min_size = rule.min_team_size if rule else None
+        if min_size is None:
+            return
+        for cg in crud.event_groups.get_multi_by_category(db, event_id=event_id):
+            if crud.members.count_by_group(db, group_id=cg.group_id, status="accepted") < min_size:
+                for member in crud.members.get_multi_by_group(db, group_id=cg.group_id):
+                    for rel in rels:
+                        post = crud.posts.get(db, id=rel.post_id)
+                        if post and post.created_by == member.user_id:
+                            flag(post)
+    elif target == "post":
+        for rel in rels:
+            post = crud.posts.get(db, id=rel.post_id)
+            if post and tag == "missing_attachment" and not crud.post_resources.get_multi_by_post(db, post_id=post.id):
+                flag(post)
+    db.flush()
+
+
+def _seed_disqualification_world(db):
+    """Event 1 with four registered teams of varying size and their members' submissions.
+
+    Team 1: 3 accepted. Team 2: 1 accepted + 1 pending. Team 3: only a pending
+    member. Team 4: 2 accepted. Team 5 (not registered): 1 accepted. Users 1-9
+    each own one submission; user 2 also submitted to event 2; user 8's post is
+    deleted; posts 1, 4 and 6 have attachments.
+    """
+    from datetime import datetime, timezone
+    from app.models.event_group import EventGroup
+    from app.models.event_post import EventPost
+    from app.models.member import Member
+    from app.models.post import Post
+    from app.models.post_resource import PostResource
+    from app.models.resource import Resource
+    members = {1: [(1, "accepted"), (2, "accepted"), (3, "accepted")],
+               2: [(4, "accepted"), (5, "pending")],
+               3: [(6, "pending")],
+               4: [(7, "accepted"), (8, "accepted")],
+               5: [(9, "accepted")]}
+    db.add_all(Member(group_id=g, user_id=u, status=st) for g, rows in members.items() for u, st in rows)
+    db.add_all(EventGroup(event_id=1, group_id=g) for g in (1, 2, 3, 4))
+    tags = {4: ["ai", "team_too_small"], 5: "solo"}
+    deleted = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    db.add_all(Post(id=u, title=f"S{u}", created_by=u, tags=tags.get(u, []),
+                    deleted_at=deleted if u == 8 else None) for u in range(1, 10))
+    db.add(Post(id=10, title="Other event", created_by=2, tags=[]))
+    db.add_all(EventPost(event_id=1, post_id=u, relation_type="submission") for u in range(1, 10))
+    db.add(EventPost(event_id=2, post_id=10, relation_type="submission"))
+    db.add(Resource(id=1, filename="deck.pdf"))
+    db.add_all(PostResource(post_id=p, resource_id=1) for p in (1, 4, 6))
+    db.commit()
+
+
+def _all_tags(db):
+    from app.models.post import Post
+    db.expire_all()
+    return {p.id: p.tags for p in db.query(Post).order_by(Post.id)}
+
+
+@pytest.mark.parametrize("params, min_team_size", [
+    ({"target": "group", "tag": "team_too_small"}, 2),
+    ({"target": "group"}, 3),
+    ({"target": "group"}, 0),
+    ({"target": "group"}, None),
+    ({"target": "post", "tag": "missing_attachment"}, None),
+    ({"target": "post", "tag": "unknown_check"}, None),
+    ({"target": "elsewhere"}, 2),
+])
+def test_close_011_flag_disqualified_matches_per_row(db_session, params, min_team_size):
+    from types import SimpleNamespace
+    from app.models.post import Post
+    from app.services.rule_engine import _action_flag_disqualified
+    _seed_disqualification_world(db_session)
+    context = {"event_id": 1, "rule": SimpleNamespace(min_team_size=min_team_size)}
+    before = _all_tags(db_session)
+
+    _legacy_flag_disqualified(db_session, params, context)
+    expected = _all_tags(db_session)
+    for post_id, tags in before.items():
+        db_session.get(Post, post_id).tags = tags
+    db_session.commit()
+
+    _action_flag_disqualified(db_session, params, context)
+    assert _all_tags(db_session) == expected
+
+
+def test_close_011_flag_disqualified_is_set_based(db_session):
+    """Hundreds of teams: one SELECT and one UPDATE per target; reruns write nothing."""
+    from types import SimpleNamespace
+    from sqlalchemy import event as sa_event
+    from app import crud
+    from app.models.event_group import EventGroup
+    from app.models.member import Member
+    from app.services.rule_engine import _action_flag_disqualified
+    # Team g has g % 3 + 1 accepted members, each with one submission
+    rows = [(g, g * 10 + k) for g in range(1, 301) for k in range(g % 3 + 1)]
+    db_session.add_all(Member(group_id=g, user_id=u, status="accepted") for g, u in rows)
+    db_session.add_all(EventGroup(event_id=1, group_id=g) for g in range(1, 301))
+    ids = crud.posts.create_many(db_session, rows=[{"title": f"S{u}", "created_by": u} for _, u in rows])
+    crud.event_posts.create_many(db_session, rows=[
+        {"event_id": 1, "post_id": post_id, "relation_type": "submission"} for post_id in ids
+    ])
+
+    context = {"event_id": 1, "rule": SimpleNamespace(min_team_size=3)}
+    statements = []
+    listener = lambda *args: statements.append(args[2].split()[0])  # noqa: E731
+    sa_event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        for params in ({"target": "group"}, {"target": "post", "tag": "missing_attachment"}):
+            statements.clear()
+            _action_flag_disqualified(db_session, params, context)
+            assert statements.count("SELECT") == 1 and statements.count("UPDATE") == 1, params
+            statements.clear()
+            _action_flag_disqualified(db_session, params, context)
+            assert "UPDATE" not in statements
+    finally:
+        sa_event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    tags = _all_tags(db_session)
+    flagged = {post_id for post_id, t in tags.items() if "disqualified" in t}
+    assert flagged == {post_id for post_id, (g, _) in zip(ids, rows) if g % 3 != 2}
+    assert all("missing_attachment" in t for t in tags.values())
+
+
 # ---------------------------------------------------------------------------
 # TC-CLOSE-020: compute_ranking by average_rating
 # ---------------------------------------------------------------------------
@@ -401,6 +551,78 @@ def test_close_020_compute_ranking_by_average_rating(client):
     assert "rank_3" in tags_c, f"Post C (78.0) should be rank_3, got tags: {tags_c}"
 
 
+# ---------------------------------------------------------------------------
+# TC-CLOSE-021: compute_ranking tie modes, eligibility and scale
+# ---------------------------------------------------------------------------
+
+def _seed_ranked_event(db, scores, tags=None):
+    """Submissions with the given average_rating values in event 1; returns post ids."""
+    from app import crud
+    tags = tags or {}
+    ids = crud.posts.create_many(db, rows=[
+        {"title": f"S{i}", "average_rating": score, "tags": tags.get(i, []), "created_by": i + 1}
+        for i, score in enumerate(scores)
+    ])
+    crud.event_posts.create_many(db, rows=[
+        {"event_id": 1, "post_id": post_id, "relation_type": "submission"} for post_id in ids
+    ])
+    return ids
+
+
+def _rank_tags(db, ids, prefix="rank_"):
+    from app.models.post import Post
+    db.expire_all()
+    tags = {p.id: p.tags for p in db.query(Post).filter(Post.id.in_(ids))}
+    return [next((t for t in tags[i] if t.startswith(prefix)), None) for i in ids]
+
+
+def test_close_021_ranking_tie_modes(db_session):
+    from app.services.rule_engine import _action_compute_ranking
+    ids = _seed_ranked_event(db_session, [90, 95, 90, 80, None])
+    _action_compute_ranking(db_session, {}, {"event_id": 1})
+    assert _rank_tags(db_session, ids) == ["rank_2", "rank_1", "rank_2", "rank_4", None]
+
+    _action_compute_ranking(db_session, {"tie_mode": "dense"}, {"event_id": 1})
+    assert _rank_tags(db_session, ids) == ["rank_2", "rank_1", "rank_2", "rank_3", None]
+
+    _action_compute_ranking(db_session, {"order": "asc", "output_tag_prefix": "pos_"}, {"event_id": 1})
+    assert _rank_tags(db_session, ids, "pos_") == ["pos_2", "pos_4", "pos_2", "pos_1", None]
+
+
+def test_close_021_ranking_keeps_other_tags_and_skips_disqualified(db_session):
+    from app.services.rule_engine import _action_compute_ranking
+    ids = _seed_ranked_event(db_session, [70, 60, 50], tags={
+        0: ["ai", "rank_9"], 1: ["disqualified"], 2: "solo",
+    })
+    _action_compute_ranking(db_session, {}, {"event_id": 1})
+    db_session.expire_all()
+    from app.models.post import Post
+    assert db_session.get(Post, ids[0]).tags == ["ai", "rank_1"]
+    assert db_session.get(Post, ids[1]).tags == ["disqualified"]
+    assert db_session.get(Post, ids[2]).tags == ["solo", "rank_2"]
+
+
+def test_close_021_ranking_is_set_based(db_session):
+    """More than the old 100-row page, one ranking query and one UPDATE; reruns write nothing."""
+    from sqlalchemy import event as sa_event
+    from app.services.rule_engine import _action_compute_ranking
+    ids = _seed_ranked_event(db_session, [float(i % 150) for i in range(300)])
+    statements = []
+    listener = lambda *args: statements.append(args[2].split()[0])  # noqa: E731
+    sa_event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        _action_compute_ranking(db_session, {}, {"event_id": 1})
+        assert statements.count("SELECT") == 1 and statements.count("UPDATE") == 1
+        statements.clear()
+        _action_compute_ranking(db_session, {}, {"event_id": 1})
+        assert "UPDATE" not in statements
+    finally:
+        sa_event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+    ranks = _rank_tags(db_session, ids)
+    assert ranks[149] == ranks[299] == "rank_1"
+    assert ranks[0] == ranks[150] == "rank_299"
+
+
 # ---------------------------------------------------------------------------
 # TC-CLOSE-022: Null rating excluded from ranking
 # ---------------------------------------------------------------------------
@@ -570,6 +792,101 @@ def test_close_030_award_certificate(client):
     assert "Silver Award" in combined, f"Expected Silver Award in: {cert_titles}"
 
 
+# ---------------------------------------------------------------------------
+# TC-CLOSE-031: award_certificate bulk issuance and reruns
+# ---------------------------------------------------------------------------
+
+AWARD_RULES = {"rules": [
+    {"rank_range": [1, 1], "title": "Gold"},
+    {"rank_range": [2, 3], "title": "Silver"},
+    {"rank_range": [1, 10], "title": "Finalist"},
+]}
+
+
+def _certificates(db):
+    from app.models.event_post import EventPost
+    from app.models.post import Post
+    db.expire_all()
+    return sorted(db.query(Post.title, Post.created_by, Post.content).join(
+        EventPost, EventPost.post_id == Post.id,
+    ).filter(
+        EventPost.event_id == 1, EventPost.relation_type == "reference", Post.type == "certificate",
+    ))
+
+
+def test_close_031_award_certificate_first_matching_rule(db_session):
+    from app.services.rule_engine import _action_award_certificate
+    _seed_ranked_event(db_session, [0] * 5, tags={
+        0: ["rank_1"], 1: ["ai", "rank_3"], 2: ["rank_x", "rank_7"], 3: ["rank_11"], 4: ["ai"],
+    })
+    _action_award_certificate(db_session, AWARD_RULES, {"event_id": 1})
+    assert _certificates(db_session) == [
+        ("Finalist — S2", 3, "Certificate awarded for rank 7"),
+        ("Gold — S0", 1, "Certificate awarded for rank 1"),
+        ("Silver — S1", 2, "Certificate awarded for rank 3"),
+    ]
+
+
+def test_close_031_award_certificate_rerun_is_idempotent(db_session):
+    from app.services.rule_engine import _action_award_certificate
+    ids = _seed_ranked_event(db_session, [0] * 3, tags={0: ["rank_1"], 1: ["rank_2"]})
+    _action_award_certificate(db_session, AWARD_RULES, {"event_id": 1})
+    first = _certificates(db_session)
+    _action_award_certificate(db_session, AWARD_RULES, {"event_id": 1})
+    assert _certificates(db_session) == first
+
+    # A newly ranked submission is awarded on the next run, the others are not re-issued
+    from app.models.post import Post
+    db_session.get(Post, ids[2]).tags = ["rank_2"]
+    db_session.commit()
+    _action_award_certificate(db_session, AWARD_RULES, {"event_id": 1})
+    assert _certificates(db_session) == sorted([*first, ("Silver — S2", 3, "Certificate awarded for rank 2")])
+
+
+def test_close_031_award_certificate_keyed_on_ranked_post(db_session):
+    """One certificate per ranked submission: same submitter and title still count twice,
+    renamed awards are not re-issued."""
+    from app.models.post import Post
+    from app.models.post_post import PostPost
+    from app.services.rule_engine import _action_award_certificate
+    ids = _seed_ranked_event(db_session, [0] * 2, tags={0: ["rank_1"], 1: ["rank_2"]})
+    for post_id in ids:
+        post = db_session.get(Post, post_id)
+        post.title, post.created_by = "Same", 1
+    db_session.commit()
+    _action_award_certificate(db_session, {"rules": [{"rank_range": [1, 2], "title": "Prize"}]}, {"event_id": 1})
+    first = _certificates(db_session)
+    assert first == [("Prize — Same", 1, "Certificate awarded for rank 1"),
+                     ("Prize — Same", 1, "Certificate awarded for rank 2")]
+    assert sorted(t for t, in db_session.query(PostPost.target_post_id)) == ids
+
+    _action_award_certificate(db_session, {"rules": [{"rank_range": [1, 2], "title": "Award"}]}, {"event_id": 1})
+    assert _certificates(db_session) == first
+
+
+def test_close_031_award_certificate_is_one_transaction(db_session):
+    """Thousands of winners: two SELECTs, batched INSERTs, a single commit."""
+    from sqlalchemy import event as sa_event
+    from app.services.rule_engine import _action_award_certificate
+    _seed_ranked_event(db_session, [0] * 2000, tags={i: [f"rank_{i + 1}"] for i in range(2000)})
+    statements, commits = [], []
+    bind = db_session.get_bind()
+    listener = lambda *args: statements.append(args[2].split()[0])  # noqa: E731
+    on_commit = lambda conn: commits.append(conn)  # noqa: E731
+    sa_event.listen(bind, "before_cursor_execute", listener)
+    sa_event.listen(bind, "commit", on_commit)
+    try:
+        _action_award_certificate(db_session, {"rules": [{"rank_range": [1, 2000], "title": "Award"}]},
+                                  {"event_id": 1})
+    finally:
+        sa_event.remove(bind, "before_cursor_execute", listener)
+        sa_event.remove(bind, "commit", on_commit)
+    assert statements.count("SELECT") == 2
+    assert 2 <= statements.count("INSERT") <= 10
+    assert len(commits) == 1
+    assert len(_certificates(db_session)) == 2000
+
+
 # ---------------------------------------------------------------------------
 # TC-CLOSE-040: Full closure flow (flag + rank + award)
 # ---------------------------------------------------------------------------
@@ -0,0 +1,137 @@
+"""Database connection profile tests"""
+import pytest
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import Settings
+from app.database import (
+    Base,
+    TimedQueuePool,
+    _script_heads,
+    apply_sqlite_pragmas,
+    create_db_engine,
+    get_pool_stats,
+    init_db,
+    optimize_database,
+)
+
+
+def _pragma(conn, name):
+    return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_sqlite_profile_applied_on_connect(tmp_path):
+    profile = Settings(sqlite_mmap_size=1_048_576, sqlite_cache_size=-2048, sqlite_busy_timeout=1234)
+    engine = create_engine(f"sqlite:///{tmp_path}/profile.db")
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, profile)
+
+    with engine.connect() as conn:
+        assert _pragma(conn, "journal_mode") == "wal"
+        assert _pragma(conn, "synchronous") == 1  # NORMAL
+        assert _pragma(conn, "mmap_size") == 1_048_576
+        assert _pragma(conn, "cache_size") == -2048
+        assert _pragma(conn, "temp_store") == 2  # MEMORY
+        assert _pragma(conn, "busy_timeout") == 1234
+    optimize_database(engine)
+    engine.dispose()
+
+
+def test_sqlite_profile_settings_from_env(monkeypatch):
+    monkeypatch.setenv("SQLITE_JOURNAL_MODE", "delete")
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "full")
+    s = Settings()
+    assert s.sqlite_journal_mode == "delete"
+    assert s.sqlite_synchronous == "full"
+
+
+def test_engine_factory_honors_url_and_pool_settings(tmp_path):
+    profile = Settings(db_pool_size=3, db_max_overflow=1, db_pool_timeout=0.5)
+    engine = create_db_engine(f"sqlite:///{tmp_path}/factory.db", profile=profile)
+    assert engine.url.database == f"{tmp_path}/factory.db"
+    assert isinstance(engine.pool, TimedQueuePool)
+    assert engine.pool.size() == 3
+
+    conn = engine.connect()
+    stats = get_pool_stats(engine)
+    assert stats["checked_out"] == 1
+    assert stats["wait_count"] == 1
+    assert stats["max_overflow"] == 1
+    conn.close()
+    assert get_pool_stats(engine)["checked_out"] == 0
+    engine.dispose()
+
+
+def test_engine_factory_read_only(tmp_path):
+    path = tmp_path / "ro.db"
+    rw = create_db_engine(f"sqlite:///{path}")
+    with rw.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+    rw.dispose()
+
+    ro = create_db_engine(f"sqlite:///{path}", read_only=True)
+    with ro.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM t").scalar() == 0
+        with pytest.raises(OperationalError):
+            conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+    ro.dispose()
+
+
+def test_engine_factory_in_memory_skips_queue_pool():
+    engine = create_db_engine("sqlite://")
+    assert not isinstance(engine.pool, TimedQueuePool)
+    assert get_pool_stats(engine)["pool_class"] == type(engine.pool).__name__
+
+
+def test_admin_pool_stats_endpoint(client, admin_user, participant_user):
+    resp = client.get("/api/admin/db/pool", headers={"X-User-Id": str(admin_user["id"])})
+    assert resp.status_code == 200
+    assert "pool_class" in resp.json()
+    resp = client.get("/api/admin/db/pool", headers={"X-User-Id": str(participant_user["id"])})
+    assert resp.status_code == 403
+
+
+def _version(engine):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+
+
+def test_init_db_creates_then_takes_fast_path(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/nested/dir/init.db")
+    assert init_db(engine) == "created"
+    assert {_version(engine)} == _script_heads()
+    assert "posts_fts" in inspect(engine).get_table_names()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert init_db(engine) == "current"
+    assert not any(sql.lstrip().upper().startswith("CREATE") for sql in statements)
+    engine.dispose()
+
+
+def test_init_db_upgrades_unversioned_database(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/legacy.db")
+    # A database from a release that only ran create_all at import, minus a later index
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_posts_live_created")
+    assert init_db(engine) == "upgraded"
+    assert {_version(engine)} == _script_heads()
+    assert "ix_posts_live_created" in {ix["name"] for ix in inspect(engine).get_indexes("posts")}
+    assert init_db(engine) == "current"
+    engine.dispose()
+
+
+def test_init_db_upgrades_behind_database(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path}/behind.db")
+    init_db(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_notifications_user_created")
+        conn.exec_driver_sql("UPDATE alembic_version SET version_num = 'c4e8a1b2d3f5'")
+    assert init_db(engine) == "upgraded"
+    assert "ix_notifications_user_created" in {
+        ix["name"] for ix in inspect(engine).get_indexes("notifications")
+    }
+    engine.dispose()
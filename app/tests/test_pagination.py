@@ -0,0 +1,130 @@
+"""Keyset (cursor) pagination on list endpoints"""
+from datetime import datetime
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, select
+
+from app.crud.notifications import notifications as notification_crud
+from app.crud.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset
+from app.database import BASE_DIR, Base
+from app.tests.test_query_plans import _capture_selects
+
+import pytest
+
+
+def _walk(client, path, headers=None, **params):
+    """Follow next_cursor until the last page; returns the ids in order and the page count."""
+    ids, pages, cursor = [], 0, None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        data = client.get(path, params=query, headers=headers).json()
+        ids += [item["id"] for item in data["items"]]
+        pages += 1
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+def test_cursor_walk_matches_offset_order(client, participant_user):
+    headers = {"X-User-Id": str(participant_user["id"])}
+    # Created within the same second: created_at ties are broken by id
+    created = [
+        client.post("/api/posts", json={"title": f"p{i}", "status": "published"}, headers=headers).json()["id"]
+        for i in range(7)
+    ]
+    ids, pages = _walk(client, "/api/posts", limit=3)
+    assert ids == created
+    assert pages == 3
+    offset_ids = [p["id"] for p in client.get("/api/posts", params={"skip": 3, "limit": 3}).json()["items"]]
+    assert offset_ids == created[3:6]
+
+
+def test_with_total_false_skips_count(client, db_session, participant_user):
+    headers = {"X-User-Id": str(participant_user["id"])}
+    client.post("/api/posts", json={"title": "p", "status": "published"}, headers=headers)
+    with _capture_selects(db_session) as statements:
+        data = client.get("/api/posts", params={"with_total": "false"}).json()
+    assert data["total"] is None
+    assert data["next_cursor"] is None
+    assert len(data["items"]) == 1
+    assert not any("count(" in sql.lower() for sql, _ in statements)
+    assert client.get("/api/posts").json()["total"] == 1
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!", encode_cursor([1]), encode_cursor([{"a": 1}, 2]), "e30", encode_cursor(["yesterday", 2]),
+])
+def test_invalid_cursor_is_422(client, cursor):
+    resp = client.get("/api/posts", params={"cursor": cursor})
+    assert resp.status_code == 422
+    assert resp.json() == {"detail": "Invalid cursor"}
+
+
+def test_cursor_roundtrip():
+    cursor = encode_cursor(["2026-01-01 10:00:00", 42])
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == ["2026-01-01 10:00:00", 42]
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, 3)
+
+
+def test_datetime_keys_compare_natively_off_sqlite():
+    from sqlalchemy.dialects import postgresql, sqlite
+    from app.models.post import Post
+    cursor = encode_cursor(["2026-01-01 10:00:00", 7])
+    stmt = keyset(select(Post), (Post.created_at, Post.id), cursor=cursor, limit=5)
+    cases = [(postgresql.dialect(), datetime(2026, 1, 1, 10)), (sqlite.dialect(), "2026-01-01 10:00:00")]
+    for dialect, expected in cases:
+        compiled = stmt.compile(dialect=dialect)
+        key = next(b for b in compiled.binds.values() if b.value == "2026-01-01 10:00:00")
+        process = key.type.bind_processor(dialect)
+        assert (process(key.value) if process else key.value) == expected
+    # No text cast: PostgreSQL orders and compares the timestamp itself
+    assert "CAST" not in str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_notifications_newest_first(client, db_session, participant_user):
+    headers = {"X-User-Id": str(participant_user["id"])}
+    created = [
+        notification_crud.create(db_session, user_id=participant_user["id"], type="system", content=f"n{i}").id
+        for i in range(5)
+    ]
+    ids, pages = _walk(client, "/api/notifications", headers=headers, limit=2)
+    assert ids == created[::-1]
+    assert pages == 3
+
+
+def test_group_members_and_my_groups_cursor(client, organizer_user, participant_user):
+    org = {"X-User-Id": str(organizer_user["id"])}
+    groups = [
+        client.post("/api/groups", json={"name": f"g{i}", "visibility": "public"}, headers=org).json()["id"]
+        for i in range(3)
+    ]
+    ids, _ = _walk(client, "/api/groups", limit=2)
+    assert ids == groups
+    mine, pages = _walk(client, "/api/my/groups", headers=org, limit=2)
+    assert mine == groups
+    assert pages == 2
+
+
+def test_migration_adds_keyset_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/keyset.db")
+    Base.metadata.create_all(bind=engine)
+    names = ["ix_posts_live_created", "ix_events_live_created", "ix_groups_live_created",
+             "ix_notifications_user_created"]
+    with engine.begin() as conn:
+        for name in names:
+            conn.exec_driver_sql(f"DROP INDEX {name}")
+
+    cfg = Config(str(BASE_DIR / "alembic.ini"))
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.stamp(cfg, "c4e8a1b2d3f5")
+        command.upgrade(cfg, "d5f9b3c6e7a2")
+
+    inspector = inspect(engine)
+    indexes = {ix["name"] for table in ("posts", "events", "groups", "notifications")
+               for ix in inspector.get_indexes(table)}
+    assert set(names) <= indexes
+    engine.dispose()
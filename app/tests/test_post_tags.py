@@ -0,0 +1,68 @@
+"""post_tags — trigger sync with Post.tags, migration backfill, index usage"""
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, select, update
+
+from app.database import BASE_DIR, Base
+from app.models.post import Post
+from app.models.post_tag import PostTag, drop_post_tag_triggers
+
+
+def _tags(db, post_id):
+    return sorted(db.execute(
+        select(PostTag.tag_normalized).where(PostTag.post_id == post_id)
+    ).scalars())
+
+
+def test_post_tags_follow_post_writes(db_session):
+    post = Post(title="P", tags=["AI", " Demo ", "ai", ""])
+    db_session.add(post)
+    db_session.commit()
+    assert _tags(db_session, post.id) == ["ai", "demo"]
+
+    # Rule-engine style rewrite of the whole list
+    post.tags = ["demo", "rank_1"]
+    db_session.commit()
+    assert _tags(db_session, post.id) == ["demo", "rank_1"]
+
+    # Core bulk UPDATE bypasses the ORM but not the triggers
+    db_session.execute(update(Post).where(Post.id == post.id).values(tags=["web3"]))
+    db_session.commit()
+    assert _tags(db_session, post.id) == ["web3"]
+
+    db_session.delete(post)
+    db_session.commit()
+    assert _tags(db_session, post.id) == []
+
+
+def test_tag_filter_uses_index(db_session):
+    raw = db_session.connection().connection.driver_connection
+    plan = [row[-1] for row in raw.execute(
+        "EXPLAIN QUERY PLAN SELECT post_id FROM post_tags WHERE tag_normalized IN ('ai', 'demo')"
+    )]
+    assert any("ix_post_tags_tag_post" in detail for detail in plan)
+
+
+def test_migration_backfills_post_tags(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/tags.db")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        drop_post_tag_triggers(conn)
+        PostTag.__table__.drop(conn)
+        conn.execute(Post.__table__.insert(), [
+            {"title": "a", "type": "general", "status": "published", "visibility": "public",
+             "like_count": 0, "comment_count": 0, "tags": ["AI", "demo"]},
+            {"title": "b", "type": "general", "status": "published", "visibility": "public",
+             "like_count": 0, "comment_count": 0, "tags": None},
+        ])
+
+    cfg = Config(str(BASE_DIR / "alembic.ini"))
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.stamp(cfg, "b7d2e9f4a1c8")
+        command.upgrade(cfg, "c4e8a1b2d3f5")
+
+    with engine.connect() as conn:
+        rows = conn.execute(select(PostTag.post_id, PostTag.tag_normalized).order_by(PostTag.tag_normalized)).all()
+    assert rows == [(1, "ai"), (1, "demo")]
+    engine.dispose()
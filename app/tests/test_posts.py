@@ -315,6 +315,44 @@ def test_list_posts_filter_by_tags(client):
     assert titles == {"AI Post", "Web3 Post"}
 
 
+def test_list_posts_filter_by_tags_all(client):
+    uid = _create_user(client)
+    _create_post(client, uid, title="AI Demo", status="published", tags=["AI", "demo"])
+    _create_post(client, uid, title="AI Only", status="published", tags=["ai"])
+
+    resp = client.get("/api/posts?tags=ai,Demo&tags_mode=all")
+    assert resp.status_code == 200
+    assert [p["title"] for p in resp.json()["items"]] == ["AI Demo"]
+    assert client.get("/api/posts?tags=ai&tags_mode=some").status_code == 422
+
+
+def test_post_tag_facets(client):
+    uid = _create_user(client)
+    _create_post(client, uid, title="P1", status="published", tags=["ai", "demo"])
+    _create_post(client, uid, title="P2", status="published", tags=["AI"])
+    _create_post(client, uid, title="Hidden", status="draft", tags=["ai", "secret"])
+
+    resp = client.get("/api/posts/tag-facets")
+    assert resp.status_code == 200
+    assert resp.json()["items"] == [{"tag": "ai", "count": 2}, {"tag": "demo", "count": 1}]
+
+    # Facets respect the list filters (drill-down)
+    resp = client.get("/api/posts/tag-facets?tags=demo")
+    assert resp.json()["items"] == [{"tag": "ai", "count": 1}, {"tag": "demo", "count": 1}]
+    # Author sees their own drafts
+    resp = client.get("/api/posts/tag-facets?limit=1", headers={"X-User-Id": str(uid)})
+    assert resp.json()["items"] == [{"tag": "ai", "count": 3}]
+
+
+def test_post_tag_triggers_refuse_unsupported_dialect():
+    from types import SimpleNamespace
+    import pytest
+    from app.models.post_tag import create_post_tag_triggers
+    mysql = SimpleNamespace(dialect=SimpleNamespace(name="mysql"))
+    with pytest.raises(RuntimeError, match="mysql"):
+        create_post_tag_triggers(mysql)
+
+
 def test_list_posts_filter_by_q(client):
     uid = _create_user(client)
     _create_post(client, uid, title="Build a LLM Agent", status="published", content="hello world", tags=["ai"])
@@ -0,0 +1,145 @@
+"""Query plan regression tests — hot queries must use an index, not a full table scan
+
+Each case runs real code from crud/, services/ or the routers, captures the SELECT
+statements it issues and checks SQLite's EXPLAIN QUERY PLAN for a bare ``SCAN <table>``.
+"""
+import re
+from contextlib import contextmanager
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, inspect
+
+from app import crud
+from app.database import BASE_DIR, Base
+from app.services.cascade_delete import _collect_interaction_tree
+from app.services.rule_engine import _eval_aggregate, _eval_count, _eval_exists
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@contextmanager
+def _capture_selects(db):
+    statements = []
+    bind = db.get_bind()
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", _before)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", _before)
+
+
+def _full_scans(db, statements) -> list[str]:
+    raw = db.connection().connection.driver_connection
+    scans = []
+    for statement, parameters in statements:
+        for row in raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters):
+            detail = row[-1]
+            if FULL_SCAN.match(detail):
+                scans.append(f"{detail}  <-  {' '.join(statement.split())}")
+    return scans
+
+
+CRUD_CASES = {
+    "posts.get": lambda db: crud.posts.get(db, id=1),
+    "members.get_multi_by_group": lambda db: crud.members.get_multi_by_group(db, group_id=1, status="accepted"),
+    "members.get_page_by_group": lambda db: crud.members.get_page_by_group(db, group_id=1, status="accepted"),
+    "members.count_by_group": lambda db: crud.members.count_by_group(db, group_id=1, status="accepted"),
+    "members.get_multi_by_user": lambda db: crud.members.get_multi_by_user(db, user_id=1, status="accepted"),
+    "user_users.get_following": lambda db: crud.user_users.get_following(db, user_id=1),
+    "user_users.count_followers": lambda db: crud.user_users.count_followers(db, user_id=1),
+    "user_users.is_mutual_follow": lambda db: crud.user_users.is_mutual_follow(db, user_a=1, user_b=2),
+    "event_events.get_multi_by_source": lambda db: crud.event_events.get_multi_by_source(
+        db, source_event_id=1, relation_type="stage",
+    ),
+    "event_posts.count_submissions_by_user": lambda db: crud.event_posts.count_submissions_by_user(
+        db, event_id=1, user_id=1,
+    ),
+    "target_interactions.get_multi_by_target": lambda db: crud.target_interactions.get_multi_by_target(
+        db, target_type="post", target_id=1, interaction_type="comment",
+    ),
+    "target_interactions.has_like_by_user": lambda db: crud.target_interactions.has_like_by_user(
+        db, target_type="post", target_id=1, user_id=1,
+    ),
+    "target_interactions.count_by_target_and_type": lambda db: crud.target_interactions.count_by_target_and_type(
+        db, target_type="post", target_id=1, interaction_type="like",
+    ),
+    "target_interactions.get_likes_by_user": lambda db: crud.target_interactions.get_likes_by_user(db, user_id=1),
+    "notifications.get_multi_by_user": lambda db: crud.notifications.get_multi_by_user(db, user_id=1, is_read=False),
+    "notifications.get_page_by_user": lambda db: crud.notifications.get_page_by_user(
+        db, user_id=1, cursor="WyIyMDI2LTAxLTAxIDAwOjAwOjAwIiwxMF0",
+    ),
+    "notifications.count_unread": lambda db: crud.notifications.count_unread(db, user_id=1),
+    "cascade_delete._collect_interaction_tree": lambda db: _collect_interaction_tree(db, 1),
+    "rule_engine.count(event_post)": lambda db: _eval_count(
+        db, {"entity": "event_post", "filter": {"relation_type": "submission"}}, {"event_id": 1},
+    ),
+    "rule_engine.exists(event_post)": lambda db: _eval_exists(
+        db, {"entity": "event_post", "filter": {"relation_type": "submission"}}, {"event_id": 1, "user_id": 1},
+    ),
+    "rule_engine.exists(event_group, user_group)": lambda db: _eval_exists(
+        db, {"entity": "event_group", "scope": "user_group"}, {"event_id": 1, "user_id": 1},
+    ),
+    "rule_engine.aggregate(each_group_in_category)": lambda db: _eval_aggregate(
+        db, {"scope": "each_group_in_category", "op": ">=", "value": 2, "filter": {"status": "accepted"}},
+        {"event_id": 1},
+    ),
+}
+
+
+@pytest.mark.parametrize("case", list(CRUD_CASES))
+def test_crud_queries_use_indexes(db_session, case):
+    with _capture_selects(db_session) as statements:
+        CRUD_CASES[case](db_session)
+    assert statements
+    assert _full_scans(db_session, statements) == []
+
+
+@pytest.mark.parametrize("path", [
+    "/api/posts?type=general&status=published",
+    "/api/posts?created_by=1",
+    "/api/events?type=competition&status=published",
+    "/api/groups/1/members?status=accepted",
+    "/api/users/1/followers",
+    "/api/users/1/following",
+    "/api/notifications?is_read=false",
+    "/api/posts?with_total=false&cursor=WyIyMDI2LTAxLTAxIDAwOjAwOjAwIiwxMF0",
+    "/api/groups?with_total=false&cursor=WyIyMDI2LTAxLTAxIDAwOjAwOjAwIiwxMF0",
+])
+def test_router_queries_use_indexes(client, db_session, participant_user, path):
+    headers = {"X-User-Id": str(participant_user["id"])}
+    with _capture_selects(db_session) as statements:
+        client.get(path, headers=headers)
+    assert statements
+    assert _full_scans(db_session, statements) == []
+
+
+def test_migration_adds_composite_indexes(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/migrate.db")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name.startswith("ix_") and len(index.expressions) > 1:
+                    conn.exec_driver_sql(f"DROP INDEX {index.name}")
+
+    cfg = Config(str(BASE_DIR / "alembic.ini"))
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.stamp(cfg, "833ddc5dc597")
+        command.upgrade(cfg, "a3f1c2d4e5b6")
+
+    indexes = {ix["name"] for ix in inspect(engine).get_indexes("posts")}
+    assert {"ix_posts_type_status_created", "ix_posts_created_by_created"} <= indexes
+    with engine.connect() as conn:
+        ddl = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE name = 'ix_posts_type_status_created'"
+        ).scalar()
+    assert "WHERE deleted_at IS NULL" in ddl
+    engine.dispose()
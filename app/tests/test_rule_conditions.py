@@ -0,0 +1,371 @@
+"""Rule-engine conditions compiled to single SQL statements
+
+The ``_legacy_*`` functions are the evaluators as they were before count/exists/
+aggregate/resource conditions became one COUNT / EXISTS / GROUP BY query each.
+They serve as the reference: every condition and context below must evaluate
+the same both ways (data stays under the old 100-row page size).
+"""
+from datetime import datetime, timezone
+from itertools import product
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, select
+from sqlalchemy import event as sa_event
+
+from app import crud
+from app.database import BASE_DIR, Base
+from app.models.event_group import EventGroup
+from app.models.event_post import EventPost
+from app.models.member import Member
+from app.models.post import Post
+from app.models.post_resource import PostResource
+from app.models.resource import Resource, file_extension
+from app.services.rule_engine import (
+    _compare,
+    _eval_aggregate,
+    _eval_count,
+    _eval_exists,
+    _eval_resource_format,
+    _eval_resource_required,
+)
+
+
+# --- Reference implementations (previous evaluators) ---
+
+def _legacy_count(db, params, context):
+    entity = params.get("entity", "")
+    scope = params.get("scope", "")
+    op = params.get("op", ">=")
+    value = params.get("value", 0)
+    filt = params.get("filter", {})
+    actual = 0
+    if entity == "event_post":
+        event_id = context.get("event_id")
+        user_id = context.get("user_id")
+        if event_id and scope == "user" and user_id:
+            actual = crud.event_posts.count_submissions_by_user(db, event_id=event_id, user_id=user_id)
+        elif event_id:
+            actual = len(crud.event_posts.get_multi_by_category(
+                db, event_id=event_id, relation_type=filt.get("relation_type"),
+            ))
+    elif entity == "group_user":
+        group_id = context.get("group_id")
+        if group_id and scope == "group":
+            actual = crud.members.count_by_group(db, group_id=group_id, status=filt.get("status"))
+    return _compare(actual, op, value)
+
+
+def _legacy_exists(db, params, context):
+    entity = params.get("entity", "")
+    scope = params.get("scope", "")
+    require = params.get("require", True)
+    filt = params.get("filter", {})
+    found = False
+    if entity == "post_resource":
+        post_id = context.get("post_id")
+        if post_id and scope == "post":
+            found = len(crud.post_resources.get_multi_by_post(db, post_id=post_id)) > 0
+    elif entity == "event_post":
+        user_id = context.get("user_id")
+        event_id = context.get("event_id")
+        if user_id and event_id:
+            rels = crud.event_posts.get_multi_by_category(
+                db, event_id=event_id, relation_type=filt.get("relation_type"),
+            )
+            for rel in rels:
+                post = crud.posts.get(db, id=rel.post_id)
+                if post and post.created_by == user_id:
+                    found = True
+                    break
+    elif entity == "event_group":
+        event_id = context.get("event_id")
+        if event_id:
+            rels = crud.event_groups.get_multi_by_category(db, event_id=event_id)
+            if scope == "user_group":
+                user_id = context.get("user_id")
+                if user_id:
+                    found = any(
+                        crud.members.get_by_group_and_user(db, group_id=rel.group_id, user_id=user_id)
+                        for rel in rels
+                    )
+            else:
+                found = len(rels) > 0
+    elif entity == "group_user":
+        user_id = context.get("user_id")
+        if user_id:
+            found = db.query(Member).filter(
+                Member.user_id == user_id, Member.status == filt.get("status", "accepted"),
+            ).count() > 0
+    elif entity == "post":
+        user_id = context.get("user_id")
+        if user_id and scope == "user":
+            q = db.query(Post).filter(Post.created_by == user_id, Post.deleted_at.is_(None))
+            if "type" in filt:
+                q = q.filter(Post.type == filt["type"])
+            if "status" in filt:
+                q = q.filter(Post.status == filt["status"])
+            found = q.first() is not None
+    return found if require else not found
+
+
+def _legacy_resource_format(db, params, context):
+    formats = params.get("formats", [])
+    require_any = params.get("require_any", False)
+    post_id = context.get("post_id")
+    if not post_id or not formats:
+        return True
+    rels = crud.post_resources.get_multi_by_post(db, post_id=post_id)
+    if not rels:
+        return True
+    for rel in rels:
+        resource = crud.resources.get(db, id=rel.resource_id)
+        if resource:
+            ext = file_extension(resource.filename) if resource.filename else ""
+            if require_any:
+                if ext.lower() in [f.lower() for f in formats]:
+                    return True
+            elif ext.lower() not in [f.lower() for f in formats]:
+                return False
+    return not require_any
+
+
+def _legacy_resource_required(db, params, context):
+    min_count = params.get("min_count", 1)
+    formats = params.get("formats")
+    post_id = context.get("post_id")
+    if not post_id:
+        return True
+    rels = crud.post_resources.get_multi_by_post(db, post_id=post_id)
+    if formats:
+        count = 0
+        for rel in rels:
+            resource = crud.resources.get(db, id=rel.resource_id)
+            if resource:
+                ext = file_extension(resource.filename) if resource.filename else ""
+                if ext.lower() in [f.lower() for f in formats]:
+                    count += 1
+        return count >= min_count
+    return len(rels) >= min_count
+
+
+def _legacy_aggregate(db, params, context):
+    scope = params.get("scope", "")
+    filt = params.get("filter", {})
+    op = params.get("op", ">=")
+    value = params.get("value", 0)
+    if scope == "each_group_in_category":
+        event_id = context.get("event_id")
+        if not event_id:
+            return True
+        for cg in crud.event_groups.get_multi_by_category(db, event_id=event_id):
+            count = crud.members.count_by_group(db, group_id=cg.group_id, status=filt.get("status"))
+            if not _compare(count, op, value):
+                return False
+    return True
+
+
+# --- Fixture data ---
+
+@pytest.fixture()
+def world(db_session):
+    """Two events; users 1-4; groups 1-3; posts with resources (some deleted)."""
+    deleted = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    db = db_session
+    db.add_all([
+        Post(id=1, title="a", created_by=1, type="general", status="published"),
+        Post(id=2, title="b", created_by=1, type="proposal", status="draft"),
+        Post(id=3, title="c", created_by=2, status="published"),
+        Post(id=4, title="d", created_by=3, deleted_at=deleted),
+        Post(id=5, title="e", created_by=2, type="proposal", status="published"),
+    ])
+    db.add_all([
+        EventPost(event_id=1, post_id=1, relation_type="submission"),
+        EventPost(event_id=1, post_id=2, relation_type="reference"),
+        EventPost(event_id=1, post_id=3, relation_type="submission"),
+        EventPost(event_id=1, post_id=4, relation_type="submission"),
+        EventPost(event_id=2, post_id=5, relation_type="submission"),
+    ])
+    db.add_all([
+        Member(group_id=1, user_id=1, role="owner", status="accepted"),
+        Member(group_id=1, user_id=2, role="member", status="accepted"),
+        Member(group_id=1, user_id=3, role="member", status="pending"),
+        Member(group_id=2, user_id=3, role="owner", status="accepted"),
+        Member(group_id=3, user_id=4, role="member", status="rejected"),
+    ])
+    db.add_all([
+        EventGroup(event_id=1, group_id=1),
+        EventGroup(event_id=1, group_id=2),
+        EventGroup(event_id=2, group_id=3),
+    ])
+    db.add_all([
+        Resource(id=1, filename="deck.PDF"),
+        Resource(id=2, filename="code.zip"),
+        Resource(id=3, filename="README"),
+        Resource(id=4, filename="old.exe", deleted_at=deleted),
+        Resource(id=5, filename="notes.pdf"),
+    ])
+    db.add_all([
+        PostResource(post_id=1, resource_id=1, position=0),
+        PostResource(post_id=1, resource_id=2, position=1),
+        PostResource(post_id=2, resource_id=3),
+        PostResource(post_id=3, resource_id=4),
+        PostResource(post_id=5, resource_id=1),
+        PostResource(post_id=5, resource_id=5),
+    ])
+    db.commit()
+    return db
+
+
+CONTEXTS = [
+    {"event_id": event_id, "user_id": user_id, "post_id": post_id, "group_id": group_id}
+    for event_id, user_id, post_id, group_id in product(
+        (None, 1, 2), (None, 1, 2, 3, 4), (None, 1, 2, 3, 5), (None, 1, 3),
+    )
+]
+
+COUNT_PARAMS = [
+    {"entity": "event_post", "scope": "user", "op": "<", "value": 1},
+    {"entity": "event_post", "scope": "user", "op": ">=", "value": 1},
+    {"entity": "event_post", "op": ">=", "value": 3, "filter": {"relation_type": "submission"}},
+    {"entity": "event_post", "op": "==", "value": 4},
+    {"entity": "group_user", "scope": "group", "op": ">=", "value": 2, "filter": {"status": "accepted"}},
+    {"entity": "group_user", "scope": "group", "op": "<", "value": 3},
+    {"entity": "unknown", "op": "==", "value": 0},
+]
+
+EXISTS_PARAMS = [
+    {"entity": "post_resource", "scope": "post"},
+    {"entity": "post_resource", "scope": "post", "require": False},
+    {"entity": "event_post"},
+    {"entity": "event_post", "filter": {"relation_type": "submission"}},
+    {"entity": "event_post", "filter": {"relation_type": "reference"}, "require": False},
+    {"entity": "event_group"},
+    {"entity": "event_group", "scope": "user_group"},
+    {"entity": "event_group", "scope": "user_group", "require": False},
+    {"entity": "group_user"},
+    {"entity": "group_user", "filter": {"status": "pending"}},
+    {"entity": "post", "scope": "user"},
+    {"entity": "post", "scope": "user", "filter": {"type": "proposal", "status": "published"}},
+    {"entity": "post", "scope": "user", "filter": {"status": "draft"}, "require": False},
+    {"entity": "unknown"},
+]
+
+FORMAT_PARAMS = [
+    {"formats": ["pdf"]},
+    {"formats": ["pdf", "zip"]},
+    {"formats": ["PDF", ""]},
+    {"formats": ["pdf"], "require_any": True},
+    {"formats": ["exe"], "require_any": True},
+    {"formats": []},
+]
+
+REQUIRED_PARAMS = [
+    {},
+    {"min_count": 2},
+    {"min_count": 2, "formats": ["pdf"]},
+    {"min_count": 1, "formats": ["zip", "exe"]},
+    {"min_count": 0, "formats": ["doc"]},
+]
+
+AGGREGATE_PARAMS = [
+    {"scope": "each_group_in_category", "op": ">=", "value": 1, "filter": {"status": "accepted"}},
+    {"scope": "each_group_in_category", "op": ">=", "value": 2, "filter": {"status": "accepted"}},
+    {"scope": "each_group_in_category", "op": "<", "value": 3},
+    {"scope": "each_group_in_category", "op": "==", "value": 0, "filter": {"status": "pending"}},
+    {"scope": "each_group_in_category", "op": "~", "value": 0},
+    {"scope": "elsewhere"},
+]
+
+
+@pytest.mark.parametrize("new, legacy, cases", [
+    (_eval_count, _legacy_count, COUNT_PARAMS),
+    (_eval_exists, _legacy_exists, EXISTS_PARAMS),
+    (_eval_resource_format, _legacy_resource_format, FORMAT_PARAMS),
+    (_eval_resource_required, _legacy_resource_required, REQUIRED_PARAMS),
+    (_eval_aggregate, _legacy_aggregate, AGGREGATE_PARAMS),
+], ids=["count", "exists", "resource_format", "resource_required", "aggregate"])
+def test_conditions_match_legacy_evaluators(world, new, legacy, cases):
+    for params, context in product(cases, CONTEXTS):
+        assert new(world, params, context) == legacy(world, params, context), (params, context)
+
+
+@pytest.mark.parametrize("evaluate, params, context", [
+    (_eval_count, COUNT_PARAMS[2], {"event_id": 1}),
+    (_eval_exists, EXISTS_PARAMS[3], {"event_id": 1, "user_id": 2}),
+    (_eval_exists, EXISTS_PARAMS[6], {"event_id": 1, "user_id": 3}),
+    (_eval_resource_format, FORMAT_PARAMS[1], {"post_id": 1}),
+    (_eval_resource_required, REQUIRED_PARAMS[2], {"post_id": 5}),
+    (_eval_aggregate, AGGREGATE_PARAMS[1], {"event_id": 1}),
+])
+def test_condition_is_one_statement(world, evaluate, params, context):
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    sa_event.listen(world.get_bind(), "before_cursor_execute", listener)
+    try:
+        evaluate(world, params, context)
+    finally:
+        sa_event.remove(world.get_bind(), "before_cursor_execute", listener)
+    assert len(statements) == 1
+
+
+def test_event_wide_count_is_not_capped(db_session):
+    """The previous evaluator counted len(get_multi_by_category()), which stops at 100 rows."""
+    crud.event_posts.create_many(db_session, rows=[
+        {"event_id": 1, "post_id": i, "relation_type": "submission"} for i in range(1, 151)
+    ])
+    params = {"entity": "event_post", "op": ">=", "value": 150, "filter": {"relation_type": "submission"}}
+    assert _eval_count(db_session, params, {"event_id": 1})
+    assert not _legacy_count(db_session, params, {"event_id": 1})
+
+
+def test_resource_checks_stay_one_statement_with_many_attachments(db_session):
+    db_session.add_all([Resource(id=i, filename=f"page{i}.PDF") for i in range(1, 61)] + [
+        Resource(id=61, filename="archive.tar.GZ"),
+    ])
+    db_session.add_all(PostResource(post_id=1, resource_id=i, position=i) for i in range(1, 62))
+    db_session.commit()
+    assert [r.extension for r in db_session.query(Resource).filter(Resource.id.in_([1, 61]))] == ["pdf", "gz"]
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    sa_event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        assert not _eval_resource_format(db_session, {"formats": ["pdf"]}, {"post_id": 1})
+        assert _eval_resource_format(db_session, {"formats": ["Pdf", "gz"]}, {"post_id": 1})
+        assert _eval_resource_required(db_session, {"min_count": 60, "formats": ["pdf"]}, {"post_id": 1})
+        assert not _eval_resource_required(db_session, {"min_count": 2, "formats": ["gz"]}, {"post_id": 1})
+    finally:
+        sa_event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+    assert len(statements) == 4
+
+    # Renaming a resource keeps its stored extension in step
+    resource = db_session.get(Resource, 61)
+    resource.filename = "archive.pdf"
+    db_session.commit()
+    assert resource.extension == "pdf"
+    assert _eval_resource_format(db_session, {"formats": ["pdf"]}, {"post_id": 1})
+
+
+def test_migration_backfills_resource_extension(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/resources.db")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_resources_extension")
+        conn.exec_driver_sql("ALTER TABLE resources DROP COLUMN extension")
+        conn.exec_driver_sql(
+            "INSERT INTO resources (filename, created_at) VALUES ('Deck.PDF', '2026-01-01'), ('README', '2026-01-01')"
+        )
+
+    cfg = Config(str(BASE_DIR / "alembic.ini"))
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.stamp(cfg, "f7c3a9d2b5e8")
+        command.upgrade(cfg, "a8d4b2e6c1f9")
+
+    with engine.connect() as conn:
+        assert conn.execute(select(Resource.filename, Resource.extension).order_by(Resource.id)).all() == [
+            ("Deck.PDF", "pdf"), ("README", ""),
+        ]
+    engine.dispose()
@@ -24,6 +24,14 @@ Covers:
 - TC-ENGINE-051: on_fail=warn allows but returns warning
 - TC-ENGINE-060: empty checks → no constraint
 - TC-ENGINE-061: no rules → no constraint
+- TC-ENGINE-070: compiled plan indexed by (trigger, phase), time bounds pre-parsed
+- TC-ENGINE-071: plan cached across calls, invalidated on rule update/delete
+- TC-ENGINE-072: event rules evaluated in EventRule.priority order
+- TC-ENGINE-073: event rule set loaded in one query, cached, invalidated on link changes
+- TC-ENGINE-074: pre checks of all rules run cheapest first; warnings keep declaration order
+- TC-ENGINE-075: member joins checked on all of the group's events at once, every failure reported
+- TC-ENGINE-076: condition results memoized per request across pre checks and post hooks, dropped on writes
+- TC-ENGINE-077: rule-set cache dropped again when a flushed rule or link change commits or rolls back
 """
 
 
@@ -721,3 +729,260 @@ def test_no_rules_no_constraint(client):
     post_id = _create_post(client, uid)
     resp = _submit_post(client, cat_id, post_id)
     assert resp.status_code == 201
+
+
+# --- 17.7 Compiled rule plans ---
+
+def test_compiled_plan_indexed_by_trigger(client, db_session):
+    """TC-ENGINE-070: plan groups expanded + custom checks by (trigger, phase)."""
+    from datetime import datetime, timezone
+    from app import crud
+    from app.services.rule_engine import get_rule_plan
+    uid = _create_user(client)
+    rule_id = _create_rule(
+        client, uid, max_submissions=2, max_team_size=4,
+        submission_deadline="2030-01-01T00:00:00",
+        checks=[{
+            "trigger": "create_relation(event_post)",
+            "phase": "post",
+            "action": "compute_ranking",
+            "action_params": {"order": "desc"},
+        }],
+    )
+    plan = get_rule_plan(crud.rules.get(db_session, id=rule_id))
+    pre = plan.for_trigger("create_relation(event_post)", "pre")
+    assert [c.message for c in pre] == [
+        "Submission not within allowed time window", "Max submissions reached (2)",
+    ]
+    assert pre[0].condition["params"]["end"] == datetime(2030, 1, 1, tzinfo=timezone.utc)
+    assert len(plan.for_trigger("create_relation(group_user)", "pre")) == 1
+    assert plan.for_trigger("create_relation(event_post)", "post")[0].action == "compute_ranking"
+    assert plan.for_trigger("update_content(post)", "pre") == ()
+
+
+def test_compiled_plan_cache_invalidation(client, db_session):
+    """TC-ENGINE-071: plan reused until the rule is updated or deleted."""
+    from app import crud
+    from app.services.rule_engine import get_rule_plan
+    uid = _create_user(client)
+    cat_id = _create_event(client, uid)
+    rule_id = _create_rule(client, uid, max_submissions=1)
+    _link_rule(client, cat_id, rule_id)
+
+    plan = get_rule_plan(crud.rules.get(db_session, id=rule_id))
+    assert get_rule_plan(crud.rules.get(db_session, id=rule_id)) is plan
+
+    assert _submit_post(client, cat_id, _create_post(client, uid, "first")).status_code == 201
+    assert _submit_post(client, cat_id, _create_post(client, uid, "second")).status_code == 422
+
+    resp = client.patch(f"/api/rules/{rule_id}", json={"max_submissions": 2},
+                        headers={"X-User-Id": str(uid)})
+    assert resp.status_code == 200
+    assert _submit_post(client, cat_id, _create_post(client, uid, "third")).status_code == 201
+    assert get_rule_plan(crud.rules.get(db_session, id=rule_id)) is not plan
+
+    client.delete(f"/api/rules/{rule_id}", headers={"X-User-Id": str(uid)})
+    assert _submit_post(client, cat_id, _create_post(client, uid, "fourth")).status_code == 201
+
+
+def test_event_rules_follow_priority(client):
+    """TC-ENGINE-072: the first failing rule by priority produces the error."""
+    uid = _create_user(client)
+    cat_id = _create_event(client, uid)
+    deny = {
+        "trigger": "create_relation(event_post)",
+        "phase": "pre",
+        "condition": {"type": "time_window", "params": {"end": "2020-01-01T00:00:00Z"}},
+        "on_fail": "deny",
+    }
+    late = _create_rule(client, uid, name="late", checks=[{**deny, "message": "from late"}])
+    early = _create_rule(client, uid, name="early", checks=[{**deny, "message": "from early"}])
+    _link_rule(client, cat_id, late, priority=5)
+    _link_rule(client, cat_id, early, priority=1)
+    resp = _submit_post(client, cat_id, _create_post(client, uid))
+    assert resp.json()["detail"] == "from early"
+
+    client.patch(f"/api/events/{cat_id}/rules/{late}", json={"rule_id": late, "priority": 0})
+    resp = _submit_post(client, cat_id, _create_post(client, uid))
+    assert resp.json()["detail"] == "from late"
+
+
+def test_event_rule_set_single_query_and_cache(client, db_session):
+    """TC-ENGINE-073: rule loading doesn't grow with linked rules; link changes invalidate."""
+    from sqlalchemy import event as sa_event
+    from app.services.rule_engine import run_pre_checks
+    uid = _create_user(client)
+    cat_id = _create_event(client, uid)
+    for i in range(5):
+        _link_rule(client, cat_id, _create_rule(client, uid, name=f"r{i}", checks=[]))
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    sa_event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        run_pre_checks(db_session, "create_relation(event_post)", cat_id, {"user_id": uid})
+        assert len(statements) == 1
+        statements.clear()
+        run_pre_checks(db_session, "create_relation(event_post)", cat_id, {"user_id": uid})
+        assert statements == []
+    finally:
+        sa_event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    blocker = _create_rule(client, uid, name="blocker", max_submissions=0)
+    _link_rule(client, cat_id, blocker)
+    assert _submit_post(client, cat_id, _create_post(client, uid)).status_code == 422
+    client.delete(f"/api/events/{cat_id}/rules/{blocker}")
+    assert _submit_post(client, cat_id, _create_post(client, uid)).status_code == 201
+
+
+def test_pre_checks_run_cheapest_first(client, db_session):
+    """TC-ENGINE-074: a late submission is denied without querying; warnings keep declaration order."""
+    import pytest
+    from sqlalchemy import event as sa_event
+    from app.services.rule_engine import RuleCheckError, get_event_rule_plans, run_pre_checks
+    uid = _create_user(client)
+    cat_id = _create_event(client, uid)
+    client.post(f"/api/events/{cat_id}/groups", json={"group_id": _create_group(client, uid)})
+    trigger = "create_relation(event_post)"
+
+    def warn(message, condition):
+        return {"trigger": trigger, "phase": "pre", "on_fail": "warn", "message": message, "condition": condition}
+    quota = _create_rule(client, uid, name="quota", checks=[
+        warn("fill the teams", {"type": "aggregate", "params": {
+            "entity": "group_user", "scope": "each_group_in_category", "op": ">=", "value": 5}}),
+        warn("big event", {"type": "count", "params": {"entity": "event_post", "op": ">=", "value": 5}}),
+        warn("attach a file", {"type": "resource_required", "params": {"min_count": 1}}),
+    ])
+    deadline = _create_rule(client, uid, name="deadline", max_submissions=3)
+    _link_rule(client, cat_id, quota, priority=0)
+    _link_rule(client, cat_id, deadline, priority=1)
+    context = {"user_id": uid, "post_id": _create_post(client, uid)}
+
+    costs = [c.cost for plan in get_event_rule_plans(db_session, cat_id) for c in plan.for_trigger(trigger, "pre")]
+    assert costs == [4, 3, 2, 2]
+    warnings = run_pre_checks(db_session, trigger, cat_id, context)
+    assert [w.message for w in warnings] == ["fill the teams", "big event", "attach a file"]
+
+    client.patch(f"/api/rules/{deadline}", json={"submission_deadline": "2020-01-01T00:00:00"})
+    get_event_rule_plans(db_session, cat_id)  # reload the updated rule set
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    sa_event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        with pytest.raises(RuleCheckError) as exc:
+            run_pre_checks(db_session, trigger, cat_id, context)
+    finally:
+        sa_event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+    assert exc.value.message == "Submission not within allowed time window"
+    assert statements == []
+
+
+def test_group_member_checks_batched_across_events(client, db_session):
+    """TC-ENGINE-075: one rule load and one member count for all tracks; each failing track is reported."""
+    from sqlalchemy import event as sa_event
+    from app.services.rule_engine import invalidate_rule_plan, run_pre_checks_batch
+    uid = _create_user(client)
+    gid = _create_group(client, uid)
+    events = [_create_event(client, uid, f"Track {i}") for i in range(6)]
+    for i, cat_id in enumerate(events):
+        client.post(f"/api/events/{cat_id}/groups", json={"group_id": gid})
+        _link_rule(client, cat_id, _create_rule(client, uid, name=f"size {i}", max_team_size=5 + i))
+
+    invalidate_rule_plan()
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    sa_event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        warnings = run_pre_checks_batch(db_session, "create_relation(group_user)", events, {"group_id": gid})
+    finally:
+        sa_event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+    assert warnings == {cat_id: [] for cat_id in events}
+    assert len(statements) == 2
+
+    small = [_create_rule(client, uid, name=f"tiny {i}", max_team_size=1) for i in range(2)]
+    _link_rule(client, events[1], small[0])
+    _link_rule(client, events[4], small[1])
+    resp = client.post(f"/api/groups/{gid}/members", json={"user_id": _create_user(client, "joiner")})
+    assert resp.status_code == 422
+    assert resp.json()["detail"] == (
+        f"Event {events[1]}: Team cannot exceed 1 members; Event {events[4]}: Team cannot exceed 1 members"
+    )
+
+
+def test_condition_results_memoized_until_a_write(client, db_session):
+    """TC-ENGINE-076: rules expanding to the same condition share one query per request until a write."""
+    from sqlalchemy import event as sa_event
+    from sqlalchemy import update
+    from app.database import UNIT_OF_WORK
+    from app.models.member import Member
+    from app.services.rule_engine import RULE_MEMO, get_event_rule_plans, run_post_hooks, run_pre_checks
+    uid = _create_user(client)
+    gid = _create_group(client, uid)
+    cat_id = _create_event(client, uid)
+    trigger = "create_relation(event_post)"
+    team_check = {"type": "count", "params": {
+        "entity": "group_user", "scope": "group", "filter": {"status": "accepted"}, "op": ">=", "value": 1}}
+    _link_rule(client, cat_id, _create_rule(client, uid, name="a", min_team_size=1, checks=[
+        {"trigger": trigger, "phase": "post", "condition": team_check, "action": "notify"},
+    ]))
+    _link_rule(client, cat_id, _create_rule(client, uid, name="b", min_team_size=1))
+    context = {"user_id": uid, "post_id": _create_post(client, uid), "group_id": gid}
+    get_event_rule_plans(db_session, cat_id)  # warm the rule-set cache
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    sa_event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        run_pre_checks(db_session, trigger, cat_id, context)
+        assert len(statements) == 2  # outside a request nothing is memoized
+
+        db_session.info[UNIT_OF_WORK] = True
+        statements.clear()
+        run_pre_checks(db_session, trigger, cat_id, context)
+        run_post_hooks(db_session, trigger, cat_id, context)
+        assert len(statements) == 1
+
+        db_session.add(Member(group_id=gid, user_id=uid + 1, status="accepted"))
+        db_session.flush()
+        assert RULE_MEMO not in db_session.info
+        statements.clear()
+        run_pre_checks(db_session, trigger, cat_id, context)
+        assert len([s for s in statements if s.startswith("SELECT")]) == 1
+
+        db_session.execute(update(Member).where(Member.group_id == gid).values(status="pending"))
+        assert RULE_MEMO not in db_session.info
+    finally:
+        sa_event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+        db_session.info.pop(UNIT_OF_WORK, None)
+
+
+def test_rule_cache_dropped_when_link_change_commits(client, db_session):
+    """TC-ENGINE-077: a rule set cached while a link change is only flushed is dropped at commit/rollback."""
+    from app import crud
+    from app.database import UNIT_OF_WORK
+    from app.schemas.rule import RuleUpdate
+    from app.services import rule_engine
+    uid = _create_user(client)
+    cat_id = _create_event(client, uid)
+    first = _create_rule(client, uid, name="first", checks=[])
+    second = _create_rule(client, uid, name="second", checks=[])
+    _link_rule(client, cat_id, first)
+
+    db_session.info[UNIT_OF_WORK] = True
+    try:
+        for end in (db_session.commit, db_session.rollback):
+            crud.event_rules.remove_by_category_and_rule(db_session, event_id=cat_id, rule_id=first)
+            crud.event_rules.create(db_session, event_id=cat_id, rule_id=second)
+            # Reloaded (and cached) before the transaction ends, as a concurrent request would
+            rule_engine.get_event_rule_plans(db_session, cat_id)
+            assert cat_id in rule_engine._event_cache
+            end()
+            assert cat_id not in rule_engine._event_cache
+            first, second = second, first
+
+        crud.rules.update(db_session, db_obj=crud.rules.get(db_session, first), obj_in=RuleUpdate(name="renamed"))
+        rule_engine.get_event_rule_plans(db_session, cat_id)
+        db_session.commit()
+        assert cat_id not in rule_engine._event_cache
+    finally:
+        db_session.info.pop(UNIT_OF_WORK, None)
@@ -0,0 +1,202 @@
+"""Rule job queue — post hooks queued by requests and run by the job worker"""
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import crud
+from app.core.config import settings
+from app.database import Base
+from app.models.post import Post
+from app.models.rule_job import RuleJob
+from app.services import rule_engine, rule_jobs
+
+CLOSE_HOOKS = [
+    {
+        "trigger": "update_content(event.status)", "phase": "post",
+        "action": "compute_ranking", "action_params": {}, "message": "Rank",
+    },
+    {
+        "trigger": "update_content(event.status)", "phase": "post",
+        "action": "award_certificate",
+        "action_params": {"rules": [{"rank_range": [1, 1], "title": "Gold"}]},
+        "message": "Award",
+    },
+]
+
+
+@pytest.fixture()
+def queued(monkeypatch):
+    """Queue post hooks as in production; retries are immediate so run_pending drains them."""
+    monkeypatch.setattr(settings, "rule_jobs_sync", False)
+    monkeypatch.setattr(settings, "rule_job_retry_delay", 0.0)
+
+
+@pytest.fixture()
+def closable_event(client, db_session, organizer_user):
+    """A published event with ranking + certificate close hooks and two rated submissions."""
+    org = {"X-User-Id": str(organizer_user["id"])}
+    event_id = client.post("/api/events", json={
+        "name": "Jam", "description": "d", "type": "competition", "status": "published",
+    }, headers=org).json()["id"]
+    rule_id = client.post("/api/rules", json={
+        "name": "Close", "description": "d", "checks": CLOSE_HOOKS,
+    }, headers=org).json()["id"]
+    client.post(f"/api/events/{event_id}/rules", json={"rule_id": rule_id}, headers=org)
+    ids = crud.posts.create_many(db_session, rows=[
+        {"title": "A", "created_by": organizer_user["id"], "average_rating": 80.0},
+        {"title": "B", "created_by": organizer_user["id"], "average_rating": 90.0},
+    ])
+    crud.event_posts.create_many(db_session, rows=[
+        {"event_id": event_id, "post_id": post_id, "relation_type": "submission"} for post_id in ids
+    ])
+    return event_id, ids, org
+
+
+def _sessions(db_session):
+    return sessionmaker(bind=db_session.get_bind(), autoflush=False)
+
+
+def _tags(db_session, ids):
+    db_session.expire_all()
+    return [db_session.get(Post, post_id).tags for post_id in ids]
+
+
+def test_close_queues_post_hooks_instead_of_running_them(client, db_session, queued, closable_event):
+    event_id, ids, org = closable_event
+    resp = client.patch(f"/api/events/{event_id}", json={"status": "closed"}, headers=org)
+    assert resp.status_code == 200
+    assert _tags(db_session, ids) == [[], []]
+
+    jobs = client.get(f"/api/events/{event_id}/jobs", headers=org).json()
+    assert [(j["trigger"], j["status"], j["attempts"]) for j in jobs] == [
+        ("update_content(event.status)", "queued", 0),
+    ]
+
+    assert rule_jobs.run_pending(_sessions(db_session)) == 1
+    assert _tags(db_session, ids) == [["rank_2"], ["rank_1"]]
+    job = client.get(f"/api/events/{event_id}/jobs", headers=org).json()[0]
+    assert job["status"] == "succeeded" and job["attempts"] == 1
+    assert job["logs"] == [
+        "Post-hook executed: compute_ranking — Rank",
+        "Post-hook executed: award_certificate — Award",
+    ]
+    assert job["started_at"] and job["finished_at"] and job["last_error"] is None
+
+
+def test_submission_post_hooks_are_queued(client, db_session, queued, closable_event, organizer_user):
+    event_id, _, org = closable_event
+    post_id = client.post("/api/posts", json={"title": "C", "status": "published"}, headers=org).json()["id"]
+    resp = client.post(f"/api/events/{event_id}/posts", json={"post_id": post_id}, headers=org)
+    assert resp.status_code == 201
+    job = db_session.query(RuleJob).one()
+    assert (job.trigger, job.context) == (
+        "create_relation(event_post)", {"user_id": organizer_user["id"], "post_id": post_id},
+    )
+
+
+def test_failed_run_rolls_back_and_retries_until_max_attempts(client, db_session, queued, closable_event, monkeypatch):
+    event_id, ids, org = closable_event
+    client.patch(f"/api/events/{event_id}", json={"status": "closed"}, headers=org)
+
+    def _broken(db, params, context):
+        raise RuntimeError("certificate store down")
+    monkeypatch.setattr(rule_engine, "_action_award_certificate", _broken)
+
+    assert rule_jobs.run_pending(_sessions(db_session)) == settings.rule_job_max_attempts
+    job = db_session.query(RuleJob).one()
+    db_session.refresh(job)
+    assert (job.status, job.attempts) == ("failed", settings.rule_job_max_attempts)
+    assert job.last_error == "RuntimeError: certificate store down"
+    # The ranking that ran before the failing action was rolled back with it
+    assert _tags(db_session, ids) == [[], []]
+
+
+def test_retry_waits_with_doubling_delay(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "rule_job_retry_delay", 5.0)
+    monkeypatch.setattr(rule_jobs, "run_post_hooks", lambda *a, **kw: 1 / 0)
+    job = crud.rule_jobs.enqueue(db_session, event_id=1, trigger="t", context={})
+    Session = _sessions(db_session)
+
+    assert rule_jobs.run_pending(Session) == 1
+    db_session.refresh(job)
+    assert job.status == "queued" and job.last_error == "ZeroDivisionError: division by zero"
+    delay = job.run_after.replace(tzinfo=timezone.utc) - datetime.now(timezone.utc)
+    assert timedelta(seconds=3) < delay <= timedelta(seconds=5)
+    assert rule_jobs.run_pending(Session) == 0  # not due yet
+
+    job.run_after = datetime.now(timezone.utc)
+    db_session.commit()
+    assert rule_jobs.run_pending(Session) == 1
+    db_session.refresh(job)
+    delay = job.run_after.replace(tzinfo=timezone.utc) - datetime.now(timezone.utc)
+    assert job.attempts == 2 and timedelta(seconds=8) < delay <= timedelta(seconds=10)
+
+
+def test_claims_are_exclusive_and_expired_leases_are_reclaimed(db_session):
+    job = crud.rule_jobs.enqueue(db_session, event_id=1, trigger="t", context={})
+    claimed = crud.rule_jobs.claim_next(db_session, lease=60)
+    assert (claimed.id, claimed.status, claimed.attempts) == (job.id, "running", 1)
+    assert crud.rule_jobs.claim_next(db_session, lease=60) is None
+
+    # Its worker died: once the lease runs out another one picks the job up again
+    claimed.run_after = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+    assert crud.rule_jobs.claim_next(db_session, lease=60).attempts == 2
+
+
+def test_job_lost_on_its_last_attempt_is_failed_without_running(db_session, monkeypatch):
+    calls = []
+    monkeypatch.setattr(rule_jobs, "run_post_hooks", lambda *a, **kw: calls.append(a) or [])
+    db_session.add(RuleJob(
+        event_id=1, trigger="t", context={}, status="running",
+        attempts=settings.rule_job_max_attempts, run_after=datetime.now(timezone.utc) - timedelta(seconds=1),
+    ))
+    db_session.commit()
+    assert rule_jobs.run_pending(_sessions(db_session)) == 1
+    job = db_session.query(RuleJob).one()
+    db_session.refresh(job)
+    assert job.status == "failed" and calls == []
+
+
+def test_sync_mode_runs_post_hooks_in_the_request(client, db_session, closable_event):
+    event_id, ids, org = closable_event
+    client.patch(f"/api/events/{event_id}", json={"status": "closed"}, headers=org)
+    assert _tags(db_session, ids) == [["rank_2"], ["rank_1"]]
+    assert db_session.query(RuleJob).count() == 0
+
+
+def test_jobs_endpoint_checks_event_and_owner(client, closable_event, admin_user):
+    event_id, _, org = closable_event
+    other = client.post("/api/users", json={
+        "username": "other_org", "email": "other_org@example.com", "role": "organizer",
+    }).json()
+    assert client.get(f"/api/events/{event_id}/jobs", headers={"X-User-Id": str(other["id"])}).status_code == 403
+    assert client.get(f"/api/events/{event_id}/jobs", headers={"X-User-Id": str(admin_user["id"])}).status_code == 200
+    assert client.get(f"/api/events/{event_id}/jobs?status=done", headers=org).status_code == 422
+    assert client.get("/api/events/9999/jobs", headers=org).status_code == 404
+
+
+def test_worker_thread_runs_queued_jobs(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path}/jobs.db")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    monkeypatch.setattr(rule_jobs, "run_post_hooks", lambda db, trigger, *a, **kw: [f"ran {trigger}"])
+    worker = rule_jobs.RuleJobWorker(Session, poll_interval=0.05)
+    worker.start()
+    try:
+        with Session() as db:
+            job_id = crud.rule_jobs.enqueue(db, event_id=1, trigger="t", context={}).id
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            with Session() as db:
+                job = crud.rule_jobs.get(db, id=job_id)
+                if job.status == "succeeded":
+                    break
+            time.sleep(0.02)
+        assert (job.status, job.logs) == ("succeeded", ["ran t"])
+    finally:
+        worker.stop()
+        engine.dispose()
@@ -0,0 +1,120 @@
+"""Rule-engine instrumentation — per-check timing, SQL counts, outcomes and Server-Timing"""
+import pytest
+
+from app.core.config import settings
+from app.models.event_post import EventPost
+from app.models.post import Post
+from app.services import rule_engine
+from app.services.rule_engine import RuleCheckError, run_post_hooks, run_pre_checks
+from app.services.rule_metrics import metrics
+
+SUBMIT = "create_relation(event_post)"
+CLOSE = "update_content(event.status)"
+
+CHECKS = [
+    {"trigger": SUBMIT, "phase": "pre", "on_fail": "deny", "message": "closed",
+     "condition": {"type": "time_window", "params": {"end": "2099-01-01T00:00:00Z"}}},
+    {"trigger": SUBMIT, "phase": "pre", "on_fail": "warn", "message": "needs 5 entries",
+     "condition": {"type": "count", "params": {"entity": "event_post", "op": ">=", "value": 5}}},
+    {"trigger": SUBMIT, "phase": "pre", "on_fail": "deny", "message": "one entry per user",
+     "condition": {"type": "count", "params": {"entity": "event_post", "scope": "user", "op": "<", "value": 1}}},
+    {"trigger": CLOSE, "phase": "post", "action": "compute_ranking", "message": "Rank",
+     "condition": {"type": "field_match", "params": {
+         "entity": "event", "target": "$current", "field": "status", "op": "==", "value": "closed"}}},
+    {"trigger": CLOSE, "phase": "post", "action": "flag_disqualified", "message": "Flag"},
+]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture()
+def event_with_rule(client, organizer_user):
+    org = {"X-User-Id": str(organizer_user["id"])}
+    event_id = client.post("/api/events", json={
+        "name": "Jam", "description": "d", "type": "competition", "status": "published",
+    }, headers=org).json()["id"]
+    rule_id = client.post("/api/rules", json={"name": "Entry rules", "description": "d", "checks": CHECKS},
+                          headers=org).json()["id"]
+    client.post(f"/api/events/{event_id}/rules", json={"rule_id": rule_id}, headers=org)
+    return event_id, rule_id, org
+
+
+def _by_labels():
+    return {(m["trigger"], m["kind"], m["type"], m["outcome"]): m for m in metrics.snapshot()}
+
+
+def test_pre_checks_record_latency_statements_and_outcome(db_session, event_with_rule, organizer_user):
+    event_id, rule_id, _ = event_with_rule
+    run_pre_checks(db_session, SUBMIT, event_id, {"user_id": organizer_user["id"]})
+    stats = _by_labels()
+    assert set(stats) == {
+        (SUBMIT, "condition", "time_window", "pass"),
+        (SUBMIT, "condition", "count", "warn"),
+        (SUBMIT, "condition", "count", "pass"),
+    }
+    window, warned = stats[(SUBMIT, "condition", "time_window", "pass")], stats[(SUBMIT, "condition", "count", "warn")]
+    assert (window["rule_id"], window["rule_name"], window["count"]) == (rule_id, "Entry rules", 1)
+    assert window["statements_total"] == 0 and warned["statements_total"] == 1
+    assert warned["time_total_ms"] > 0 and warned["time_max_ms"] == warned["time_total_ms"]
+
+    # A deny is recorded before RuleCheckError leaves the engine
+    db_session.add_all([
+        Post(id=1, title="Entry", created_by=organizer_user["id"]),
+        EventPost(event_id=event_id, post_id=1, relation_type="submission"),
+    ])
+    db_session.flush()
+    with pytest.raises(RuleCheckError):
+        run_pre_checks(db_session, SUBMIT, event_id, {"user_id": organizer_user["id"]})
+    stats = _by_labels()
+    assert stats[(SUBMIT, "condition", "count", "deny")]["count"] == 1
+    assert stats[(SUBMIT, "condition", "time_window", "pass")]["count"] == 2
+
+
+def test_post_hooks_record_conditions_and_actions(db_session, event_with_rule, monkeypatch):
+    event_id, _, _ = event_with_rule
+    run_post_hooks(db_session, CLOSE, event_id, {"new_status": "published"})
+
+    def _broken(db, params, context):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(rule_engine, "_action_flag_disqualified", _broken)
+    run_post_hooks(db_session, CLOSE, event_id, {})
+    stats = _by_labels()
+    assert stats[(CLOSE, "condition", "field_match", "skip")]["count"] == 2
+    assert stats[(CLOSE, "action", "flag_disqualified", "ok")]["count"] == 1
+    assert stats[(CLOSE, "action", "flag_disqualified", "error")]["count"] == 1
+
+
+def test_metrics_endpoint_is_admin_only_and_resettable(client, db_session, event_with_rule, admin_user,
+                                                       participant_user):
+    event_id, _, _ = event_with_rule
+    run_pre_checks(db_session, SUBMIT, event_id, {"user_id": participant_user["id"]})
+    admin = {"X-User-Id": str(admin_user["id"])}
+    assert client.get("/api/admin/rules/metrics", headers={"X-User-Id": str(participant_user["id"])}).status_code == 403
+    body = client.get("/api/admin/rules/metrics", headers=admin).json()
+    assert len(body) == 3
+    assert body == sorted(body, key=lambda m: m["time_total_ms"], reverse=True)
+    assert client.delete("/api/admin/rules/metrics", headers=admin).status_code == 204
+    assert client.get("/api/admin/rules/metrics", headers=admin).json() == []
+
+
+def test_server_timing_header_breaks_down_the_request(client, event_with_rule, monkeypatch):
+    event_id, rule_id, org = event_with_rule
+    post_id = client.post("/api/posts", json={"title": "Entry", "status": "published"}, headers=org).json()["id"]
+    monkeypatch.setattr(settings, "rule_trace_header", True)
+    resp = client.post(f"/api/events/{event_id}/posts", json={"post_id": post_id}, headers=org)
+    assert resp.status_code == 201
+    entries = resp.headers["server-timing"].split(", ")
+    assert len(entries) == 3  # cheapest first: the event-wide count runs last
+    assert entries[2].startswith(f'rule2;desc="r{rule_id} {SUBMIT} condition:count warn sql=1";dur=')
+
+    # Requests that evaluate no rules, and all requests with the setting off, carry no header
+    assert "server-timing" not in client.get(f"/api/events/{event_id}").headers
+    monkeypatch.setattr(settings, "rule_trace_header", False)
+    post_id = client.post("/api/posts", json={"title": "Two", "status": "published"}, headers=org).json()["id"]
+    resp = client.post(f"/api/events/{event_id}/posts", json={"post_id": post_id}, headers=org)
+    assert "server-timing" not in resp.headers
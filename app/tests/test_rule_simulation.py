@@ -0,0 +1,108 @@
+"""Rule simulation — dry runs of an event's checks with outcomes, timings and would-be writes"""
+import pytest
+
+from app import crud
+from app.models.event_post import EventPost
+from app.models.post import Post
+from app.services.rule_metrics import metrics
+
+SUBMIT = "create_relation(event_post)"
+CLOSE = "update_content(event.status)"
+
+CHECKS = [
+    {"trigger": SUBMIT, "phase": "pre", "on_fail": "warn", "message": "needs 5 entries",
+     "condition": {"type": "count", "params": {"entity": "event_post", "op": ">=", "value": 5}}},
+    {"trigger": SUBMIT, "phase": "pre", "on_fail": "deny", "message": "one entry per user",
+     "condition": {"type": "count", "params": {"entity": "event_post", "scope": "user", "op": "<", "value": 1}}},
+    {"trigger": CLOSE, "phase": "post", "action": "compute_ranking", "message": "Rank"},
+    {"trigger": CLOSE, "phase": "post", "action": "award_certificate", "message": "Award",
+     "action_params": {"rules": [{"rank_range": [1, 1], "title": "Gold"}]}},
+]
+
+
+@pytest.fixture()
+def event_with_rule(client, db_session, organizer_user):
+    """A published event with CHECKS linked and three rated submissions by different users."""
+    org = {"X-User-Id": str(organizer_user["id"])}
+    event_id = client.post("/api/events", json={
+        "name": "Jam", "description": "d", "type": "competition", "status": "published",
+    }, headers=org).json()["id"]
+    rule_id = client.post("/api/rules", json={"name": "Entry rules", "description": "d", "checks": CHECKS},
+                          headers=org).json()["id"]
+    client.post(f"/api/events/{event_id}/rules", json={"rule_id": rule_id}, headers=org)
+    ids = crud.posts.create_many(db_session, rows=[
+        {"title": f"S{i}", "created_by": 100 + i, "average_rating": 50.0 + i} for i in range(3)
+    ])
+    crud.event_posts.create_many(db_session, rows=[
+        {"event_id": event_id, "post_id": post_id, "relation_type": "submission"} for post_id in ids
+    ])
+    db_session.commit()
+    return event_id, rule_id, ids, org
+
+
+def _simulate(client, event_id, org, **body):
+    return client.post(f"/api/events/{event_id}/rules/simulate", json=body, headers=org)
+
+
+def test_pre_checks_report_every_outcome(client, event_with_rule):
+    event_id, rule_id, ids, org = event_with_rule
+    resp = _simulate(client, event_id, org, trigger=SUBMIT, context={"user_id": 100, "post_id": ids[0]})
+    assert resp.status_code == 200
+    run, = resp.json()["runs"]
+    assert (run["outcome"], run["message"]) == ("deny", "one entry per user")
+    # Engine order (scoped count before the event-wide one), but the deny doesn't stop the run
+    assert [(c["rule_id"], c["condition"], c["outcome"]) for c in run["checks"]] == [
+        (rule_id, "count", "deny"), (rule_id, "count", "warn"),
+    ]
+    assert all(c["statements"] == 1 and c["elapsed_ms"] > 0 for c in run["checks"])
+    assert run["statements"] == 2
+    assert metrics.snapshot() == []
+
+    run, = _simulate(client, event_id, org, trigger=SUBMIT, context={"user_id": 999}).json()["runs"]
+    assert (run["outcome"], run["message"]) == ("allow", None)
+
+
+def test_post_hooks_report_writes_without_making_them(client, db_session, event_with_rule):
+    event_id, _, ids, org = event_with_rule
+    run, = _simulate(client, event_id, org, trigger=CLOSE, context={"user_id": 1}).json()["runs"]
+    ranking, award = run["checks"]
+    assert (ranking["action"], ranking["outcome"]) == ("compute_ranking", "ok")
+    assert ranking["writes"] == [{"statement": "UPDATE", "table": "posts", "rows": 3}]
+    # The certificate step sees the ranking made before it in the same run
+    assert (award["action"], award["outcome"]) == ("award_certificate", "ok")
+    assert award["writes"] == [
+        {"statement": "INSERT", "table": "posts", "rows": 1},
+        {"statement": "INSERT", "table": "category_posts", "rows": 1},
+        {"statement": "INSERT", "table": "post_posts", "rows": 1},
+    ]
+
+    db_session.expire_all()
+    assert [db_session.get(Post, post_id).tags for post_id in ids] == [[], [], []]
+    assert db_session.query(Post).count() == 3
+    assert db_session.query(EventPost).count() == 3
+
+
+def test_sampled_contexts_and_draft_checks(client, event_with_rule):
+    event_id, rule_id, ids, org = event_with_rule
+    draft = [{"trigger": SUBMIT, "phase": "pre", "on_fail": "deny", "message": "closed",
+              "condition": {"type": "time_window", "params": {"end": "2020-01-01T00:00:00Z"}}}]
+    body = _simulate(client, event_id, org, trigger=SUBMIT, sample=2, rule_ids=[], checks=draft).json()
+    assert [run["context"] for run in body["runs"]] == [
+        {"user_id": 102, "post_id": ids[2]}, {"user_id": 101, "post_id": ids[1]},
+    ]
+    assert all((run["outcome"], run["message"]) == ("deny", "closed") for run in body["runs"])
+    assert [(c["rule_id"], c["rule_name"]) for c in body["runs"][0]["checks"]] == [(None, "draft")]
+
+    body = _simulate(client, event_id, org, trigger=SUBMIT, sample=5, rule_ids=[rule_id]).json()
+    assert len(body["runs"]) == 3
+
+
+def test_simulate_validation_and_access(client, event_with_rule, participant_user):
+    event_id, _, _, org = event_with_rule
+    assert _simulate(client, event_id, org, trigger=SUBMIT).status_code == 422
+    assert _simulate(client, event_id, org, trigger=SUBMIT, sample=1, context={}).status_code == 422
+    assert _simulate(client, event_id, org, trigger=CLOSE, sample=1).status_code == 422
+    assert _simulate(client, event_id, org, trigger=SUBMIT, sample=1, rule_ids=[999]).status_code == 404
+    assert _simulate(client, 999, org, trigger=SUBMIT, sample=1).status_code == 404
+    other = {"X-User-Id": str(participant_user["id"])}
+    assert _simulate(client, event_id, other, trigger=SUBMIT, sample=1).status_code == 403
@@ -0,0 +1,153 @@
+"""Full-text search — FTS5 index sync and /api/search"""
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine
+
+from app.database import BASE_DIR, Base
+from app.models.search_index import drop_search_index
+from app.services.search import fts_match_query, fts_phrase_query, short_terms
+
+
+def _seed(client, organizer_user, participant_user):
+    org = {"X-User-Id": str(organizer_user["id"])}
+    part = {"X-User-Id": str(participant_user["id"])}
+    client.patch(f"/api/users/{participant_user['id']}", json={
+        "display_name": "Quantum Kim", "bio": "Builds quantum compilers",
+    }, headers=part)
+    posts = [
+        client.post("/api/posts", json={
+            "title": "Quantum computing primer", "content": "qubits and gates", "status": "published",
+        }, headers=part).json(),
+        client.post("/api/posts", json={
+            "title": "Weekly notes", "content": "a short quantum aside", "status": "published",
+            "tags": ["physics"],
+        }, headers=part).json(),
+        client.post("/api/posts", json={
+            "title": "Quantum draft", "status": "draft",
+        }, headers=part).json(),
+        client.post("/api/posts", json={
+            "title": "量子计算入门", "content": "中文内容", "status": "published",
+        }, headers=part).json(),
+    ]
+    event = client.post("/api/events", json={
+        "name": "Quantum Hackathon", "description": "Build on quantum hardware",
+        "type": "competition", "status": "published",
+    }, headers=org).json()
+    return posts, event
+
+
+def test_search_ranks_mixed_results(client, organizer_user, participant_user):
+    posts, event = _seed(client, organizer_user, participant_user)
+    resp = client.get("/api/search", params={"q": "quantum"})
+    assert resp.status_code == 200
+    data = resp.json()
+    found = {(r["type"], r["id"]) for r in data["items"]}
+    assert ("post", posts[0]["id"]) in found
+    assert ("post", posts[1]["id"]) in found
+    assert ("event", event["id"]) in found
+    assert ("user", participant_user["id"]) in found
+    # Drafts stay hidden from other users
+    assert ("post", posts[2]["id"]) not in found
+    assert data["total"] == len(data["items"]) == 4
+    # Title hits outrank a passing mention in the body
+    ids = [r["id"] for r in data["items"] if r["type"] == "post"]
+    assert ids.index(posts[0]["id"]) < ids.index(posts[1]["id"])
+    scores = [r["score"] for r in data["items"]]
+    assert scores == sorted(scores)
+
+
+def test_search_pagination_and_type_filter(client, organizer_user, participant_user):
+    posts, _ = _seed(client, organizer_user, participant_user)
+    resp = client.get("/api/search", params={"q": "quantum", "type": "post", "limit": 1, "skip": 1})
+    data = resp.json()
+    assert data["total"] == 2
+    assert [r["id"] for r in data["items"]] == [posts[1]["id"]]
+    assert client.get("/api/search", params={"q": "quantum", "type": "group"}).status_code == 422
+
+
+def test_search_sees_own_drafts_and_cjk(client, organizer_user, participant_user):
+    posts, _ = _seed(client, organizer_user, participant_user)
+    headers = {"X-User-Id": str(participant_user["id"])}
+    found = client.get("/api/search", params={"q": "draft", "type": "post"}, headers=headers).json()
+    assert [r["id"] for r in found["items"]] == [posts[2]["id"]]
+    cjk = client.get("/api/search", params={"q": "量子计算"}).json()
+    assert [r["id"] for r in cjk["items"]] == [posts[3]["id"]]
+    # Two characters are below the trigram size: LIKE fallback
+    short = client.get("/api/search", params={"q": "量子"}).json()
+    assert [r["id"] for r in short["items"]] == [posts[3]["id"]]
+
+
+def test_search_index_follows_updates_and_deletes(client, organizer_user, participant_user):
+    posts, _ = _seed(client, organizer_user, participant_user)
+    headers = {"X-User-Id": str(participant_user["id"])}
+    client.patch(f"/api/posts/{posts[0]['id']}", json={"title": "Photonics primer"}, headers=headers)
+    client.delete(f"/api/posts/{posts[1]['id']}", headers=headers)
+    post_ids = [r["id"] for r in client.get(
+        "/api/search", params={"q": "quantum", "type": "post"},
+    ).json()["items"]]
+    assert post_ids == []
+    hits = client.get("/api/search", params={"q": "photonics"}).json()["items"]
+    assert [r["id"] for r in hits] == [posts[0]["id"]]
+
+
+def test_list_posts_q_uses_fts(client, participant_user):
+    headers = {"X-User-Id": str(participant_user["id"])}
+    client.post("/api/posts", json={"title": "Deep Learning", "content": "x", "status": "published"}, headers=headers)
+    client.post("/api/posts", json={"title": "Other", "content": "mentions DEEP learning", "status": "published"}, headers=headers)
+    client.post("/api/posts", json={"title": "Unrelated", "status": "published", "tags": ["deep learning"]}, headers=headers)
+    resp = client.get("/api/posts", params={"q": "deep learning"})
+    assert resp.json()["total"] == 2
+    # Below the trigram size: LIKE fallback, same columns
+    assert client.get("/api/posts", params={"q": "de"}).json()["total"] == 2
+
+
+def test_search_keeps_short_terms_and_hides_unpublished(client, organizer_user, participant_user):
+    posts, _ = _seed(client, organizer_user, participant_user)
+    part = {"X-User-Id": str(participant_user["id"])}
+    ai = client.post("/api/posts", json={
+        "title": "AI agent toolkit", "status": "published",
+    }, headers=part).json()
+    plain = client.post("/api/posts", json={
+        "title": "Agent basics", "status": "published",
+    }, headers=part).json()
+    pending = client.post("/api/posts", json={
+        "title": "Quantum review", "status": "pending_review",
+    }, headers=part).json()
+    # "AI" is below the trigram size but still has to match
+    both = client.get("/api/search", params={"q": "AI agent", "type": "post"}).json()
+    assert [r["id"] for r in both["items"]] == [ai["id"]]
+    short = client.get("/api/search", params={"q": "AI", "type": "post"}).json()
+    assert ai["id"] in [r["id"] for r in short["items"]]
+    assert plain["id"] not in [r["id"] for r in short["items"]]
+    # Only published posts, plus the author's own
+    found = client.get("/api/search", params={"q": "quantum", "type": "post"}).json()
+    assert pending["id"] not in [r["id"] for r in found["items"]]
+    own = client.get("/api/search", params={"q": "quantum", "type": "post"}, headers=part).json()
+    assert {pending["id"], posts[2]["id"]} <= {r["id"] for r in own["items"]}
+
+
+def test_fts_query_quoting():
+    assert fts_match_query('ab "quoted" AND x') == '"""quoted""" "AND"'
+    assert fts_match_query("a b") is None
+    assert short_terms('ab "quoted" AND x') == ["ab", "x"]
+    assert fts_phrase_query(" hello ", ("title",)) == '{title} : "hello"'
+
+
+def test_migration_backfills_search_index(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/fts.db")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        drop_search_index(conn)
+        conn.exec_driver_sql("INSERT INTO posts (title, type, status, visibility, like_count, comment_count) "
+                             "VALUES ('Existing quantum post', 'general', 'published', 'public', 0, 0)")
+
+    cfg = Config(str(BASE_DIR / "alembic.ini"))
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.stamp(cfg, "a3f1c2d4e5b6")
+        command.upgrade(cfg, "b7d2e9f4a1c8")
+
+    with engine.connect() as conn:
+        hits = conn.exec_driver_sql("SELECT rowid FROM posts_fts WHERE posts_fts MATCH 'quantum'").all()
+    assert len(hits) == 1
+    engine.dispose()
@@ -6,6 +6,8 @@ Covers:
 - TC-IACT-001: Like post, like_count increments
 - TC-IACT-002: Duplicate like rejected
 - TC-IACT-003: Unlike, like_count decrements
+- TC-IACT-004: Like/unlike update like_count with an atomic increment
+- TC-IACT-005: Admin recount repairs drifted like_count / comment_count
 - TC-IACT-010: Create top-level comment, comment_count +1
 - TC-IACT-011: Create nested reply
 - TC-IACT-013: comment_count includes all levels
@@ -96,6 +98,54 @@ def test_multiple_users_like(client):
     assert _get_post(client, post_id, u1)["like_count"] == 1
 
 
+def test_like_counters_are_atomic_increments(client, db_session):
+    """TC-IACT-004: like/unlike bump like_count in the UPDATE itself, never read-count-assign.
+
+    SQLite serializes writers, so parallel requests can't expose a lost update here;
+    the emitted SQL shows the counter never round-trips through Python instead.
+    """
+    from sqlalchemy import event as sa_event
+    uid = _create_user(client)
+    post_id = _create_post(client, uid)["id"]
+    headers = {"X-User-Id": str(uid)}
+
+    statements = []
+    listener = lambda *args: statements.append(" ".join(args[2].split()))  # noqa: E731
+    sa_event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    try:
+        assert client.post(f"/api/posts/{post_id}/like", headers=headers).status_code == 201
+        assert client.delete(f"/api/posts/{post_id}/like", headers=headers).status_code == 204
+    finally:
+        sa_event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+    writes = [s for s in statements if s.startswith("UPDATE posts") and "like_count" in s]
+    assert len(writes) == 2
+    assert all("like_count=(posts.like_count + ?)" in s for s in writes)
+    assert not any("count(" in s.lower() for s in statements)
+    assert _get_post(client, post_id, uid)["like_count"] == 0
+
+
+def test_admin_recount_repairs_counters(client, db_session, admin_user):
+    """TC-IACT-005: recount-counters resets drifted counters from the interaction bindings."""
+    from app.models.post import Post
+    uid = _create_user(client)
+    post_id = _create_post(client, uid)["id"]
+    client.post(f"/api/posts/{post_id}/like", headers={"X-User-Id": str(uid)})
+    client.post(f"/api/posts/{post_id}/comments", json={"type": "comment", "value": "hi"},
+                headers={"X-User-Id": str(uid)})
+    db_session.query(Post).filter(Post.id == post_id).update({"like_count": 7, "comment_count": -2})
+    db_session.commit()
+
+    admin = {"X-User-Id": str(admin_user["id"])}
+    assert client.post("/api/admin/posts/recount-counters", json={"ids": [post_id]},
+                       headers={"X-User-Id": str(uid)}).status_code == 403
+    resp = client.post("/api/admin/posts/recount-counters", json={"ids": [post_id, 9999]}, headers=admin)
+    assert resp.status_code == 200
+    assert (resp.json()["success_count"], resp.json()["failed_ids"]) == (1, [9999])
+    post = _get_post(client, post_id, uid)
+    assert (post["like_count"], post["comment_count"]) == (1, 1)
+
+
 # --- Comment tests ---
 
 def test_create_comment_increments_cache(client):
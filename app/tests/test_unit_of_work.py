@@ -0,0 +1,123 @@
+"""Request-scoped unit of work — CRUD calls flush, commit_db commits once per request"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import crud
+from app.database import UNIT_OF_WORK, commit_db, unit_of_work
+from app.models.user import User
+from app.schemas.user import UserCreate
+
+
+@contextmanager
+def _count_commits(db):
+    commits = []
+    bind = db.get_bind()
+
+    def _on_commit(conn):
+        commits.append(conn)
+
+    event.listen(bind, "commit", _on_commit)
+    try:
+        yield commits
+    finally:
+        event.remove(bind, "commit", _on_commit)
+
+
+def _setup(client, organizer_user, participant_user):
+    org = {"X-User-Id": str(organizer_user["id"])}
+    part = {"X-User-Id": str(participant_user["id"])}
+    post = client.post("/api/posts", json={"title": "Entry", "status": "published"}, headers=org).json()
+    own = client.post("/api/posts", json={"title": "Mine", "status": "published"}, headers=part).json()
+    event_id = client.post("/api/events", json={
+        "name": "Jam", "description": "d", "type": "competition", "status": "published",
+    }, headers=org).json()["id"]
+    return post, own, event_id, part
+
+
+FLOWS = {
+    "comment": lambda c, post, own, event_id, h: c.post(
+        f"/api/posts/{post['id']}/comments", json={"type": "comment", "value": "nice"}, headers=h,
+    ),
+    "like": lambda c, post, own, event_id, h: c.post(f"/api/posts/{post['id']}/like", headers=h),
+    "follow": lambda c, post, own, event_id, h: c.post(f"/api/users/{post['created_by']}/follow", headers=h),
+    "submission": lambda c, post, own, event_id, h: c.post(
+        f"/api/events/{event_id}/posts", json={"post_id": own["id"]}, headers=h,
+    ),
+}
+
+
+@pytest.mark.parametrize("flow", list(FLOWS))
+def test_write_flow_commits_once(client, db_session, organizer_user, participant_user, flow):
+    post, own, event_id, headers = _setup(client, organizer_user, participant_user)
+    with _count_commits(db_session) as commits:
+        resp = FLOWS[flow](client, post, own, event_id, headers)
+    assert resp.status_code == 201, resp.text
+    assert len(commits) == 1
+
+
+def test_comment_flow_is_visible_after_commit(client, db_session, organizer_user, participant_user):
+    post, own, event_id, headers = _setup(client, organizer_user, participant_user)
+    comment = FLOWS["comment"](client, post, own, event_id, headers).json()
+    assert comment["id"] and comment["created_at"]
+    refreshed = client.get(f"/api/posts/{post['id']}").json()
+    assert refreshed["comment_count"] == 1
+    assert client.get(
+        "/api/notifications", headers={"X-User-Id": str(organizer_user["id"])},
+    ).json()["total"] == 1
+
+
+def test_error_response_rolls_back_request(client, db_session, participant_user):
+    headers = {"X-User-Id": str(participant_user["id"])}
+    with _count_commits(db_session) as commits:
+        resp = client.post("/api/posts/999/like", headers=headers)
+    assert resp.status_code == 404
+    assert commits == []
+
+
+def test_commit_db_rolls_back_flushed_work(db_session):
+    db_session.info[UNIT_OF_WORK] = True
+    gen = commit_db(db_session)
+    next(gen)
+    crud.users.create(db_session, obj_in=UserCreate(username="ghost", email="ghost@example.com"))
+    assert db_session.query(User).count() == 1  # flushed, not committed
+    with pytest.raises(RuntimeError):
+        gen.throw(RuntimeError("boom"))
+    assert db_session.query(User).count() == 0
+
+
+def test_crud_commits_outside_a_request(db_session):
+    with _count_commits(db_session) as commits:
+        user = crud.users.create(db_session, obj_in=UserCreate(username="solo", email="solo@example.com"))
+    assert len(commits) == 1
+    assert user.created_at is not None
+
+
+def test_unit_of_work_block_commits_once(db_session):
+    with _count_commits(db_session) as commits:
+        with unit_of_work(db_session):
+            for name in ("one", "two"):
+                crud.users.create(db_session, obj_in=UserCreate(username=name, email=f"{name}@example.com"))
+            assert commits == []
+    assert len(commits) == 1
+    assert UNIT_OF_WORK not in db_session.info
+    assert db_session.query(User).count() == 2
+
+
+def test_unit_of_work_block_rolls_back_on_error(db_session):
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db_session):
+            crud.users.create(db_session, obj_in=UserCreate(username="ghost", email="ghost@example.com"))
+            raise RuntimeError("boom")
+    assert UNIT_OF_WORK not in db_session.info
+    assert db_session.query(User).count() == 0
+
+
+def test_unit_of_work_inside_a_request_leaves_commit_to_owner(db_session):
+    db_session.info[UNIT_OF_WORK] = True
+    with _count_commits(db_session) as commits:
+        with unit_of_work(db_session):
+            crud.users.create(db_session, obj_in=UserCreate(username="req", email="req@example.com"))
+    assert commits == []
+    assert db_session.info[UNIT_OF_WORK] is True
@@ -26,8 +26,8 @@ describe('search-api', () => {
       status: 200,
       json: async () => ({
         items: [
-          { id: 1, username: 'alice', display_name: 'Alice' },
-          { id: 2, username: 'bob', display_name: 'Bob' },
+          { type: 'user', id: 1, title: 'Alice', subtitle: 'alice', score: -2.1 },
+          { type: 'user', id: 2, title: 'Alicia', subtitle: 'alicia', score: -1.4 },
         ],
         total: 2,
       }),
@@ -35,8 +35,9 @@ describe('search-api', () => {
 
     const results = await searchUsers('ali', 5)
 
-    expect(mockFetch).toHaveBeenCalledWith('http://example.test/api/users?limit=100')
+    expect(mockFetch).toHaveBeenCalledWith('http://example.test/api/search?q=ali&type=user&limit=5')
     expect(results[0]?.url).toBe('/users/1')
+    expect(results[0]?.subtitle).toBe('@alice')
   })
 
   it('searchPosts 结果链接统一指向 /posts/:id', async () => {
@@ -47,8 +48,8 @@ describe('search-api', () => {
       status: 200,
       json: async () => ({
         items: [
-          { id: 10, title: 'P1', type: 'proposal', status: 'published', created_by: 1 },
-          { id: 11, title: 'G1', type: 'general', status: 'published', created_by: 1 },
+          { type: 'post', id: 10, title: 'P1', subtitle: 'proposal', score: -3.0 },
+          { type: 'post', id: 11, title: 'G1', subtitle: 'general', score: -1.0 },
         ],
         total: 2,
       }),
@@ -56,7 +57,7 @@ describe('search-api', () => {
 
     const results = await searchPosts('1', 5)
 
-    expect(mockFetch).toHaveBeenCalledWith('http://example.test/api/posts?limit=100&status=published')
+    expect(mockFetch).toHaveBeenCalledWith('http://example.test/api/search?q=1&type=post&limit=5')
     expect(results.map(r => r.url)).toEqual(['/posts/10', '/posts/11'])
   })
 })
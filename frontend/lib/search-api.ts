@@ -15,28 +15,12 @@ export interface SearchResult {
   url: string
 }
 
-interface UserResult {
-  id: number
-  username: string
-  display_name?: string
-  bio?: string
-}
-
-interface CategoryResult {
-  id: number
-  name: string
-  description?: string
-  type: string
-  status: string
-}
-
-interface PostResult {
+interface SearchHit {
+  type: 'user' | 'event' | 'post'
   id: number
   title: string
-  body?: string
-  type: string
-  status: string
-  created_by: number
+  subtitle?: string | null
+  score: number
 }
 
 interface PaginatedResponse<T> {
@@ -53,85 +37,69 @@ async function fetchJson<T>(url: string): Promise<T> {
 }
 
 /**
- * Search users by username or display_name
+ * Query the backend full-text index (/search, bm25-ranked) for one result type
+ */
+async function searchType(
+  type: SearchResult['type'],
+  query: string,
+  limit: number,
+): Promise<SearchHit[]> {
+  const params = new URLSearchParams({ q: query, type, limit: String(limit) })
+  const data = await fetchJson<PaginatedResponse<SearchHit>>(
+    `${getApiBase()}/search?${params.toString()}`
+  )
+  return data.items
+}
+
+/**
+ * Search users by username, display_name or bio
  */
 export async function searchUsers(query: string, limit = 5): Promise<SearchResult[]> {
   try {
-    // Backend doesn't have a search endpoint, so we fetch and filter client-side
-    const data = await fetchJson<PaginatedResponse<UserResult>>(
-      `${getApiBase()}/users?limit=100`
-    )
-
-    const q = query.toLowerCase()
-    return data.items
-      .filter(user =>
-        user.username.toLowerCase().includes(q) ||
-        (user.display_name && user.display_name.toLowerCase().includes(q))
-      )
-      .slice(0, limit)
-      .map(user => ({
-        type: 'user' as const,
-        id: user.id,
-        title: user.display_name || user.username,
-        subtitle: `@${user.username}`,
-        url: `/users/${user.id}`,
-      }))
+    const hits = await searchType('user', query, limit)
+    return hits.map(user => ({
+      type: 'user' as const,
+      id: user.id,
+      title: user.title,
+      subtitle: `@${user.subtitle}`,
+      url: `/users/${user.id}`,
+    }))
   } catch {
     return []
   }
 }
 
 /**
- * Search events by name
+ * Search events by name or description
  */
 export async function searchCategories(query: string, limit = 5): Promise<SearchResult[]> {
   try {
-    const data = await fetchJson<PaginatedResponse<CategoryResult>>(
-      `${getApiBase()}/events?limit=100`
-    )
-
-    const q = query.toLowerCase()
-    return data.items
-      .filter(cat =>
-        cat.name.toLowerCase().includes(q) ||
-        (cat.description && cat.description.toLowerCase().includes(q))
-      )
-      .slice(0, limit)
-      .map(cat => ({
-        type: 'event' as const,
-        id: cat.id,
-        title: cat.name,
-        subtitle: cat.type === 'competition' ? '比赛' : '活动',
-        url: `/events/${cat.id}`,
-      }))
+    const hits = await searchType('event', query, limit)
+    return hits.map(cat => ({
+      type: 'event' as const,
+      id: cat.id,
+      title: cat.title,
+      subtitle: cat.subtitle === 'competition' ? '比赛' : '活动',
+      url: `/events/${cat.id}`,
+    }))
   } catch {
     return []
   }
 }
 
 /**
- * Search posts by title
+ * Search posts by title, content or tags
  */
 export async function searchPosts(query: string, limit = 5): Promise<SearchResult[]> {
   try {
-    const data = await fetchJson<PaginatedResponse<PostResult>>(
-      `${getApiBase()}/posts?limit=100&status=published`
-    )
-
-    const q = query.toLowerCase()
-    return data.items
-      .filter(post =>
-        post.title.toLowerCase().includes(q) ||
-        (post.body && post.body.toLowerCase().includes(q))
-      )
-      .slice(0, limit)
-      .map(post => ({
-        type: 'post' as const,
-        id: post.id,
-        title: post.title,
-        subtitle: getPostTypeLabel(post.type),
-        url: `/posts/${post.id}`,
-      }))
+    const hits = await searchType('post', query, limit)
+    return hits.map(post => ({
+      type: 'post' as const,
+      id: post.id,
+      title: post.title,
+      subtitle: getPostTypeLabel(post.subtitle ?? 'general'),
+      url: `/posts/${post.id}`,
+    }))
   } catch {
     return []
   }
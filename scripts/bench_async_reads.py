@@ -0,0 +1,150 @@
+"""Load benchmark: sync (threadpool) vs async (AsyncSession) read endpoints.
+
+Seeds a temporary SQLite database, then fires concurrent GET requests at the hot read
+endpoints (list_posts, get_post, list_categories, list_notifications, get_unread_count)
+through an in-process ASGI transport. The sync mode runs each request on the AnyIO
+threadpool; the async mode mounts the async routers the way app.main does when
+DB_ASYNC_READS=true.
+
+Usage:
+    uv run python scripts/bench_async_reads.py [--requests 2000] [--concurrency 200] [--thread-limit 40]
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+import anyio.to_thread
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from bench_common import make_parser, temp_database
+from app.core.config import Settings
+from app.database import create_async_db_engine, get_async_db, get_db
+from app.models.event import Event
+from app.models.notification import Notification
+from app.models.post import Post
+from app.models.user import User
+from app.routers import events, notifications, posts
+
+USERS = 50
+
+
+def _seed(Session, n_posts: int) -> None:
+    with Session() as db:
+        db.add_all(User(username=f"u{i}", email=f"u{i}@example.com") for i in range(1, USERS + 1))
+        db.flush()
+        db.add_all(
+            Post(title=f"Post {i}", content="lorem ipsum " * 20, status="published",
+                 tags=["ai"] if i % 3 == 0 else [], created_by=i % USERS + 1)
+            for i in range(n_posts)
+        )
+        db.add_all(
+            Event(name=f"Event {i}", description="d", type="competition", status="published", created_by=1)
+            for i in range(200)
+        )
+        db.add_all(
+            Notification(user_id=i % USERS + 1, type="system", content=f"n{i}", is_read=i % 2 == 0)
+            for i in range(n_posts)
+        )
+        db.commit()
+
+
+def _build_app(async_reads: bool, SyncSession, AsyncSession) -> FastAPI:
+    bench_app = FastAPI()
+    if async_reads:
+        for module in (posts, events, notifications):
+            bench_app.include_router(module.async_router, prefix="/api")
+    for module in (posts, events, notifications):
+        bench_app.include_router(module.router, prefix="/api")
+
+    def _get_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def _get_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    bench_app.dependency_overrides[get_db] = _get_db
+    bench_app.dependency_overrides[get_async_db] = _get_async_db
+    return bench_app
+
+
+def _request_plan(n: int, n_posts: int) -> list[tuple[str, dict]]:
+    paths = []
+    for i in range(n):
+        user = str(i % USERS + 1)
+        kind = i % 5
+        if kind == 0:
+            paths.append((f"/api/posts?limit=20&skip={i % 100}", {}))
+        elif kind == 1:
+            paths.append((f"/api/posts/{i % n_posts + 1}", {}))
+        elif kind == 2:
+            paths.append(("/api/events?limit=20", {}))
+        elif kind == 3:
+            paths.append(("/api/notifications?limit=20", {"X-User-Id": user}))
+        else:
+            paths.append(("/api/notifications/unread-count", {"X-User-Id": user}))
+    return paths
+
+
+async def _run(bench_app: FastAPI, plan, concurrency: int) -> dict:
+    latencies: list[float] = []
+    sem = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(path, headers):
+            async with sem:
+                start = time.perf_counter()
+                resp = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                assert resp.status_code == 200, (path, resp.status_code)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(p, h) for p, h in plan))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": len(plan) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+async def main_async(args) -> None:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = args.thread_limit
+    pool = {"db_pool_size": args.thread_limit, "db_max_overflow": args.concurrency}
+    with temp_database(**pool) as (sync_engine, SyncSession):
+        _seed(SyncSession, args.posts)
+        url = sync_engine.url.render_as_string(hide_password=False)
+        async_engine = create_async_db_engine(url, profile=Settings(database_url=url, **pool))
+        AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        plan = _request_plan(args.requests, args.posts)
+        print(f"{'mode':<8} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10}")
+        for mode in (False, True):
+            bench_app = _build_app(mode, SyncSession, AsyncSession)
+            await _run(bench_app, plan[:100], args.concurrency)  # warm-up
+            r = await _run(bench_app, plan, args.concurrency)
+            name = "async" if mode else "sync"
+            print(f"{name:<8} {r['rps']:>10.0f} {r['p50_ms']:>10.1f} {r['p95_ms']:>10.1f}")
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--thread-limit", type=int, default=40, help="AnyIO threadpool size (default 40)")
+    parser.add_argument("--posts", type=int, default=5000)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
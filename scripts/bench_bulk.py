@@ -0,0 +1,91 @@
+"""Benchmark bulk CRUD: per-row create() vs create_many() / upsert_many() / update_many().
+
+Writes notifications, event_posts and group members into a temporary SQLite file
+and reports the median wall time and number of statements for each strategy:
+
+- per-row:  crud.<x>.create() per row inside one unit of work (flush per row)
+- bulk:     crud.<x>.create_many(), batched multi-row INSERT ... RETURNING
+- upsert:   crud.<x>.upsert_many() over the same rows again (all conflicts)
+- update:   crud.<x>.update_many() touching every row (notifications only)
+
+Usage:
+    uv run python scripts/bench_bulk.py [--rows 10000 100000] [--runs 3]
+"""
+from __future__ import annotations
+
+import statistics
+import time
+
+from bench_common import StatementCounter, make_parser, temp_database
+
+from app import crud
+from app.database import UNIT_OF_WORK, Base
+from app.models.user import User
+
+
+def _rows(table: str, n: int) -> list:
+    if table == "notifications":
+        return [{"user_id": 1 + i % 100, "type": "system", "content": f"n{i}"} for i in range(n)]
+    if table == "event_posts":
+        return [{"event_id": 1 + i // 1000, "post_id": 1 + i % 1000, "relation_type": "submission"} for i in range(n)]
+    return [{"group_id": 1 + i // 100, "user_id": 1 + i % 100} for i in range(n)]
+
+
+def _seed(Session) -> None:
+    with Session() as db:
+        db.add_all(User(username=f"u{i}", email=f"u{i}@example.com") for i in range(1, 101))
+        db.commit()
+
+
+def _per_row(db, table: str, rows: list) -> None:
+    create = getattr(crud, table).create
+    for row in rows:
+        create(db, **row)
+
+
+def _time(engine, Session, fn) -> tuple:
+    with StatementCounter(engine) as counter, Session(info={UNIT_OF_WORK: True}) as db:
+        start = time.perf_counter()
+        fn(db)
+        db.commit()
+        return time.perf_counter() - start, counter.count
+
+
+def _run(table: str, n: int, runs: int) -> dict:
+    samples = {}
+    for _ in range(runs):
+        with temp_database() as (engine, Session):
+            _seed(Session)
+            rows = _rows(table, n)
+            bulk = getattr(crud, table)
+            results = {"per-row": _time(engine, Session, lambda db: _per_row(db, table, rows))}
+            Base.metadata.drop_all(bind=engine)
+            Base.metadata.create_all(bind=engine)
+            _seed(Session)
+            ids = []
+            results["bulk"] = _time(engine, Session, lambda db: ids.extend(bulk.create_many(db, rows=rows)))
+            if table == "notifications":
+                results["update"] = _time(engine, Session, lambda db: bulk.update_many(
+                    db, rows=[{"id": i, "is_read": True} for i in ids]))
+            else:
+                results["upsert"] = _time(engine, Session, lambda db: bulk.upsert_many(db, rows=rows))
+            for mode, sample in results.items():
+                samples.setdefault(mode, []).append(sample)
+    return {mode: (statistics.median(s[0] for s in runs_) * 1000, runs_[0][1]) for mode, runs_ in samples.items()}
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'table':<14} {'rows':>7} {'mode':<8} {'ms':>9} {'statements':>11} {'rows/s':>10}")
+    for n in args.rows:
+        for table in ("notifications", "event_posts", "members"):
+            for mode, (ms, statements) in _run(table, n, args.runs).items():
+                print(f"{table:<14} {n:>7} {mode:<8} {ms:>9.1f} {statements:>11} {n / ms * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark award_certificate: per-certificate commits vs one bulk transaction.
+
+Seeds one event with N ranked submissions (tags rank_1 .. rank_N) and awards a
+certificate to every one of them, then re-runs the action (which must issue
+nothing new). Modes:
+
+- python: the previous shape (posts.get per relation, scan tags for the rank,
+          add + commit each certificate, then event_posts.create per link);
+          run here without the old 100-row cap so it awards every submission
+- sql:    _action_award_certificate (rank tags from post_tags, create_many for
+          posts and links inside one unit_of_work)
+
+The previous code has no rerun guard, so its "rerun" issues every certificate
+again (see the "certs" column). The python mode is skipped above --python-max
+winners.
+
+Usage:
+    uv run python scripts/bench_certificates.py [--winners 1000 10000] [--python-max 1000]
+"""
+from __future__ import annotations
+
+import time
+
+from bench_common import make_parser, temp_database
+
+from app import crud
+from app.models.event_post import EventPost
+from app.models.post import Post
+from app.services.rule_engine import _action_award_certificate
+
+PARAMS = {"rules": [
+    {"rank_range": [1, 1], "title": "Gold"},
+    {"rank_range": [2, 3], "title": "Podium"},
+    {"rank_range": [4, 10**9], "title": "Finalist"},
+]}
+
+
+def _python_award(db, params, context) -> None:
+    event_id = context["event_id"]
+    rels = db.query(EventPost).filter(
+        EventPost.event_id == event_id, EventPost.relation_type == "submission",
+    ).all()
+    for rel in rels:
+        post = crud.posts.get(db, id=rel.post_id)
+        if not post:
+            continue
+        rank = None
+        for t in post.tags or []:
+            if t.startswith("rank_"):
+                try:
+                    rank = int(t[len("rank_"):])
+                except ValueError:
+                    pass
+        if rank is None:
+            continue
+        for award_rule in params["rules"]:
+            low, high = award_rule["rank_range"]
+            if low <= rank <= high:
+                cert_post = Post(
+                    title=f"{award_rule['title']} — {post.title}",
+                    content=f"Certificate awarded for rank {rank}",
+                    type="certificate", status="published", visibility="public",
+                    created_by=post.created_by,
+                )
+                db.add(cert_post)
+                db.commit()
+                crud.event_posts.create(db, event_id=event_id, post_id=cert_post.id, relation_type="reference")
+                break
+
+
+def _seed(Session, n: int) -> None:
+    with Session() as db:
+        ids = crud.posts.create_many(db, rows=[
+            {"title": f"S{i}", "status": "published", "created_by": i, "tags": ["ai", f"rank_{i + 1}"]}
+            for i in range(n)
+        ])
+        crud.event_posts.create_many(db, rows=[
+            {"event_id": 1, "post_id": post_id, "relation_type": "submission"} for post_id in ids
+        ])
+        db.commit()
+
+
+def _run(n: int, mode: str) -> tuple[float, float, int]:
+    with temp_database() as (engine, Session):
+        _seed(Session, n)
+        award = _action_award_certificate if mode == "sql" else _python_award
+        timings = []
+        for _ in range(2):  # first pass, then a re-run
+            with Session() as db:
+                start = time.perf_counter()
+                award(db, PARAMS, {"event_id": 1})
+                timings.append(time.perf_counter() - start)
+        with Session() as db:
+            certs = db.query(Post).filter(Post.type == "certificate").count()
+        return timings[0] * 1000, timings[1] * 1000, certs
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--winners", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--python-max", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'winners':>8} {'mode':<7} {'first ms':>10} {'rerun ms':>10} {'certs':>7}")
+    for n in args.winners:
+        for mode in ("python", "sql"):
+            if mode == "python" and n > args.python_max:
+                continue
+            first, rerun, certs = _run(n, mode)
+            print(f"{n:>8} {mode:<7} {first:>10.1f} {rerun:>10.1f} {certs:>7}")
+
+
+if __name__ == "__main__":
+    main()
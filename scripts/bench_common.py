@@ -0,0 +1,114 @@
+"""Shared helpers for the scripts/bench_*.py benchmarks.
+
+Importing this module puts the repository root on sys.path, so scripts import it
+before the ``app`` package (it does not import ``app`` itself, which keeps
+subprocess-based benchmarks such as bench_startup free of it)::
+
+    from bench_common import make_parser, measure, temp_database
+
+    with temp_database() as (engine, Session):
+        ...
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def make_parser(doc: str) -> argparse.ArgumentParser:
+    """Argument parser described by the first line of the script's docstring."""
+    return argparse.ArgumentParser(description=doc.splitlines()[0])
+
+
+@contextmanager
+def temp_database(**settings):
+    """Yield ``(engine, Session)`` for a fresh SQLite file with the full schema.
+
+    ``settings`` override the connection profile (e.g. ``sqlite_synchronous="full"``);
+    the engine is disposed and the file removed on exit.
+    """
+    from app.core.config import Settings
+    from app.database import Base, create_db_engine
+    import app.models  # noqa: F401
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{tmp}/bench.db"
+        engine = create_db_engine(url, profile=Settings(database_url=url, **settings))
+        try:
+            Base.metadata.create_all(bind=engine)
+            yield engine, sessionmaker(bind=engine, autoflush=False)
+        finally:
+            engine.dispose()
+
+
+class StatementCounter:
+    """Count the statements ``engine`` executes inside the ``with`` block."""
+
+    def __init__(self, engine):
+        self.engine, self.count = engine, 0
+
+    def _listener(self, *args) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "StatementCounter":
+        event.listen(self.engine, "before_cursor_execute", self._listener)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._listener)
+
+
+def median_ms(fn, repeat: int, before=None) -> float:
+    """Median wall time of ``repeat`` calls of ``fn``, in milliseconds.
+
+    ``before`` runs ahead of each call, outside the timed span (e.g. to drop a cache).
+    """
+    samples = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def measure(engine, fn, iterations: int, before=None) -> tuple[float, float]:
+    """(median ms, statements per call) of ``iterations`` calls of ``fn``; see median_ms."""
+    with StatementCounter(engine) as counter:
+        ms = median_ms(fn, iterations, before)
+    return ms, counter.count / iterations
+
+
+def peak_kb(fn) -> float:
+    """Peak memory traced while running ``fn`` once, in KiB."""
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def git_commit() -> str | None:
+    """Short hash of HEAD, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,83 @@
+"""Benchmark loading an event's rule set as the number of linked rules grows.
+
+Rules carry only checks for other triggers, so the timings isolate rule loading
+on the submission path (run_pre_checks("create_relation(event_post)")). Modes:
+
+- n+1:    event_rules.get_multi_by_category + rules.get per link (previous loading)
+- join:   one join query per call (RULE_CACHE_TTL=0), compiled plans still cached
+- cached: per-event rule set served from the cache
+
+Usage:
+    uv run python scripts/bench_event_rules.py [--rules 1 10 50 200] [--iterations 500]
+"""
+from __future__ import annotations
+
+from bench_common import make_parser, measure, temp_database
+
+from app import crud
+from app.core.config import settings
+from app.models.event import Event
+from app.models.event_rule import EventRule
+from app.models.rule import Rule
+from app.services.rule_engine import invalidate_rule_plan, run_pre_checks
+
+TRIGGER = "create_relation(event_post)"
+OTHER_CHECK = {
+    "trigger": "create_relation(group_user)", "phase": "pre",
+    "condition": {"type": "time_window", "params": {"end": "2099-01-01T00:00:00Z"}},
+    "on_fail": "deny", "message": "closed",
+}
+
+
+def _seed(Session, n_rules: int) -> int:
+    with Session() as db:
+        ev = Event(name="Jam", description="d", type="competition", status="published")
+        db.add(ev)
+        db.flush()
+        rules = [Rule(name=f"Rule {i}", description="d", checks=[OTHER_CHECK]) for i in range(n_rules)]
+        db.add_all(rules)
+        db.flush()
+        db.add_all(EventRule(event_id=ev.id, rule_id=r.id, priority=n_rules - i) for i, r in enumerate(rules))
+        db.commit()
+        return ev.id
+
+
+def _n_plus_one(db, event_id: int) -> None:
+    for cr in crud.event_rules.get_multi_by_category(db, event_id=event_id):
+        crud.rules.get(db, id=cr.rule_id)
+
+
+def _run(n_rules: int, iterations: int) -> dict:
+    with temp_database() as (engine, Session):
+        event_id = _seed(Session, n_rules)
+        invalidate_rule_plan()
+        ttl = settings.rule_cache_ttl
+        results = {}
+        try:
+            with Session() as db:
+                results["n+1"] = measure(engine, lambda: _n_plus_one(db, event_id), iterations)
+                settings.rule_cache_ttl = 0
+                results["join"] = measure(
+                    engine, lambda: run_pre_checks(db, TRIGGER, event_id, {}), iterations)
+                settings.rule_cache_ttl = 3600
+                results["cached"] = measure(
+                    engine, lambda: run_pre_checks(db, TRIGGER, event_id, {}), iterations)
+        finally:
+            settings.rule_cache_ttl = ttl
+        return results
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--rules", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'rules':>6} {'mode':<7} {'us/call':>10} {'queries':>8}")
+    for n in args.rules:
+        for mode, (ms, queries) in _run(n, args.iterations).items():
+            print(f"{n:>6} {mode:<7} {ms * 1000:>10.1f} {queries:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
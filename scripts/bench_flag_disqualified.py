@@ -0,0 +1,119 @@
+"""Benchmark flag_disqualified: per-member/per-submission loops vs set-based queries.
+
+Seeds one event with --teams registered teams (team g has g % 4 + 1 accepted
+members; every member owns one submission, a third of them with an attachment)
+and times both targets with min_team_size=3. Modes:
+
+- python: the previous shape (per undersized team, per member, re-list the
+          event's submissions and posts.get each; one post_resources query per
+          submission for "missing_attachment")
+- sql:    _action_flag_disqualified (one SELECT, one executemany UPDATE)
+
+The previous code read relation lists through get_multi_by_category(), which
+stops at 100 rows, so past 100 submissions its timings are bounded by that page
+and it flags only part of the event (the "flagged" column shows how many posts
+each mode tagged). The python mode is skipped above --python-max teams.
+
+Usage:
+    uv run python scripts/bench_flag_disqualified.py [--teams 100 1000 10000] [--python-max 1000]
+"""
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+from bench_common import StatementCounter, make_parser, temp_database
+
+from app import crud
+from app.database import UNIT_OF_WORK
+from app.models.event_group import EventGroup
+from app.models.post import Post
+from app.models.post_resource import PostResource
+from app.models.resource import Resource
+from app.services.rule_engine import _action_flag_disqualified
+
+TARGETS = {
+    "group": {"target": "group", "tag": "team_too_small"},
+    "post": {"target": "post", "tag": "missing_attachment"},
+}
+
+
+def _python_flag(db, params, context) -> None:
+    event_id = context["event_id"]
+    tag = params["tag"]
+
+    def flag(post):
+        if tag not in (post.tags or []):
+            post.tags = [*(post.tags or []), tag]
+
+    if params["target"] == "group":
+        for cg in crud.event_groups.get_multi_by_category(db, event_id=event_id):
+            if crud.members.count_by_group(db, group_id=cg.group_id, status="accepted") < context["rule"].min_team_size:
+                for member in crud.members.get_multi_by_group(db, group_id=cg.group_id):
+                    for rel in crud.event_posts.get_multi_by_category(
+                        db, event_id=event_id, relation_type="submission",
+                    ):
+                        post = crud.posts.get(db, id=rel.post_id)
+                        if post and post.created_by == member.user_id:
+                            flag(post)
+    else:
+        for rel in crud.event_posts.get_multi_by_category(db, event_id=event_id, relation_type="submission"):
+            post = crud.posts.get(db, id=rel.post_id)
+            if post and not crud.post_resources.get_multi_by_post(db, post_id=post.id):
+                flag(post)
+    db.flush()
+
+
+def _seed(Session, teams: int) -> int:
+    rows = [(g, g * 10 + k) for g in range(1, teams + 1) for k in range(g % 4 + 1)]
+    with Session() as db:
+        db.bulk_insert_mappings(EventGroup, [{"event_id": 1, "group_id": g} for g in range(1, teams + 1)])
+        crud.members.create_many(db, rows=[
+            {"group_id": g, "user_id": u, "status": "accepted"} for g, u in rows
+        ])
+        ids = crud.posts.create_many(db, rows=[
+            {"title": f"S{u}", "status": "published", "created_by": u, "tags": []} for _, u in rows
+        ])
+        crud.event_posts.create_many(db, rows=[
+            {"event_id": 1, "post_id": post_id, "relation_type": "submission"} for post_id in ids
+        ])
+        db.add(Resource(id=1, filename="deck.pdf"))
+        db.bulk_insert_mappings(PostResource, [{"post_id": post_id, "resource_id": 1} for post_id in ids[::3]])
+        db.commit()
+        return len(ids)
+
+
+def _run(teams: int, mode: str, target: str) -> tuple[int, float, int, int]:
+    with temp_database() as (engine, Session):
+        submissions = _seed(Session, teams)
+        flag = _action_flag_disqualified if mode == "sql" else _python_flag
+        params = TARGETS[target]
+        context = {"event_id": 1, "rule": SimpleNamespace(min_team_size=3)}
+        with StatementCounter(engine) as counter, Session(info={UNIT_OF_WORK: True}) as db:
+            start = time.perf_counter()
+            flag(db, params, context)
+            db.commit()
+            elapsed = time.perf_counter() - start
+        with Session() as db:
+            flagged = sum(params["tag"] in (tags or []) for (tags,) in db.query(Post.tags))
+        return submissions, elapsed * 1000, counter.count, flagged
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--teams", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--python-max", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'teams':>6} {'submissions':>11} {'target':<6} {'mode':<7} {'ms':>10} {'queries':>8} {'flagged':>8}")
+    for n in args.teams:
+        for target in TARGETS:
+            for mode in ("python", "sql"):
+                if mode == "python" and n > args.python_max:
+                    continue
+                submissions, ms, queries, flagged = _run(n, mode, target)
+                print(f"{n:>6} {submissions:>11} {target:<6} {mode:<7} {ms:>10.1f} {queries:>8} {flagged:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark a member joining a team registered in many events: per-event vs batched pre checks.
+
+Seeds one team with --members accepted members, registered in N events. Each
+event links its own rule with a different max_team_size (a team-size COUNT) and
+a custom "already in a team" warning (a membership EXISTS), both on the
+create_relation(group_user) trigger. Modes:
+
+- loop:  run_pre_checks per event (previous add_group_member)
+- batch: run_pre_checks_batch over all events (shared lookups)
+
+Both are timed with the per-event rule sets cached (RULE_CACHE_TTL, the steady
+state) and uncached (RULE_CACHE_TTL=0, every call reloads them).
+
+Usage:
+    uv run python scripts/bench_group_join.py [--events 1 10 50 200] [--iterations 200]
+"""
+from __future__ import annotations
+
+from bench_common import make_parser, measure, temp_database
+
+from app import crud
+from app.core.config import settings
+from app.models.event import Event
+from app.models.event_group import EventGroup
+from app.models.event_rule import EventRule
+from app.models.rule import Rule
+from app.services.rule_engine import invalidate_rule_plan, run_pre_checks, run_pre_checks_batch
+
+TRIGGER = "create_relation(group_user)"
+GROUP_ID = 1
+JOINER = 10_000
+
+CHECKS = [{
+    "trigger": TRIGGER, "phase": "pre", "on_fail": "warn", "message": "already in a team",
+    "condition": {"type": "exists", "params": {
+        "entity": "group_user", "filter": {"status": "accepted"}, "require": False}},
+}]
+
+
+def _seed(Session, n_events: int, members: int) -> list[int]:
+    with Session() as db:
+        events = [Event(name=f"Track {i}", description="d", type="competition", status="published")
+                  for i in range(n_events)]
+        rules = [Rule(name=f"Track {i} rules", description="d", max_team_size=members + 1 + i, checks=CHECKS)
+                 for i in range(n_events)]
+        db.add_all(events + rules)
+        db.flush()
+        db.add_all(EventRule(event_id=ev.id, rule_id=rule.id) for ev, rule in zip(events, rules))
+        db.add_all(EventGroup(event_id=ev.id, group_id=GROUP_ID) for ev in events)
+        crud.members.create_many(db, rows=[
+            {"group_id": GROUP_ID, "user_id": u, "status": "accepted"} for u in range(1, members + 1)
+        ])
+        db.commit()
+        return [ev.id for ev in events]
+
+
+def _loop(db, event_ids: list[int], context: dict) -> None:
+    for event_id in event_ids:
+        run_pre_checks(db, TRIGGER, event_id, context)
+
+
+def _run(n_events: int, members: int, iterations: int) -> list[tuple[str, str, float, float]]:
+    with temp_database() as (engine, Session):
+        event_ids = _seed(Session, n_events, members)
+        context = {"user_id": JOINER, "group_id": GROUP_ID}
+        invalidate_rule_plan()
+        ttl = settings.rule_cache_ttl
+        results = []
+        try:
+            with Session() as db:
+                for cache, cache_ttl in (("cached", 3600), ("uncached", 0)):
+                    settings.rule_cache_ttl = cache_ttl
+                    for mode, fn in (
+                        ("loop", lambda: _loop(db, event_ids, context)),
+                        ("batch", lambda: run_pre_checks_batch(db, TRIGGER, event_ids, context)),
+                    ):
+                        results.append((cache, mode, *measure(engine, fn, iterations)))
+        finally:
+            settings.rule_cache_ttl = ttl
+        return results
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--events", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--members", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'events':>7} {'rules':<9} {'mode':<6} {'ms/join':>9} {'queries':>8}")
+    for n in args.events:
+        for cache, mode, ms, queries in _run(n, args.members, args.iterations):
+            print(f"{n:>7} {cache:<9} {mode:<6} {ms:>9.3f} {queries:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
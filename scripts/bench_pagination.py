@@ -0,0 +1,71 @@
+"""Benchmark deep-page latency of GET /api/posts: OFFSET (skip) vs keyset cursor.
+
+Seeds a fresh SQLite database with --posts rows (created_at ties included, as in
+real bursts of inserts) and times fetching page N both ways through the same
+query the router builds, with and without the total count.
+
+Usage:
+    uv run python scripts/bench_pagination.py [--posts 250000] [--limit 20] [--pages 1 100 10000]
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import String, type_coerce
+
+from bench_common import make_parser, median_ms, temp_database
+from app.crud.pagination import encode_cursor, paginate
+from app.models.post import Post
+
+KEYS = (Post.created_at, Post.id)
+START = datetime(2026, 1, 1)
+
+
+def _seed(Session, n: int) -> None:
+    with Session() as db:
+        rows = [{
+            "title": f"post {i}", "type": "general", "status": "published", "visibility": "public",
+            "tags": [], "like_count": 0, "comment_count": 0, "created_by": 1,
+            # Ten posts per second so the id tie-breaker matters
+            "created_at": START + timedelta(seconds=i // 10),
+        } for i in range(n)]
+        db.execute(Post.__table__.insert(), rows)
+        db.commit()
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--posts", type=int, default=250_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with temp_database() as (engine, Session):
+        _seed(Session, args.posts)
+
+        print(f"{'page':>7} {'offset ms':>10} {'cursor ms':>10} {'+count ms':>10}")
+        with Session() as db:
+            query = db.query(Post).filter(Post.deleted_at.is_(None))
+            for page in args.pages:
+                skip = (page - 1) * args.limit
+                if skip >= args.posts:
+                    continue
+                # Cursor of the last row on the previous page, as the client would hold it
+                cursor = None
+                if skip:
+                    prev = db.query(type_coerce(Post.created_at, String), Post.id) \
+                        .filter(Post.deleted_at.is_(None)).order_by(*KEYS).offset(skip - 1).limit(1).one()
+                    cursor = encode_cursor(prev)
+                by_offset = paginate(query, KEYS, skip=skip, limit=args.limit)[0]
+                by_cursor = paginate(query, KEYS, cursor=cursor, limit=args.limit)[0]
+                assert [p.id for p in by_offset] == [p.id for p in by_cursor]
+
+                offset_ms = median_ms(lambda: paginate(query, KEYS, skip=skip, limit=args.limit), args.repeat)
+                cursor_ms = median_ms(lambda: paginate(query, KEYS, cursor=cursor, limit=args.limit), args.repeat)
+                count_ms = median_ms(query.count, args.repeat)
+                print(f"{page:>7} {offset_ms:>10.2f} {cursor_ms:>10.2f} {count_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark pre-check ordering: declaration order vs cheapest first.
+
+Seeds one event with --submissions submissions and --groups registered teams and
+links two rules to it: "quota" (priority 0) declares DB-backed checks (an
+aggregate over every team, an event-wide COUNT and an EXISTS on the user's
+entries), "deadline" (priority 1) sets submission_deadline and max_submissions.
+A new user's submission is then checked with the deadline passed ("late") and
+ahead ("open"). Modes:
+
+- declared: the previous loop (rule by rule, checks in declaration order)
+- cost:     run_pre_checks (checks of all rules merged, cheapest first)
+
+Late submissions are denied by the in-memory time_window check, which the cost
+mode evaluates before any query. Open submissions run every check in both modes.
+
+Usage:
+    uv run python scripts/bench_precheck_order.py [--submissions 50000] [--groups 2000]
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from bench_common import make_parser, measure, temp_database
+
+from app import crud
+from app.models.event import Event
+from app.models.event_group import EventGroup
+from app.models.event_rule import EventRule
+from app.models.post import Post
+from app.models.rule import Rule
+from app.services.rule_engine import (
+    RuleCheckError,
+    _evaluate_condition,
+    get_event_rule_plans,
+    invalidate_rule_plan,
+    run_pre_checks,
+)
+
+TRIGGER = "create_relation(event_post)"
+QUOTA_CHECKS = [
+    {"trigger": TRIGGER, "phase": "pre", "on_fail": "warn", "message": "Every team needs 3 members",
+     "condition": {"type": "aggregate", "params": {
+         "scope": "each_group_in_category", "filter": {"status": "accepted"}, "op": ">=", "value": 3}}},
+    {"trigger": TRIGGER, "phase": "pre", "on_fail": "warn", "message": "Event is nearly full",
+     "condition": {"type": "count", "params": {
+         "entity": "event_post", "filter": {"relation_type": "submission"}, "op": "<", "value": 10**6}}},
+    {"trigger": TRIGGER, "phase": "pre", "on_fail": "deny", "message": "One entry per user",
+     "condition": {"type": "exists", "params": {
+         "entity": "event_post", "filter": {"relation_type": "submission"}, "require": False}}},
+]
+
+
+def _declared_pre_checks(db, trigger: str, event_id: int, context: dict) -> None:
+    for plan in get_event_rule_plans(db, event_id):
+        ctx = {**context, "rule": plan.rule, "event_id": event_id}
+        for check in plan.for_trigger(trigger, "pre"):
+            if check.condition is None or _evaluate_condition(db, check.condition, ctx):
+                continue
+            if check.on_fail == "deny":
+                raise RuleCheckError(message=check.message or "Rule check failed", rule_name=plan.rule.name)
+
+
+def _seed(Session, submissions: int, groups: int) -> tuple[int, int]:
+    with Session() as db:
+        ev = Event(name="Jam", description="d", type="competition", status="published")
+        db.add(ev)
+        db.flush()
+        db.bulk_insert_mappings(Post, [
+            {"id": i, "title": f"Entry {i}", "status": "published", "created_by": i}
+            for i in range(1, submissions + 1)
+        ])
+        crud.event_posts.create_many(db, rows=[
+            {"event_id": ev.id, "post_id": i, "relation_type": "submission"} for i in range(1, submissions + 1)
+        ])
+        db.bulk_insert_mappings(EventGroup, [{"event_id": ev.id, "group_id": g} for g in range(1, groups + 1)])
+        crud.members.create_many(db, rows=[
+            {"group_id": g, "user_id": g * 10 + k, "status": "accepted"}
+            for g in range(1, groups + 1) for k in range(3)
+        ])
+        quota = Rule(name="quota", description="d", checks=QUOTA_CHECKS)
+        deadline = Rule(name="deadline", description="d", max_submissions=1)
+        db.add_all([quota, deadline])
+        db.flush()
+        db.add_all([
+            EventRule(event_id=ev.id, rule_id=quota.id, priority=0),
+            EventRule(event_id=ev.id, rule_id=deadline.id, priority=1),
+        ])
+        db.commit()
+        return ev.id, deadline.id
+
+
+def _set_deadline(Session, rule_id: int, deadline: datetime) -> None:
+    with Session() as db:
+        db.get(Rule, rule_id).submission_deadline = deadline
+        db.commit()
+    invalidate_rule_plan(rule_id)
+
+
+def _outcome(fn) -> str:
+    try:
+        fn()
+    except RuleCheckError:
+        return "deny"
+    return "pass"
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--submissions", type=int, default=50_000)
+    parser.add_argument("--groups", type=int, default=2_000)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with temp_database() as (engine, Session):
+        event_id, deadline_rule = _seed(Session, args.submissions, args.groups)
+        context = {"user_id": args.submissions + 1}
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        print(f"{args.submissions} submissions, {args.groups} teams, median of {args.runs} runs")
+        print(f"{'case':<6} {'mode':<9} {'ms':>9} {'queries':>8} {'outcome':>8}")
+        for case, deadline in (("late", now - timedelta(days=1)), ("open", now + timedelta(days=1))):
+            _set_deadline(Session, deadline_rule, deadline)
+            with Session() as db:
+                get_event_rule_plans(db, event_id)  # warm the rule-set cache
+                for mode, check in (("declared", _declared_pre_checks), ("cost", run_pre_checks)):
+                    run = lambda: _outcome(lambda: check(db, TRIGGER, event_id, context))  # noqa: E731
+                    ms, queries = measure(engine, run, args.runs)
+                    print(f"{case:<6} {mode:<9} {ms:>9.3f} {queries:>8.0f} {run():>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark compute_ranking: per-post Python ranking vs the set-based window query.
+
+Seeds one event with N rated submissions (1% carry a disqualification tag) and
+times a full ranking pass followed by a re-run with unchanged scores. Modes:
+
+- python: the previous shape (list the event's relations, posts.get per row,
+          sort in Python, rewrite each post's tags through the ORM); run here
+          without the old 100-row cap so it ranks every submission
+- sql:    _action_compute_ranking (RANK() OVER ..., one executemany UPDATE)
+
+The python mode is skipped above --python-max submissions.
+
+Usage:
+    uv run python scripts/bench_ranking.py [--submissions 10000 100000] [--python-max 20000]
+"""
+from __future__ import annotations
+
+import random
+import time
+
+from bench_common import make_parser, temp_database
+
+from app import crud
+from app.database import UNIT_OF_WORK
+from app.models.event_post import EventPost
+from app.services.rule_engine import DISQUALIFICATION_TAGS, _action_compute_ranking
+
+
+def _python_ranking(db, params, context) -> None:
+    rels = db.query(EventPost).filter(
+        EventPost.event_id == context["event_id"], EventPost.relation_type == "submission",
+    ).all()
+    scored = []
+    for rel in rels:
+        post = crud.posts.get(db, id=rel.post_id)
+        if post and post.average_rating is not None:
+            if not any(t in DISQUALIFICATION_TAGS for t in (post.tags or [])):
+                scored.append((post, post.average_rating))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    i = 0
+    while i < len(scored):
+        j = i
+        while j < len(scored) and scored[j][1] == scored[i][1]:
+            j += 1
+        for post, _ in scored[i:j]:
+            post.tags = [t for t in (post.tags or []) if not t.startswith("rank_")] + [f"rank_{i + 1}"]
+        i = j
+    db.flush()
+
+
+def _seed(Session, n: int) -> None:
+    rng = random.Random(42)
+    with Session() as db:
+        ids = crud.posts.create_many(db, rows=[
+            {"title": f"S{i}", "status": "published", "created_by": i,
+             "average_rating": round(rng.uniform(50, 100), 1),
+             "tags": ["disqualified"] if i % 100 == 0 else ["ai"]}
+            for i in range(n)
+        ])
+        crud.event_posts.create_many(db, rows=[
+            {"event_id": 1, "post_id": post_id, "relation_type": "submission"} for post_id in ids
+        ])
+        db.commit()
+
+
+def _run(n: int, mode: str) -> tuple[float, float]:
+    with temp_database() as (engine, Session):
+        _seed(Session, n)
+        rank = _action_compute_ranking if mode == "sql" else _python_ranking
+        timings = []
+        for _ in range(2):  # first pass, then a re-run with the same scores
+            with Session(info={UNIT_OF_WORK: True}) as db:
+                start = time.perf_counter()
+                rank(db, {}, {"event_id": 1})
+                db.commit()
+                timings.append(time.perf_counter() - start)
+        return timings[0] * 1000, timings[1] * 1000
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--submissions", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--python-max", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'submissions':>11} {'mode':<7} {'first ms':>10} {'rerun ms':>10}")
+    for n in args.submissions:
+        for mode in ("python", "sql"):
+            if mode == "python" and n > args.python_max:
+                continue
+            first, rerun = _run(n, mode)
+            print(f"{n:>11} {mode:<7} {first:>10.1f} {rerun:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
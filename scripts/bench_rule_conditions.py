@@ -0,0 +1,104 @@
+"""Benchmark rule-engine conditions: Python-side evaluation vs one SQL statement.
+
+Seeds one event with --submissions submission posts (default 50k) from as many
+users, plus --groups registered teams, then times each condition. "python" is
+the previous evaluator shape (load the relation list, then one query per row);
+"sql" is the current evaluator in app.services.rule_engine.
+
+The previous evaluators read relation lists through get_multi_by_category(),
+which stops at 100 rows, so their timings are bounded by that page (and their
+answers are wrong past it: the "ok" column shows whether each agrees with the
+true result).
+
+Usage:
+    uv run python scripts/bench_rule_conditions.py [--submissions 50000] [--groups 500]
+"""
+from __future__ import annotations
+
+from bench_common import make_parser, measure, temp_database
+
+from app import crud
+from app.models.event_group import EventGroup
+from app.models.post import Post
+from app.services.rule_engine import _compare, _eval_aggregate, _eval_count, _eval_exists
+
+
+def _python_exists_submission(db, params, context):
+    for rel in crud.event_posts.get_multi_by_category(
+        db, event_id=context["event_id"], relation_type="submission",
+    ):
+        post = crud.posts.get(db, id=rel.post_id)
+        if post and post.created_by == context["user_id"]:
+            return True
+    return False
+
+
+def _python_count_submissions(db, params, context):
+    rels = crud.event_posts.get_multi_by_category(db, event_id=context["event_id"], relation_type="submission")
+    return _compare(len(rels), params["op"], params["value"])
+
+
+def _python_each_group(db, params, context):
+    for cg in crud.event_groups.get_multi_by_category(db, event_id=context["event_id"]):
+        count = crud.members.count_by_group(db, group_id=cg.group_id, status="accepted")
+        if not _compare(count, params["op"], params["value"]):
+            return False
+    return True
+
+
+def _seed(Session, submissions: int, groups: int) -> None:
+    with Session() as db:
+        db.bulk_insert_mappings(Post, [
+            {"id": i, "title": f"Entry {i}", "status": "published", "created_by": i}
+            for i in range(1, submissions + 1)
+        ])
+        crud.event_posts.create_many(db, rows=[
+            {"event_id": 1, "post_id": i, "relation_type": "submission"} for i in range(1, submissions + 1)
+        ])
+        db.bulk_insert_mappings(EventGroup, [{"event_id": 1, "group_id": g} for g in range(1, groups + 1)])
+        crud.members.create_many(db, rows=[
+            {"group_id": g, "user_id": g * 10 + k, "status": "accepted"}
+            for g in range(1, groups + 1) for k in range(3)
+        ])
+        db.commit()
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--submissions", type=int, default=50_000)
+    parser.add_argument("--groups", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    n = args.submissions
+    cases = [
+        # (name, params, context, python evaluator, sql evaluator)
+        ("exists: user submitted (last)", {"entity": "event_post", "filter": {"relation_type": "submission"}},
+         {"event_id": 1, "user_id": n}, _python_exists_submission, _eval_exists),
+        ("exists: user submitted (none)", {"entity": "event_post", "filter": {"relation_type": "submission"}},
+         {"event_id": 1, "user_id": n + 1}, _python_exists_submission, _eval_exists),
+        ("count: event submissions >= n", {"entity": "event_post", "op": ">=", "value": n,
+                                           "filter": {"relation_type": "submission"}},
+         {"event_id": 1}, _python_count_submissions, _eval_count),
+        ("aggregate: each team >= 3", {"scope": "each_group_in_category", "op": ">=", "value": 3,
+                                       "filter": {"status": "accepted"}},
+         {"event_id": 1}, _python_each_group, _eval_aggregate),
+    ]
+
+    with temp_database() as (engine, Session):
+        _seed(Session, n, args.groups)
+
+        print(f"{n} submissions, {args.groups} teams, median of {args.runs} runs")
+        print(f"{'condition':<32} {'mode':<7} {'ms':>9} {'queries':>8} {'ok':>4}")
+        with Session() as db:
+            for name, params, context, python_eval, sql_eval in cases:
+                expected = None
+                for mode, fn in (("sql", sql_eval), ("python", python_eval)):
+                    ms, queries = measure(engine, lambda: fn(db, params, context), args.runs)
+                    result = fn(db, params, context)
+                    expected = result if mode == "sql" else expected
+                    print(f"{name:<32} {mode:<7} {ms:>9.2f} {queries:>8.0f} {'yes' if result == expected else 'NO':>4}")
+
+
+if __name__ == "__main__":
+    main()
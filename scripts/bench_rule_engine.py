@@ -0,0 +1,262 @@
+"""Benchmark the rule engine at scale and write a baseline to diff between commits.
+
+Each scenario (SCENARIOS: 1-50 rules, 10-100k submissions, 1-5k teams) seeds one
+published event with its rules, its registered teams (team g has 2 + g % 3
+accepted members, so every third team is below the min_team_size of 3) and its
+rated submissions spread over the members, a third of them with an attachment.
+Rules mix fixed fields (every fifth rule: submission window, max_submissions,
+submission_format, min/max_team_size) with custom warn checks of every condition
+type; the first rule also carries the closure post hooks (flag_disqualified,
+compute_ranking, award_certificate). Measured:
+
+- pre_checks: run_pre_checks per trigger with the rule set cached (median ms and
+  queries per call, peak traced memory of one call)
+- rule_load:  get_event_rule_plans with the rule set cache dropped
+- closure:    each post hook of update_content(event.status), in rule order, on
+              a fresh transaction that is rolled back afterwards
+
+Results are written as JSON (--output); --compare reads an earlier file and
+reports entries whose query count grew or whose time grew past --tolerance (and
+by more than MIN_SLOWDOWN_MS), exiting with status 1 if there are any. Query
+counts are exact; times and memory depend on the machine, so compare baselines
+taken on the same one.
+
+Usage:
+    uv run python scripts/bench_rule_engine.py [--scenarios small medium large] [--output FILE]
+    uv run python scripts/bench_rule_engine.py --scenarios small medium --compare scripts/baselines/rule_engine.json
+"""
+from __future__ import annotations
+
+import json
+import platform
+import random
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from bench_common import ROOT, StatementCounter, git_commit, make_parser, measure, peak_kb, temp_database
+
+from app import crud
+from app.database import UNIT_OF_WORK
+from app.models.event import Event
+from app.models.event_group import EventGroup
+from app.models.event_rule import EventRule
+from app.models.post_resource import PostResource
+from app.models.resource import Resource
+from app.models.rule import Rule
+from app.services.rule_engine import (
+    _execute_action,
+    get_event_rule_plans,
+    invalidate_rule_plan,
+    run_pre_checks,
+)
+
+# name -> (rules, submissions, teams)
+SCENARIOS = {
+    "small": (1, 10, 1),
+    "medium": (10, 10_000, 500),
+    "large": (50, 100_000, 5_000),
+}
+DEFAULT_OUTPUT = ROOT / "scripts" / "baselines" / "rule_engine.json"
+
+SUBMIT = "create_relation(event_post)"
+JOIN = "create_relation(group_user)"
+REGISTER = "create_relation(event_group)"
+CLOSE = "update_content(event.status)"
+EVENT_ID = 1
+MIN_TEAM_SIZE = 3
+# --compare ignores slowdowns below this, which sub-millisecond timings hit by noise
+MIN_SLOWDOWN_MS = 0.5
+
+
+def _warn(trigger: str, ctype: str, **params) -> dict:
+    return {"trigger": trigger, "phase": "pre", "on_fail": "warn", "message": f"{ctype} check",
+            "condition": {"type": ctype, "params": params}}
+
+
+def _custom_checks(i: int) -> list[dict]:
+    """Custom checks of rule ``i``; thresholds vary by rule so conditions differ."""
+    templates = [
+        _warn(SUBMIT, "count", entity="event_post", scope="user",
+              filter={"relation_type": "submission"}, op="<", value=1_000 + i),
+        _warn(SUBMIT, "field_match", entity="event", target="$current", field="status", op="==", value="published"),
+        _warn(SUBMIT, "resource_required", min_count=1, formats=["pdf", "zip"]),
+        _warn(SUBMIT, "aggregate", scope="each_group_in_category", filter={"status": "accepted"}, op=">=", value=2),
+        _warn(JOIN, "exists", entity="group_user", filter={"status": "accepted"}, require=False),
+        _warn(JOIN, "count", entity="group_user", scope="group", filter={"status": "accepted"}, op="<", value=10 + i),
+        _warn(REGISTER, "exists", entity="event_group", require=False),
+        _warn(CLOSE, "count", entity="event_post", filter={"relation_type": "submission"}, op=">=", value=i + 1),
+    ]
+    return [templates[i % len(templates)], templates[(i + 3) % len(templates)]]
+
+
+CLOSURE_HOOKS = [
+    {"trigger": CLOSE, "phase": "post", "action": "flag_disqualified", "message": "Flag small teams",
+     "action_params": {"target": "group", "tag": "team_too_small"}},
+    {"trigger": CLOSE, "phase": "post", "action": "compute_ranking", "message": "Rank"},
+    {"trigger": CLOSE, "phase": "post", "action": "award_certificate", "message": "Certificates",
+     "action_params": {"rules": [
+         {"rank_range": [1, 1], "title": "Gold"},
+         {"rank_range": [2, 3], "title": "Podium"},
+         {"rank_range": [4, 100], "title": "Finalist"},
+     ]}},
+]
+
+
+def _seed(Session, n_rules: int, submissions: int, teams: int) -> dict:
+    """Seed one scenario; returns the pre-check contexts per trigger."""
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    members = [(g, g * 10 + k) for g in range(1, teams + 1) for k in range(2 + g % 3)]
+    with Session() as db:
+        db.add(Event(id=EVENT_ID, name="Jam", description="d", type="competition", status="published"))
+        db.bulk_insert_mappings(EventGroup, [{"event_id": EVENT_ID, "group_id": g} for g in range(1, teams + 1)])
+        crud.members.create_many(db, rows=[{"group_id": g, "user_id": u, "status": "accepted"} for g, u in members])
+        ids = crud.posts.create_many(db, rows=[
+            {"title": f"S{i}", "status": "published", "created_by": members[i % len(members)][1],
+             "average_rating": round(rng.uniform(50, 100), 1), "tags": []}
+            for i in range(submissions)
+        ])
+        crud.event_posts.create_many(db, rows=[
+            {"event_id": EVENT_ID, "post_id": post_id, "relation_type": "submission"} for post_id in ids
+        ])
+        db.add(Resource(id=1, filename="deck.pdf"))
+        db.bulk_insert_mappings(PostResource, [{"post_id": post_id, "resource_id": 1} for post_id in ids[::3]])
+
+        rules = []
+        for i in range(n_rules):
+            fields = {}
+            if i % 5 == 0:
+                fields = {
+                    "submission_start": now - timedelta(days=1), "submission_deadline": now + timedelta(days=1),
+                    "max_submissions": submissions + 1, "submission_format": ["pdf", "zip"],
+                    "min_team_size": MIN_TEAM_SIZE, "max_team_size": 10,
+                }
+            checks = _custom_checks(i) + (CLOSURE_HOOKS if i == 0 else [])
+            rules.append(Rule(name=f"Rule {i}", description="d", checks=checks, **fields))
+        db.add_all(rules)
+        db.flush()
+        db.add_all(EventRule(event_id=EVENT_ID, rule_id=rule.id, priority=i) for i, rule in enumerate(rules))
+        db.commit()
+
+    # Team 1 has MIN_TEAM_SIZE members; its first member submits, joins and registers
+    user_id = members[0][1]
+    return {
+        SUBMIT: {"user_id": user_id, "post_id": ids[0], "group_id": 1},
+        JOIN: {"user_id": 10**9, "group_id": 1},
+        REGISTER: {"user_id": user_id, "group_id": 1},
+        CLOSE: {"user_id": user_id, "new_status": "closed"},
+    }
+
+
+def _measure_pre_checks(engine, Session, contexts: dict, iterations: int) -> list[dict]:
+    results = []
+    with Session() as db:
+        get_event_rule_plans(db, EVENT_ID)  # warm the rule-set cache
+        for trigger, context in contexts.items():
+            check = lambda: run_pre_checks(db, trigger, EVENT_ID, context)  # noqa: E731
+            ms, queries = measure(engine, check, iterations)
+            results.append({"kind": "pre_checks", "name": trigger, "ms": round(ms, 3), "queries": queries,
+                            "peak_kb": peak_kb(check)})
+
+        def load():
+            invalidate_rule_plan()
+            get_event_rule_plans(db, EVENT_ID)
+        ms, queries = measure(engine, load, iterations)
+        results.append({"kind": "rule_load", "name": "get_event_rule_plans", "ms": round(ms, 3), "queries": queries,
+                        "peak_kb": peak_kb(load)})
+    return results
+
+
+def _measure_closure(engine, Session, context: dict) -> list[dict]:
+    results = []
+    with Session() as db:
+        plans = get_event_rule_plans(db, EVENT_ID)
+    hooks = [(plan, check) for plan in plans for check in plan.for_trigger(CLOSE, "post")]
+    # Each action runs after the previous ones, as in run_post_hooks; the timed pass
+    # and the traced pass each start from the seeded data
+    timings = {}
+    with Session(info={UNIT_OF_WORK: True}) as db, StatementCounter(engine) as counter:
+        for plan, check in hooks:
+            ctx = {**context, "rule": plan.rule, "event_id": EVENT_ID}
+            before, start = counter.count, time.perf_counter()
+            _execute_action(db, check.action, dict(check.action_params), ctx)
+            db.flush()
+            timings[check.action] = (round((time.perf_counter() - start) * 1000, 3), counter.count - before)
+        db.rollback()
+    with Session(info={UNIT_OF_WORK: True}) as db:
+        for plan, check in hooks:
+            ctx = {**context, "rule": plan.rule, "event_id": EVENT_ID}
+            peak = peak_kb(lambda: (_execute_action(db, check.action, dict(check.action_params), ctx), db.flush()))
+            ms, queries = timings[check.action]
+            results.append({"kind": "closure", "name": check.action, "ms": ms, "queries": queries, "peak_kb": peak})
+        db.rollback()
+    return results
+
+
+def _run(name: str, iterations: int) -> list[dict]:
+    n_rules, submissions, teams = SCENARIOS[name]
+    with temp_database() as (engine, Session):
+        contexts = _seed(Session, n_rules, submissions, teams)
+        invalidate_rule_plan()
+        results = _measure_pre_checks(engine, Session, contexts, iterations)
+        results += _measure_closure(engine, Session, contexts[CLOSE])
+    scenario = {"scenario": name, "rules": n_rules, "submissions": submissions, "teams": teams}
+    return [{**scenario, **result} for result in results]
+
+
+def _compare(baseline: dict, results: list[dict], tolerance: float) -> int:
+    """Print each entry against the baseline; returns the number of regressions."""
+    previous = {(r["scenario"], r["kind"], r["name"]): r for r in baseline["results"]}
+    regressions = 0
+    print(f"\nagainst {baseline.get('commit') or 'baseline'} (time tolerance x{tolerance}):")
+    for result in results:
+        old = previous.get((result["scenario"], result["kind"], result["name"]))
+        if old is None:
+            continue
+        ratio = result["ms"] / old["ms"] if old["ms"] else 1.0
+        slower = ratio > tolerance and result["ms"] - old["ms"] > MIN_SLOWDOWN_MS
+        regressed = result["queries"] > old["queries"] or slower
+        regressions += regressed
+        print(f"{result['scenario']:<7} {result['kind']:<10} {result['name']:<30} "
+              f"{old['ms']:>9.3f} -> {result['ms']:>9.3f} ms (x{ratio:.2f}) "
+              f"{old['queries']:>6.1f} -> {result['queries']:>6.1f} queries{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", type=Path, help="earlier output to diff against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed time ratio before flagging")
+    args = parser.parse_args()
+
+    # Read first: --compare may name the file about to be overwritten
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    results = []
+    print(f"{'scenario':<8} {'kind':<10} {'name':<30} {'ms':>10} {'queries':>8} {'peak KB':>9}")
+    for name in args.scenarios:
+        for result in _run(name, args.iterations):
+            results.append(result)
+            print(f"{name:<8} {result['kind']:<10} {result['name']:<30} "
+                  f"{result['ms']:>10.3f} {result['queries']:>8.1f} {result['peak_kb']:>9.1f}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "iterations": args.iterations,
+        "results": results,
+    }, indent=2) + "\n")
+    print(f"\nwrote {args.output}")
+    if baseline is not None and _compare(baseline, results, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
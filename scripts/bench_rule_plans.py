@@ -0,0 +1,102 @@
+"""Benchmark per-submission rule-check overhead: recompiling rules vs cached plans.
+
+An event is linked to 20 rules, each with a submission window, a team-size cap,
+a format list and a few custom checks on other triggers. For every simulated
+submission we time:
+
+- plan:      building the per-rule check lists alone (compile_rule vs get_rule_plan)
+- pre-check: the full run_pre_checks("create_relation(event_post)") call
+
+"recompile" drops the plan cache before every call, which is what the engine did
+before plans were cached.
+
+Usage:
+    uv run python scripts/bench_rule_plans.py [--rules 20] [--iterations 2000]
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from bench_common import make_parser, median_ms, temp_database
+
+from app.models.event import Event
+from app.models.event_rule import EventRule
+from app.models.post import Post
+from app.models.rule import Rule
+from app.models.user import User
+from app.services.rule_engine import (
+    compile_rule,
+    get_rule_plan,
+    invalidate_rule_plan,
+    run_pre_checks,
+)
+
+TRIGGER = "create_relation(event_post)"
+
+
+def _custom_checks(i: int) -> list[dict]:
+    return [
+        {"trigger": "create_relation(group_user)", "phase": "pre",
+         "condition": {"type": "exists", "params": {"entity": "group_user", "require": True}},
+         "on_fail": "warn", "message": f"rule {i}: join a team first"},
+        {"trigger": "update_content(post)", "phase": "pre",
+         "condition": {"type": "time_window", "params": {"end": "2099-01-01T00:00:00Z"}},
+         "on_fail": "deny", "message": f"rule {i}: editing closed"},
+        {"trigger": TRIGGER, "phase": "post", "action": "compute_ranking",
+         "action_params": {"source_field": "average_rating"}},
+    ]
+
+
+def _seed(Session, n_rules: int) -> tuple[int, int, int]:
+    now = datetime.now()
+    with Session() as db:
+        user = User(username="bench", email="bench@example.com")
+        db.add(user)
+        db.flush()
+        event = Event(name="Jam", description="d", type="competition", status="published", created_by=user.id)
+        post = Post(title="Entry", created_by=user.id)
+        db.add_all([event, post])
+        db.flush()
+        for i in range(n_rules):
+            rule = Rule(
+                name=f"Rule {i}", description="d",
+                submission_start=now - timedelta(days=1), submission_deadline=now + timedelta(days=30),
+                max_team_size=5, submission_format=["pdf", "zip"], checks=_custom_checks(i),
+            )
+            db.add(rule)
+            db.flush()
+            db.add(EventRule(event_id=event.id, rule_id=rule.id, priority=i))
+        db.commit()
+        return event.id, user.id, post.id
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--rules", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with temp_database() as (engine, Session), Session() as db:
+        event_id, user_id, post_id = _seed(Session, args.rules)
+        context = {"user_id": user_id, "post_id": post_id}
+        rules = db.query(Rule).all()
+        results = {
+            ("plan", "recompile"): median_ms(
+                lambda: [compile_rule(r).for_trigger(TRIGGER, "pre") for r in rules], args.iterations),
+            ("plan", "cached"): median_ms(
+                lambda: [get_rule_plan(r).for_trigger(TRIGGER, "pre") for r in rules], args.iterations),
+            ("pre-check", "recompile"): median_ms(
+                lambda: run_pre_checks(db, TRIGGER, event_id, context), args.iterations,
+                before=invalidate_rule_plan),
+            ("pre-check", "cached"): median_ms(
+                lambda: run_pre_checks(db, TRIGGER, event_id, context), args.iterations),
+        }
+
+    print(f"{args.rules} rules per event, median of {args.iterations} submissions")
+    print(f"{'stage':<10} {'mode':<10} {'us/submission':>14}")
+    for (stage, mode), ms in results.items():
+        print(f"{stage:<10} {mode:<10} {ms * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
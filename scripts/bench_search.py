@@ -0,0 +1,70 @@
+"""Benchmark post search latency: LIKE scan vs FTS5 index, as the post count grows.
+
+Seeds a fresh SQLite database per size (schema via Base.metadata, so the FTS5
+tables and triggers come along) and times the list_posts text filter both ways,
+plus the mixed /api/search query from app.services.search.
+
+Usage:
+    uv run python scripts/bench_search.py [--sizes 1000 10000 50000] [--repeat 50]
+"""
+from __future__ import annotations
+
+import random
+
+from sqlalchemy import func, or_, text
+
+from bench_common import make_parser, median_ms, temp_database
+from app.models.post import Post
+from app.services.search import fts_phrase_query, search
+
+WORDS = ("alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india",
+         "juliet", "kilo", "lima", "mike", "november", "oscar", "papa", "quebec", "romeo")
+NEEDLE = "zephyrine"
+
+
+def _seed(Session, n: int) -> None:
+    rng = random.Random(n)
+    with Session() as db:
+        rows = []
+        for i in range(n):
+            body = " ".join(rng.choices(WORDS, k=120))
+            if i % 500 == 0:
+                body += f" {NEEDLE}"
+            rows.append({
+                "title": " ".join(rng.choices(WORDS, k=5)), "content": body, "type": "general",
+                "status": "published", "visibility": "public", "tags": [], "like_count": 0,
+                "comment_count": 0, "created_by": 1,
+            })
+        db.execute(Post.__table__.insert(), rows)
+        db.commit()
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    like = f"%{NEEDLE}%"
+    like_filter = or_(func.lower(Post.title).like(like), func.lower(func.coalesce(Post.content, "")).like(like))
+    fts_filter = text("posts.id IN (SELECT rowid FROM posts_fts WHERE posts_fts MATCH :fts_q)").bindparams(
+        fts_q=fts_phrase_query(NEEDLE, ("title", "content")),
+    )
+
+    print(f"{'posts':>8} {'LIKE ms':>10} {'FTS ms':>10} {'/search ms':>11} {'hits':>6}")
+    for n in args.sizes:
+        with temp_database() as (engine, Session):
+            _seed(Session, n)
+            with Session() as db:
+                like_q = db.query(Post).filter(Post.deleted_at.is_(None), like_filter)
+                fts_q = db.query(Post).filter(Post.deleted_at.is_(None), fts_filter)
+                hits = fts_q.count()
+                assert hits == like_q.count()
+                like_ms = median_ms(lambda: like_q.limit(20).all() and like_q.count(), args.repeat)
+                fts_ms = median_ms(lambda: fts_q.limit(20).all() and fts_q.count(), args.repeat)
+                search_ms = median_ms(lambda: search(db, NEEDLE, limit=20), args.repeat)
+        print(f"{n:>8} {like_ms:>10.2f} {fts_ms:>10.2f} {search_ms:>11.2f} {hits:>6}")
+
+
+if __name__ == "__main__":
+    main()
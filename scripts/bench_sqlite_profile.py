@@ -0,0 +1,132 @@
+"""Benchmark SQLite read/write throughput under mixed concurrent load.
+
+Compares the legacy connection setup (rollback journal, driver defaults) with the
+connection profile from ``app.core.config.Settings`` (WAL, synchronous=NORMAL, mmap,
+cache sizing, busy_timeout). Each profile runs against a fresh database file with the
+same seed data and the same mix of reader and writer threads.
+
+Usage:
+    uv run python scripts/bench_sqlite_profile.py [--seconds 5] [--readers 8] [--writers 2]
+"""
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from bench_common import make_parser
+from app.core.config import settings
+from app.database import Base, apply_sqlite_pragmas
+import app.models  # noqa: F401
+from app.models.post import Post
+
+
+def _make_engine(path: Path, tuned: bool):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=32,
+        max_overflow=0,
+    )
+    if tuned:
+        @event.listens_for(engine, "connect")
+        def _pragmas(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection, settings)
+    return engine
+
+
+def _seed(Session, rows: int) -> None:
+    with Session() as db:
+        db.add_all(
+            Post(title=f"seed {i}", content="x" * 200, status="published", created_by=i % 50)
+            for i in range(rows)
+        )
+        db.commit()
+
+
+def _run_profile(name: str, tuned: bool, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = _make_engine(Path(tmp) / "bench.db", tuned)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        _seed(Session, args.rows)
+
+        stop = threading.Event()
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+
+        def reader(worker_id: int):
+            n = 0
+            with Session() as db:
+                while not stop.is_set():
+                    db.execute(
+                        select(Post.id, Post.title).where(
+                            Post.deleted_at.is_(None), Post.created_by == (n + worker_id) % 50,
+                        ).limit(20)
+                    ).all()
+                    db.execute(select(func.count(Post.id))).scalar()
+                    db.rollback()
+                    n += 1
+            with lock:
+                counts["reads"] += n
+
+        def writer(worker_id: int):
+            n = locked = 0
+            with Session() as db:
+                while not stop.is_set():
+                    try:
+                        db.add(Post(title=f"w{worker_id}-{n}", content="y" * 200, created_by=worker_id))
+                        db.commit()
+                        n += 1
+                    except OperationalError:
+                        db.rollback()
+                        locked += 1
+            with lock:
+                counts["writes"] += n
+                counts["locked"] += locked
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+        for t in threads:
+            t.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        engine.dispose()
+
+    return {
+        "profile": name,
+        "reads_per_s": counts["reads"] / args.seconds,
+        "writes_per_s": counts["writes"] / args.seconds,
+        "locked_errors": counts["locked"],
+    }
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    results = [
+        _run_profile("baseline (rollback journal)", tuned=False, args=args),
+        _run_profile(
+            f"tuned ({settings.sqlite_journal_mode}, synchronous={settings.sqlite_synchronous})",
+            tuned=True, args=args,
+        ),
+    ]
+    print(f"{'profile':<40} {'reads/s':>10} {'writes/s':>10} {'locked':>8}")
+    for r in results:
+        print(f"{r['profile']:<40} {r['reads_per_s']:>10.0f} {r['writes_per_s']:>10.0f} {r['locked_errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark worker startup: import time, schema check and first-request latency.
+
+Each sample runs in a fresh interpreter against a temporary SQLite database that is
+already at the Alembic head (the normal restart case). Modes:
+
+- create_all: the previous behaviour, Base.metadata.create_all() on every start
+- init_db:    app lifespan with init_db() taking the "already at head" fast path
+
+Usage:
+    uv run python scripts/bench_startup.py [--runs 5]
+"""
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from bench_common import ROOT, make_parser
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app.main
+from app.main import app as api
+t1 = time.perf_counter()
+if sys.argv[1] == "create_all":
+    from app.database import Base, engine
+    Base.metadata.create_all(bind=engine)
+from fastapi.testclient import TestClient
+with TestClient(api) as client:
+    t2 = time.perf_counter()
+    assert client.get("/api/posts").status_code == 200
+    t3 = time.perf_counter()
+    assert client.get("/api/events/1").status_code in (200, 404)
+    t4 = time.perf_counter()
+    client.get("/api/posts")
+    t5 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "startup": t2 - t1, "first": t3 - t2, "first_other": t4 - t3, "warm": t5 - t4}))
+"""
+
+
+def _sample(mode: str, data_dir: str) -> dict:
+    env = dict(os.environ, SYNNOVATOR_DATA_DIR=data_dir, PYTHONPATH=str(ROOT),
+               DB_INIT_ON_STARTUP="true" if mode == "init_db" else "false")
+    out = subprocess.run([sys.executable, "-c", CHILD, mode], env=env, cwd=ROOT,
+                         check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _sample("init_db", tmp)  # create + stamp the database once
+        print(f"{'mode':<11} {'import ms':>10} {'startup ms':>11} {'1st req ms':>11} "
+              f"{'1st other ms':>13} {'warm ms':>8}")
+        for mode in ("create_all", "init_db"):
+            runs = [_sample(mode, tmp) for _ in range(args.runs)]
+            med = {k: statistics.median(r[k] for r in runs) * 1000 for k in runs[0]}
+            print(f"{mode:<11} {med['import']:>10.1f} {med['startup']:>11.1f} {med['first']:>11.1f} "
+                  f"{med['first_other']:>13.1f} {med['warm']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
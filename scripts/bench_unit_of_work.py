@@ -0,0 +1,98 @@
+"""Benchmark write flows: per-call commits vs the request-scoped unit of work.
+
+Runs the comment, like, follow and submission endpoints of app.main against a
+temporary SQLite file and reports, per request, the number of COMMITs (each one
+is a journal fsync with synchronous=FULL, or a WAL append with NORMAL) and the
+median latency. "per-call" serves requests from a session without the unit-of-work
+flag, which is how every CRUD call committed before.
+
+Usage:
+    uv run python scripts/bench_unit_of_work.py [--requests 300] [--synchronous full]
+"""
+from __future__ import annotations
+
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from bench_common import make_parser, temp_database
+from app.database import UNIT_OF_WORK, get_db
+from app.main import app
+from app.models.event import Event
+from app.models.post import Post
+from app.models.user import User
+
+FLOWS = ("comment", "like", "follow", "submission")
+
+
+def _seed(Session, n: int) -> None:
+    with Session() as db:
+        # User 1 authors everything; users 2..n+1 act on it
+        db.add_all(User(username=f"u{i}", email=f"u{i}@example.com") for i in range(1, n + 2))
+        db.flush()
+        db.add_all(Post(title=f"Post {i}", status="published", created_by=1) for i in range(n))
+        db.add_all(Post(title=f"Entry {i}", status="published", created_by=i + 2) for i in range(n))
+        db.add(Event(name="Jam", description="d", type="competition", status="published", created_by=1))
+        db.commit()
+
+
+def _request(client: TestClient, flow: str, i: int, n: int):
+    headers = {"X-User-Id": str(i + 2)}
+    if flow == "comment":
+        return client.post(f"/api/posts/{i + 1}/comments", json={"type": "comment", "value": "hi"}, headers=headers)
+    if flow == "like":
+        return client.post(f"/api/posts/{i + 1}/like", headers=headers)
+    if flow == "follow":
+        return client.post("/api/users/1/follow", headers=headers)
+    return client.post("/api/events/1/posts", json={"post_id": n + i + 1}, headers=headers)
+
+
+def _run(unit_of_work: bool, n: int, synchronous: str) -> dict:
+    with temp_database(sqlite_synchronous=synchronous) as (engine, Session):
+        _seed(Session, n)
+
+        commits = []
+        event.listen(engine, "commit", lambda conn: commits.append(1))
+
+        def _get_db():
+            db = Session(info={UNIT_OF_WORK: unit_of_work})
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = _get_db
+        results = {}
+        try:
+            with TestClient(app) as client:
+                for flow in FLOWS:
+                    commits.clear()
+                    samples = []
+                    for i in range(n):
+                        start = time.perf_counter()
+                        resp = _request(client, flow, i, n)
+                        samples.append(time.perf_counter() - start)
+                        assert resp.status_code == 201, (flow, resp.status_code, resp.text)
+                    results[flow] = (len(commits) / n, statistics.median(samples) * 1000)
+        finally:
+            app.dependency_overrides.clear()
+        return results
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--synchronous", choices=("off", "normal", "full", "extra"), default="full")
+    args = parser.parse_args()
+
+    print(f"{'flow':<12} {'mode':<14} {'commits/req':>12} {'p50 ms':>8}")
+    for flow_results, mode in ((_run(False, args.requests, args.synchronous), "per-call"),
+                               (_run(True, args.requests, args.synchronous), "unit-of-work")):
+        for flow, (commits, p50) in flow_results.items():
+            print(f"{flow:<12} {mode:<14} {commits:>12.1f} {p50:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
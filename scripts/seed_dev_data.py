@@ -5,7 +5,7 @@ import sqlite3
 
 from sqlalchemy.orm import Session
 
-from app.database import Base, SessionLocal, engine, DATA_DIR
+from app.database import SessionLocal, engine, init_db, DATA_DIR
 from app.models.event import Event
 from app.models.group import Group
 from app.models.member import Member
@@ -25,7 +25,7 @@ def _has_category_tags_column(db_path: str) -> bool:
 
 
 def _ensure_schema() -> None:
-    Base.metadata.create_all(bind=engine)
+    init_db(engine)
 
 
 def _seed_users(db: Session) -> dict[str, int]: